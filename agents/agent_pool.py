@@ -0,0 +1,182 @@
+from typing import Callable, Dict, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+
+def definition_key(session_id: str, session_data: Dict) -> str:
+    """Pool key for a session link: its id plus the founder inputs it was built from"""
+    inputs = json.dumps(session_data.get('founder_inputs', {}), sort_keys=True, default=str)
+    return f"{session_id}:{hashlib.sha256(inputs.encode('utf-8')).hexdigest()[:16]}"
+
+def build_interview_agent(session_id: str, session_data: Dict):
+    from agents.interview_agent import InterviewAgent
+    return InterviewAgent(session_id=session_id, session_data=copy.deepcopy(session_data))
+
+class AgentPool:
+    """Keeps constructed, unused interview agents ready per session link.
+
+    Building an agent reads config, validates the founder inputs, renders the
+    system prompts and probes the OpenAI connection; a warm agent skips all
+    of that on the tester's critical path. Every ``acquire`` hands out an
+    agent exactly once and tops the session back up in the background.
+
+    Limits: ``per_session`` warm agents per link, ``max_total`` across links
+    (least recently used links are trimmed first) and ``idle_ttl`` seconds
+    before an unused agent is dropped.
+    """
+
+    def __init__(self, factory: Optional[Callable] = None, per_session: int = 2, max_total: int = 50,
+                 idle_ttl: float = 600.0, workers: int = 2):
+        self.factory = factory or build_interview_agent
+        self.per_session = per_session
+        self.max_total = max_total
+        self.idle_ttl = idle_ttl
+        # key -> deque of (agent, warmed_at), least recently used key first
+        self._warm: "OrderedDict[str, deque]" = OrderedDict()
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-pool")
+        self._counters = {
+            "hits": 0, "misses": 0, "builds": 0, "build_errors": 0,
+            "evicted_idle": 0, "evicted_capacity": 0, "build_seconds": 0.0
+        }
+
+    def acquire(self, session_id: str, session_data: Dict, replenish: bool = True):
+        """Return a fresh agent for this session, warm if one is ready"""
+        key = definition_key(session_id, session_data)
+        self.evict_idle()
+        agent = None
+        with self._lock:
+            warm = self._warm.get(key)
+            if warm:
+                agent, _ = warm.popleft()
+                self._warm.move_to_end(key)
+                self._counters["hits"] += 1
+            else:
+                self._counters["misses"] += 1
+        if agent is None:
+            agent = self._build(session_id, session_data)
+        if replenish:
+            self._schedule(key, session_id, session_data, self.per_session)
+        return agent
+
+    def prewarm(self, session_id: str, session_data: Dict, count: Optional[int] = None, wait: bool = False) -> None:
+        """Build up to ``count`` (default ``per_session``) warm agents for a session link"""
+        key = definition_key(session_id, session_data)
+        futures = self._schedule(key, session_id, session_data, min(count or self.per_session, self.per_session))
+        if wait:
+            for future in futures:
+                future.result()
+
+    def _schedule(self, key: str, session_id: str, session_data: Dict, target: int) -> list:
+        with self._lock:
+            have = len(self._warm.get(key, ())) + self._pending.get(key, 0)
+            needed = max(0, target - have)
+            self._pending[key] = self._pending.get(key, 0) + needed
+        if not needed:
+            return []
+        data = copy.deepcopy(session_data)
+        return [self._executor.submit(self._warm_one, key, session_id, data) for _ in range(needed)]
+
+    def _build(self, session_id: str, session_data: Dict):
+        started = time.perf_counter()
+        try:
+            agent = self.factory(session_id, session_data)
+        except Exception:
+            with self._lock:
+                self._counters["build_errors"] += 1
+            raise
+        with self._lock:
+            self._counters["builds"] += 1
+            self._counters["build_seconds"] += time.perf_counter() - started
+        return agent
+
+    def _warm_one(self, key: str, session_id: str, session_data: Dict) -> None:
+        try:
+            agent = self._build(session_id, session_data)
+        except Exception as e:
+            print(f"Error prewarming interview agent: {str(e)}")
+            with self._lock:
+                self._finish_pending(key)
+            return
+        with self._lock:
+            self._finish_pending(key)
+            warm = self._warm.setdefault(key, deque())
+            self._warm.move_to_end(key)
+            if len(warm) >= self.per_session:
+                return
+            warm.append((agent, time.monotonic()))
+            self._trim()
+
+    def _finish_pending(self, key: str) -> None:
+        self._pending[key] -= 1
+        if not self._pending[key]:
+            del self._pending[key]
+
+    def _trim(self) -> None:
+        """Drop agents from the least recently used links until under ``max_total``"""
+        total = sum(len(warm) for warm in self._warm.values())
+        for key in list(self._warm):
+            if total <= self.max_total:
+                break
+            warm = self._warm[key]
+            while warm and total > self.max_total:
+                warm.popleft()
+                total -= 1
+                self._counters["evicted_capacity"] += 1
+            if not warm:
+                del self._warm[key]
+
+    def evict_idle(self) -> int:
+        """Drop agents that have been waiting longer than ``idle_ttl``; returns how many"""
+        cutoff = time.monotonic() - self.idle_ttl
+        evicted = 0
+        with self._lock:
+            for key in list(self._warm):
+                warm = self._warm[key]
+                while warm and warm[0][1] < cutoff:
+                    warm.popleft()
+                    evicted += 1
+                if not warm and not self._pending.get(key):
+                    del self._warm[key]
+            self._counters["evicted_idle"] += evicted
+        return evicted
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            warm = sum(len(w) for w in self._warm.values())
+            links = len(self._warm)
+            pending = sum(self._pending.values())
+        acquired = counters["hits"] + counters["misses"]
+        builds = counters.pop("build_seconds")
+        return {
+            **counters,
+            "warm": warm,
+            "links": links,
+            "pending": pending,
+            "hit_rate": counters["hits"] / acquired if acquired else 0.0,
+            "avg_build_ms": builds / counters["builds"] * 1000 if counters["builds"] else 0.0
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+agent_pool = AgentPool(
+    per_session=int(os.getenv('AGENT_POOL_PER_SESSION', '2')),
+    max_total=int(os.getenv('AGENT_POOL_MAX', '50')),
+    idle_ttl=float(os.getenv('AGENT_POOL_IDLE_SECONDS', '600'))
+)
+
+def get_agent_pool() -> AgentPool:
+    return agent_pool
+
+def set_agent_pool(pool: AgentPool) -> None:
+    """Replace the process-wide pool, e.g. with different limits in load tests"""
+    global agent_pool
+    agent_pool = pool
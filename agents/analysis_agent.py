@@ -1,57 +1,298 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
+import re
+import time
 from datetime import datetime
-import openai
+from utils.llm_usage import get_usage_meter, estimate_tokens
+from utils.admission import get_admission_controller, AdmissionDeferred, ALLOW, DEGRADE
+from utils.model_router import get_model_router
+from utils.prompt_cache import get_prefix_tracker
+from utils.tracing import get_tracer
+from utils.answers import LIKELIHOOD_LABELS
+from utils.cancellation import CancellationToken
+from utils.responses import upgrade_responses
 from dotenv import load_dotenv
 import os
 
+# Instructions go in the system message, ahead of any interview data, so the
+# data is the only part that varies. At a few hundred tokens they are below the
+# providers' 1024-token caching minimum, so they are not served from cache.
+ANALYSIS_INSTRUCTIONS = """You are an expert startup researcher analyzing user interview responses.
+
+You will be given a startup idea and the structured responses from user interviews about it.
+
+Please provide:
+1. Key insights about the problem and solution
+2. Validation signals (positive and negative)
+3. Suggested next steps for the founder
+4. Potential risks or concerns
+
+Write each of the four parts as a single paragraph, separated by blank lines, in that order."""
+
+REPORT_INSTRUCTIONS = """You are a professional research analyst creating a startup research report.
+
+You will be given a structured analysis of user interviews. Create a professional research report based on it.
+
+Include:
+1. Executive Summary
+2. Methodology
+3. Key Findings
+4. Recommendations
+5. Next Steps
+
+Start each section with a Markdown heading (## Section Name)."""
+
+UPDATE_INSTRUCTIONS = """You are an expert startup researcher analyzing user interview responses as they come in.
+
+You will be given a startup idea, the analysis so far with running totals and recurring themes, and the responses from the interviews that arrived since. Update the analysis so it covers every interview, not only the new ones.
+
+Please provide:
+1. Key insights about the problem and solution
+2. Validation signals (positive and negative)
+3. Suggested next steps for the founder
+4. Potential risks or concerns
+5. A line starting with "Themes:" listing the recurring themes as short phrases separated by semicolons, keeping earlier themes that still hold
+
+Write each of the five parts as a single paragraph, separated by blank lines, in that order."""
+
+ANALYSIS_FIELDS = ("key_insights", "validation_signals", "next_steps", "risks")
+ANALYSIS_STATE_VERSION = 2
+# Recurring themes kept in the compact state
+MAX_THEMES = 15
+# Prompt tokens of new responses folded in per update call
+UPDATE_BATCH_TOKENS = 6000
+
+def empty_analysis_state() -> Dict:
+    return {
+        "version": ANALYSIS_STATE_VERSION,
+        "interviews": 0,
+        "problems": {},
+        "value_prop_answers": 0,
+        "price_answers": 0,
+        "opt_in_answers": 0,
+        "likelihood": {},
+        "opt_in": {"yes": 0, "no": 0},
+        "themes": [],
+        "summary": {field: "" for field in ANALYSIS_FIELDS}
+    }
+
+def fold_responses(state: Dict, interviews: List[List[Dict]]) -> Dict:
+    """Add the counters for ``interviews`` (one response list each) to a copy of ``state``"""
+    state = json.loads(json.dumps(state))
+    # States saved before answers were normalized lack these counters
+    state.setdefault("likelihood", {})
+    state.setdefault("opt_in", {"yes": 0, "no": 0})
+    for responses in interviews:
+        state["interviews"] += 1
+        problem = None
+        # Older interviews recorded answers under the type of the next question
+        for response in upgrade_responses(responses):
+            kind = response.get("type")
+            if kind == "problem_resonance":
+                problem = state["problems"].setdefault(response.get("problem", ""), {"scores": {}, "explained": 0})
+                score = str(response.get("resonance_score"))
+                problem["scores"][score] = problem["scores"].get(score, 0) + 1
+            elif kind == "problem_explanation" and problem is not None:
+                # Explanations follow the resonance score of the problem they describe
+                problem["explained"] += 1
+            elif kind == "value_prop_interest":
+                state["value_prop_answers"] += 1
+                if response.get("likelihood") is not None:
+                    score = str(response["likelihood"])
+                    state["likelihood"][score] = state["likelihood"].get(score, 0) + 1
+            elif kind == "price_sensitivity":
+                state["price_answers"] += 1
+            elif kind == "opt_in_intent":
+                state["opt_in_answers"] += 1
+                if response.get("opt_in") is not None:
+                    state["opt_in"]["yes" if response["opt_in"] else "no"] += 1
+    return state
+
+def state_totals(state: Dict) -> Dict:
+    """Running totals from the compact state, as shown to the model"""
+    problems = {}
+    for problem, counts in state["problems"].items():
+        rated = sum(counts["scores"].values())
+        scored = sum(int(score) * n for score, n in counts["scores"].items() if score.isdigit())
+        problems[problem] = {
+            "testers_rated": rated,
+            "average_resonance": round(scored / rated, 2) if rated else None,
+            "score_counts": counts["scores"],
+            "testers_explained": counts["explained"]
+        }
+    likelihood = state.get("likelihood", {})
+    rated = sum(likelihood.values())
+    return {
+        "interviews": state["interviews"],
+        "problems": problems,
+        "value_prop_answers": state["value_prop_answers"],
+        "value_prop_likelihood": {
+            "average": round(sum(int(score) * n for score, n in likelihood.items()) / rated, 2) if rated else None,
+            "counts": {LIKELIHOOD_LABELS[int(score)]: n for score, n in sorted(likelihood.items(), reverse=True)}
+        },
+        "price_answers": state["price_answers"],
+        "opt_in_answers": state["opt_in_answers"],
+        "opted_in": state.get("opt_in", {}).get("yes", 0)
+    }
+
+def _parse_themes(analysis_text: str) -> List[str]:
+    match = re.search(r'(?im)^\s*(?:5\.\s*)?themes:\s*(.+)$', analysis_text)
+    if not match:
+        return []
+    return [theme.strip(" .") for theme in match.group(1).split(";") if theme.strip(" .")][:MAX_THEMES]
+
 class AnalysisAgent:
     def __init__(self, session_id: str, interview_data: Dict):
         load_dotenv()
         self.session_id = session_id
         self.interview_data = interview_data
+        # Imported on first use so pages that only need split_report_sections stay light
+        import openai
         self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        self.usage_meter = get_usage_meter()
+        self.admission = get_admission_controller()
+        self.router = get_model_router()
+        self.prefix_tracker = get_prefix_tracker()
+    
+    def _admit(self, site: str, estimated_tokens: int) -> Dict:
+        """Reserve budget for a call and route it; raises AdmissionDeferred when over budget"""
+        founder_email = self.interview_data.get('founder_email')
+        decision = self.admission.admit(site, estimated_tokens, founder_email=founder_email, session_id=self.session_id)
+        if decision in (ALLOW, DEGRADE):
+            return self.router.route(site, degraded=decision == DEGRADE)
+        retry_after = self.admission.retry_after(estimated_tokens, founder_email, self.session_id)
+        raise AdmissionDeferred(site, retry_after, estimated_tokens)
+        
+    def _complete(self, site: str, instructions: str, prompt: str, extra_tokens: int) -> str:
+        """Run one non-streaming call at ``site`` and return its text"""
+        route = self._admit(site, estimate_tokens(prompt) + extra_tokens)
+        messages = [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": prompt}
+        ]
+        cached_tokens = self.prefix_tracker.observe(messages, site)
         
+        started_at = time.perf_counter()
+        with get_tracer().start_as_current_span(f"llm.{site}", {"session_id": self.session_id, "llm.model": route["model"]}):
+            response = self.openai_client.chat.completions.create(
+                model=route["model"],
+                messages=messages,
+                temperature=route["temperature"],
+                max_tokens=route["max_tokens"],
+                timeout=route["timeout"]
+            )
+        self.usage_meter.record_completion(
+            response, site, route["model"], started_at,
+            session_id=self.session_id, founder_email=self.interview_data.get('founder_email'),
+            cached_tokens=cached_tokens
+        )
+        return response.choices[0].message.content
+    
     def analyze_responses(self) -> Dict:
         """Analyze interview responses using ChatGPT"""
         # Prepare the prompt for analysis
         prompt = self._prepare_analysis_prompt()
-        
-        # Get analysis from ChatGPT
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {"role": "system", "content": "You are an expert startup researcher analyzing user interview responses."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
-        )
+        analysis_text = self._complete("analysis.analyze", ANALYSIS_INSTRUCTIONS, prompt, 1000)
         
         # Parse and structure the analysis
-        analysis = self._parse_analysis(response.choices[0].message.content)
+        analysis = self._parse_analysis(analysis_text)
         return analysis
     
-    def _prepare_analysis_prompt(self) -> str:
-        """Prepare the prompt for ChatGPT analysis"""
+    def update_analysis(self, state: Optional[Dict], interviews: List[List[Dict]]) -> Tuple[Dict, Dict]:
+        """Fold new interviews into a compact analysis state; returns ``(analysis, state)``.
+
+        The prompt holds the previous summary, themes and totals plus only the
+        new interviews, so its size does not grow with the number analyzed.
+        """
+        previous = state or empty_analysis_state()
+        state = fold_responses(previous, interviews)
+        analysis_text = self._complete("analysis.update", UPDATE_INSTRUCTIONS,
+                                       self._prepare_update_prompt(previous, state, interviews), 1000)
+        
+        analysis = self._parse_analysis(analysis_text)
+        state["themes"] = _parse_themes(analysis_text) or previous["themes"]
+        state["summary"] = {field: analysis[field] for field in ANALYSIS_FIELDS}
+        analysis["interviews"] = state["interviews"]
+        analysis["themes"] = state["themes"]
+        return analysis, state
+    
+    def refresh_analysis(self, db, max_batch_tokens: int = UPDATE_BATCH_TOKENS) -> Optional[Dict]:
+        """Bring the stored incremental analysis up to date with responses saved since its watermark.
+
+        New interviews are folded in batches of about ``max_batch_tokens``
+        prompt tokens; each batch is saved with its watermark, so an
+        interrupted refresh resumes where it stopped. Returns the latest
+        analysis, or None if the session has no responses.
+        """
+        current = db.get_analysis_state(self.session_id)
+        if current and (current["state"] or {}).get("version") != ANALYSIS_STATE_VERSION:
+            # Counted before older responses were upgraded to the current schema; fold every interview again
+            current = None
+        analysis = current["analysis"] if current else None
+        state = current["state"] if current else None
+        watermark = current["watermark"] if current else 0
+        while True:
+            rows = db.get_response_rows(self.session_id, after_id=watermark, limit=100)
+            if not rows:
+                return analysis
+            batch, tokens = [], 0
+            for row in rows:
+                tokens += estimate_tokens(json.dumps(row["responses"]))
+                if batch and tokens > max_batch_tokens:
+                    break
+                batch.append(row)
+            analysis, state = self.update_analysis(state, [row["responses"] for row in batch])
+            watermark = batch[-1]["id"]
+            db.save_analysis_state(self.session_id, analysis, state, watermark)
+    
+    def _idea_header(self) -> str:
         founder_inputs = self.interview_data['founder_inputs']
-        responses = self.interview_data['responses']
+        if isinstance(founder_inputs, str):
+            founder_inputs = json.loads(founder_inputs)
         
-        prompt = f"""
-        Analyze these user interview responses for a startup idea:
+        # Sessions created in the app store problem_domain/problems/value_prop
+        idea = founder_inputs.get('idea_summary') or founder_inputs.get('value_prop', '')
+        target_user = founder_inputs.get('target_user') or founder_inputs.get('problem_domain', '')
+        problem = founder_inputs.get('problem_statement') or "; ".join(founder_inputs.get('problems', []))
         
-        Startup Idea: {founder_inputs['idea_summary']}
-        Target User: {founder_inputs['target_user']}
-        Problem: {founder_inputs['problem_statement']}
+        return f"""Startup Idea: {idea}
+Target User: {target_user}
+Problem: {problem}"""
+    
+    def _prepare_analysis_prompt(self) -> str:
+        """Prepare the per-session part of the analysis prompt (the data, not the instructions)"""
+        responses = self.interview_data['responses']
+        # One interview's events, or one list of events per interview
+        if responses and isinstance(responses[0], list):
+            responses = [upgrade_responses(interview) for interview in responses]
+        else:
+            responses = upgrade_responses(responses)
         
-        Interview Responses:
-        {json.dumps(responses, indent=2)}
+        prompt = f"""{self._idea_header()}
+
+Interview Responses:
+{json.dumps(responses, indent=2)}"""
+        return prompt
+    
+    def _prepare_update_prompt(self, previous: Dict, state: Dict, interviews: List[List[Dict]]) -> str:
+        """Previous summary, themes and totals plus the new interviews only"""
+        if previous["interviews"]:
+            summary = "\n\n".join(previous["summary"][field] for field in ANALYSIS_FIELDS)
+        else:
+            summary = "None yet."
         
-        Please provide:
-        1. Key insights about the problem and solution
-        2. Validation signals (positive and negative)
-        3. Suggested next steps for the founder
-        4. Potential risks or concerns
-        """
+        prompt = f"""{self._idea_header()}
+
+Analysis so far ({previous["interviews"]} interviews):
+{summary}
+
+Themes so far: {"; ".join(previous["themes"]) or "none yet"}
+
+Totals across all {state["interviews"]} interviews:
+{json.dumps(state_totals(state), indent=2)}
+
+New Interview Responses ({len(interviews)} interviews):
+{json.dumps([upgrade_responses(responses) for responses in interviews], indent=2)}"""
         return prompt
     
     def _parse_analysis(self, analysis_text: str) -> Dict:
@@ -69,30 +310,62 @@ class AnalysisAgent:
             "risks": sections[3] if len(sections) > 3 else ""
         }
     
-    def generate_report(self) -> str:
+    def generate_report(self, analysis: Optional[Dict] = None) -> str:
         """Generate a comprehensive report using ChatGPT"""
-        analysis = self.analyze_responses()
-        
-        prompt = f"""
-        Create a professional research report based on this analysis:
-        
-        {json.dumps(analysis, indent=2)}
-        
-        Include:
-        1. Executive Summary
-        2. Methodology
-        3. Key Findings
-        4. Recommendations
-        5. Next Steps
-        """
+        return "".join(self.stream_report(analysis))
+
+    def stream_report(self, analysis: Optional[Dict] = None, token: Optional[CancellationToken] = None) -> Iterator[str]:
+        """Stream the report token by token, reusing a cached analysis if given; ``token`` closes the stream"""
+        if analysis is None:
+            analysis = self.analyze_responses()
         
-        response = self.openai_client.chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {"role": "system", "content": "You are a professional research analyst creating a startup research report."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7
-        )
+        prompt = f"""Analysis:
+{json.dumps(analysis, indent=2)}"""
         
-        return response.choices[0].message.content 
\ No newline at end of file
+        messages = [
+            {"role": "system", "content": REPORT_INSTRUCTIONS},
+            {"role": "user", "content": prompt}
+        ]
+        route = self._admit("analysis.report", estimate_tokens(prompt) + 1500)
+        cached_tokens = self.prefix_tracker.observe(messages, "analysis.report")
+        # Ended when the caller finishes (or abandons) the stream
+        span = get_tracer().start_span("llm.analysis.report", {"session_id": self.session_id, "llm.model": route["model"]})
+        try:
+            started_at = time.perf_counter()
+            response = self.openai_client.chat.completions.create(
+                model=route["model"],
+                messages=messages,
+                temperature=route["temperature"],
+                max_tokens=route["max_tokens"],
+                timeout=route["timeout"],
+                stream=True
+            )
+            
+            unregister = token.on_cancel(response.close) if token else (lambda: None)
+            try:
+                deltas = (
+                    chunk.choices[0].delta.content for chunk in response
+                    if chunk.choices and chunk.choices[0].delta.content is not None
+                )
+                yield from self.usage_meter.track_stream(
+                    deltas, "analysis.report", route["model"], messages, started_at,
+                    session_id=self.session_id, founder_email=self.interview_data.get('founder_email'),
+                    cached_tokens=cached_tokens
+                )
+            finally:
+                unregister()
+        finally:
+            span.end()
+
+
+def split_report_sections(report_text: str) -> Tuple[List[str], str]:
+    """Split a (possibly partial) report into completed sections and the trailing one.
+
+    A section is complete once the next ``## `` heading has started, so the last
+    section is only final when the stream ends.
+    """
+    sections = re.split(r'(?m)^(?=#{1,3} )', report_text)
+    sections = [s for s in sections if s.strip()]
+    if not sections:
+        return [], ""
+    return sections[:-1], sections[-1]
@@ -1,20 +1,79 @@
 from typing import Dict, List, Optional
+from functools import lru_cache
 import json
 import os
+import time
 from datetime import datetime
-import requests
-import openai
+from utils.llm_usage import get_usage_meter, estimate_message_tokens
+from utils.admission import get_admission_controller, DEGRADE, SKIP
+from utils.model_router import get_model_router
+from utils.prompt_cache import get_prefix_tracker
+from utils.speculation import fingerprint, get_speculator
+from utils.tracing import get_tracer
+from utils.answers import LIKELIHOOD_LABELS, get_answer_normalizer
+from utils.responses import RESPONSE_SCHEMA_VERSION
+from utils.cancellation import TURN_TIMEOUT_SECONDS, CancellationToken, get_cancellation_meter
+from utils.result_counters import get_result_counters
+
+# Conversation state carried across processes by to_state/from_state
+STATE_VERSION = 1
+STATE_FIELDS = (
+    "stage", "current_problem_index", "current_problem", "last_user_response", "is_waiting_for_scale",
+    "resonance_score", "responses", "messages", "_summary_context_length", "pending_summaries"
+)
+
+# Cancellation reasons meaning the tester sent the message again: the turn is undone, not finished
+SUPERSEDED_REASONS = ("retry",)
+
+class TurnSuperseded(Exception):
+    """The turn was cancelled by a retry of the message and its changes were rolled back"""
+
+SUMMARY_REQUEST = {
+    "role": "user",
+    "content": "Based on this interview, summarize the key problems, actions taken, and reactions to the solution in one founder-friendly paragraph."
+}
+
+@lru_cache(maxsize=8)
+def _openai_client(api_key: str, base_url: str):
+    # Building a client sets up a TLS context (~35ms of CPU), so share one per key and endpoint.
+    # openai is imported here because it adds ~0.6s to the import of this module.
+    import openai
+    return openai.OpenAI(api_key=api_key, base_url=base_url)
+
+@lru_cache(maxsize=None)
+def _load_config(name: str) -> Dict:
+    with open(os.path.join(os.path.dirname(__file__), '..', 'config', name), 'r') as f:
+        return json.load(f)
+
+@lru_cache(maxsize=1)
+def _probe_session():
+    # A shared session keeps the probe's connection alive between agents
+    import requests
+    return requests.Session()
 
 class InterviewAgent:
-    def __init__(self, session_id: str, session_data: Dict):
+    def __init__(self, session_id: str, session_data: Dict, probe: bool = True):
         self.session_id = session_id
         self.session_data = session_data
         self.responses = []
         self.current_problem_index = 0
         self.last_user_response = None
-        self.stage = "domain_question"
+        self._stage = "domain_question"
         self.current_problem = None
         self.is_waiting_for_scale = False
+        self.usage_meter = get_usage_meter()
+        self.admission = get_admission_controller()
+        self.router = get_model_router()
+        self.prefix_tracker = get_prefix_tracker()
+        self.speculator = get_speculator()
+        self.normalizer = get_answer_normalizer()
+        self.counters = get_result_counters()
+        self._speculation = None
+        self._summary_context_length = 0
+        self._turn: Optional[CancellationToken] = None
+        # [response index, summary context length] of summaries cut off by a cancelled turn
+        self.pending_summaries: List[List[int]] = []
+        self._summary_retries: Dict[int, object] = {}
 
         # Validate founder inputs
         founder_inputs = self.session_data.get("founder_inputs", {})
@@ -33,17 +92,14 @@ class InterviewAgent:
         if not founder_inputs["problems"]:
             raise ValueError("Problems list cannot be empty")
 
-        # Load config
-        script_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'interview_script.json')
-        chatgpt_path = os.path.join(os.path.dirname(__file__), '..', 'config', 'chatgpt_config.json')
-        with open(script_path, 'r') as f:
-            self.interview_script = json.load(f)
-        with open(chatgpt_path, 'r') as f:
-            self.chatgpt_config = json.load(f)
+        # Load config (parsed once per process and shared read-only)
+        self.interview_script = _load_config('interview_script.json')
+        self.chatgpt_config = _load_config('chatgpt_config.json')
 
         # Set up OpenAI config
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.project_id = os.getenv('OPENAI_PROJECT_ID')
+        self.base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
         if not self.api_key or not self.project_id:
             raise Exception("Missing OPENAI_API_KEY or OPENAI_PROJECT_ID in environment variables")
         self.headers = {
@@ -52,24 +108,66 @@ class InterviewAgent:
             "OpenAI-Project": self.project_id
         }
 
-        # Check OpenAI connection
+        # Check OpenAI connection; skipped when restoring an agent that already passed it
+        if probe:
+            self._check_connection()
+
+        self.messages = self._create_system_messages()
+
+    @property
+    def stage(self) -> str:
+        return self._stage
+
+    @stage.setter
+    def stage(self, stage: str) -> None:
+        # Each transition is an event on the turn's span
+        get_tracer().current_span().add_event("interview.stage", {"from": getattr(self, "_stage", None), "to": stage})
+        self._stage = stage
+
+    def _check_connection(self) -> None:
         try:
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=self.headers,
-                json={"model": "gpt-4", "messages": [{"role": "system", "content": "Test connection"}], "max_tokens": 5},
-                timeout=10
-            )
-            if response.status_code != 200:
-                raise Exception(response.json().get('error', {}).get('message', 'Unknown error'))
+            route = self.router.route("interview.probe")
+            with get_tracer().start_as_current_span("llm.interview.probe", {"llm.model": route["model"]}):
+                self._probe(route)
         except Exception as e:
             raise Exception(f"OpenAI API connection failed: {str(e)}")
 
-        self.messages = [{"role": "system", "content": self._create_system_prompt()}]
+    def _probe(self, route: Dict) -> None:
+        started_at = time.perf_counter()
+        response = _probe_session().post(
+            f"{self.base_url}/chat/completions",
+            headers=self.headers,
+            json={"model": route["model"], "messages": [{"role": "system", "content": "Test connection"}], "max_tokens": route["max_tokens"]},
+            timeout=route["timeout"]
+        )
+        if response.status_code != 200:
+            raise Exception(response.json().get('error', {}).get('message', 'Unknown error'))
+        usage = response.json().get('usage', {})
+        latency = time.perf_counter() - started_at
+        self.usage_meter.record(
+            "interview.probe", route["model"],
+            prompt_tokens=usage.get('prompt_tokens', 0),
+            completion_tokens=usage.get('completion_tokens', 0),
+            latency=latency, ttft=latency,
+            session_id=self.session_id, founder_email=self.session_data.get('founder_email')
+        )
+
+    def _create_system_messages(self) -> List[Dict]:
+        """Shared instructions first, founder-specific context second.
+
+        The instructions are a few hundred tokens, below the 1024 providers
+        cache from, so they are not cached across sessions on their own. What
+        does get cached is a conversation's own history: each call repeats the
+        previous one's messages, so later summary calls hit once it passes the
+        minimum.
+        """
+        return [
+            {"role": "system", "content": self._create_instructions_prompt()},
+            {"role": "system", "content": self._create_session_prompt()}
+        ]
 
-    def _create_system_prompt(self) -> str:
-        founder_inputs = self.session_data['founder_inputs']
-        prompt = f"""You are an AI research assistant conducting user interviews using The Mom Test.
+    def _create_instructions_prompt(self) -> str:
+        return """You are an AI research assistant conducting user interviews using The Mom Test.
 
 Your role:
 - Ask about past behavior
@@ -77,7 +175,17 @@ Your role:
 - Focus on specific experiences
 - Dig deeper when needed
 
-The founder is working on a solution in this space:
+The next message describes the founder's idea: their problem space, the problems to test, the value prop and the action they want testers to take.
+
+If the founder's product is a paid service:
+- Ask about current spend
+- Understand their budget
+- Gauge reactions to price points
+- Explore decision-making process"""
+
+    def _create_session_prompt(self) -> str:
+        founder_inputs = self.session_data['founder_inputs']
+        prompt = f"""The founder is working on a solution in this space:
 {founder_inputs['problem_domain']}
 
 Problems to test:
@@ -101,31 +209,73 @@ Price points to test:
 
 Pricing questions:
 {chr(10).join(f"- {q}" for q in founder_inputs.get('pricing_questions', []))}
-
-Tips:
-- Ask about current spend
-- Understand their budget
-- Gauge reactions to price points
-- Explore decision-making process
 """
         return prompt
 
-    def _get_chatgpt_response(self):
+    def _get_chatgpt_response(self, site: str = "interview.chat", degraded: bool = False,
+                              messages: Optional[List[Dict]] = None, token: Optional[CancellationToken] = None):
+        messages = self.messages if messages is None else messages
+        token = token or self._turn or CancellationToken()
+        # Not made current: the generator is suspended between chunks while the caller runs
+        span = get_tracer().start_span(f"llm.{site}", {"session_id": self.session_id, "llm.degraded": degraded})
+        started_at = time.perf_counter()
+        completion_tokens = 0
+        completed = False
+        unregister = None
+        stream = None
         try:
-            client = openai.OpenAI(api_key=self.api_key)
+            if token.cancelled:
+                return
+            route = self.router.route(site, degraded=degraded)
+            span.set_attribute("llm.model", route["model"])
+            cached_tokens = self.prefix_tracker.observe(messages, site)
+            client = _openai_client(self.api_key, self.base_url)
             response = client.chat.completions.create(
-                model="gpt-4",
-                messages=self.messages,
+                model=route["model"],
+                messages=messages,
                 stream=True,
-                temperature=0.7,
-                max_tokens=500
+                temperature=route["temperature"],
+                max_tokens=route["max_tokens"],
+                timeout=route["timeout"]
+            )
+            # Closing the response wakes a read blocked on the next chunk
+            unregister = token.on_cancel(response.close)
+            deltas = (
+                chunk.choices[0].delta.content for chunk in response
+                if chunk.choices and chunk.choices[0].delta.content is not None
+            )
+            stream = self.usage_meter.track_stream(
+                deltas, site, route["model"], messages, started_at,
+                session_id=self.session_id, founder_email=self.session_data.get('founder_email'),
+                cached_tokens=cached_tokens
             )
-            for chunk in response:
-                if chunk.choices[0].delta.content is not None:
-                    yield chunk.choices[0].delta.content
+            for delta in stream:
+                if token.cancelled:
+                    break
+                if not completion_tokens:
+                    span.add_event("llm.first_token")
+                completion_tokens += 1
+                yield delta
+            else:
+                completed = not token.cancelled
         except Exception as e:
-            print(f"Error getting ChatGPT response: {str(e)}")
-            yield "I apologize, but I'm having trouble processing your response. Could you please try again?"
+            if not token.cancelled:
+                span.record_exception(e)
+                print(f"Error getting ChatGPT response: {str(e)}")
+                yield "I apologize, but I'm having trouble processing your response. Could you please try again?"
+        finally:
+            if unregister:
+                unregister()
+            if stream is not None:
+                # Records the tokens used so far in the usage meter
+                stream.close()
+            elapsed = time.perf_counter() - started_at
+            if completed:
+                get_cancellation_meter().observe(site, completion_tokens, elapsed)
+            elif token.cancelled:
+                span.set_attribute("llm.cancelled", token.reason)
+                get_cancellation_meter().record_cancel(site, token.reason, completion_tokens, elapsed)
+            span.end()
 
     def start_interview(self) -> str:
         problems = self.session_data['founder_inputs']['problems']
@@ -137,10 +287,12 @@ Tips:
         domain = self.session_data['founder_inputs'].get('problem_domain', 'this space')
         self.stage = "domain_question"
 
-        # Only include system prompt in GPT message history for now
-        self.messages = [
-            {"role": "system", "content": self._create_system_prompt()}
-        ]
+        # Only include system prompts in GPT message history for now
+        self.messages = self._create_system_messages()
+        self.speculator.discard(self._speculation)
+        self._speculation = None
+
+        self.counters.record_started(self.session_id, self.session_data.get('founder_email'))
 
         # Prepare both intro and context question for UI display
         intro = self.interview_script["intro"]
@@ -149,10 +301,52 @@ Tips:
         # Return both together (your app will show this as the assistant's first message)
         return f"{intro}\n\n{context_question}"
 
-    def get_response(self, user_input: str) -> str:
+    def get_response(self, user_input: str, token: Optional[CancellationToken] = None) -> str:
+        """Answer one tester message; ``token`` cancels the turn's LLM calls (default: a ``TURN_TIMEOUT_SECONDS`` deadline)"""
+        token = token or CancellationToken(timeout=TURN_TIMEOUT_SECONDS)
+        self._turn = token
+        snapshot = self._snapshot()
+        try:
+            with get_tracer().start_as_current_span("interview.turn", {"session_id": self.session_id, "interview.stage": self.stage}) as span:
+                reply = self._respond(user_input)
+                if token.reason in SUPERSEDED_REASONS:
+                    raise TurnSuperseded(token.reason)
+                span.set_attribute("interview.next_stage", self.stage)
+                return reply
+        except TurnSuperseded:
+            # The re-sent message is answered from where this one started
+            self._restore(snapshot)
+            raise
+        finally:
+            token.finish()
+            if self._turn is token:
+                self._turn = None
+
+    def _snapshot(self) -> Dict:
+        state = {field: getattr(self, field) for field in STATE_FIELDS if hasattr(self, field)}
+        for field in ("responses", "messages", "pending_summaries"):
+            state[field] = list(state[field])
+        state["_speculation"] = self._speculation
+        return state
+
+    def _restore(self, snapshot: Dict) -> None:
+        for field, value in snapshot.items():
+            setattr(self, field, value)
+
+    def cancel_turn(self, reason: str = "cancelled", wait: Optional[float] = None) -> bool:
+        """Cancel the turn in progress, if any, and wait up to ``wait`` seconds for it to return"""
+        token = self._turn
+        if token is None or not token.cancel(reason):
+            return False
+        if wait:
+            token.wait(wait)
+        return True
+
+    def _respond(self, user_input: str) -> str:
         try:
             self.last_user_response = user_input.strip()
             self.messages.append({"role": "user", "content": user_input})
+            answered_stage = self.stage
 
             if self.stage == "domain_question":
                 self.stage = "problem_intro"
@@ -168,20 +362,19 @@ Tips:
                 return prompt
 
             elif self.stage == "problem_resonance":
-                try:
-                    score = int(self.last_user_response.strip())
-                    if score < 1 or score > 5:
-                        raise ValueError
-                    self.resonance_score = score
-                    self.record_response({
-                        "type": "problem_resonance",
-                        "problem": self.current_problem,
-                        "resonance_score": score
-                    })
-                except ValueError:
+                # "4/5", "four" and "definitely a 5" are all a score; only ask again when nothing matches
+                score = self.normalizer.resonance(self.last_user_response)
+                if score is None:
                     clarification = "Could you please give a number from 1 to 5 to show how much this resonates with your experience?"
                     self.messages.append({"role": "assistant", "content": clarification})
                     return clarification
+                self.resonance_score = score
+                self.record_response({
+                    "type": "problem_resonance",
+                    "problem": self.current_problem,
+                    "resonance_score": score,
+                    "response": self.last_user_response
+                })
 
                 self.stage = "problem_explanation"
                 prompt = self.interview_script["problem_validation"]["explanation_prompt"]
@@ -203,12 +396,12 @@ Tips:
                     self.stage = "value_prop"
 
             if self.stage == "value_prop":
-                self.record_response({
-                    "type": "value_prop_interest",
-                    "value_prop": self.session_data['founder_inputs'].get('value_prop', ''),
-                    "action": self.session_data['founder_inputs'].get('target_action', ''),
-                    "response": self.last_user_response
-                })
+                # Low scores skip the action question and arrive here with the explanation already recorded
+                if answered_stage == "value_prop":
+                    self.record_response({
+                        "type": "problem_action",
+                        "text": self.last_user_response
+                    })
 
                 self.stage = "price_test"
                 target_action = self.session_data['founder_inputs'].get('target_action', 'sign up')
@@ -218,35 +411,57 @@ Tips:
                 return prompt
 
             elif self.stage == "price_test":
+                # The answer to the pitch, on the "very likely ... very unlikely" scale it offers
+                likelihood = self.normalizer.likelihood(self.last_user_response)
+                self.record_response({
+                    "type": "value_prop_interest",
+                    "value_prop": self.session_data['founder_inputs'].get('value_prop', ''),
+                    "action": self.session_data['founder_inputs'].get('target_action', ''),
+                    "response": self.last_user_response,
+                    "likelihood": likelihood,
+                    "likelihood_label": LIKELIHOOD_LABELS.get(likelihood)
+                })
                 if "buy" in self.session_data['founder_inputs'].get('target_action', '').lower():
-                    self.record_response({
-                        "type": "price_sensitivity",
-                        "response": self.last_user_response
-                    })
+                    self.stage = "price_answer"
                     prompt = self.interview_script["value_prop_test"]["price_prompt"]
                     self.messages.append({"role": "assistant", "content": prompt})
                     return prompt
                 self.stage = "intent"
 
-            if self.stage == "intent":
-                follow_up = self.session_data['founder_inputs'].get('follow_up_action', 'get early access')
-                prompt = self.interview_script["intent_prompt"].replace("{follow_up_action}", follow_up)
-
+            elif self.stage == "price_answer":
                 self.record_response({
-                    "type": "opt_in_intent",
+                    "type": "price_sensitivity",
                     "response": self.last_user_response
                 })
+                self.stage = "intent"
+
+            if self.stage == "intent":
+                follow_up = self.session_data['founder_inputs'].get('follow_up_action', 'get early access')
+                prompt = self.interview_script["intent_prompt"].replace("{follow_up_action}", follow_up)
 
                 self.stage = "closing"
                 self.messages.append({"role": "assistant", "content": prompt})
+                self._speculate_summary()
                 return prompt
 
             elif self.stage == "closing":
+                self.record_response({
+                    "type": "opt_in_intent",
+                    "response": self.last_user_response,
+                    "opt_in": self.normalizer.opt_in(self.last_user_response)
+                })
+
                 self.stage = "complete"
                 self.messages.append({"role": "assistant", "content": self.interview_script["closing"]})
 
                 summary = self.get_summary_from_gpt()
-                self.record_response({"type": "interview_summary", "summary": summary})
+                token = self._turn
+                if token is not None and token.reason in SUPERSEDED_REASONS:
+                    raise TurnSuperseded(token.reason)
+                self.record_response({"type": "interview_summary", "summary": summary, "skipped": not summary})
+                if not summary and token is not None and token.cancelled:
+                    # Cut off by a timeout or a closed tab rather than refused: try again in the background
+                    self._requeue_summary(len(self.responses) - 1)
 
                 self.current_problem_index += 1
                 problems = self.session_data['founder_inputs'].get('problems', [])
@@ -261,17 +476,43 @@ Tips:
                     self.messages.append({"role": "assistant", "content": prompt})
                     return f"{transition}\n\n{prompt}"
                 else:
+                    self.counters.record_completed(self.session_id, self.session_data.get('founder_email'))
                     closing_message = "That's all for now — thanks so much for your time and thoughtful answers. You've really helped the founder understand which problems matter most."
                     self.messages.append({"role": "assistant", "content": closing_message})
                     return closing_message
 
+        except TurnSuperseded:
+            raise
         except Exception as e:
             print(f"Error in get_response: {str(e)}")
             return "I apologize, but I'm having trouble processing your response. Could you please try again?"
 
+    def to_state(self) -> Dict:
+        """JSON-serializable snapshot of the conversation, for handing it to another worker"""
+        state = {field: getattr(self, field) for field in STATE_FIELDS if hasattr(self, field)}
+        return {"version": STATE_VERSION, "session_id": self.session_id, "session_data": self.session_data, **state}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'InterviewAgent':
+        """Rebuild an agent from ``to_state`` without probing the connection again"""
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported agent state version: {state.get('version')}")
+        agent = cls(state["session_id"], state["session_data"], probe=False)
+        for field in STATE_FIELDS:
+            if field in state:
+                setattr(agent, field, state[field])
+        # Speculative work stays behind on the old worker; restart it here
+        if agent.stage == "closing":
+            agent._speculate_summary()
+        for index, context_length in agent.pending_summaries:
+            agent._start_summary_retry(index, context_length)
+        return agent
+
     def record_response(self, response_data: Dict) -> None:
         response_data["timestamp"] = datetime.now().isoformat()
+        response_data["schema_version"] = RESPONSE_SCHEMA_VERSION
         self.responses.append(response_data)
+        self.counters.record_response(self.session_id, self.session_data.get('founder_email'), response_data)
 
     def export_responses(self) -> str:
         return json.dumps({
@@ -288,15 +529,83 @@ Tips:
         total = len(self.session_data['founder_inputs'].get('problems', []))
         return f"{self.current_problem_index + 1} of {total}"
 
-    def get_summary_from_gpt(self) -> str:
-        self.messages.append({
-            "role": "user",
-            "content": "Based on this interview, summarize the key problems, actions taken, and reactions to the solution in one founder-friendly paragraph."
-        })
+    def next_turn_calls_llm(self) -> bool:
+        """Whether the next ``get_response`` waits on the model for a problem summary"""
+        if self.stage != "closing":
+            return False
+        return self._speculation is None or not self._speculation.future.done()
+
+    def _summary_messages(self) -> List[Dict]:
+        # The problem's transcript up to the intent question. The tester's reply to
+        # that question only says whether their email may be shared, so leaving it
+        # out lets the summary start before they answer.
+        return self.messages[:self._summary_context_length] + [SUMMARY_REQUEST]
+
+    def _speculate_summary(self) -> None:
+        """Start this problem's summary in the background while the tester answers"""
+        self._summary_context_length = len(self.messages)
+        messages = self._summary_messages()
+        self.speculator.discard(self._speculation)
+        # Outlives the turn that starts it, so it keeps only the turn's disconnect check
+        token = (self._turn or CancellationToken()).inherit(("disconnect",), timeout=TURN_TIMEOUT_SECONDS)
+        self._speculation = self.speculator.start(fingerprint(messages), self._summarize, messages, token, token=token)
+
+    def _summarize(self, messages: List[Dict], token: Optional[CancellationToken] = None) -> str:
+        # Summaries are optional, so they are the first thing dropped when over budget
+        decision = self.admission.admit(
+            "interview.summary", estimate_message_tokens(messages) + 500,
+            founder_email=self.session_data.get('founder_email'), session_id=self.session_id
+        )
+        if decision == SKIP:
+            return ""
+
+        token = token or self._turn or CancellationToken()
         summary_text = ""
-        for chunk in self._get_chatgpt_response():
+        for chunk in self._get_chatgpt_response(site="interview.summary", degraded=decision == DEGRADE,
+                                                messages=messages, token=token):
             summary_text += chunk
-        return summary_text.strip()
+        # A summary cut off part-way is worse than none
+        return "" if token.cancelled else summary_text.strip()
+
+    def _requeue_summary(self, index: int) -> None:
+        self.pending_summaries.append([index, self._summary_context_length])
+        self._start_summary_retry(index, self._summary_context_length)
+
+    def _start_summary_retry(self, index: int, context_length: int) -> None:
+        messages = self.messages[:context_length] + [SUMMARY_REQUEST]
+        token = CancellationToken(timeout=TURN_TIMEOUT_SECONDS)
+        self._summary_retries[index] = self.speculator.start(fingerprint(messages), self._summarize, messages, token,
+                                                             token=token)
+
+    def finish_pending_summaries(self) -> int:
+        """Fill in summaries cut off by cancelled turns, waiting for their retries; returns how many were recovered"""
+        recovered = 0
+        for index, context_length in list(self.pending_summaries):
+            retry = self._summary_retries.pop(index, None)
+            summary = ""
+            try:
+                if retry is not None:
+                    summary = retry.future.result()
+                else:
+                    summary = self._summarize(self.messages[:context_length] + [SUMMARY_REQUEST],
+                                              CancellationToken(timeout=TURN_TIMEOUT_SECONDS))
+            except Exception as e:
+                print(f"Error retrying interview summary: {str(e)}")
+            self.pending_summaries.remove([index, context_length])
+            if summary:
+                self.responses[index].update(summary=summary, skipped=False)
+                recovered += 1
+        return recovered
+
+    def get_summary_from_gpt(self) -> str:
+        messages = self._summary_messages()
+        # Use the speculative summary only if it was computed from this exact transcript
+        hit, summary = self.speculator.resolve(self._speculation, fingerprint(messages))
+        self._speculation = None
+        self.messages.append(dict(SUMMARY_REQUEST))
+        if hit:
+            return summary
+        return self._summarize(messages)
 
     def get_summary(self) -> Dict:
         problems = self.session_data['founder_inputs']['problems']
@@ -0,0 +1,61 @@
+"""Job handlers for the analysis page's LLM work, run by ``worker.py``.
+
+Payloads carry only the session id and the last responses row the result
+should cover; the handler loads everything else itself, so a job queued
+before new interviews came in is a different job from one queued after.
+"""
+from typing import Callable, Dict
+from utils.admission import AdmissionDeferred
+from utils.job_queue import RetryLater
+from utils.storage import StorageBackend
+
+ANALYZE_JOB = "analysis.analyze"
+REPORT_JOB = "analysis.report"
+
+# The short analysis is claimed ahead of full reports queued at the same time
+JOB_PRIORITIES = {ANALYZE_JOB: 10, REPORT_JOB: 5}
+
+def analysis_job_payload(session_id: str, through: int) -> Dict:
+    """Payload for analysing ``session_id`` up to and including responses row ``through``"""
+    return {"session_id": session_id, "through": through}
+
+def _analysis_agent(db: StorageBackend, session_id: str):
+    from agents.analysis_agent import AnalysisAgent
+
+    session_data = db.get_session(session_id)
+    responses = db.get_responses(session_id)
+    if not session_data or not responses:
+        raise ValueError(f"Session {session_id} or its responses not found")
+    return AnalysisAgent(session_id, {
+        "session_id": session_id,
+        "founder_email": session_data.get("founder_email"),
+        "founder_inputs": session_data["founder_inputs"],
+        "responses": responses
+    })
+
+def job_handlers(db: StorageBackend) -> Dict[str, Callable]:
+    """Handlers for ``JobWorker``, keyed by job kind"""
+
+    def analyze(payload: Dict, progress: Callable) -> Dict:
+        agent = _analysis_agent(db, payload["session_id"])
+        try:
+            # Only interviews saved since the stored analysis are sent to the model
+            return agent.refresh_analysis(db)
+        except AdmissionDeferred as e:
+            raise RetryLater(e.retry_after, str(e))
+
+    def report(payload: Dict, progress: Callable) -> Dict:
+        agent = _analysis_agent(db, payload["session_id"])
+        try:
+            # Reuse the stored analysis, topped up with any new interviews, instead of paying for it twice
+            analysis = agent.refresh_analysis(db)
+            report_text = ""
+            # A lost lease closes the stream and the next progress call raises LeaseLost
+            for chunk in agent.stream_report(analysis, token=progress.token):
+                report_text += chunk
+                progress({"report": report_text})
+        except AdmissionDeferred as e:
+            raise RetryLater(e.retry_after, str(e))
+        return {"report": report_text}
+
+    return {ANALYZE_JOB: analyze, REPORT_JOB: report}
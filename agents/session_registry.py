@@ -0,0 +1,352 @@
+from typing import Callable, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+import os
+import sys
+import threading
+import time
+import uuid
+
+MB = 1024 * 1024
+
+# Parsed once per process and shared by every agent, so not part of any one session's footprint
+SHARED_FIELDS = ("interview_script", "chatgpt_config")
+PLAIN_TYPES = (dict, list, tuple, set, str, bytes, int, float, bool, type(None))
+
+class RegistryFull(Exception):
+    """A new interview would push the registry past its memory ceiling"""
+
+def deep_size(obj, seen: set) -> int:
+    """Bytes held by a tree of plain containers and scalars, counting each object once"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_size(key, seen) + deep_size(value, seen)
+    elif isinstance(obj, (list, tuple, set)):
+        for item in obj:
+            size += deep_size(item, seen)
+    return size
+
+def agent_bytes(agent) -> int:
+    """Approximate memory held by one agent's own state: transcript, responses, inputs and prompts"""
+    fields = vars(agent)
+    seen = set()
+    size = sys.getsizeof(agent) + sys.getsizeof(fields)
+    for name, value in fields.items():
+        if name not in SHARED_FIELDS and isinstance(value, PLAIN_TYPES):
+            size += deep_size(value, seen)
+    return size
+
+def restore_interview_agent(state: Dict):
+    from agents.interview_agent import InterviewAgent
+    return InterviewAgent.from_state(state)
+
+class _Entry:
+    __slots__ = ("agent", "bytes", "last_used", "busy")
+
+    def __init__(self, agent, size: int, last_used: float):
+        self.agent = agent
+        self.bytes = size
+        self.last_used = last_used
+        self.busy = 1
+
+class SessionRegistry:
+    """Live interview agents for open chat tabs, bounded in memory.
+
+    The app keeps only a registry key in ``st.session_state``; the agent, with
+    its growing transcript, lives here. An agent is checked out while a turn
+    runs on it and checked back in afterwards, when its size is measured
+    again. Agents idle for ``idle_ttl`` seconds are spilled to the store as
+    ``InterviewAgent.to_state`` and dropped, and the next ``checkout`` of
+    their key rebuilds them without the tester noticing; the stored state is
+    then deleted, as it is when the interview is ``discard``ed.
+
+    ``max_bytes`` is a hard ceiling on the agents held: past ``low_water`` of
+    it the least recently used idle agents are spilled early, and a new
+    interview that still does not fit after ``room_wait`` seconds is refused
+    with ``RegistryFull``. Checked-out agents are never spilled.
+
+    Spills and deletes run on a background thread, so no tester's rerun
+    waits on writing other tabs' agents to the store.
+    """
+
+    def __init__(self, db=None, idle_ttl: float = 900.0, max_bytes: int = 256 * MB, low_water: float = 0.9,
+                 sweep_interval: float = 30.0, spill_batch: int = 500, room_wait: float = 2.0,
+                 restore: Optional[Callable] = None, clock: Callable[[], float] = time.monotonic):
+        self._db = db
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.sweep_interval = sweep_interval
+        self.spill_batch = spill_batch
+        self.room_wait = room_wait
+        self.restore = restore or restore_interview_agent
+        self.clock = clock
+        # key -> entry, least recently used first
+        self._live: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._last_sweep = clock()
+        self._lock = threading.Lock()
+        # Notified whenever spilling frees memory, for ``put`` calls waiting for room
+        self._room = threading.Condition(self._lock)
+        # One spill at a time; an idle sweep that finds one running skips its turn
+        self._spill_lock = threading.Lock()
+        # Stored states to delete: rehydrated or discarded agents
+        self._stale: List[str] = []
+        self._wake = threading.Event()
+        self._counters = {
+            "hits": 0, "misses": 0, "rehydrated": 0, "spilled": 0, "evicted_idle": 0,
+            "evicted_capacity": 0, "spill_errors": 0, "rejected": 0, "discarded": 0
+        }
+        threading.Thread(target=self._run, name="session-registry", daemon=True).start()
+
+    @property
+    def db(self):
+        # Created on first spill so a registry that never fills needs no storage
+        if self._db is None:
+            from utils.storage import get_database_service
+            self._db = get_database_service()
+        return self._db
+
+    def put(self, session_id: str, agent) -> str:
+        """Register a new interview, checked out to the caller, and return its key"""
+        key = f"{session_id}:{uuid.uuid4().hex}"
+        size = agent_bytes(agent)
+        with self._lock:
+            if self._bytes + size > self.max_bytes:
+                # Spilling is the sweeper's job; give it a moment to make room
+                self._wake.set()
+                self._room.wait_for(lambda: self._bytes + size <= self.max_bytes, timeout=self.room_wait)
+            if self._bytes + size > self.max_bytes:
+                self._counters["rejected"] += 1
+                raise RegistryFull(f"Interview registry is full ({self._bytes // MB} of {self.max_bytes // MB} MB)")
+            self._live[key] = _Entry(agent, size, self.clock())
+            self._bytes += size
+        self.maintain()
+        return key
+
+    def checkout(self, key: str):
+        """The agent for ``key``, rebuilt from the store if it was spilled; None if unknown"""
+        with self._lock:
+            entry = self._live.get(key)
+            if entry is not None:
+                self._use(key, entry)
+                self._counters["hits"] += 1
+                return entry.agent
+        state = None
+        try:
+            state = self.db.get_agent_state(key)
+        except Exception as e:
+            print(f"Error loading spilled interview agent: {str(e)}")
+        agent = None
+        if state is not None:
+            try:
+                agent = self.restore(state)
+            except (KeyError, ValueError) as e:
+                print(f"Error restoring interview agent: {str(e)}")
+        if agent is None:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+        size = agent_bytes(agent)
+        with self._lock:
+            entry = self._live.get(key)
+            if entry is not None:
+                # Another rerun of the same tab got there first
+                self._use(key, entry)
+                return entry.agent
+            self._live[key] = _Entry(agent, size, self.clock())
+            self._bytes += size
+            self._counters["rehydrated"] += 1
+            # Live again; a later spill writes a fresh state
+            self._stale.append(key)
+        self.maintain()
+        return agent
+
+    def checkin(self, key: str) -> None:
+        """Hand an agent back after a turn; it becomes eligible for spilling again"""
+        with self._lock:
+            entry = self._live.get(key)
+        if entry is None:
+            return
+        size = agent_bytes(entry.agent)
+        with self._lock:
+            if self._live.get(key) is entry:
+                self._bytes += size - entry.bytes
+                entry.bytes = size
+                entry.busy = max(0, entry.busy - 1)
+                entry.last_used = self.clock()
+                self._live.move_to_end(key)
+        self.maintain()
+
+    @contextmanager
+    def use(self, key: str):
+        """``checkout`` for the length of a block; yields None for an unknown key"""
+        agent = self.checkout(key)
+        try:
+            yield agent
+        finally:
+            if agent is not None:
+                self.checkin(key)
+
+    def discard(self, key: str) -> None:
+        """Forget an interview, e.g. once it is complete, in memory and (in the background) in the store"""
+        with self._lock:
+            entry = self._live.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.bytes
+                self._room.notify_all()
+            self._counters["discarded"] += 1
+            self._stale.append(key)
+        self.maintain()
+
+    def _use(self, key: str, entry: _Entry) -> None:
+        entry.busy += 1
+        entry.last_used = self.clock()
+        self._live.move_to_end(key)
+
+    def maintain(self) -> None:
+        """Wake the sweeper if there is work: stale states, an idle sweep due, or memory past the low-water mark"""
+        if (self._stale or self.clock() - self._last_sweep >= self.sweep_interval
+                or self._bytes > self.max_bytes * self.low_water):
+            self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.sweep_interval)
+            self._wake.clear()
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error sweeping interview agents: {str(e)}")
+
+    def sweep(self) -> None:
+        """Delete stale stored states, then spill idle agents and make room under the ceiling"""
+        # Deletes go first: a state queued for deletion is never one written by a later spill
+        self.delete_stale()
+        if self.clock() - self._last_sweep >= self.sweep_interval:
+            self.evict_idle()
+        if self._bytes > self.max_bytes * self.low_water:
+            self._make_room()
+
+    def delete_stale(self) -> int:
+        """Delete the stored states of rehydrated and discarded agents; returns how many"""
+        with self._lock:
+            keys, self._stale = self._stale, []
+        if not keys:
+            return 0
+        try:
+            self.db.delete_agent_states(keys)
+        except Exception as e:
+            print(f"Error deleting spilled interview agents: {str(e)}")
+            with self._lock:
+                self._stale[:0] = keys
+            return 0
+        return len(keys)
+
+    def evict_idle(self) -> int:
+        """Spill agents idle for longer than ``idle_ttl``; returns how many"""
+        now = self.clock()
+        self._last_sweep = now
+        cutoff = now - self.idle_ttl
+        victims = []
+        with self._lock:
+            for key, entry in self._live.items():
+                if entry.last_used >= cutoff:
+                    break
+                if not entry.busy:
+                    victims.append((key, entry, entry.last_used))
+        return self._spill(victims, "evicted_idle")
+
+    def _make_room(self) -> int:
+        """Spill least recently used idle agents until the registry is under the low-water mark"""
+        victims = []
+        with self._lock:
+            excess = self._bytes - self.max_bytes * self.low_water
+            if excess <= 0:
+                return 0
+            for key, entry in self._live.items():
+                if excess <= 0:
+                    break
+                if not entry.busy:
+                    victims.append((key, entry, entry.last_used))
+                    excess -= entry.bytes
+        return self._spill(victims, "evicted_capacity")
+
+    def _spill(self, victims: List, reason: str) -> int:
+        if not victims or not self._spill_lock.acquire(blocking=False):
+            return 0
+        spilled = 0
+        try:
+            for start in range(0, len(victims), self.spill_batch):
+                with self._lock:
+                    # Another spill may have taken some while this one waited
+                    batch = [(key, entry, last_used) for key, entry, last_used in victims[start:start + self.spill_batch]
+                             if self._live.get(key) is entry]
+                try:
+                    self.db.save_agent_states({key: entry.agent.to_state() for key, entry, _ in batch})
+                except Exception as e:
+                    print(f"Error spilling interview agents: {str(e)}")
+                    with self._lock:
+                        self._counters["spill_errors"] += len(batch)
+                    break
+                with self._lock:
+                    for key, entry, last_used in batch:
+                        # Keep agents a tester came back to while their state was being written
+                        if self._live.get(key) is entry and not entry.busy and entry.last_used == last_used:
+                            del self._live[key]
+                            self._bytes -= entry.bytes
+                            spilled += 1
+                    self._room.notify_all()
+        finally:
+            self._spill_lock.release()
+        with self._lock:
+            self._counters["spilled"] += spilled
+            self._counters[reason] += spilled
+        return spilled
+
+    def memory_report(self, limit: int = 20) -> List[Dict]:
+        """The largest live sessions: key, stage, transcript length, bytes and idle seconds"""
+        now = self.clock()
+        with self._lock:
+            entries = sorted(self._live.items(), key=lambda item: item[1].bytes, reverse=True)[:limit]
+            return [{
+                "key": key,
+                "session_id": entry.agent.session_id,
+                "stage": entry.agent.stage,
+                "messages": len(entry.agent.messages),
+                "bytes": entry.bytes,
+                "idle_seconds": round(now - entry.last_used, 1),
+                "busy": bool(entry.busy)
+            } for key, entry in entries]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            live = len(self._live)
+            busy = sum(1 for entry in self._live.values() if entry.busy)
+            held = self._bytes
+        return {
+            **counters,
+            "live": live,
+            "busy": busy,
+            "bytes": held,
+            "max_bytes": self.max_bytes,
+            "avg_bytes": held // live if live else 0
+        }
+
+session_registry = SessionRegistry(
+    idle_ttl=float(os.getenv('SESSION_IDLE_SECONDS', '900')),
+    max_bytes=int(float(os.getenv('SESSION_MEMORY_MB', '256')) * MB)
+)
+
+def get_session_registry() -> SessionRegistry:
+    return session_registry
+
+def set_session_registry(registry: SessionRegistry) -> None:
+    """Replace the process-wide registry, e.g. with a smaller ceiling in benchmarks"""
+    global session_registry
+    session_registry = registry
@@ -0,0 +1,458 @@
+"""Headless HTTP API for the interview engine.
+
+A plain ASGI app (no framework) so embedded widgets and mobile clients can
+run interviews without Streamlit re-executing a script on every message.
+Serve it with any ASGI server, e.g.:
+
+    uvicorn api:app --port 8000
+
+Endpoints:
+
+    POST /sessions/{session_id}/conversations   start an interview, returns the first message
+    POST /conversations/{id}/messages           {"content": "..."}; replies with JSON, or with
+                                                server-sent events when the request sends
+                                                ``Accept: text/event-stream``
+    POST /conversations/{id}/tester             {"email", "opt_in", "gdpr_consent"} after completion
+    GET  /conversations/{id}                    stage and progress
+    GET  /healthz
+
+Behind ``shard_router.py`` several API processes share the load; the router
+moves conversations between them with the ``/internal`` endpoints. They hand
+out whole transcripts, so they are refused unless ``SHARD_INTERNAL_TOKEN`` is
+set and sent in the ``X-Shard-Token`` header:
+
+    GET  /internal/conversations                ids of the conversations held here
+    POST /internal/conversations/{id}/export    remove a conversation and return its state
+    POST /internal/conversations                {"conversation_id", "saved", "agent"}; adopt one
+
+Agents are synchronous, so their work runs on a bounded thread pool while the
+event loop keeps serving every other conversation.
+
+Conversations are swept out of memory by ``last_active``: a finished and saved
+one ``API_COMPLETED_GRACE_SECONDS`` after its last request (time for the tester
+form), any other ``API_IDLE_SECONDS`` after it, spilled to the store as its
+handoff state and rebuilt on the tester's next request.
+"""
+from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hmac
+import json
+import os
+import re
+import time
+import uuid
+from dotenv import load_dotenv
+from agents.agent_pool import AgentPool, get_agent_pool
+from agents.interview_agent import InterviewAgent, TurnSuperseded
+from utils.cancellation import TURN_TIMEOUT_SECONDS, CancellationToken, get_cancellation_meter
+from utils.llm_usage import get_usage_meter
+from utils.result_counters import get_result_counters
+from utils.sharding import routing_key
+from utils.storage import get_database_service
+from utils.tracing import get_tracer, run_in_context
+
+load_dotenv()
+
+# Threads for agent start-up and summary turns, the only calls that wait on the network
+API_WORKER_THREADS = int(os.getenv('API_WORKER_THREADS', '64'))
+MAX_BODY_BYTES = 64 * 1024
+# Handed-off conversations carry their whole transcript
+MAX_INTERNAL_BODY_BYTES = 4 * 1024 * 1024
+SHARD_INTERNAL_TOKEN = os.getenv('SHARD_INTERNAL_TOKEN')
+# Seconds without a request before a conversation leaves memory, and how often to look
+API_IDLE_SECONDS = float(os.getenv('API_IDLE_SECONDS', '900'))
+API_COMPLETED_GRACE_SECONDS = float(os.getenv('API_COMPLETED_GRACE_SECONDS', '600'))
+API_SWEEP_SECONDS = float(os.getenv('API_SWEEP_SECONDS', '30'))
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class Conversation:
+    """One tester's interview and the lock that keeps their turns in order"""
+
+    def __init__(self, conversation_id: str, agent: InterviewAgent):
+        self.id = conversation_id
+        self.agent = agent
+        self.lock = asyncio.Lock()
+        self.saved = False
+        self.last_active = time.monotonic()
+
+    def status(self) -> Dict:
+        return {
+            "conversation_id": self.id,
+            "session_id": self.agent.session_id,
+            "stage": self.agent.stage,
+            "problem": self.agent.current_problem_number(),
+            "complete": self.agent.is_complete()
+        }
+
+class InterviewAPI:
+    """ASGI application holding live conversations in memory"""
+
+    def __init__(self, db=None, max_workers: int = API_WORKER_THREADS, pool: Optional[AgentPool] = None,
+                 internal_token: Optional[str] = SHARD_INTERNAL_TOKEN, idle_ttl: float = API_IDLE_SECONDS,
+                 completed_grace: float = API_COMPLETED_GRACE_SECONDS, sweep_interval: float = API_SWEEP_SECONDS):
+        self._db = db
+        self.internal_token = internal_token
+        self.pool = pool or get_agent_pool()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="interview-api")
+        self.conversations: Dict[str, Conversation] = {}
+        self.idle_ttl = idle_ttl
+        self.completed_grace = completed_grace
+        self.sweep_interval = sweep_interval
+        self._sweeper: Optional[asyncio.Future] = None
+        # Spilled conversations being read back, so concurrent requests share one load
+        self._loading: Dict[str, asyncio.Future] = {}
+        self.sweep_stats = {"dropped": 0, "spilled": 0, "rehydrated": 0, "spill_errors": 0}
+        self.routes = [
+            ("POST", re.compile(r"^/sessions/(?P<session_id>[^/]+)/conversations$"), self.start_conversation),
+            ("POST", re.compile(r"^/conversations/(?P<conversation_id>[^/]+)/messages$"), self.send_message),
+            ("POST", re.compile(r"^/conversations/(?P<conversation_id>[^/]+)/tester$"), self.save_tester),
+            ("GET", re.compile(r"^/conversations/(?P<conversation_id>[^/]+)$"), self.get_conversation),
+            ("GET", re.compile(r"^/healthz$"), self.health),
+            ("GET", re.compile(r"^/internal/conversations$"), self.list_conversations),
+            ("POST", re.compile(r"^/internal/conversations/(?P<conversation_id>[^/]+)/export$"), self.export_conversation),
+            ("POST", re.compile(r"^/internal/conversations$"), self.import_conversation),
+        ]
+
+    @property
+    def db(self):
+        # Created on first use so importing the module needs no credentials
+        if self._db is None:
+            self._db = get_database_service()
+            get_usage_meter().set_sink(self._db.save_llm_usage)
+            get_result_counters().set_sink(self._db.increment_result_counters)
+        return self._db
+
+    async def run(self, fn, *args):
+        # Carries the request's span over to the worker thread
+        return await asyncio.get_running_loop().run_in_executor(self.executor, run_in_context(fn, *args))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if self._sweeper is None:
+            # Servers run without lifespan events too
+            self._sweeper = asyncio.ensure_future(self._sweep_loop())
+        try:
+            handler, params = self._match(scope["method"], scope["path"])
+            internal = scope["path"].startswith("/internal/")
+            if internal:
+                self._check_internal_token(scope)
+            body = await self._read_body(receive, MAX_INTERNAL_BODY_BYTES if internal else MAX_BODY_BYTES)
+            # send_message listens on the channel for a client that hangs up mid-turn
+            scope = {**scope, "receive": receive}
+            with get_tracer().start_as_current_span(f"api.{handler.__name__}", {"http.method": scope["method"], **params}):
+                await handler(scope, body, send, **params)
+        except HTTPError as e:
+            await self._json(send, e.status, {"error": e.message})
+        except Exception as e:
+            print(f"Error handling {scope['method']} {scope['path']}: {str(e)}")
+            await self._json(send, 500, {"error": "Internal server error"})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if self._sweeper is None:
+                    self._sweeper = asyncio.ensure_future(self._sweep_loop())
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._sweeper is not None:
+                    self._sweeper.cancel()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _match(self, method: str, path: str):
+        path_matched = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match:
+                path_matched = True
+                if route_method == method:
+                    return handler, match.groupdict()
+        if path_matched:
+            raise HTTPError(405, "Method not allowed")
+        raise HTTPError(404, "Not found")
+
+    def _check_internal_token(self, scope) -> None:
+        if not self.internal_token:
+            raise HTTPError(403, "Internal endpoints are disabled until SHARD_INTERNAL_TOKEN is set")
+        if not hmac.compare_digest(header(scope, b"x-shard-token") or b"", self.internal_token.encode("utf-8")):
+            raise HTTPError(403, "Forbidden")
+
+    async def _read_body(self, receive, limit: int = MAX_BODY_BYTES) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > limit:
+                raise HTTPError(413, "Request body too large")
+            if not message.get("more_body"):
+                return body
+
+    def _parse_json(self, body: bytes) -> Dict:
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Request body must be JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return data
+
+    async def _conversation(self, conversation_id: str) -> Conversation:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            # Swept out while idle; the store has its state
+            loading = self._loading.get(conversation_id)
+            if loading is None:
+                loading = self._loading[conversation_id] = asyncio.ensure_future(
+                    self.run(self._load_spilled, conversation_id))
+                loading.add_done_callback(lambda _: self._loading.pop(conversation_id, None))
+            state = await asyncio.shield(loading)
+            conversation = self.conversations.get(conversation_id)
+            if conversation is None:
+                if state is None:
+                    raise HTTPError(404, "Conversation not found")
+                conversation = self._adopt(state)
+                self.sweep_stats["rehydrated"] += 1
+        conversation.last_active = time.monotonic()
+        return conversation
+
+    def _load_spilled(self, conversation_id: str) -> Optional[Dict]:
+        state = self.db.get_agent_state(conversation_id)
+        if state is not None:
+            # The live copy is the only one from here on
+            self.db.delete_agent_states([conversation_id])
+        return state
+
+    def _adopt(self, data: Dict) -> Conversation:
+        """Hold a conversation from its handoff state: ``{"conversation_id", "saved", "agent"}``"""
+        try:
+            agent = InterviewAgent.from_state(data["agent"])
+        except (KeyError, ValueError) as e:
+            raise HTTPError(422, f"Invalid agent state: {str(e)}")
+        conversation = Conversation(data["conversation_id"], agent)
+        conversation.saved = bool(data.get("saved", False))
+        self.conversations[conversation.id] = conversation
+        return conversation
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Error sweeping conversations: {str(e)}")
+
+    async def sweep(self) -> Dict:
+        """Drop finished conversations past their grace period and spill idle ones to the store"""
+        now = time.monotonic()
+        dropped, idle = 0, []
+        for conversation in list(self.conversations.values()):
+            if conversation.lock.locked():
+                continue
+            age = now - conversation.last_active
+            if conversation.saved and conversation.agent.is_complete():
+                if age >= self.completed_grace:
+                    self.conversations.pop(conversation.id, None)
+                    dropped += 1
+            elif age >= self.idle_ttl:
+                idle.append(conversation)
+        spilled = await self._spill(idle) if idle else 0
+        self.sweep_stats["dropped"] += dropped
+        self.sweep_stats["spilled"] += spilled
+        return {"dropped": dropped, "spilled": spilled}
+
+    async def _spill(self, conversations) -> int:
+        states = {c.id: {"conversation_id": c.id, "session_id": c.agent.session_id, "saved": c.saved,
+                         "agent": c.agent.to_state()}
+                  for c in conversations}
+        seen = {c.id: c.last_active for c in conversations}
+        try:
+            await self.run(self.db.save_agent_states, states)
+        except Exception as e:
+            print(f"Error spilling conversations: {str(e)}")
+            self.sweep_stats["spill_errors"] += len(states)
+            return 0
+        spilled, stale = 0, []
+        for conversation in conversations:
+            if (self.conversations.get(conversation.id) is conversation and not conversation.lock.locked()
+                    and conversation.last_active == seen[conversation.id]):
+                del self.conversations[conversation.id]
+                spilled += 1
+            else:
+                # The tester came back while it was written; the live copy wins
+                stale.append(conversation.id)
+        if stale:
+            try:
+                await self.run(self.db.delete_agent_states, stale)
+            except Exception as e:
+                print(f"Error deleting spilled conversations: {str(e)}")
+        return spilled
+
+    async def _json(self, send, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def health(self, scope, body, send):
+        health = {"status": "ok", "conversations": len(self.conversations), "sweep": self.sweep_stats,
+                  "agent_pool": self.pool.stats(), "cancellation": get_cancellation_meter().stats()}
+        outbox = getattr(self._db, "outbox", None)
+        if outbox is not None:
+            health["outbox"] = outbox.stats()
+        await self._json(send, 200, health)
+
+    def _create_agent(self, session_id: str) -> InterviewAgent:
+        session_data = self.db.get_session(session_id)
+        if not session_data or 'founder_inputs' not in session_data:
+            raise HTTPError(404, "Session not found")
+        if isinstance(session_data['founder_inputs'], str):
+            session_data['founder_inputs'] = json.loads(session_data['founder_inputs'])
+        try:
+            return self.pool.acquire(session_id, session_data)
+        except ValueError as e:
+            raise HTTPError(422, str(e))
+
+    async def start_conversation(self, scope, body, send, session_id: str):
+        agent = await self.run(self._create_agent, session_id)
+        # Prefixed with the session's routing key so a shard router can place it
+        conversation = Conversation(routing_key(session_id) + uuid.uuid4().hex, agent)
+        message = agent.start_interview()
+        self.conversations[conversation.id] = conversation
+        await self._json(send, 201, {**conversation.status(), "message": message})
+
+    async def _turn(self, scope, conversation: Conversation, content: str) -> str:
+        # Scripted turns take microseconds, so only turns that call the model go to
+        # the pool; otherwise they would queue behind summaries in flight
+        if not conversation.agent.next_turn_calls_llm():
+            reply = conversation.agent.get_response(content)
+        else:
+            token = CancellationToken(timeout=TURN_TIMEOUT_SECONDS)
+            watcher = asyncio.ensure_future(watch_disconnect(scope["receive"], token))
+            try:
+                reply = await self.run(conversation.agent.get_response, content, token)
+            except TurnSuperseded:
+                raise HTTPError(409, "This message was sent again; the newer request has the reply")
+            finally:
+                watcher.cancel()
+        if conversation.agent.is_complete() and not conversation.saved:
+            # Also after a closing turn whose summary was ready, which ran here on the event loop
+            await self.run(conversation.agent.finish_pending_summaries)
+            await self.run(self.db.save_responses, conversation.agent.session_id, conversation.agent.responses)
+            conversation.saved = True
+        return reply
+
+    async def send_message(self, scope, body, send, conversation_id: str):
+        conversation = await self._conversation(conversation_id)
+        content = self._parse_json(body).get("content")
+        if not isinstance(content, str) or not content.strip():
+            raise HTTPError(400, "content must be a non-empty string")
+
+        # A message sent while the last one is still being answered means the client gave up on that
+        # turn; it is rolled back and this message answers the same question
+        if conversation.lock.locked():
+            conversation.agent.cancel_turn("retry")
+        async with conversation.lock:
+            if self.conversations.get(conversation_id) is not conversation:
+                raise HTTPError(404, "Conversation was handed off to another worker")
+            if conversation.agent.is_complete():
+                raise HTTPError(409, "Interview is already complete")
+            if wants_event_stream(scope):
+                await self._stream_reply(scope, send, conversation, content)
+                return
+            reply = await self._turn(scope, conversation, content)
+        await self._json(send, 200, {**conversation.status(), "message": reply})
+
+    async def _stream_reply(self, scope, send, conversation: Conversation, content: str) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"),
+                        (b"x-accel-buffering", b"no")]
+        })
+        try:
+            reply = await self._turn(scope, conversation, content)
+            for chunk in split_deltas(reply):
+                await send({"type": "http.response.body", "body": sse_event("delta", {"content": chunk}), "more_body": True})
+            await send({"type": "http.response.body", "body": sse_event("done", conversation.status())})
+        except HTTPError as e:
+            await send({"type": "http.response.body", "body": sse_event("error", {"error": e.message})})
+        except Exception as e:
+            print(f"Error streaming reply: {str(e)}")
+            await send({"type": "http.response.body", "body": sse_event("error", {"error": "Internal server error"})})
+
+    async def save_tester(self, scope, body, send, conversation_id: str):
+        conversation = await self._conversation(conversation_id)
+        if not conversation.agent.is_complete():
+            raise HTTPError(409, "Interview is not complete yet")
+        data = self._parse_json(body)
+        email = data.get("email") or ""
+        opt_in = bool(data.get("opt_in", False))
+        if email or opt_in:
+            await self.run(self.db.save_tester_info, conversation.agent.session_id, email, opt_in,
+                           bool(data.get("gdpr_consent", False)))
+            get_result_counters().record_tester(conversation.agent.session_id,
+                                                conversation.agent.session_data.get("founder_email"), opt_in)
+        await self._json(send, 200, {"saved": bool(email or opt_in)})
+
+    async def get_conversation(self, scope, body, send, conversation_id: str):
+        await self._json(send, 200, (await self._conversation(conversation_id)).status())
+
+    async def list_conversations(self, scope, body, send):
+        await self._json(send, 200, {"conversations": list(self.conversations)})
+
+    async def export_conversation(self, scope, body, send, conversation_id: str):
+        conversation = await self._conversation(conversation_id)
+        # Waits for a turn in progress so the state handed off is complete
+        async with conversation.lock:
+            state = conversation.agent.to_state()
+            self.conversations.pop(conversation_id, None)
+        await self._json(send, 200, {"conversation_id": conversation_id, "saved": conversation.saved, "agent": state})
+
+    async def import_conversation(self, scope, body, send):
+        data = self._parse_json(body)
+        conversation_id = data.get("conversation_id")
+        if not isinstance(conversation_id, str) or not conversation_id or not isinstance(data.get("agent"), dict):
+            raise HTTPError(400, "conversation_id and agent are required")
+        conversation = self._adopt(data)
+        await self._json(send, 201, conversation.status())
+
+async def watch_disconnect(receive, token: CancellationToken) -> None:
+    """Cancel ``token`` when the client disconnects; the request body has already been read"""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            token.cancel("disconnect")
+            return
+
+def header(scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value
+    return None
+
+def wants_event_stream(scope) -> bool:
+    return b"text/event-stream" in (header(scope, b"accept") or b"")
+
+def split_deltas(text: str):
+    """Word-sized chunks, the granularity clients render a typing effect at"""
+    return re.findall(r"\S+\s*|\s+", text)
+
+def sse_event(event: str, data: Dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+app = InterviewAPI()
@@ -1,14 +1,16 @@
 import streamlit as st
-from agents.founder_agent import FounderAgent
-from agents.interview_agent import InterviewAgent
-from agents.analysis_agent import AnalysisAgent
-from utils.database import DatabaseService
+from utils.storage import get_database_service
+from utils.llm_usage import get_usage_meter
+from utils.result_counters import get_result_counters
+from utils.tracing import get_tracer
+from utils.storage import JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_DEAD
 import json
 from datetime import datetime
 import secrets
 import re
 import hashlib
 import os
+import time
 from dotenv import load_dotenv
 import uuid
 
@@ -23,6 +25,18 @@ PASSWORD_REQUIREMENTS = {
     "special": r'[!@#$%^&*(),.?":{}|<>]'
 }
 
+# Minimum seconds between UI updates while a report is streaming
+REPORT_FLUSH_INTERVAL = 0.05
+
+# Seconds between checks on a queued analysis or report
+JOB_POLL_INTERVAL = 1.0
+
+# Seconds between refreshes of the live results panel
+LIVE_RESULTS_POLL_INTERVAL = 5.0
+
+# Chat messages rendered on every rerun; earlier ones sit behind a toggle
+CHAT_HISTORY_WINDOW = 6
+
 def validate_password(password):
     if len(password) < PASSWORD_MIN_LENGTH:
         return False, f"Password must be at least {PASSWORD_MIN_LENGTH} characters long"
@@ -58,8 +72,15 @@ def update_founder_inputs_to_session(**kwargs):
     st.session_state.founder_inputs = {**st.session_state.founder_inputs, **kwargs}
 
 def main():
+    # One trace per script run: every widget interaction, including each chat message
+    with get_tracer().start_as_current_span("app.rerun", {"session_id": st.query_params.get("session_id")}):
+        run_page()
+
+def run_page():
     if 'db' not in st.session_state:
-        st.session_state.db = DatabaseService()
+        st.session_state.db = get_database_service()
+        get_usage_meter().set_sink(st.session_state.db.save_llm_usage)
+        get_result_counters().set_sink(st.session_state.db.increment_result_counters)
     if 'is_admin' not in st.session_state:
         st.session_state.is_admin = False
     if 'current_session_id' not in st.session_state:
@@ -126,7 +147,7 @@ def founder_auth_page():
         password = st.text_input("Password", type="password", key="login_password")
         if st.button("Login"):
             try:
-                db = DatabaseService()
+                db = get_database_service()
                 founder = db.get_founder(email)
                 if founder and verify_password(founder['password_hash'], password):
                     st.session_state.clear()
@@ -148,13 +169,13 @@ def founder_auth_page():
                 st.error(msg)
             else:
                 try:
-                    db = DatabaseService()
+                    db = get_database_service()
                     existing = db.get_founder(new_email)
                     if existing:
                         st.error("Account already exists.")
                     else:
                         hashed_pw = hash_password(new_password)
-                        db.create_founder_account(new_email, hashed_pw)
+                        db.create_founder(new_email, hashed_pw)
                         st.success("Account created. Please log in.")
                         st.session_state["login_email"] = new_email
                         st.rerun()
@@ -167,19 +188,17 @@ def admin_pages():
     # Initialize agents if needed
     if 'founder_agent' not in st.session_state:
         st.session_state.founder_agent = None
-    if 'interview_agent' not in st.session_state:
-        st.session_state.interview_agent = None
-    if 'analysis_agent' not in st.session_state:
-        st.session_state.analysis_agent = None
     
     # Sidebar navigation
     page = st.sidebar.radio(
         "Navigation",
-        ["Founder Input", "Analysis"]
+        ["Founder Input", "Live Results", "Analysis"]
     )
     
     if page == "Founder Input":
         founder_inputs_page()
+    elif page == "Live Results":
+        live_results_page()
     else:
         analysis_page()
 
@@ -330,7 +349,7 @@ def founder_inputs_page():
         
         try:
             # Save to database
-            db = DatabaseService()
+            db = get_database_service()
             db.save_founder_inputs(st.session_state.founder_email, st.session_state.founder_inputs)
             
             # Generate session URL
@@ -353,7 +372,28 @@ def founder_inputs_page():
         except Exception as e:
             st.error(f"Error saving founder inputs: {str(e)}")
 
+def render_chat_history(history, window=CHAT_HISTORY_WINDOW):
+    """Render the latest ``window`` chat messages, with earlier ones behind a toggle.
+
+    Streamlit re-sends every element on each rerun, so rendering the whole
+    history would make every turn of an interview cost more than the last.
+    """
+    hidden = len(history) - window
+    if hidden > 0:
+        if st.toggle("Show earlier messages", key="show_full_history"):
+            st.caption(f"{hidden} earlier messages")
+        else:
+            history = history[-window:]
+    for message in history:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+
 def interview_page():
+    # Agents are imported by the pages that use them so the login page starts
+    # without loading the LLM client stack
+    from agents.agent_pool import get_agent_pool
+    from agents.session_registry import RegistryFull, get_session_registry
+
     st.title("Chat with MomBot")
     
     # Initialize chat history in session state
@@ -364,93 +404,203 @@ def interview_page():
     try:
         session_data = st.session_state.db.get_session(st.session_state.current_session_id)
         
-        if session_data and 'founder_inputs' in session_data:
+        completed = st.session_state.get('completed_interview')
+        if completed and completed["session_id"] == st.session_state.current_session_id:
+            # The agent was let go when the interview ended; only the closing form is left
+            render_chat_history(st.session_state.chat_history)
+            render_tester_form(completed["founder_email"])
+        elif session_data and 'founder_inputs' in session_data:
+            # The agent lives in the session registry, which spills it to the database
+            # while this tab sits idle and rebuilds it on the next rerun
+            registry = get_session_registry()
+            key = st.session_state.get('interview_key')
+            agent = registry.checkout(key) if key else None
+            if agent is not None and agent.session_id != st.session_state.current_session_id:
+                registry.discard(key)
+                agent = None
+            
             # Initialize interview agent if not already done
-            if 'interview_agent' not in st.session_state:
+            if agent is None:
                 # Ensure founder_inputs is properly formatted
                 if isinstance(session_data['founder_inputs'], str):
                     session_data['founder_inputs'] = json.loads(session_data['founder_inputs'])
                 
-                # Initialize the interview agent with the correct arguments
-                st.session_state.interview_agent = InterviewAgent(
-                    session_id=st.session_state.current_session_id,
-                    session_data=session_data
-                )
+                # Take a prewarmed agent for this link; the pool builds the next one in the background
+                with get_tracer().start_as_current_span("agent_pool.acquire"):
+                    agent = get_agent_pool().acquire(
+                        st.session_state.current_session_id,
+                        session_data
+                    )
+                key = st.session_state.interview_key = registry.put(st.session_state.current_session_id, agent)
+                st.session_state.completed_interview = None
                 
                 # Add initial message to chat history
-                initial_message = st.session_state.interview_agent.start_interview()
+                initial_message = agent.start_interview()
                 st.session_state.chat_history = [{
                     "role": "assistant",
                     "content": initial_message
                 }]
             
-            # Display chat history
-            for message in st.session_state.chat_history:
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
-            
-            # Chat input
-            # Chat input with error handling
             try:
-                if prompt := st.chat_input("Type your response here..."):
-                    # Add user message to chat history
-                    st.session_state.chat_history.append({"role": "user", "content": prompt})
-                    with st.chat_message("user"):
-                        st.markdown(prompt)
-                    
-                    # Get and display assistant response with streaming
-                    with st.chat_message("assistant"):
-                        message_placeholder = st.empty()
-                        full_response = ""
-                        
-                        # Get streaming response from interview agent
-                        for response_chunk in st.session_state.interview_agent.get_response(prompt):
-                            full_response += response_chunk
-                            message_placeholder.markdown(full_response + "▌")
-                        
-                        message_placeholder.markdown(full_response)
-                        st.session_state.chat_history.append({"role": "assistant", "content": full_response})
-            except Exception as e:
-                st.error(f"Chat error: {e}")
-                
-                # Check if interview is complete
-                if st.session_state.interview_agent.is_complete():
-                    # Show email collection and opt-in form
-                    with st.form("tester_info"):
-                        st.write("### Thank you for completing the interview!")
-                        email = st.text_input("Email (optional)", help="Add your email if you'd like to be contacted about the results")
-                        opt_in = st.checkbox(
-                            "I'd like to receive opportunities to participate in paid research for other founders",
-                            help="By checking this box, you agree to receive occasional emails about paid research opportunities"
-                        )
-                        gdpr_consent = st.checkbox(
-                            "I consent to my data being processed in accordance with GDPR guidelines",
-                            help="Your data will be stored securely and you can request its deletion at any time"
-                        )
-                        
-                        if st.form_submit_button("Submit"):
-                            if email or opt_in:
-                                try:
-                                    st.session_state.db.save_tester_info(
-                                        st.session_state.current_session_id,
-                                        email,
-                                        opt_in,
-                                        gdpr_consent
-                                    )
-                                    st.success("Thank you for your participation!")
-                                except Exception as e:
-                                    st.error(f"Error saving information: {str(e)}")
-                            else:
-                                st.success("Thank you for your participation!")
+                render_interview(agent)
+            finally:
+                if agent.is_complete():
+                    # Nothing left to resume: free the memory and any spilled copy
+                    registry.discard(key)
+                    st.session_state.interview_key = None
+                else:
+                    registry.checkin(key)
         else:
             st.error("Session data is incomplete. Please check the session ID or create a new session.")
+    except RegistryFull:
+        st.error("MomBot is talking to a lot of people right now. Please try again in a few minutes.")
     except Exception as e:
         st.error(f"Error retrieving session: {str(e)}")
         st.write("Debug info:")
         st.write(f"Session ID: {st.session_state.current_session_id}")
         st.write(f"Session data: {session_data if 'session_data' in locals() else 'Not loaded'}")
 
+def streamlit_cancel_checks():
+    """Checks that cancel this script run's LLM work: a newer rerun is waiting, or the tab was closed"""
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    from streamlit.runtime.scriptrunner.script_requests import ScriptRequestType
+
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return []
+
+    def rerun_requested():
+        # Streamlit only starts the rerun once this run reaches an st call, after the LLM call
+        return getattr(ctx.script_requests, "_state", ScriptRequestType.CONTINUE) != ScriptRequestType.CONTINUE
+
+    def disconnected():
+        return Runtime.exists() and not Runtime.instance().is_active_session(ctx.session_id)
+
+    return [(rerun_requested, "rerun"), (disconnected, "disconnect")]
+
+def render_interview(agent):
+    """Chat history, input and the closing form for a checked-out interview agent"""
+    from utils.cancellation import TURN_TIMEOUT_SECONDS, CancellationToken
+
+    with get_tracer().start_as_current_span("app.render_history", {"messages": len(st.session_state.chat_history)}):
+        render_chat_history(st.session_state.chat_history)
+
+    # Chat input with error handling
+    try:
+        if prompt := st.chat_input("Type your response here..."):
+            # Add user message to chat history
+            st.session_state.chat_history.append({"role": "user", "content": prompt})
+            with st.chat_message("user"):
+                st.markdown(prompt)
+
+            # Replies arrive as one string, so render them once instead of
+            # re-sending the growing text for every character
+            token = CancellationToken(timeout=TURN_TIMEOUT_SECONDS, checks=streamlit_cancel_checks())
+            full_response = agent.get_response(prompt, token=token)
+            with get_tracer().start_as_current_span("app.render_reply"), st.chat_message("assistant"):
+                st.markdown(full_response)
+            st.session_state.chat_history.append({"role": "assistant", "content": full_response})
+    except Exception as e:
+        st.error(f"Chat error: {e}")
+
+    # Check if interview is complete
+    if agent.is_complete():
+        st.session_state.completed_interview = {
+            "session_id": agent.session_id,
+            "founder_email": agent.session_data.get('founder_email')
+        }
+        render_tester_form(agent.session_data.get('founder_email'))
+
+def render_tester_form(founder_email):
+    """Email and opt-in form shown once the interview is complete"""
+    # Show email collection and opt-in form
+    with st.form("tester_info"):
+        st.write("### Thank you for completing the interview!")
+        email = st.text_input("Email (optional)", help="Add your email if you'd like to be contacted about the results")
+        opt_in = st.checkbox(
+            "I'd like to receive opportunities to participate in paid research for other founders",
+            help="By checking this box, you agree to receive occasional emails about paid research opportunities"
+        )
+        gdpr_consent = st.checkbox(
+            "I consent to my data being processed in accordance with GDPR guidelines",
+            help="Your data will be stored securely and you can request its deletion at any time"
+        )
+
+        if st.form_submit_button("Submit"):
+            if email or opt_in:
+                try:
+                    st.session_state.db.save_tester_info(
+                        st.session_state.current_session_id,
+                        email,
+                        opt_in,
+                        gdpr_consent
+                    )
+                    get_result_counters().record_tester(
+                        st.session_state.current_session_id,
+                        founder_email,
+                        opt_in
+                    )
+                    st.success("Thank you for your participation!")
+                except Exception as e:
+                    st.error(f"Error saving information: {str(e)}")
+            else:
+                st.success("Thank you for your participation!")
+
+def live_results_page():
+    """Interview counts and resonance for the founder's links, read from the live counters"""
+    from datetime import date, timedelta
+    from utils.result_counters import (
+        INTERVIEWS_STARTED, INTERVIEWS_COMPLETED, TESTERS, OPT_INS, summarize_counters
+    )
+
+    st.header("Live Results")
+    periods = {"Today": 0, "Last 7 days": 6, "Last 30 days": 29, "All time": None}
+    period = st.selectbox("Period", list(periods), index=1)
+    since = None if periods[period] is None else (date.today() - timedelta(days=periods[period])).isoformat()
+    auto_refresh = st.checkbox("Refresh automatically", value=True)
+    
+    # Interviews in this process show up at once rather than after the next background flush
+    get_result_counters().flush()
+    summary = summarize_counters(st.session_state.db.get_result_counters(st.session_state.founder_email, since))
+    totals = summary["totals"]
+    
+    started, completed, testers, opt_ins = st.columns(4)
+    started.metric("Interviews started", totals[INTERVIEWS_STARTED])
+    completed.metric("Completed", totals[INTERVIEWS_COMPLETED])
+    testers.metric("Testers who left details", totals[TESTERS])
+    opt_ins.metric("Opted in", totals[OPT_INS])
+    
+    if not summary["sessions"]:
+        st.info("No interviews in this period yet. Share a session link to start collecting results.")
+    else:
+        st.write("### Problem Resonance")
+        if summary["problems"]:
+            st.table([{"Problem": problem, "Ratings": counts["ratings"], "Mean resonance (1-5)": counts["mean_resonance"]}
+                      for problem, counts in sorted(summary["problems"].items(),
+                                                    key=lambda item: item[1]["mean_resonance"] or 0, reverse=True)])
+        else:
+            st.caption("No problem has been rated yet.")
+        
+        st.write("### Session Links")
+        st.table([{"Session ID": session_id, "Started": counts[INTERVIEWS_STARTED],
+                   "Completed": counts[INTERVIEWS_COMPLETED], "Testers": counts[TESTERS], "Opted in": counts[OPT_INS]}
+                  for session_id, counts in summary["sessions"].items()])
+        
+        if len(summary["days"]) > 1:
+            st.write("### Interviews per Day")
+            st.line_chart({"day": list(summary["days"]),
+                           "Started": [day[INTERVIEWS_STARTED] for day in summary["days"].values()],
+                           "Completed": [day[INTERVIEWS_COMPLETED] for day in summary["days"].values()]}, x="day")
+    
+    if auto_refresh:
+        time.sleep(LIVE_RESULTS_POLL_INTERVAL)
+        st.rerun()
+
 def analysis_page():
+    from agents.jobs import ANALYZE_JOB, REPORT_JOB, JOB_PRIORITIES, analysis_job_payload
+    from utils.job_queue import JobQueue
+
     st.header("Analysis")
     
     session_id = st.text_input("Enter Session ID")
@@ -464,20 +614,32 @@ def analysis_page():
             st.error("Session or responses not found")
             return
         
-        interview_data = {
-            "session_id": session_id,
-            "founder_inputs": session_data["founder_inputs"],
-            "responses": responses
-        }
+        # The LLM work runs in worker.py; this page only queues it and polls
+        queue = JobQueue(st.session_state.db)
+        current = st.session_state.db.get_analysis_state(session_id)
+        watermark = current["watermark"] if current else 0
+        new_rows = st.session_state.db.get_response_rows(session_id, after_id=watermark)
+        payload = analysis_job_payload(session_id, new_rows[-1]["id"] if new_rows else watermark)
+        founder_email = session_data.get("founder_email")
         
-        if st.session_state.analysis_agent is None:
-            st.session_state.analysis_agent = AnalysisAgent(session_id, interview_data)
+        if current and new_rows:
+            st.caption(f"{len(new_rows)} new interview(s) since the last analysis; generating again folds in only those.")
         
         if st.button("Generate Analysis"):
-            with st.spinner("Analyzing responses..."):
-                analysis = st.session_state.analysis_agent.analyze_responses()
-                st.session_state.db.save_analysis(session_id, analysis)
-                
+            queue.enqueue(ANALYZE_JOB, payload, priority=JOB_PRIORITIES[ANALYZE_JOB], founder_email=founder_email)
+        
+        if st.button("Generate Full Report"):
+            queue.enqueue(REPORT_JOB, payload, priority=JOB_PRIORITIES[REPORT_JOB], founder_email=founder_email)
+        
+        # Jobs are found by their content, so results survive navigating away and back
+        pending = False
+        analysis_job = queue.find(ANALYZE_JOB, payload)
+        if analysis_job:
+            pending = render_job_status(analysis_job, "Analysis") or pending
+            if analysis_job["status"] == JOB_SUCCEEDED:
+                analysis = analysis_job["result"]
+                if analysis.get("interviews"):
+                    st.caption(f"Based on {analysis['interviews']} interview(s)")
                 st.write("### Key Insights")
                 st.write(analysis["key_insights"])
                 
@@ -489,11 +651,108 @@ def analysis_page():
                 
                 st.write("### Potential Risks")
                 st.write(analysis["risks"])
+                
+                if analysis.get("themes"):
+                    st.write("### Recurring Themes")
+                    st.write("; ".join(analysis["themes"]))
         
-        if st.button("Generate Full Report"):
-            with st.spinner("Generating report..."):
-                report = st.session_state.analysis_agent.generate_report()
-                st.write(report)
+        report_job = queue.find(REPORT_JOB, payload)
+        if report_job:
+            pending = render_job_status(report_job, "Report") or pending
+            if report_job["status"] == JOB_SUCCEEDED:
+                render_report_stream([report_job["result"]["report"]])
+            elif report_job["status"] == JOB_RUNNING and report_job.get("progress"):
+                render_report_stream([report_job["progress"]["report"]])
+        
+        render_price_curves(session_data, st.session_state.db.get_response_rows(session_id))
+        
+        if pending:
+            time.sleep(JOB_POLL_INTERVAL)
+            st.rerun()
+
+def render_price_curves(session_data, rows) -> None:
+    """Van Westendorp-style curves from the testers' price answers, computed locally"""
+    from utils.pricing import extract_prices, founder_period, price_answers, price_curves
+
+    founder_inputs = session_data['founder_inputs']
+    if isinstance(founder_inputs, str):
+        founder_inputs = json.loads(founder_inputs)
+    answers = price_answers(row["responses"] for row in rows)
+    if not founder_inputs.get('is_paid_service') or not answers:
+        return
+    period = founder_period(founder_inputs)
+    curves = price_curves(extract_prices(answers, period=period), founder_inputs.get('price_points', []))
+    
+    st.write("### Price Sensitivity")
+    st.caption(f"{curves['priced']} of {curves['answers']} price answer(s) named a price"
+               + (f", quoted per {period}" if period != "one_time" else ""))
+    if not curves['priced']:
+        return
+    # Curves are step functions of few answers; a line chart is enough to see where they cross
+    st.line_chart({name: values for name, values in curves['curves'].items()}, x="price")
+    
+    def share(value):
+        return f"{value:.0%}" if value is not None else "-"
+    
+    def price(value):
+        return f"${value:.2f}" if value is not None else "-"
+    
+    if curves['price_points']:
+        st.table([{"Price": price(point['price']), "Would pay": share(point['would_pay']),
+                   "Too expensive": share(point['too_expensive']), "Too cheap": share(point['too_cheap'])}
+                  for point in curves['price_points']])
+    low, high = curves['acceptable_range']
+    st.write(f"Median fair price: {price(curves['median_fair'])}  \n"
+             f"Optimal price: {price(curves['optimal_price'])}  \n"
+             f"Acceptable range: {price(low)} to {price(high)}")
+
+def render_job_status(job, label: str) -> bool:
+    """Show where a queued job is; returns True while it is still queued or running"""
+    if job["status"] == JOB_QUEUED:
+        if job.get("last_error"):
+            st.info(f"{label} is waiting to retry: {job['last_error']}")
+        else:
+            st.info(f"{label} is queued and will start shortly.")
+        return True
+    if job["status"] == JOB_RUNNING:
+        st.info(f"{label} is being generated...")
+        return True
+    if job["status"] == JOB_DEAD:
+        st.error(f"{label} failed after {job['attempts']} attempts: {job.get('last_error')}. Click the button to try again.")
+    return False
+
+def render_report_stream(chunks, flush_interval: float = REPORT_FLUSH_INTERVAL) -> str:
+    """Render a streamed report, batching UI updates and freezing finished sections"""
+    from agents.analysis_agent import split_report_sections
+
+    report_text = ""
+    section_slots = []
+    frozen = 0
+    last_flush = 0.0
+    
+    def flush(final: bool = False):
+        nonlocal frozen
+        done, current = split_report_sections(report_text)
+        # Completed sections are drawn once and never touched again
+        for section in done[frozen:]:
+            if len(section_slots) <= frozen:
+                section_slots.append(st.empty())
+            section_slots[frozen].markdown(section)
+            frozen += 1
+        if current:
+            if len(section_slots) <= frozen:
+                section_slots.append(st.empty())
+            section_slots[frozen].markdown(current if final else current + "▌")
+    
+    for chunk in chunks:
+        report_text += chunk
+        now = time.monotonic()
+        if now - last_flush >= flush_interval:
+            flush()
+            last_flush = now
+    
+    flush(final=True)
+    return report_text
 
 def display_chat(interview_agent):
     """Display chat interface and handle user input"""
@@ -0,0 +1,96 @@
+"""Time to first message for bursty arrivals on popular session links.
+
+Testers arrive in bursts (a founder posts a link, a handful of people click
+it within seconds) across a few links. Each arrival builds or takes an
+interview agent and renders the opening message, the tester's wait before
+the chat appears. Runs once with agents built on the request path ("cold")
+and once through ``AgentPool``, then prints latency percentiles and the
+pool's counters.
+
+    python -m benchmarks.agent_pool
+    python -m benchmarks.agent_pool --links 5 --bursts 10 --burst-size 4 --latency-scale 0.2
+"""
+import argparse
+import copy
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.agent_pool import AgentPool, build_interview_agent
+from benchmarks.fixtures import SAMPLE_SESSION
+from benchmarks.load_test import percentile
+from benchmarks.mock_openai import MockOpenAIServer
+
+
+def arrivals(args) -> list:
+    """(offset_seconds, session_id) for every tester, in arrival order"""
+    rng = random.Random(args.seed)
+    schedule = []
+    for burst in range(args.bursts):
+        link = rng.randrange(args.links)
+        at = burst * args.burst_gap
+        for _ in range(args.burst_size):
+            schedule.append((at + rng.uniform(0, args.burst_spread), f"bench-link-{link}"))
+    return sorted(schedule)
+
+
+def run(args, acquire) -> list:
+    schedule = arrivals(args)
+    session = copy.deepcopy(SAMPLE_SESSION)
+    waits = []
+
+    def tester(offset: float, session_id: str):
+        time.sleep(max(0.0, start + offset - time.perf_counter()))
+        arrived = time.perf_counter()
+        agent = acquire(session_id, session)
+        agent.start_interview()
+        waits.append(time.perf_counter() - arrived)
+
+    with ThreadPoolExecutor(max_workers=len(schedule)) as executor:
+        start = time.perf_counter()
+        for future in [executor.submit(tester, offset, session_id) for offset, session_id in schedule]:
+            future.result()
+    return waits
+
+
+def report(name: str, waits: list) -> None:
+    print(f"{name:<8} n={len(waits)}  p50 {percentile(waits, 50) * 1000:.1f}ms  "
+          f"p95 {percentile(waits, 95) * 1000:.1f}ms  max {max(waits) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prewarmed interview agents under bursty arrivals")
+    parser.add_argument("--links", type=int, default=3, help="Popular session links")
+    parser.add_argument("--bursts", type=int, default=12)
+    parser.add_argument("--burst-size", type=int, default=3, help="Testers per burst")
+    parser.add_argument("--burst-gap", type=float, default=1.0, help="Seconds between bursts")
+    parser.add_argument("--burst-spread", type=float, default=0.3, help="Seconds over which a burst arrives")
+    parser.add_argument("--per-session", type=int, default=3, help="Warm agents kept per link")
+    parser.add_argument("--latency-scale", type=float, default=0.2, help="Multiply recorded LLM delays by this factor")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+
+        cold = run(args, build_interview_agent)
+
+        pool = AgentPool(per_session=args.per_session, workers=4)
+        # Links a founder just shared are warmed before the first tester arrives
+        for link in range(args.links):
+            pool.prewarm(f"bench-link-{link}", SAMPLE_SESSION, wait=True)
+        pooled = run(args, pool.acquire)
+        stats = pool.stats()
+        pool.close()
+
+    report("cold", cold)
+    report("pooled", pooled)
+    print(f"pool     hits {stats['hits']}  misses {stats['misses']}  hit rate {stats['hit_rate']:.0%}  "
+          f"builds {stats['builds']}  avg build {stats['avg_build_ms']:.1f}ms  warm {stats['warm']}")
+
+
+if __name__ == "__main__":
+    main()
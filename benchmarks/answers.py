@@ -0,0 +1,122 @@
+"""Accuracy, coverage and speed of the local answer normalizer.
+
+Scores hand-labelled tester replies for each kind of answer three ways: the
+old handling (``int(answer)`` for resonance scores, nothing for pitch and
+opt-in answers), rules alone, and rules plus the tiny model. A reply
+labelled None is one a person couldn't score either; the right outcome there
+is to ask again. None of the replies are in the model's training examples.
+"Clarifications saved" counts resonance replies the old
+handling sent back to the tester that now get the right score.
+
+    python -m benchmarks.answers
+    python -m benchmarks.answers --show-misses
+"""
+import argparse
+import time
+
+from utils.answers import LIKELIHOOD, OPT_IN, RESONANCE, AnswerNormalizer, TinyAnswerModel
+
+LABELLED = {
+    RESONANCE: [
+        ("4", 4), ("5", 5), ("1", 1), ("3 ", 3), ("4/5", 4), ("5/5", 5), ("2 out of 5", 2), ("8/10", 4),
+        ("four", 4), ("Five!", 5), ("definitely a 5", 5), ("I'd say 3", 3), ("probably a 2", 2),
+        ("3-4", 4), ("3 or 4", 4), ("solid four", 4), ("10/10 this is me", 5), ("a 1, honestly", 1),
+        ("Not at all", 1), ("not really", 2), ("a little", 2), ("somewhat", 3), ("kind of", 3),
+        ("a lot", 4), ("very much so", 5), ("totally", 5), ("exactly my experience", 5),
+        ("that's me every week", 5), ("slightly", 2), ("happens every so often", 3),
+        ("this describes my week perfectly", 5), ("not something I deal with", 1), ("relatable enough", 4),
+        ("mostly", 4), ("sort of, sometimes", 3), ("never had that problem", 1),
+        ("hmm", None), ("what do you mean?", None), ("10", None), ("I have 2 kids so 4", None),
+    ],
+    LIKELIHOOD: [
+        ("Very likely", 5), ("Somewhat likely", 4), ("Unsure", 3), ("Unlikely", 2), ("Very unlikely", 1),
+        ("very likely!", 5), ("somewhat", None), ("likely", 4), ("probably", 4), ("probably not", 2),
+        ("definitely", 5), ("definitely not", 1), ("no way", 1), ("maybe", 3), ("not sure", 3),
+        ("I'd say somewhat likely", 4), ("it depends on the price", 3), ("absolutely, sign me up", 5),
+        ("not very likely", 2), ("hard to say", 3), ("I'd try it", 4), ("I'd sign up today", 5),
+        ("on the fence", 3), ("I'd probably pass", 2), ("not for me", 2), ("no interest whatsoever", 1),
+        ("yes", 4), ("I would love this", 5), ("I doubt it", 2), ("5", 5), ("2", 2),
+        ("pretty good odds", 4), ("I'd have to think it over", 3), ("I would not", 2), ("I would not use it", 2),
+        ("I wouldn't bother", 2), ("I'd not pay for that", 2), ("I would use it", 4), ("blue", None),
+    ],
+    OPT_IN: [
+        ("Yes, that's fine.", True), ("yes", True), ("sure", True), ("ok", True), ("of course", True),
+        ("why not", True), ("go ahead and share it", True), ("no problem", True), ("I don't mind", True),
+        ("absolutely", True), ("please do", True), ("count me in", True), ("sounds good", True),
+        ("I do not mind", True), ("not at all, go ahead", True),
+        ("No", False), ("no thanks", False), ("nope", False), ("I'd rather not", False),
+        ("prefer not to", False), ("I'd like to stay anonymous", False), ("I'm not comfortable", False),
+        ("keep it to yourself please", False), ("what would they use it for?", None),
+    ],
+}
+
+
+def legacy(kind: str, text: str):
+    """What the interview did before: resonance had to be a bare integer, nothing else was read"""
+    if kind != RESONANCE:
+        return None
+    try:
+        score = int(text.strip())
+    except ValueError:
+        return None
+    return score if 1 <= score <= 5 else None
+
+
+def score(normalize, kind: str, samples) -> dict:
+    correct = resolved = wrong = 0
+    misses = []
+    for text, expected in samples:
+        value = normalize(kind, text)
+        resolved += value is not None
+        if value == expected:
+            correct += 1
+        else:
+            misses.append((text, value, expected))
+            # A guess where a person would have asked again, or the wrong value: both put bad data in the store
+            wrong += value is not None
+    return {"correct": correct, "resolved": resolved, "wrong": wrong, "misses": misses}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local normalization of Likert and yes/no answers")
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over the sample for the timing")
+    parser.add_argument("--show-misses", action="store_true")
+    args = parser.parse_args()
+
+    normalizers = {
+        "old": legacy,
+        "rules": AnswerNormalizer().normalize,
+        "rules+model": AnswerNormalizer(TinyAnswerModel()).normalize,
+    }
+    print(f"{'kind':<11} {'answers':>7}  " + "  ".join(f"{name + ' ok/wrong':>18}" for name in normalizers))
+    for kind, samples in LABELLED.items():
+        results = {name: score(normalize, kind, samples) for name, normalize in normalizers.items()}
+        print(f"{kind:<11} {len(samples):>7}  " + "  ".join(
+            f"{r['correct']:>10}/{r['wrong']:<7}" for r in results.values()))
+        if args.show_misses:
+            for text, value, expected in results["rules+model"]["misses"]:
+                print(f"    miss: {text!r} -> {value} (expected {expected})")
+
+    resonance = LABELLED[RESONANCE]
+    best = normalizers["rules+model"]
+    saved = sum(1 for text, expected in resonance
+                if expected is not None and legacy(RESONANCE, text) is None and best(RESONANCE, text) == expected)
+    asked = sum(1 for text, _ in resonance if legacy(RESONANCE, text) is None)
+    print(f"\nclarifications saved: {saved} of the {asked} resonance replies the old check sent back")
+
+    samples = [(kind, text) for kind, labelled in LABELLED.items() for text, _ in labelled]
+    for name in ("rules", "rules+model"):
+        normalize = normalizers[name]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for kind, text in samples:
+                normalize(kind, text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {elapsed / (args.repeat * len(samples)) * 1e6:6.1f}us per answer, 0 model calls")
+    start = time.perf_counter()
+    TinyAnswerModel()
+    print(f"training the tiny model: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
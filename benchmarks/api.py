@@ -0,0 +1,93 @@
+"""Concurrent conversations through the headless interview API.
+
+Drives ``api.InterviewAPI`` in-process over httpx's ASGI transport (no
+sockets, so the numbers are the app's own overhead), with LLM calls going to
+the local mock OpenAI server and storage on the Supabase stand-in. Half the
+conversations use JSON replies and half server-sent events.
+
+    python -m benchmarks.api --conversations 200 --latency-scale 0.05
+    python -m benchmarks.api --conversations 2000 --skip-summaries
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from benchmarks.fixtures import interview_answers
+from benchmarks.load_test import percentile, seed_session
+from benchmarks.local_supabase import LocalSupabaseClient
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.admission import AdmissionController, set_admission_controller
+from utils.database import DatabaseService
+
+
+async def run_conversation(client: httpx.AsyncClient, session_id: str, stream: bool, turns: dict) -> None:
+    response = await client.post(f"/sessions/{session_id}/conversations")
+    response.raise_for_status()
+    status = response.json()
+    headers = {"accept": "text/event-stream"} if stream else {}
+    for answer in interview_answers(3):
+        # Replies to the closing question wait on the problem summary
+        kind = "summary" if status["stage"] == "closing" else "scripted"
+        start = time.perf_counter()
+        response = await client.post(f"/conversations/{status['conversation_id']}/messages",
+                                     json={"content": answer}, headers=headers)
+        response.raise_for_status()
+        turns[kind].append(time.perf_counter() - start)
+        if stream:
+            status = json.loads(response.text.rsplit("event: done\ndata: ", 1)[1])
+        else:
+            status = response.json()
+        if status["complete"]:
+            return
+
+
+async def run(args) -> dict:
+    from api import InterviewAPI
+
+    db = DatabaseService(client=LocalSupabaseClient(latency=args.db_latency))
+    session_id = seed_session(db)
+    api = InterviewAPI(db=db, max_workers=args.threads)
+    turns = {"scripted": [], "summary": []}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://api") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_conversation(client, session_id, i % 2 == 1, turns) for i in range(args.conversations)
+        ))
+        elapsed = time.perf_counter() - start
+    return {"turns": turns, "elapsed": elapsed, "live": len(api.conversations)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent conversations through the ASGI API")
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--latency-scale", type=float, default=0.05, help="Multiply recorded LLM delays by this factor")
+    parser.add_argument("--db-latency", type=float, default=0.0)
+    parser.add_argument("--threads", type=int, default=64, help="API worker threads")
+    parser.add_argument("--skip-summaries", action="store_true",
+                        help="Exhaust the token budget so summaries are skipped and only API overhead is measured")
+    args = parser.parse_args()
+
+    budget = 0 if args.skip_summaries else 1e12
+    set_admission_controller(AdmissionController(budget, budget, budget, budget))
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+        result = asyncio.run(run(args))
+
+    turns = result["turns"]
+    total = len(turns["scripted"]) + len(turns["summary"])
+    print(f"conversations      {result['live']}")
+    print(f"turns              {total} in {result['elapsed']:.1f}s ({total / result['elapsed']:.0f} turns/s)")
+    for kind, samples in turns.items():
+        if samples:
+            print(f"{kind + ' turns':<18} {len(samples)}  p50 {percentile(samples, 50) * 1000:.1f}ms  "
+                  f"p95 {percentile(samples, 95) * 1000:.1f}ms  p99 {percentile(samples, 99) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
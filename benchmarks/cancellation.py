@@ -0,0 +1,146 @@
+"""Tokens and seconds saved by cancelling LLM streams nobody will see.
+
+Testers reach the closing question, whose answer triggers the problem
+summary. A share of them leave (close the tab, send again) a random time
+into that turn. The same schedule runs twice against the mock OpenAI
+server: once draining every stream as before, once cancelling the turn's
+token when the tester leaves. The mock server counts the tokens it actually
+wrote, so the savings are measured, and they are printed next to the
+estimate from ``CancellationMeter``. A last run discards speculative
+summaries part-way through (the tester restarted the interview).
+
+    python -m benchmarks.cancellation
+    python -m benchmarks.cancellation --turns 80 --leave-rate 0.3 --latency-scale 1.0
+"""
+import argparse
+import copy
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fixtures import SAMPLE_SESSION, interview_answers
+from benchmarks.load_test import percentile
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.admission import AdmissionController, set_admission_controller
+from utils.cancellation import CancellationMeter, CancellationToken, get_cancellation_meter, set_cancellation_meter
+from utils.speculation import Speculator, set_speculator
+
+# Answers up to the closing question; the next one ends the problem and asks for its summary
+TO_CLOSING = 6
+
+
+def agent_at_closing():
+    from agents.interview_agent import InterviewAgent
+
+    agent = InterviewAgent(SAMPLE_SESSION["session_id"], copy.deepcopy(SAMPLE_SESSION), probe=False)
+    agent.start_interview()
+    for answer in interview_answers(1)[:TO_CLOSING]:
+        agent.get_response(answer)
+    return agent
+
+
+def schedule(args) -> list:
+    """Seconds into the summary turn each tester leaves, or None if they stay"""
+    rng = random.Random(args.seed)
+    return [rng.uniform(0.0, args.leave_within) if rng.random() < args.leave_rate else None for _ in range(args.turns)]
+
+
+def run(mock, leaves: list, cancel: bool, workers: int) -> dict:
+    set_cancellation_meter(CancellationMeter())
+    first_call = len(mock.calls)
+    durations = []
+    wasted = []
+
+    def turn(leave_after):
+        agent = agent_at_closing()
+        token = CancellationToken()
+        timer = None
+        if leave_after is not None and cancel:
+            timer = threading.Timer(leave_after, token.cancel, args=("disconnect",))
+            timer.start()
+        start = time.perf_counter()
+        agent.get_response(interview_answers(1)[TO_CLOSING], token=token)
+        elapsed = time.perf_counter() - start
+        if timer:
+            timer.cancel()
+        durations.append(elapsed)
+        if leave_after is not None:
+            # Worker time spent after the tester had gone
+            wasted.append(max(0.0, elapsed - leave_after))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(turn, leaves))
+    time.sleep(0.2)  # lets the server notice the last hang-ups
+    calls = [c for c in mock.calls[first_call:] if c["match"] and "summarize" in c["match"]]
+    return {
+        "calls": len(calls),
+        "sent": sum(c["sent_tokens"] for c in calls),
+        "cut": sum(1 for c in calls if c["disconnected"]),
+        "seconds": sum(durations),
+        "wasted": sum(wasted),
+        "p95": percentile(durations, 95),
+        "meter": get_cancellation_meter().stats()
+    }
+
+
+def run_discarded(mock, count: int, discard_after: float) -> dict:
+    # Keeps the meter of the previous run, whose completed summaries the estimate is based on
+    before = get_cancellation_meter().stats()
+    set_speculator(Speculator(workers=count))
+    first_call = len(mock.calls)
+    # Reaching the closing question starts each summary in the background
+    agents = [agent_at_closing() for _ in range(count)]
+    time.sleep(discard_after)
+    for agent in agents:
+        # Restarting the interview discards the summary being prepared for the old transcript
+        agent.start_interview()
+    time.sleep(0.5)
+    calls = [c for c in mock.calls[first_call:] if c["match"] and "summarize" in c["match"]]
+    after = get_cancellation_meter().stats()
+    return {"calls": len(calls), "sent": sum(c["sent_tokens"] for c in calls),
+            "full": sum(c["completion_tokens"] for c in calls),
+            "cancelled": after["reasons"].get("discarded", 0) - before["reasons"].get("discarded", 0),
+            "estimate": after["tokens_saved"] - before["tokens_saved"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cancelling LLM streams for testers who left")
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--leave-rate", type=float, default=0.5, help="Share of testers who leave during the turn")
+    parser.add_argument("--leave-within", type=float, default=1.0, help="Testers leave up to this many seconds in")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply recorded LLM delays by this factor")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    set_admission_controller(AdmissionController(1e12, 1e12, 1e12, 1e12))
+    leaves = schedule(args)
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+        # Summaries run in the turn, so leaving cuts the foreground stream
+        set_speculator(Speculator(enabled=False))
+        drained = run(mock, leaves, cancel=False, workers=args.workers)
+        cancelled = run(mock, leaves, cancel=True, workers=args.workers)
+        discarded = run_discarded(mock, 10, discard_after=0.3 * args.latency_scale)
+
+    left = sum(1 for leave in leaves if leave is not None)
+    print(f"{args.turns} summary turns, {left} testers left within {args.leave_within:g}s")
+    for name, result in (("drain", drained), ("cancel", cancelled)):
+        print(f"  {name:<7} tokens streamed {result['sent']:5d} over {result['calls']} calls ({result['cut']} cut off)  "
+              f"worker time {result['seconds']:6.1f}s, {result['wasted']:5.1f}s after the tester left  "
+              f"p95 turn {result['p95'] * 1000:.0f}ms")
+    meter = cancelled["meter"]
+    print(f"  measured saving  {drained['sent'] - cancelled['sent']} tokens, "
+          f"{drained['seconds'] - cancelled['seconds']:.1f}s of worker time")
+    print(f"  meter estimate   {meter['tokens_saved']} tokens, {meter['seconds_saved']:.1f}s "
+          f"({meter['cancelled']} cancelled, {meter['completed']} completed, {meter['unmeasured']} unmeasured)")
+    print(f"discarded speculations: {discarded['calls']} summaries streamed {discarded['sent']} of "
+          f"{discarded['full']} tokens; {discarded['cancelled']} cancelled, meter estimate {discarded['estimate']} tokens saved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Bytes Streamlit sends per interview turn, full vs windowed chat history.
+
+Runs the interview chat rendering under Streamlit's ``AppTest`` at every
+turn of a full three-problem interview and counts the serialized size of
+every message the script run enqueues for the browser. The old strategy
+re-renders the full history; the new one is ``app.render_chat_history``.
+Both render the reply the same way, once, so the difference is the
+history alone.
+
+    python -m benchmarks.chat_rendering
+"""
+import argparse
+import copy
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.fixtures import SAMPLE_SESSION, interview_answers
+from benchmarks.mock_openai import MockOpenAIServer
+
+
+def full_history_turn():
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    enqueue = ctx._enqueue
+    ctx._enqueue = lambda msg: (st.session_state.sent.append(msg.ByteSize()), enqueue(msg))
+
+    for message in st.session_state.history:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+    with st.chat_message("user"):
+        st.markdown(st.session_state.prompt)
+    with st.chat_message("assistant"):
+        st.markdown(st.session_state.reply)
+
+
+def windowed_turn():
+    import os
+    import sys
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    sys.path.insert(0, os.environ["CHAT_BENCH_ROOT"])
+    from app import render_chat_history
+
+    ctx = get_script_run_ctx()
+    enqueue = ctx._enqueue
+    ctx._enqueue = lambda msg: (st.session_state.sent.append(msg.ByteSize()), enqueue(msg))
+
+    render_chat_history(st.session_state.history)
+    with st.chat_message("user"):
+        st.markdown(st.session_state.prompt)
+    with st.chat_message("assistant"):
+        st.markdown(st.session_state.reply)
+
+
+def conversation():
+    """(history, prompt, reply) for every turn of a full interview"""
+    from agents.interview_agent import InterviewAgent
+
+    with MockOpenAIServer(latency_scale=0) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+        agent = InterviewAgent(SAMPLE_SESSION["session_id"], copy.deepcopy(SAMPLE_SESSION))
+        history = [{"role": "assistant", "content": agent.start_interview()}]
+        for answer in interview_answers(len(SAMPLE_SESSION["founder_inputs"]["problems"])):
+            if agent.is_complete():
+                break
+            reply = agent.get_response(answer)
+            yield list(history), answer, reply
+            history += [{"role": "user", "content": answer}, {"role": "assistant", "content": reply}]
+
+
+def measure(script, history, prompt, reply) -> int:
+    at = AppTest.from_function(script)
+    at.session_state["sent"] = []
+    at.session_state["history"] = history
+    at.session_state["prompt"] = prompt
+    at.session_state["reply"] = reply
+    at.run()
+    return sum(at.session_state["sent"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure bytes sent to the browser per chat turn")
+    parser.add_argument("--every", type=int, default=4, help="Print every Nth turn")
+    args = parser.parse_args()
+    os.environ["CHAT_BENCH_ROOT"] = os.getcwd()
+
+    totals = {"full": 0, "windowed": 0}
+    print(f"{'turn':>4} {'history':>7} {'full history':>14} {'windowed':>10}")
+    for turn, (history, prompt, reply) in enumerate(conversation(), start=1):
+        full = measure(full_history_turn, history, prompt, reply)
+        windowed = measure(windowed_turn, history, prompt, reply)
+        totals["full"] += full
+        totals["windowed"] += windowed
+        if turn == 1 or turn % args.every == 0:
+            print(f"{turn:>4} {len(history):>7} {full:>13,}B {windowed:>9,}B")
+    print(f"total {totals['full']:,}B full history vs {totals['windowed']:,}B windowed "
+          f"({totals['full'] / totals['windowed']:.0f}x less)")
+
+
+if __name__ == "__main__":
+    main()
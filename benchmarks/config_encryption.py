@@ -0,0 +1,79 @@
+"""Startup cost of loading an encrypted config with ``--secrets`` values.
+
+Writes the same secrets as a version 1 file (one PBKDF2 derivation per value)
+and as a version 2 file (one derivation per file, values under a wrapped data
+key), then times ``load_encrypted_config`` in fresh processes, as a container
+boot would, plus a second load of the v2 file inside one process, where the
+derived key comes from the cache.
+
+    python -m benchmarks.config_encryption
+    python -m benchmarks.config_encryption --secrets 200 --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from utils.config_manager import ConfigManager
+
+PASSWORD = "benchmark-password"
+
+LOAD = r"""
+import json, sys, time
+from utils.config_manager import ConfigManager
+config = ConfigManager()
+start = time.perf_counter()
+version = config.load_encrypted_config(sys.argv[1], sys.argv[2])
+cold = time.perf_counter() - start
+start = time.perf_counter()
+config.load_encrypted_config(sys.argv[1], sys.argv[2])
+warm = time.perf_counter() - start
+print(json.dumps({"version": version, "cold": cold, "warm": warm, "loaded": len(config.config)}))
+"""
+
+
+def write_files(count: int, directory: str) -> dict:
+    config = ConfigManager()
+    config.config = {f"secret_{i}": f"sk-{os.urandom(24).hex()}" for i in range(count)}
+
+    v1 = os.path.join(directory, "config.v1.enc")
+    with open(v1, "w") as f:
+        for key, value in config.config.items():
+            f.write(f"{key}={config.encrypt_value(value, PASSWORD)}\n")
+    v2 = os.path.join(directory, "config.v2.enc")
+    config.save_encrypted_config(PASSWORD, v2)
+    return {"v1": v1, "v2": v2}
+
+
+def load_in_fresh_process(path: str) -> dict:
+    result = subprocess.run([sys.executable, "-c", LOAD, PASSWORD, path], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading encrypted config files")
+    parser.add_argument("--secrets", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per format")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    files = write_files(args.secrets, tempfile.mkdtemp())
+    print(f"wrote {args.secrets} secrets in both formats in {time.perf_counter() - start:.1f}s")
+
+    for name, path in files.items():
+        runs = [load_in_fresh_process(path) for _ in range(args.runs)]
+        if any(run["loaded"] < args.secrets for run in runs):
+            print(f"FAIL: {name} did not load every secret")
+            sys.exit(1)
+        cold = statistics.median(run["cold"] for run in runs) * 1000
+        warm = statistics.median(run["warm"] for run in runs) * 1000
+        print(f"{name}  load {cold:8.1f}ms  second load in the same process {warm:8.1f}ms  "
+              f"({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Bulk export throughput on a local SQLite corpus.
+
+Seeds one founder with enough sessions to reach ``--events`` response events
+(five per problem, three problems per interview), then times the paged
+columnar export to each format and, for comparison, the per-session
+``get_responses`` + indented JSON path the app used before.
+
+    python -m benchmarks.export --events 1000000
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.fixtures import SAMPLE_SESSION
+from utils.exporter import FORMATS, InterviewExporter
+from utils.responses import RESPONSE_SCHEMA_VERSION
+from utils.sqlite_database import SQLiteDatabaseService
+
+
+def session_events(problems) -> list:
+    events = []
+    for problem in problems:
+        events.extend([
+            {"type": "problem_resonance", "problem": problem, "resonance_score": 4, "timestamp": "2024-01-01T00:00:00"},
+            {"type": "problem_explanation", "text": "We lose a day every sprint reconciling spreadsheets.", "timestamp": "2024-01-01T00:00:10"},
+            {"type": "value_prop_interest", "value_prop": "Automated reconciliation", "action": "sign up",
+             "response": "Yes, I would try it tomorrow.", "timestamp": "2024-01-01T00:00:20"},
+            {"type": "opt_in_intent", "response": "Sure, add me to the beta.", "timestamp": "2024-01-01T00:00:30"},
+            {"type": "interview_summary", "summary": "Strong pain, wants early access.", "skipped": False,
+             "timestamp": "2024-01-01T00:00:40"},
+        ])
+    return [dict(event, schema_version=RESPONSE_SCHEMA_VERSION) for event in events]
+
+
+def seed(db: SQLiteDatabaseService, founder_email: str, events: int) -> int:
+    problems = SAMPLE_SESSION["founder_inputs"]["problems"]
+    payload = json.dumps(session_events(problems))
+    per_session = len(problems) * 5
+    sessions = max(1, events // per_session)
+    founder_inputs = json.dumps(SAMPLE_SESSION["founder_inputs"])
+    with db._transaction() as conn:
+        conn.executemany(
+            "INSERT INTO sessions (session_id, founder_email, founder_inputs, created_at) VALUES (?, ?, ?, ?)",
+            ((f"s{i}", founder_email, founder_inputs, "2024-01-01T00:00:00") for i in range(sessions))
+        )
+        conn.executemany(
+            "INSERT INTO responses (session_id, responses, created_at) VALUES (?, ?, ?)",
+            ((f"s{i}", payload, "2024-01-01T00:01:00") for i in range(sessions))
+        )
+        conn.executemany(
+            "INSERT INTO testers (session_id, email, opt_in, gdpr_consent, created_at) VALUES (?, ?, ?, ?, ?)",
+            ((f"s{i}", f"tester{i}@example.com", 1, 1, "2024-01-01T00:01:00") for i in range(sessions))
+        )
+    return sessions
+
+
+def per_session_json(db, founder_email: str, sessions: int, out_path: str) -> None:
+    with open(out_path, "w") as f:
+        for i in range(sessions):
+            f.write(json.dumps({"session_id": f"s{i}", "responses": db.get_responses(f"s{i}")}, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk interview export")
+    parser.add_argument("--events", type=int, default=1_000_000, help="Response events to seed")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        db = SQLiteDatabaseService(os.path.join(workdir, "export.db"))
+        founder_email = SAMPLE_SESSION["founder_email"]
+        start = time.perf_counter()
+        sessions = seed(db, founder_email, args.events)
+        print(f"seeded {sessions} sessions in {time.perf_counter() - start:.1f}s")
+
+        exporter = InterviewExporter(db, page_size=args.page_size)
+        for fmt in args.formats:
+            out_dir = os.path.join(workdir, fmt)
+            start = time.perf_counter()
+            counts = exporter.export(founder_email, out_dir, fmt=fmt)
+            elapsed = time.perf_counter() - start
+            size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in os.listdir(out_dir))
+            events = counts["response_events"]
+            print(f"{fmt:<8} {events} events in {elapsed:.2f}s "
+                  f"({events / elapsed:,.0f} events/s, {size / 1e6:.1f} MB)")
+
+        start = time.perf_counter()
+        per_session_json(db, founder_email, sessions, os.path.join(workdir, "sessions.json"))
+        print(f"per-session JSON baseline {time.perf_counter() - start:.2f}s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
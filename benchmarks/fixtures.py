@@ -0,0 +1,43 @@
+"""Shared sample data for the benchmarks."""
+from typing import List
+
+SAMPLE_FOUNDER_INPUTS = {
+    "problem_domain": "Validating startup ideas",
+    "problems": [
+        "Founders don't get honest feedback because friends are too polite",
+        "Founders don't know which of their ideas to test first",
+        "Customer interviews take too long to schedule and run"
+    ],
+    "value_prop": "An AI interviewer that runs Mom Test interviews with your target users and summarises what they really think",
+    "target_action": "Sign up for early access",
+    "follow_up_action": "join a 20 minute onboarding call",
+    "is_paid_service": True,
+    "pricing_model": "Subscription",
+    "price_points": [9.0, 29.0, 79.0],
+    "pricing_questions": ["Would you pay for this before trying it?"]
+}
+
+SAMPLE_SESSION = {
+    "session_id": "bench-session",
+    "founder_email": "founder@example.com",
+    "founder_inputs": SAMPLE_FOUNDER_INPUTS
+}
+
+# Answers for one problem, from the problem intro through the closing question
+PROBLEM_ANSWERS = [
+    "Sure, let's go.",
+    "4",
+    "Last month my friends all said they loved my app idea, then none of them signed up.",
+    "I tried an anonymous survey but the answers were vague.",
+    "Somewhat likely",
+    "Yes, that's fine.",
+    "No, I think that covers it."
+]
+
+
+def interview_answers(problem_count: int) -> List[str]:
+    """Tester messages for a complete interview over ``problem_count`` problems"""
+    answers = ["I'm trying to launch a side project this year and want to know it's worth it."]
+    for _ in range(problem_count):
+        answers.extend(PROBLEM_ANSWERS)
+    return answers
@@ -0,0 +1,103 @@
+"""Cost of refreshing a session's analysis as interviews keep arriving.
+
+Interviews arrive in waves; after each wave the founder asks for an updated
+analysis. The "full" mode re-runs ``analyze_responses`` over every interview
+so far, the "incremental" mode calls ``refresh_analysis``, which folds only
+the interviews saved since the stored watermark into the compact state.
+Prints prompt tokens and wall time per refresh for both, against the mock
+OpenAI server.
+
+    python -m benchmarks.incremental_analysis
+    python -m benchmarks.incremental_analysis --waves 10 --wave-size 20 --latency-scale 0
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from agents.analysis_agent import AnalysisAgent
+from benchmarks.fixtures import SAMPLE_SESSION
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.admission import AdmissionController, set_admission_controller
+from utils.responses import RESPONSE_SCHEMA_VERSION
+from utils.sqlite_database import SQLiteDatabaseService
+
+
+def interview(i: int) -> list:
+    founder_inputs = SAMPLE_SESSION["founder_inputs"]
+    responses = []
+    for n, problem in enumerate(founder_inputs["problems"]):
+        responses.extend([
+            {"type": "problem_resonance", "problem": problem, "resonance_score": 1 + (i + n) % 5},
+            {"type": "problem_explanation", "text": f"Tester {i}: last month my friends said they loved the idea, then nobody signed up."},
+            {"type": "value_prop_interest", "value_prop": founder_inputs["value_prop"],
+             "action": founder_inputs["target_action"], "response": "Maybe, if it was cheap."},
+            {"type": "price_sensitivity", "response": "I'd pay about $10 a month."},
+            {"type": "opt_in_intent", "response": "Sure, add me to the beta."},
+        ])
+    return [dict(event, schema_version=RESPONSE_SCHEMA_VERSION) for event in responses]
+
+
+def agent_for(session_id: str, responses: list) -> AnalysisAgent:
+    return AnalysisAgent(session_id, {
+        "session_id": session_id,
+        "founder_email": SAMPLE_SESSION["founder_email"],
+        "founder_inputs": SAMPLE_SESSION["founder_inputs"],
+        "responses": responses
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs incremental analysis refreshes")
+    parser.add_argument("--waves", type=int, default=6)
+    parser.add_argument("--wave-size", type=int, default=10, help="Interviews arriving between refreshes")
+    parser.add_argument("--latency-scale", type=float, default=0.1, help="Multiply recorded LLM delays by this factor")
+    args = parser.parse_args()
+
+    # Full re-analysis soon outgrows a session's hourly budget; compare without one
+    set_admission_controller(AdmissionController(1e12, 1e12, 1e12, 1e12))
+    db = SQLiteDatabaseService(os.path.join(tempfile.mkdtemp(), "incremental.db"))
+    session_id = SAMPLE_SESSION["session_id"]
+    db.save_session({"session_id": session_id, "founder_email": SAMPLE_SESSION["founder_email"],
+                     "founder_inputs": json.dumps(SAMPLE_SESSION["founder_inputs"])})
+
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+
+        print(f"{'interviews':>10}  {'full tokens':>11}  {'full ms':>8}  {'incr tokens':>11}  {'incr ms':>8}  {'calls':>5}")
+        totals = {"full": 0, "incremental": 0}
+        everything = []
+        for wave in range(args.waves):
+            batch = [interview(wave * args.wave_size + i) for i in range(args.wave_size)]
+            db.save_responses_batch([{"session_id": session_id, "responses": responses} for responses in batch])
+            everything.extend(batch)
+
+            calls = len(mock.calls)
+            start = time.perf_counter()
+            agent_for(session_id, everything).analyze_responses()
+            full_ms = (time.perf_counter() - start) * 1000
+            full_tokens = sum(call["prompt_tokens"] for call in mock.calls[calls:])
+
+            calls = len(mock.calls)
+            start = time.perf_counter()
+            analysis = agent_for(session_id, []).refresh_analysis(db)
+            incremental_ms = (time.perf_counter() - start) * 1000
+            incremental_tokens = sum(call["prompt_tokens"] for call in mock.calls[calls:])
+
+            totals["full"] += full_tokens
+            totals["incremental"] += incremental_tokens
+            print(f"{len(everything):>10}  {full_tokens:>11}  {full_ms:>8.0f}  {incremental_tokens:>11}  "
+                  f"{incremental_ms:>8.0f}  {len(mock.calls) - calls:>5}")
+
+        state = db.get_analysis_state(session_id)
+        print(f"total prompt tokens: full {totals['full']}, incremental {totals['incremental']} "
+              f"({totals['incremental'] / totals['full']:.0%})")
+        print(f"stored state covers {state['state']['interviews']} interviews up to row {state['watermark']}, "
+              f"{len(json.dumps(state['state']))} bytes, themes: {'; '.join(analysis['themes'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Bulk ingest throughput for JSONL transcripts.
+
+Generates ``--records`` phone-interview transcripts (with a small share of
+invalid lines), then imports them into local SQLite and into the Supabase
+stand-in with a simulated round trip, reporting records per minute.
+
+    python -m benchmarks.ingest --records 100000 --remote-latency 0.03
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.fixtures import SAMPLE_SESSION
+from benchmarks.local_supabase import LocalSupabaseClient
+from utils.database import DatabaseService
+from utils.ingest import IngestPipeline
+from utils.sqlite_database import SQLiteDatabaseService
+
+
+def transcript(i: int) -> dict:
+    founder_inputs = SAMPLE_SESSION["founder_inputs"]
+    responses = []
+    for problem in founder_inputs["problems"]:
+        responses.extend([
+            {"type": "problem_resonance", "problem": problem, "resonance_score": 1 + i % 5},
+            {"type": "problem_explanation", "text": "We lose a day every sprint reconciling spreadsheets."},
+            {"type": "value_prop_interest", "value_prop": founder_inputs["value_prop"],
+             "action": founder_inputs["target_action"], "response": "Yes, I would try it."},
+            {"type": "opt_in_intent", "response": "Sure, add me to the beta."},
+        ])
+    return {
+        "session_id": f"call-{i:07d}",
+        "founder_email": SAMPLE_SESSION["founder_email"],
+        "created_at": "2024-03-01T10:00:00",
+        "tester": {"email": f"tester{i}@example.com", "opt_in": True, "gdpr_consent": True},
+        "responses": responses
+    }
+
+
+def write_transcripts(path: str, records: int, invalid_every: int) -> None:
+    with open(path, "w") as f:
+        for i in range(records):
+            record = transcript(i)
+            if invalid_every and i % invalid_every == 0:
+                record["responses"][0]["resonance_score"] = 9
+            f.write(json.dumps(record) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSONL transcript ingest")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--remote-latency", type=float, default=0.03, help="Simulated Supabase round trip in seconds")
+    parser.add_argument("--invalid-every", type=int, default=1000, help="Make every Nth record invalid (0 for none)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(workdir, "transcripts.jsonl")
+        write_transcripts(path, args.records, args.invalid_every)
+        backends = {
+            "sqlite": SQLiteDatabaseService(os.path.join(workdir, "ingest.db")),
+            "supabase (simulated)": DatabaseService(client=LocalSupabaseClient(latency=args.remote_latency)),
+        }
+        for name, db in backends.items():
+            start = time.perf_counter()
+            stats = IngestPipeline(db, batch_size=args.batch_size).ingest_file(path)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22} {stats['imported']} imported, {stats['rejected']} rejected, "
+                  f"{stats['batches']} batches in {elapsed:.2f}s ({stats['lines'] / elapsed * 60:,.0f} records/min)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
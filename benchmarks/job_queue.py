@@ -0,0 +1,202 @@
+"""Page latency and correctness of the durable job queue, on local SQLite.
+
+* page: time for the analysis page to respond to "Generate Analysis" when it
+  runs the LLM call inline vs. when it enqueues a job, plus how long the
+  queued job takes to finish on a worker.
+* claimers: several worker processes drain one queue; every job must run
+  exactly once.
+* retries: a handler that fails twice succeeds on its third attempt, one
+  that always fails ends up dead, and a ``RetryLater`` does not use attempts.
+* dedupe: enqueueing the same work twice returns the same job.
+
+    python -m benchmarks.job_queue
+    python -m benchmarks.job_queue --processes 4 --jobs 400 --latency-scale 0.5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from agents.jobs import ANALYZE_JOB, analysis_job_payload, job_handlers
+from benchmarks.fixtures import SAMPLE_SESSION
+from benchmarks.load_test import percentile
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.job_queue import JobQueue, JobWorker, RetryLater
+from utils.sqlite_database import SQLiteDatabaseService
+from utils.storage import JOB_DEAD, JOB_SUCCEEDED
+
+RESPONSES = [{"type": "problem_resonance", "problem": problem, "resonance_score": 4}
+             for problem in SAMPLE_SESSION["founder_inputs"]["problems"]]
+
+
+def bench_page(path: str, runs: int) -> None:
+    from agents.analysis_agent import AnalysisAgent
+
+    db = SQLiteDatabaseService(path)
+    inline, enqueue, completion = [], [], []
+    for run in range(runs):
+        # A new session each run, so the queued work is never a duplicate of the last run's
+        session_id = f"bench-page-{run}"
+        db.save_session({"session_id": session_id, "founder_email": SAMPLE_SESSION["founder_email"],
+                         "founder_inputs": json.dumps(SAMPLE_SESSION["founder_inputs"])})
+        db.save_responses(session_id, RESPONSES)
+        responses = db.get_responses(session_id)
+        session_data = db.get_session(session_id)
+
+        start = time.perf_counter()
+        agent = AnalysisAgent(session_id, {"session_id": session_id, "founder_email": session_data["founder_email"],
+                                           "founder_inputs": session_data["founder_inputs"], "responses": responses})
+        db.save_analysis(session_id, agent.analyze_responses())
+        inline.append(time.perf_counter() - start)
+
+        queue = JobQueue(db)
+        payload = analysis_job_payload(session_id, db.get_response_rows(session_id)[-1]["id"])
+        start = time.perf_counter()
+        job = queue.enqueue(ANALYZE_JOB, payload)
+        queue.find(ANALYZE_JOB, payload)
+        enqueue.append(time.perf_counter() - start)
+
+        worker = JobWorker(queue, {ANALYZE_JOB: job_handlers(db)[ANALYZE_JOB]}, poll_interval=0.01)
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        while queue.get(job["id"])["status"] != JOB_SUCCEEDED:
+            time.sleep(0.005)
+        completion.append(time.perf_counter() - start)
+        worker.stopping.set()
+        thread.join()
+
+    for name, samples in (("inline page", inline), ("queued page", enqueue), ("queued job done", completion)):
+        print(f"{name:<16} p50 {percentile(samples, 50) * 1000:8.1f}ms  p95 {percentile(samples, 95) * 1000:8.1f}ms")
+
+
+def record_run(payload, progress):
+    time.sleep(payload["work"])
+    return {"pid": os.getpid()}
+
+
+def claimer(path: str, concurrency: int) -> None:
+    worker = JobWorker(JobQueue(SQLiteDatabaseService(path)), {"bench.record": record_run},
+                       concurrency=concurrency, poll_interval=0.02)
+
+    def drain():
+        # Stop once the queue has been empty for a few polls
+        idle = 0
+        while idle < 10:
+            idle = 0 if worker.run_once() or worker.stats()["running"] else idle + 1
+            time.sleep(0.02)
+        worker.stopping.set()
+
+    drain()
+    worker.run()
+    print(json.dumps(worker.stats()))
+
+
+def bench_claimers(path: str, processes: int, jobs: int, concurrency: int) -> bool:
+    db = SQLiteDatabaseService(path)
+    queue = JobQueue(db)
+    for i in range(jobs):
+        queue.enqueue("bench.record", {"n": i, "work": 0.002}, priority=i % 3)
+
+    start = time.perf_counter()
+    workers = [multiprocessing.Process(target=claimer, args=(path, concurrency)) for _ in range(processes)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    rows = db.conn.execute("SELECT status, attempts, result FROM jobs WHERE kind = 'bench.record'").fetchall()
+    done = [row for row in rows if row["status"] == JOB_SUCCEEDED]
+    repeated = [row for row in rows if row["attempts"] != 1]
+    pids = {json.loads(row["result"])["pid"] for row in done}
+    print(f"claimers         {processes} processes x {concurrency} slots ran {len(done)}/{jobs} jobs in {elapsed:.2f}s "
+          f"({len(done) / elapsed:.0f} jobs/s), {len(repeated)} claimed more than once, {len(pids)} processes did work")
+    return len(done) == jobs and not repeated
+
+
+def bench_retries(path: str) -> bool:
+    db = SQLiteDatabaseService(path)
+    queue = JobQueue(db, base_backoff=0.01, max_backoff=0.05)
+    calls = {"flaky": 0, "deferred": 0}
+
+    def flaky(payload, progress):
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            raise RuntimeError("upstream timeout")
+        return {"ok": True}
+
+    def broken(payload, progress):
+        raise RuntimeError("always fails")
+
+    def deferred(payload, progress):
+        calls["deferred"] += 1
+        if calls["deferred"] <= 3:
+            raise RetryLater(0.01)
+        return {"ok": True}
+
+    jobs = {
+        "flaky": queue.enqueue("bench.flaky", {}, max_attempts=5),
+        "broken": queue.enqueue("bench.broken", {}, max_attempts=3),
+        "deferred": queue.enqueue("bench.deferred", {}, max_attempts=1),
+    }
+    worker = JobWorker(queue, {"bench.flaky": flaky, "bench.broken": broken, "bench.deferred": deferred},
+                       concurrency=3, poll_interval=0.005)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        final = {name: queue.get(job["id"]) for name, job in jobs.items()}
+        if all(job["status"] in (JOB_SUCCEEDED, JOB_DEAD) for job in final.values()):
+            break
+        time.sleep(0.01)
+    worker.stopping.set()
+    thread.join()
+
+    for name, job in final.items():
+        print(f"retries          {name:<9} {job['status']:<10} attempts {job['attempts']}  last error {job['last_error']}")
+    print(f"retries          worker counters {worker.stats()}")
+    return (final["flaky"]["status"] == JOB_SUCCEEDED and final["flaky"]["attempts"] == 3
+            and final["broken"]["status"] == JOB_DEAD and final["broken"]["attempts"] == 3
+            and final["deferred"]["status"] == JOB_SUCCEEDED and final["deferred"]["attempts"] == 1)
+
+
+def bench_dedupe(path: str) -> bool:
+    queue = JobQueue(SQLiteDatabaseService(path))
+    payload = analysis_job_payload("bench-session", 1)
+    first = queue.enqueue(ANALYZE_JOB, payload)
+    second = queue.enqueue(ANALYZE_JOB, payload)
+    changed = queue.enqueue(ANALYZE_JOB, analysis_job_payload("bench-session", 2))
+    print(f"dedupe           same work -> job {first['id']} and {second['id']}, new responses -> job {changed['id']}")
+    return first["id"] == second["id"] != changed["id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the durable job queue on SQLite")
+    parser.add_argument("--runs", type=int, default=10, help="Analysis page requests per mode")
+    parser.add_argument("--processes", type=int, default=3, help="Claimer processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="Jobs each claimer runs at once")
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--latency-scale", type=float, default=0.3, help="Multiply recorded LLM delays by this factor")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+        bench_page(os.path.join(directory, "page.db"), args.runs)
+
+    ok = bench_claimers(os.path.join(directory, "claimers.db"), args.processes, args.jobs, args.concurrency)
+    ok = bench_retries(os.path.join(directory, "retries.db")) and ok
+    ok = bench_dedupe(os.path.join(directory, "dedupe.db")) and ok
+    if not ok:
+        print("FAIL")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""End-to-end load test: N concurrent testers completing full interviews.
+
+Every tester follows what ``app.interview_page`` does: load the session on each
+rerun, build an ``InterviewAgent``, answer every stage for every problem, then
+save the responses. Each completed session is then analysed and its report
+streamed with ``AnalysisAgent``, as the results page does. LLM calls go to the
+local mock OpenAI server (recorded stream replay, configurable latency) and
+database calls to an in-memory Supabase stand-in or a local SQLite database,
+so the run is deterministic and fully offline.
+
+    python -m benchmarks.load_test --testers 20 --latency-scale 0.1 --db-latency 0.02
+    python -m benchmarks.load_test --backend sqlite
+"""
+from typing import Dict, List
+from collections import Counter
+import argparse
+import copy
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fixtures import SAMPLE_SESSION, interview_answers
+from benchmarks.local_supabase import LocalSupabaseClient
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.admission import AdmissionController, set_admission_controller
+from utils.database import DatabaseService
+from utils.llm_usage import get_usage_meter
+from utils.sqlite_database import SQLiteDatabaseService
+
+
+class CountingStorage:
+    """Wraps a storage backend and counts calls per method"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.calls: Counter = Counter()
+
+    def __getattr__(self, name):
+        attr = getattr(self.backend, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def seed_session(db) -> str:
+    session = copy.deepcopy(SAMPLE_SESSION)
+    db.save_session({
+        "session_id": session["session_id"],
+        "founder_email": session["founder_email"],
+        "founder_inputs": json.dumps(session["founder_inputs"]),
+        "created_at": "2024-01-01T00:00:00"
+    })
+    return session["session_id"]
+
+
+def run_analysis(session_data: Dict, responses: List[Dict]) -> Dict:
+    """Analyse one completed interview and stream its report; returns the latencies"""
+    from agents.analysis_agent import AnalysisAgent
+
+    agent = AnalysisAgent(session_data["session_id"], {
+        "founder_email": session_data.get("founder_email"),
+        "founder_inputs": session_data["founder_inputs"],
+        "responses": responses
+    })
+    start = time.perf_counter()
+    analysis = agent.analyze_responses()
+    analyze = time.perf_counter() - start
+    start = time.perf_counter()
+    first_chunk = None
+    for chunk in agent.stream_report(analysis):
+        if first_chunk is None and chunk.strip():
+            first_chunk = time.perf_counter() - start
+    report = time.perf_counter() - start
+    return {"analyze": analyze, "report": report, "report_first_chunk": first_chunk or report}
+
+
+def run_tester(db, session_id: str, analyse: bool = True) -> Dict:
+    from agents.interview_agent import InterviewAgent
+
+    turn_latencies = []
+    start = time.perf_counter()
+    session_data = db.get_session(session_id)
+    session_data["founder_inputs"] = json.loads(session_data["founder_inputs"])
+    agent = InterviewAgent(session_id=session_id, session_data=session_data)
+    agent.start_interview()
+    first_message = time.perf_counter() - start
+
+    for answer in interview_answers(len(session_data["founder_inputs"]["problems"])):
+        turn_start = time.perf_counter()
+        # Streamlit re-runs the page, and with it get_session, on every message
+        db.get_session(session_id)
+        agent.get_response(answer)
+        turn_latencies.append(time.perf_counter() - turn_start)
+
+    db.save_responses(session_id, agent.responses)
+    result = {"turns": turn_latencies, "first_message": first_message, "total": time.perf_counter() - start}
+    if analyse:
+        result["analysis"] = run_analysis(session_data, agent.responses)
+    return result
+
+
+def site_usage() -> Dict[str, Dict]:
+    """Calls and tokens per LLM call site, from the process-wide usage meter"""
+    return {site: {key: totals[key] for key in ("calls", "prompt_tokens", "completion_tokens", "total_tokens")}
+            for site, totals in sorted(get_usage_meter().rollup("site").items())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test full interviews against local mocks")
+    parser.add_argument("--testers", type=int, default=20, help="Number of concurrent testers")
+    parser.add_argument("--latency-scale", type=float, default=0.1, help="Multiply recorded LLM delays by this factor")
+    parser.add_argument("--backend", choices=["local", "sqlite"], default="local",
+                        help="In-memory Supabase stand-in or an on-disk SQLite database")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="Seconds added to every stand-in database call")
+    parser.add_argument("--no-analysis", action="store_true", help="Only run the interviews, not analysis and reports")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    # Every simulated tester shares one link; keep budgets out of the measurement
+    set_admission_controller(AdmissionController(1e12, 1e12, 1e12, 1e12))
+
+    if args.backend == "sqlite":
+        backend = SQLiteDatabaseService(os.path.join(tempfile.mkdtemp(), "load_test.db"))
+    else:
+        backend = DatabaseService(client=LocalSupabaseClient(latency=args.db_latency))
+    session_id = seed_session(backend)
+    db = CountingStorage(backend)
+
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.testers) as pool:
+            results = list(pool.map(lambda _: run_tester(db, session_id, not args.no_analysis), range(args.testers)))
+        elapsed = time.perf_counter() - start
+        llm_calls = len(mock.calls)
+
+    turns = [t for r in results for t in r["turns"]]
+    report = {
+        "testers": args.testers,
+        "turns": len(turns),
+        "turn_p50_ms": percentile(turns, 50) * 1000,
+        "turn_p95_ms": percentile(turns, 95) * 1000,
+        "turn_p99_ms": percentile(turns, 99) * 1000,
+        "first_message_p50_ms": statistics.median(r["first_message"] for r in results) * 1000,
+        "turns_per_second": len(turns) / elapsed,
+        "interviews_per_minute": args.testers / elapsed * 60,
+        "db_calls": sum(db.calls.values()),
+        "db_calls_by_method": dict(db.calls),
+        "llm_calls": llm_calls,
+        "llm_usage_by_site": site_usage(),
+        "elapsed_s": elapsed
+    }
+    analyses = [r["analysis"] for r in results if "analysis" in r]
+    if analyses:
+        for key in ("analyze", "report", "report_first_chunk"):
+            values = [a[key] for a in analyses]
+            report[f"{key}_p50_ms"] = percentile(values, 50) * 1000
+            report[f"{key}_p95_ms"] = percentile(values, 95) * 1000
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"testers            {report['testers']}")
+    print(f"turns              {report['turns']}")
+    print(f"turn latency       p50 {report['turn_p50_ms']:.1f}ms  p95 {report['turn_p95_ms']:.1f}ms  p99 {report['turn_p99_ms']:.1f}ms")
+    print(f"first message p50  {report['first_message_p50_ms']:.1f}ms")
+    print(f"throughput         {report['turns_per_second']:.1f} turns/s, {report['interviews_per_minute']:.1f} interviews/min")
+    print(f"db calls           {report['db_calls']} {report['db_calls_by_method']}")
+    if analyses:
+        print(f"analysis           p50 {report['analyze_p50_ms']:.1f}ms  p95 {report['analyze_p95_ms']:.1f}ms")
+        print(f"report             p50 {report['report_p50_ms']:.1f}ms  p95 {report['report_p95_ms']:.1f}ms  "
+              f"first chunk p50 {report['report_first_chunk_p50_ms']:.1f}ms")
+    print(f"llm calls          {report['llm_calls']}")
+    for site, usage in report["llm_usage_by_site"].items():
+        print(f"  {site:<17}{usage['calls']:>5} calls  {usage['prompt_tokens']:>8} prompt  "
+              f"{usage['completion_tokens']:>7} completion tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""In-memory stand-in for the Supabase client used by ``DatabaseService``.
+
+Implements the slice of the PostgREST query builder the app uses
+(``table().select().eq().order().limit().execute()``, ``insert``, ``upsert``
+and ``rpc``), with optional per-request latency to mimic a remote round trip
+and per-table call counters.
+
+    db = DatabaseService(client=LocalSupabaseClient(latency=0.02))
+"""
+from typing import Any, Dict, List, Optional
+from collections import Counter
+import copy
+import itertools
+import threading
+import time
+
+
+class LocalResponse:
+    def __init__(self, data: Any):
+        self.data = data
+
+
+class LocalQuery:
+    def __init__(self, client: 'LocalSupabaseClient', table: str):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.payload: Any = None
+        self.on_conflict: Optional[str] = None
+        self.ignore_duplicates = False
+        self.filters: List = []
+        self.order_by: Optional[tuple] = None
+        self.row_limit: Optional[int] = None
+        self.row_offset = 0
+
+    def select(self, columns: str = "*") -> 'LocalQuery':
+        self.operation = "select"
+        return self
+
+    def insert(self, data: Any) -> 'LocalQuery':
+        self.operation = "insert"
+        self.payload = data
+        return self
+
+    def upsert(self, data: Any, on_conflict: Optional[str] = None, ignore_duplicates: bool = False) -> 'LocalQuery':
+        self.operation = "upsert"
+        self.payload = data
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, data: Dict) -> 'LocalQuery':
+        self.operation = "update"
+        self.payload = data
+        return self
+
+    def delete(self) -> 'LocalQuery':
+        self.operation = "delete"
+        return self
+
+    def eq(self, column: str, value: Any) -> 'LocalQuery':
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column: str, value: Any) -> 'LocalQuery':
+        self.filters.append(lambda row: row.get(column) is not None and row.get(column) > value)
+        return self
+
+    def in_(self, column: str, values: List) -> 'LocalQuery':
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column: str, desc: bool = False) -> 'LocalQuery':
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count: int) -> 'LocalQuery':
+        self.row_limit = count
+        return self
+
+    def range(self, start: int, end: int) -> 'LocalQuery':
+        self.row_offset = start
+        self.row_limit = end - start + 1
+        return self
+
+    def execute(self) -> LocalResponse:
+        return self.client._execute(self)
+
+
+class LocalSupabaseClient:
+    """Thread-safe in-memory tables with Supabase-style query builders"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables: Dict[str, List[Dict]] = {}
+        self.calls: Counter = Counter()
+        self.functions: Dict[str, Any] = {"import_interviews": self._import_interviews}
+        self._ids = itertools.count(1)
+        # result_counters rows by key, for the increments import_interviews applies
+        self._counters: Dict[tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def rpc(self, name: str, params: Dict) -> LocalQuery:
+        query = LocalQuery(self, name)
+        query.operation = "rpc"
+        query.payload = params
+        return query
+
+    def _import_interviews(self, p_sessions: List[Dict], p_responses: List[Dict], p_testers: List[Dict],
+                           p_counters: Optional[List[Dict]] = None) -> List[str]:
+        """The ``import_interviews`` database function; runs under the client lock, so all or nothing"""
+        stored = {row.get("session_id") for row in self.tables.get("sessions", [])}
+        skipped = [s["session_id"] for s in p_sessions if s["session_id"] in stored]
+        for table, payload in (("sessions", p_sessions), ("responses", p_responses), ("testers", p_testers)):
+            rows = self.tables.setdefault(table, [])
+            for item in payload:
+                if item["session_id"] not in stored:
+                    rows.append({**copy.deepcopy(item), "id": next(self._ids)})
+        for item in p_counters or []:
+            if item["session_id"] in stored:
+                continue
+            key = (item["founder_email"], item["session_id"], item["problem"], item["day"], item["metric"])
+            if key in self._counters:
+                self._counters[key]["value"] += item["value"]
+            else:
+                self._counters[key] = {**item}
+                self.tables.setdefault("result_counters", []).append(self._counters[key])
+        return skipped
+
+    def _matches(self, query: LocalQuery, row: Dict) -> bool:
+        return all(f(row) for f in query.filters)
+
+    def _execute(self, query: LocalQuery) -> LocalResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[f"{query.table}.{query.operation}"] += 1
+            if query.operation == "rpc":
+                function = self.functions.get(query.table)
+                if function is None:
+                    raise Exception(f"Could not find the function {query.table}")
+                return LocalResponse(function(**query.payload))
+
+            rows = self.tables.setdefault(query.table, [])
+            if query.operation in ("insert", "upsert"):
+                payload = query.payload if isinstance(query.payload, list) else [query.payload]
+                written = []
+                for item in payload:
+                    item = copy.deepcopy(item)
+                    existing = None
+                    if query.operation == "upsert" and query.on_conflict:
+                        existing = next((r for r in rows if r.get(query.on_conflict) == item.get(query.on_conflict)), None)
+                    if existing is not None and query.ignore_duplicates:
+                        continue
+                    if existing is not None:
+                        existing.update(item)
+                        written.append(copy.deepcopy(existing))
+                    else:
+                        item.setdefault("id", next(self._ids))
+                        rows.append(item)
+                        written.append(copy.deepcopy(item))
+                return LocalResponse(written)
+
+            matched = [r for r in rows if self._matches(query, r)]
+            if query.operation == "update":
+                for row in matched:
+                    row.update(query.payload)
+                return LocalResponse(copy.deepcopy(matched))
+            if query.operation == "delete":
+                self.tables[query.table] = [r for r in rows if not self._matches(query, r)]
+                return LocalResponse(copy.deepcopy(matched))
+
+            if query.order_by:
+                column, desc = query.order_by
+                matched.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+            end = query.row_offset + query.row_limit if query.row_limit is not None else None
+            matched = matched[query.row_offset:end]
+            return LocalResponse(copy.deepcopy(matched))
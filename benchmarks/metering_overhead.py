@@ -0,0 +1,51 @@
+"""Overhead of UsageMeter relative to LLM call latency.
+
+Measures the per-call cost of ``track_stream`` (per-chunk pass-through plus the
+final ``record``) and compares it with the latency of the recorded streams the
+mock server replays. The target is well under 1% of call latency.
+
+    python -m benchmarks.metering_overhead
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.mock_openai import load_recordings
+from utils.llm_usage import UsageMeter
+
+MESSAGES = [
+    {"role": "system", "content": "You are an AI research assistant conducting user interviews." * 20},
+    {"role": "user", "content": "I forget to drink water when I'm in meetings."}
+]
+
+
+def time_call(meter, deltas, metered: bool) -> float:
+    start = time.perf_counter()
+    if metered:
+        for _ in meter.track_stream(iter(deltas), "bench", "gpt-4", MESSAGES, start, session_id="s1"):
+            pass
+    else:
+        for _ in iter(deltas):
+            pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LLM usage metering overhead")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    meter = UsageMeter(flush_size=100, sink=lambda batch: None)
+    print(f"{'recording':<40}{'chunks':>8}{'latency':>10}{'overhead':>12}{'share':>10}")
+    for recording in load_recordings():
+        deltas = [c['delta'] for c in recording['chunks']]
+        latency = sum(c['delay_ms'] for c in recording['chunks']) / 1000
+        plain = statistics.median(time_call(meter, deltas, False) for _ in range(args.calls))
+        metered = statistics.median(time_call(meter, deltas, True) for _ in range(args.calls))
+        overhead = max(metered - plain, 0.0)
+        print(f"{recording['match'][:38]:<40}{len(deltas):>8}{latency:>9.2f}s"
+              f"{overhead * 1e6:>10.1f}us{overhead / latency:>9.4%}")
+
+
+if __name__ == "__main__":
+    main()
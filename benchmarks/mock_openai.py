@@ -0,0 +1,226 @@
+"""Local OpenAI-compatible server that replays recorded completion streams.
+
+Point the OpenAI client at it with ``OPENAI_BASE_URL=<server.base_url>``. Each
+recording is a JSON file with a ``match`` substring (looked up in the request
+messages) and a list of ``{"delta", "delay_ms"}`` chunks captured from a real
+stream, so replays keep realistic time-to-first-token and inter-token gaps.
+"""
+from typing import Dict, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import threading
+import time
+import uuid
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(__file__), 'recordings')
+
+# Smaller models stream faster; recorded delays are multiplied by these factors
+MODEL_SPEED = {
+    "gpt-4o-mini": 0.35,
+    "gpt-3.5-turbo": 0.4,
+    "gpt-4o": 0.6,
+}
+
+FALLBACK_RECORDING = {
+    "match": "",
+    "chunks": [{"delta": "Thanks for sharing that.", "delay_ms": 300}]
+}
+
+
+def load_recordings(directory: str = RECORDINGS_DIR) -> List[Dict]:
+    """Load every recording in a directory, sorted by file name"""
+    recordings = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.json'):
+            with open(os.path.join(directory, name), 'r') as f:
+                recordings.append(json.load(f))
+    return recordings
+
+
+def record_stream(response, match: str, output_file: str) -> str:
+    """Capture a live OpenAI stream (``stream=True``) into a recording file"""
+    chunks = []
+    last = time.monotonic()
+    for chunk in response:
+        if not chunk.choices or chunk.choices[0].delta.content is None:
+            continue
+        now = time.monotonic()
+        chunks.append({"delta": chunk.choices[0].delta.content, "delay_ms": int((now - last) * 1000)})
+        last = now
+    with open(output_file, 'w') as f:
+        json.dump({"match": match, "chunks": chunks}, f, indent=2)
+    return "".join(c["delta"] for c in chunks)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 resets connections under concurrent load tests
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class MockOpenAIServer:
+    """Threaded HTTP server speaking the chat completions API"""
+
+    def __init__(self, recordings: Optional[List[Dict]] = None, latency_scale: float = 1.0,
+                 host: str = '127.0.0.1', port: int = 0, model_speed: Optional[Dict[str, float]] = None):
+        self.recordings = recordings if recordings is not None else load_recordings()
+        self.latency_scale = latency_scale
+        self.model_speed = MODEL_SPEED if model_speed is None else model_speed
+        self.calls: List[Dict] = []
+        self._lock = threading.Lock()
+        self._httpd = _MockHTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'MockOpenAIServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def pick_recording(self, messages: List[Dict]) -> Dict:
+        text = "\n".join(str(m.get('content', '')) for m in messages)
+        for recording in self.recordings:
+            if recording.get('match') and recording['match'] in text:
+                return recording
+        return FALLBACK_RECORDING
+
+    def _log_call(self, body: Dict, recording: Dict, completion_tokens: int) -> Dict:
+        prompt_chars = sum(len(str(m.get('content', ''))) for m in body.get('messages', []))
+        call = {
+            "model": body.get('model'),
+            "stream": bool(body.get('stream')),
+            "match": recording.get('match'),
+            "prompt_tokens": prompt_chars // 4,
+            "completion_tokens": completion_tokens,
+            # Streams count what was actually written before the client hung up
+            "sent_tokens": completion_tokens,
+            "disconnected": False
+        }
+        with self._lock:
+            self.calls.append(call)
+        return call
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Each SSE event is a small write; without TCP_NODELAY they stall on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                if not self.path.endswith('/chat/completions'):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                recording = server.pick_recording(body.get('messages', []))
+                chunks = recording['chunks']
+                if body.get('max_tokens'):
+                    chunks = chunks[:body['max_tokens']]
+                call = server._log_call(body, recording, len(chunks))
+                self.speed = server.latency_scale * server.model_speed.get(body.get('model'), 1.0)
+                if body.get('stream'):
+                    self._stream(body, chunks, call)
+                else:
+                    self._complete(body, chunks)
+
+            def _sleep(self, delay_ms: int) -> None:
+                if delay_ms and self.speed:
+                    time.sleep(delay_ms / 1000 * self.speed)
+
+            def _complete(self, body: Dict, chunks: List[Dict]) -> None:
+                for chunk in chunks:
+                    self._sleep(chunk['delay_ms'])
+                prompt_tokens = sum(len(str(m.get('content', ''))) for m in body.get('messages', [])) // 4
+                payload = json.dumps({
+                    "id": f"chatcmpl-{uuid.uuid4().hex}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get('model'),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "".join(c['delta'] for c in chunks)},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": len(chunks),
+                        "total_tokens": prompt_tokens + len(chunks)
+                    }
+                }).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _stream(self, body: Dict, chunks: List[Dict], call: Dict) -> None:
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+                sent = 0
+                try:
+                    for chunk in chunks:
+                        self._sleep(chunk['delay_ms'])
+                        self._event(body, completion_id, {"content": chunk['delta']}, None)
+                        sent += 1
+                    self._event(body, completion_id, {}, "stop")
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client hung up mid-stream
+                    with server._lock:
+                        call["sent_tokens"] = sent
+                        call["disconnected"] = True
+                self.close_connection = True
+
+            def _event(self, body: Dict, completion_id: str, delta: Dict, finish_reason: Optional[str]) -> None:
+                event = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get('model'),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode())
+                self.wfile.flush()
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI server that replays recorded streams")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply recorded delays by this factor")
+    args = parser.parse_args()
+
+    mock = MockOpenAIServer(latency_scale=args.latency_scale, port=args.port).start()
+    print(f"Mock OpenAI server listening on {mock.base_url}")
+    print(f"export OPENAI_BASE_URL={mock.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
@@ -0,0 +1,84 @@
+"""Latency and cost per interview for different model routing policies.
+
+Each policy is a variation of the ``call_sites`` mapping in
+``config/chatgpt_config.json``. Interviews plus one analysis run against the
+local mock OpenAI server, which streams smaller models faster.
+
+    python -m benchmarks.model_routing --interviews 3 --latency-scale 0.2
+"""
+import argparse
+import copy
+import json
+import os
+import time
+
+from benchmarks.fixtures import SAMPLE_SESSION, interview_answers
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.llm_usage import get_usage_meter
+from utils.model_router import CHATGPT_CONFIG_PATH, ModelRouter, set_model_router
+
+
+def routing_policies() -> dict:
+    with open(CHATGPT_CONFIG_PATH, 'r') as f:
+        config = json.load(f)
+    legacy = copy.deepcopy(config)
+    # What the agents hard-coded before routing existed
+    for site in ("interview.probe", "interview.chat", "interview.summary"):
+        legacy["call_sites"][site]["tier"] = "large"
+    all_small = copy.deepcopy(config)
+    for settings in all_small["call_sites"].values():
+        settings["tier"] = "small"
+    return {"legacy": legacy, "configured": config, "all_small": all_small}
+
+
+def run_interview(session_id: str) -> None:
+    from agents.interview_agent import InterviewAgent
+    from agents.analysis_agent import AnalysisAgent
+
+    session_data = copy.deepcopy(SAMPLE_SESSION)
+    session_data["session_id"] = session_id
+    agent = InterviewAgent(session_id, session_data)
+    agent.start_interview()
+    for answer in interview_answers(len(session_data["founder_inputs"]["problems"])):
+        agent.get_response(answer)
+
+    analysis_agent = AnalysisAgent(session_id, {
+        "session_id": session_id,
+        "founder_email": session_data["founder_email"],
+        "founder_inputs": {
+            "idea_summary": session_data["founder_inputs"]["value_prop"],
+            "target_user": "founders",
+            "problem_statement": session_data["founder_inputs"]["problems"][0]
+        },
+        "responses": agent.responses
+    })
+    analysis_agent.generate_report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model routing policies")
+    parser.add_argument("--interviews", type=int, default=3)
+    parser.add_argument("--latency-scale", type=float, default=0.2, help="Multiply recorded delays by this factor")
+    args = parser.parse_args()
+
+    meter = get_usage_meter()
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+
+        print(f"{'policy':<12}{'latency/interview':>20}{'cost/interview':>16}{'calls':>8}")
+        for name, config in routing_policies().items():
+            set_model_router(ModelRouter(config))
+            start = time.perf_counter()
+            for i in range(args.interviews):
+                run_interview(f"bench-{name}-{i}")
+            elapsed = time.perf_counter() - start
+            entries = [e for e in meter.recent if (e["session_id"] or "").startswith(f"bench-{name}-")]
+            cost = sum(e["cost_usd"] for e in entries)
+            print(f"{name:<12}{elapsed / args.interviews:>19.2f}s{cost / args.interviews:>15.4f}${len(entries) / args.interviews:>8.1f}")
+    set_model_router(None)
+
+
+if __name__ == "__main__":
+    main()
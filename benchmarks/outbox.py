@@ -0,0 +1,166 @@
+"""Interview writes through a Supabase outage, with and without the local outbox.
+
+Testers finish ``--rate`` interviews a second on ``--workers`` threads,
+each saving a session, its responses, tester info and an analysis, against
+the Supabase stand-in with a simulated round trip. Part-way through the store goes down for
+``--outage`` seconds, and outside the outage a share of writes lose their
+reply after being applied (the client sees an error, the row is stored).
+
+Writing directly, every write waits on the network and the ones that fail
+are dropped, as the app did. Through the outbox, writes are acknowledged
+once they are in the local file; after the run the outbox is flushed and
+the store is checked for missing and duplicated rows.
+
+    python -m benchmarks.outbox
+    python -m benchmarks.outbox --interviews 400 --outage 2 --lost-replies 0.05
+"""
+import argparse
+import copy
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fixtures import SAMPLE_FOUNDER_INPUTS, interview_answers
+from benchmarks.load_test import percentile
+from benchmarks.local_supabase import LocalSupabaseClient
+from utils.database import DatabaseService
+from utils.outbox import Outbox, OutboxStorage
+
+TABLES = ("sessions", "responses", "testers", "analyses")
+
+
+class FlakyClient(LocalSupabaseClient):
+    """The stand-in with an outage switch and replies lost after the write went through"""
+
+    def __init__(self, latency: float, lost_replies: float, seed: int):
+        super().__init__(latency=latency)
+        self.down = False
+        self.lost_replies = lost_replies
+        self.rng = random.Random(seed)
+        self.failures = 0
+
+    def _execute(self, query):
+        if self.down:
+            time.sleep(self.latency)
+            self.failures += 1
+            raise Exception("503 Service Unavailable")
+        response = super()._execute(query)
+        if query.operation != "select" and self.rng.random() < self.lost_replies:
+            self.failures += 1
+            raise Exception("Connection reset by peer")
+        return response
+
+
+def interview(db, founder_email: str) -> list:
+    """Saves one completed interview the way the app does; returns each write's latency"""
+    session_id = str(uuid.uuid4())
+    writes = [
+        lambda: db.save_session({"session_id": session_id, "founder_email": founder_email,
+                                 "founder_inputs": copy.deepcopy(SAMPLE_FOUNDER_INPUTS)}),
+        lambda: db.save_responses(session_id, [{"question": "q", "answer": a} for a in interview_answers(1)]),
+        lambda: db.save_tester_info(session_id, f"tester-{session_id[:8]}@example.com", True, True),
+        lambda: db.save_analysis(session_id, {"summary": "Testers want honest feedback"})
+    ]
+    results = []
+    for write in writes:
+        start = time.perf_counter()
+        try:
+            write()
+            results.append((time.perf_counter() - start, True))
+        except Exception:
+            results.append((time.perf_counter() - start, False))
+    return results
+
+
+def run(args, use_outbox: bool) -> dict:
+    client = FlakyClient(args.latency, args.lost_replies, args.seed)
+    remote = DatabaseService(client=client)
+    db = remote
+    box = None
+    if use_outbox:
+        box = Outbox(os.path.join(tempfile.mkdtemp(), "outbox.db"), base_backoff=0.1, max_backoff=1.0)
+        db = OutboxStorage(remote, box)
+    founders = [f"founder-{i}@example.com" for i in range(args.founders)]
+    for email in founders:
+        db.save_founder_inputs(email, SAMPLE_FOUNDER_INPUTS)
+
+    def outage():
+        time.sleep(args.outage_after)
+        client.down = True
+        time.sleep(args.outage)
+        client.down = False
+
+    def arrive(i):
+        # Testers finish at a steady rate, so both runs meet the outage at the same point
+        time.sleep(max(0.0, start + i / args.rate - time.perf_counter()))
+        return interview(db, founders[i % len(founders)])
+
+    switch = threading.Thread(target=outage)
+    start = time.perf_counter()
+    switch.start()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        results = [w for r in pool.map(arrive, range(args.interviews)) for w in r]
+    elapsed = time.perf_counter() - start
+    switch.join()
+    flushed, drain_s = True, 0.0
+    if box is not None:
+        drain_start = time.perf_counter()
+        flushed = box.flush(timeout=30.0)
+        drain_s = time.perf_counter() - drain_start
+    rows = {table: client.tables.get(table, []) for table in TABLES}
+    # A lost reply on a direct insert still stored the row, so count what arrived, not what was acknowledged
+    stored = {table: len(rows[table]) for table in TABLES}
+    distinct = {table: len({r["session_id"] for r in rows[table]}) for table in TABLES}
+    waits = [latency for latency, _ in results]
+    return {
+        "writes": len(results),
+        "errors": sum(1 for _, ok in results if not ok),
+        "stored": stored,
+        "duplicates": sum(stored[t] - distinct[t] for t in TABLES),
+        "missing": sum(args.interviews - distinct[t] for t in TABLES),
+        "p50": percentile(waits, 50),
+        "p95": percentile(waits, 95),
+        "p99": percentile(waits, 99),
+        "elapsed": elapsed,
+        "flushed": flushed,
+        "drain_s": drain_s,
+        "remote_calls": sum(client.calls.values()),
+        "outbox": box.stats() if box else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interview writes through a store outage")
+    parser.add_argument("--interviews", type=int, default=300)
+    parser.add_argument("--founders", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=100.0, help="Interviews finishing per second")
+    parser.add_argument("--latency", type=float, default=0.03, help="Simulated round trip to the store, seconds")
+    parser.add_argument("--outage-after", type=float, default=0.5)
+    parser.add_argument("--outage", type=float, default=1.5, help="Seconds the store is down")
+    parser.add_argument("--lost-replies", type=float, default=0.02, help="Share of writes whose reply is lost")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.interviews} interviews x 4 writes, {args.workers} workers, {args.latency * 1000:.0f}ms round trip, "
+          f"store down {args.outage:g}s after {args.outage_after:g}s, {args.lost_replies:.0%} replies lost")
+    for name, use_outbox in (("direct", False), ("outbox", True)):
+        result = run(args, use_outbox)
+        print(f"  {name:<7} write p50 {result['p50'] * 1000:6.2f}ms p95 {result['p95'] * 1000:6.2f}ms "
+              f"p99 {result['p99'] * 1000:6.2f}ms  errors shown {result['errors']:4d}/{result['writes']}  "
+              f"run {result['elapsed']:.1f}s")
+        print(f"          stored {result['stored']}  missing {result['missing']}  duplicated {result['duplicates']}  "
+              f"remote calls {result['remote_calls']}")
+        if result["outbox"]:
+            stats = result["outbox"]
+            print(f"          replayed {stats['sent']} entries in {stats['batches']} batches "
+                  f"({stats['failed_batches']} failed), flush {'done' if result['flushed'] else 'timed out'} "
+                  f"in {result['drain_s']:.2f}s, pending {stats['pending']}, dead {stats['dead']}")
+
+
+if __name__ == "__main__":
+    main()
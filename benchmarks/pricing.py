@@ -0,0 +1,135 @@
+"""Accuracy and throughput of the local price extractor.
+
+Scores ``extract_prices`` against a hand-labelled sample of price answers
+(every anchor's price must match, and unanchored fields must stay empty),
+then times extraction and the Van Westendorp curves over a corpus built by
+repeating the sample.
+
+    python -m benchmarks.pricing
+    python -m benchmarks.pricing --corpus 1000000 --show-misses
+"""
+import argparse
+import math
+import time
+
+from utils.pricing import extract_prices, price_curves
+
+FIELDS = ("too_cheap", "cheap", "fair_low", "fair_high", "expensive", "too_expensive")
+
+# (answer, expected monthly prices); a bare number for "fair" is a single price
+LABELLED = [
+    ("$5-10 per month would feel fair", {"fair": (5, 10)}),
+    ("10 bucks is fair, 30 a month is too much", {"fair": 10, "too_expensive": 30}),
+    ("anything under $3 feels sketchy", {"too_cheap": 3}),
+    ("I'd pay about $10 a month.", {"fair": 10}),
+    ("Fair would be $120 a year and expensive $240", {"fair": 10, "expensive": 20}),
+    ("Between 5 and 10 dollars. Over 25 is too expensive.", {"fair": (5, 10), "too_expensive": 25}),
+    ("Not sure, I'd have to try it first", {}),
+    ("twenty-five a month is fine", {"fair": 25}),
+    ("$15/mo ok but 40 is a rip-off", {"fair": 15, "too_expensive": 40}),
+    ("$20 feels fair. $35 would feel expensive. $60 and I'm out, too much.",
+     {"fair": 20, "expensive": 35, "too_expensive": 60}),
+    ("Honestly $9.99 per month", {"fair": 9.99}),
+    ("Maybe $50 a year?", {"fair": 50 / 12}),
+    ("$2 a week seems reasonable", {"fair": 2 * 365 / 7 / 12}),
+    ("Ten dollars would be a bargain, twenty is getting pricey", {"cheap": 10, "expensive": 20}),
+    ("If it was under $5 I'd wonder if it's a scam", {"too_cheap": 5}),
+    ("I wouldn't pay more than $15", {"too_expensive": 15}),
+    ("$12 is fair", {"fair": 12}),
+    ("Something like 8-12 bucks monthly", {"fair": (8, 12)}),
+    ("$100 a year would be a no-brainer", {"cheap": 100 / 12}),
+    ("Up to $30 a month", {"expensive": 30}),
+    ("I'd expect it to be free honestly", {"fair": 0}),
+    ("It depends on how much time it saves me", {}),
+    ("$7", {"fair": 7}),
+    ("Around fifteen dollars", {"fair": 15}),
+    ("$25 is reasonable while $45 is pushing it", {"fair": 25, "expensive": 45}),
+    ("$19 fair; $49 too expensive", {"fair": 19, "too_expensive": 49}),
+    ("For my team of 5 people I'd pay $40 a month", {"fair": 40}),
+    ("$1,200 a year is what we pay for similar tools", {"fair": 100}),
+    ("Fair: $10. Expensive: $20. Too cheap: $2.", {"fair": 10, "expensive": 20, "too_cheap": 2}),
+    ("Probably $3 per day at most", {"expensive": 3 * 365 / 12}),
+    ("€10 a month would be fair", {"fair": 10}),
+    ("$30 is steep but I'd consider it", {"expensive": 30}),
+    ("I would happily pay $20, $50 would be a stretch", {"fair": 20, "expensive": 50}),
+    ("No idea, whatever similar apps charge", {}),
+    ("Less than a coffee a week, so maybe $4 a week", {"fair": 4 * 365 / 7 / 12}),
+    ("$10 is a steal, $25 seems fair, $40 is too much", {"cheap": 10, "fair": 25, "too_expensive": 40}),
+    ("5 dollars would feel too cheap to trust", {"too_cheap": 5}),
+    ("I'd pay 15 to 20 a month", {"fair": (15, 20)}),
+    ("$60 would be painful", {"expensive": 60}),
+    ("Fair price is $8. Anything above $18 no way.", {"fair": 8, "too_expensive": 18}),
+]
+
+
+def expected_row(labels: dict) -> dict:
+    row = {field: math.nan for field in FIELDS}
+    for anchor, value in labels.items():
+        if anchor == "fair":
+            row["fair_low"], row["fair_high"] = value if isinstance(value, tuple) else (value, value)
+        else:
+            row[anchor] = value
+    return row
+
+
+def matches(actual: float, expected: float) -> bool:
+    if math.isnan(expected):
+        return math.isnan(actual)
+    return not math.isnan(actual) and abs(actual - expected) < 0.01
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark price extraction accuracy and throughput")
+    parser.add_argument("--corpus", type=int, default=100000, help="Answers in the throughput corpus")
+    parser.add_argument("--founder", type=int, default=500, help="Answers in one founder's corpus")
+    parser.add_argument("--show-misses", action="store_true")
+    args = parser.parse_args()
+
+    texts = [text for text, _ in LABELLED]
+    extracted = extract_prices(texts)
+    field_hits = answer_hits = 0
+    misses = []
+    for (text, labels), (_, row) in zip(LABELLED, extracted.iterrows()):
+        expected = expected_row(labels)
+        wrong = [field for field in FIELDS if not matches(float(row[field]), expected[field])]
+        field_hits += len(FIELDS) - len(wrong)
+        answer_hits += not wrong
+        if wrong:
+            misses.append((text, {f: (round(float(row[f]), 2), round(expected[f], 2)) for f in wrong}))
+
+    print(f"labelled sample: {len(LABELLED)} answers")
+    print(f"  answers fully correct {answer_hits}/{len(LABELLED)} ({answer_hits / len(LABELLED):.0%})")
+    print(f"  fields correct        {field_hits}/{len(LABELLED) * len(FIELDS)} "
+          f"({field_hits / (len(LABELLED) * len(FIELDS)):.1%})")
+    if args.show_misses:
+        for text, wrong in misses:
+            print(f"  miss: {text!r}  (got, expected): {wrong}")
+
+    founder = (texts * (args.founder // len(texts) + 1))[:args.founder]
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        price_curves(extract_prices(founder), [9.0, 29.0, 79.0])
+    founder_ms = (time.perf_counter() - start) * 1000 / runs
+    print(f"\none founder: {len(founder)} answers extracted and curved in {founder_ms:.1f}ms")
+
+    corpus = (texts * (args.corpus // len(texts) + 1))[:args.corpus]
+    start = time.perf_counter()
+    prices = extract_prices(corpus)
+    extract_s = time.perf_counter() - start
+    start = time.perf_counter()
+    curves = price_curves(prices, [9.0, 29.0, 79.0])
+    curves_ms = (time.perf_counter() - start) * 1000
+
+    print(f"corpus: {len(corpus)} answers, 0 model calls")
+    print(f"  extract       {extract_s * 1000:8.0f}ms  ({len(corpus) / extract_s:,.0f} answers/s)")
+    print(f"  price curves  {curves_ms:8.1f}ms")
+    print(f"  optimal price {curves['optimal_price']}, indifference {curves['indifference_price']}, "
+          f"acceptable range {curves['acceptable_range']}")
+    for point in curves["price_points"]:
+        print(f"  ${point['price']:>6.2f}  would pay {point['would_pay']:.0%}  "
+              f"too expensive {point['too_expensive']:.0%}  too cheap {point['too_cheap']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
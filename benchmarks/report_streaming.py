@@ -0,0 +1,76 @@
+"""Time-to-first-content for the full report: blocking vs streaming.
+
+Runs ``AnalysisAgent`` against the local mock OpenAI server and compares the old
+path (two blocking completions) with ``stream_report`` fed a cached analysis.
+
+    python -m benchmarks.report_streaming --latency-scale 1.0
+"""
+import argparse
+import os
+import time
+
+from benchmarks.mock_openai import MockOpenAIServer
+from agents.analysis_agent import split_report_sections
+
+SAMPLE_INTERVIEW = {
+    "session_id": "bench-session",
+    "founder_inputs": {
+        "idea_summary": "An AI interviewer that runs Mom Test interviews for founders",
+        "target_user": "first-time founders",
+        "problem_statement": "Founders don't get honest feedback from friends"
+    },
+    "responses": [
+        {"type": "problem_resonance", "problem": "Founders don't get honest feedback", "resonance_score": 5,
+         "schema_version": 2},
+        {"type": "problem_explanation", "text": "My friends told me it was great and then never used it.",
+         "schema_version": 2},
+        {"type": "value_prop_interest", "response": "Somewhat likely", "schema_version": 2},
+        {"type": "opt_in_intent", "response": "Yes", "schema_version": 2}
+    ]
+}
+
+
+def time_blocking(agent) -> dict:
+    start = time.perf_counter()
+    agent.generate_report()
+    total = time.perf_counter() - start
+    # Nothing can be shown until the whole report is back
+    return {"first_content": total, "first_section": total, "total": total}
+
+
+def time_streaming(agent, analysis: dict) -> dict:
+    start = time.perf_counter()
+    first_content = first_section = None
+    text = ""
+    for chunk in agent.stream_report(analysis):
+        text += chunk
+        if first_content is None and chunk.strip():
+            first_content = time.perf_counter() - start
+        if first_section is None and split_report_sections(text)[0]:
+            first_section = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return {"first_content": first_content, "first_section": first_section or total, "total": total}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streamed vs blocking report generation")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply recorded delays by this factor")
+    args = parser.parse_args()
+
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        from agents.analysis_agent import AnalysisAgent
+
+        agent = AnalysisAgent(SAMPLE_INTERVIEW['session_id'], SAMPLE_INTERVIEW)
+        blocking = time_blocking(agent)
+        cached_analysis = agent.analyze_responses()
+        streaming = time_streaming(agent, cached_analysis)
+
+    print(f"{'path':<12}{'first content':>16}{'first section':>16}{'total':>10}")
+    for name, result in (("blocking", blocking), ("streaming", streaming)):
+        print(f"{name:<12}{result['first_content']:>15.2f}s{result['first_section']:>15.2f}s{result['total']:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Live results from write-time counters versus re-scanning every interview.
+
+Seeds one founder's ``--links`` session links with ``--interviews`` completed
+interviews (three problems each, random resonance scores and opt-ins) in a
+local SQLite store, feeding the same events through ``ResultCounters`` as the
+agents would. Then times the two ways to fill the live results panel:
+
+    scan      page through the founder's sessions, fetch every responses and
+              testers row and parse each JSON blob
+    counters  read the founder's summary rows and add them up
+
+and checks both give the same numbers.
+
+    python -m benchmarks.result_counters
+    python -m benchmarks.result_counters --interviews 50000 --links 20
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.fixtures import SAMPLE_SESSION
+from utils.result_counters import (
+    INTERVIEWS_COMPLETED, OPT_INS, TESTERS, ResultCounters, summarize_counters
+)
+from utils.responses import RESPONSE_SCHEMA_VERSION
+from utils.sqlite_database import SQLiteDatabaseService
+
+FOUNDER = "founder@example.com"
+
+
+def interview_events(problems, rng: random.Random) -> list:
+    events = []
+    for problem in problems:
+        events.extend([
+            {"type": "problem_resonance", "problem": problem, "resonance_score": rng.randint(1, 5),
+             "response": "About a four", "timestamp": "2024-01-01T00:00:00"},
+            {"type": "problem_explanation", "text": "We lose a day every sprint reconciling spreadsheets.",
+             "timestamp": "2024-01-01T00:00:10"},
+            {"type": "value_prop_interest", "value_prop": "Automated reconciliation", "action": "sign up",
+             "response": "Yes, I would try it tomorrow.", "likelihood": 4, "timestamp": "2024-01-01T00:00:20"},
+            {"type": "opt_in_intent", "response": "Sure, add me to the beta.", "opt_in": True,
+             "timestamp": "2024-01-01T00:00:30"},
+            {"type": "interview_summary", "summary": "Strong pain, wants early access.", "skipped": False,
+             "timestamp": "2024-01-01T00:00:40"}
+        ])
+    return [dict(event, schema_version=RESPONSE_SCHEMA_VERSION) for event in events]
+
+
+def seed(db: SQLiteDatabaseService, counters: ResultCounters, args) -> float:
+    """Store the interviews and count them; returns seconds spent in ``record_*``"""
+    rng = random.Random(args.seed)
+    problems = SAMPLE_SESSION["founder_inputs"]["problems"]
+    founder_inputs = json.dumps(SAMPLE_SESSION["founder_inputs"])
+    links = [f"link-{i}" for i in range(args.links)]
+    responses, testers = [], []
+    recording = 0.0
+    for i in range(args.interviews):
+        link = links[i % len(links)]
+        events = interview_events(problems, rng)
+        opt_in = rng.random() < 0.4
+        responses.append((link, json.dumps(events), "2024-01-01T00:01:00"))
+        testers.append((link, f"tester{i}@example.com", opt_in, True, "2024-01-01T00:01:00"))
+        start = time.perf_counter()
+        counters.record_started(link, FOUNDER)
+        for event in events:
+            counters.record_response(link, FOUNDER, event)
+        counters.record_completed(link, FOUNDER)
+        counters.record_tester(link, FOUNDER, opt_in)
+        recording += time.perf_counter() - start
+    with db._transaction() as conn:
+        conn.executemany(
+            "INSERT INTO sessions (session_id, founder_email, founder_inputs, created_at) VALUES (?, ?, ?, ?)",
+            [(link, FOUNDER, founder_inputs, "2024-01-01T00:00:00") for link in links]
+        )
+        conn.executemany("INSERT INTO responses (session_id, responses, created_at) VALUES (?, ?, ?)", responses)
+        conn.executemany(
+            "INSERT INTO testers (session_id, email, opt_in, gdpr_consent, created_at) VALUES (?, ?, ?, ?, ?)", testers
+        )
+    return recording
+
+
+def scan(db: SQLiteDatabaseService) -> dict:
+    """The panel's numbers recomputed from the raw rows, as any dashboard had to before"""
+    session_ids, offset = [], 0
+    while True:
+        page = db.list_sessions(FOUNDER, offset=offset)
+        session_ids.extend(row["session_id"] for row in page)
+        if len(page) < 500:
+            break
+        offset += 500
+    problems = {}
+    completed = 0
+    for row in db.get_session_rows("responses", session_ids):
+        completed += 1
+        for event in json.loads(row["responses"]):
+            if event.get("type") == "problem_resonance":
+                counts = problems.setdefault(event["problem"], {"ratings": 0, "score_total": 0})
+                counts["ratings"] += 1
+                counts["score_total"] += event["resonance_score"]
+    testers = db.get_session_rows("testers", session_ids)
+    for counts in problems.values():
+        counts["mean_resonance"] = round(counts["score_total"] / counts["ratings"], 2)
+    return {"completed": completed, "testers": len(testers), "opt_ins": sum(1 for t in testers if t["opt_in"]),
+            "problems": problems}
+
+
+def from_counters(db: SQLiteDatabaseService) -> dict:
+    rows = db.get_result_counters(FOUNDER)
+    summary = summarize_counters(rows)
+    totals = summary["totals"]
+    return {"completed": totals[INTERVIEWS_COMPLETED], "testers": totals[TESTERS], "opt_ins": totals[OPT_INS],
+            "problems": summary["problems"], "rows": len(rows)}
+
+
+def timed(fn, repeats: int):
+    samples, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the live results panel's data")
+    parser.add_argument("--interviews", type=int, default=20000)
+    parser.add_argument("--links", type=int, default=10, help="Session links the interviews are spread over")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    db = SQLiteDatabaseService(os.path.join(tempfile.mkdtemp(), "counters.db"))
+    counters = ResultCounters(flush_size=10 ** 9)
+    counters.sink = db.increment_result_counters  # flushed once below, without the background thread
+    recording = seed(db, counters, args)
+    events = counters.stats()["events"]
+    start = time.perf_counter()
+    flushed = counters.flush()
+    flush_ms = (time.perf_counter() - start) * 1000
+
+    scan_s, scanned = timed(lambda: scan(db), args.repeats)
+    counter_s, counted = timed(lambda: from_counters(db), args.repeats)
+    rows = counted.pop("rows")
+    same = all(scanned[key] == counted[key] for key in ("completed", "testers", "opt_ins")) and all(
+        scanned["problems"][p]["ratings"] == counted["problems"][p]["ratings"]
+        and scanned["problems"][p]["mean_resonance"] == counted["problems"][p]["mean_resonance"]
+        for p in scanned["problems"]
+    )
+
+    print(f"{args.interviews} interviews over {args.links} session links, "
+          f"{os.path.getsize(db.path) / 1024 / 1024:.1f} MB store")
+    print(f"  recording  {events} increments, {recording / events * 1e9:.0f}ns each; "
+          f"flushed as {flushed} rows in {flush_ms:.1f}ms")
+    print(f"  scan       {scan_s * 1000:8.1f}ms per refresh  ({args.interviews} responses blobs parsed)")
+    print(f"  counters   {counter_s * 1000:8.2f}ms per refresh  ({rows} summary rows)  "
+          f"{scan_s / counter_s:.0f}x faster")
+    print(f"  same results: {same}  (completed {counted['completed']}, testers {counted['testers']}, "
+          f"opted in {counted['opt_ins']})")
+
+
+if __name__ == "__main__":
+    main()
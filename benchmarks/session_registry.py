@@ -0,0 +1,148 @@
+"""Memory held by idle interview tabs, with and without the session registry.
+
+Builds ``--sessions`` interview agents part-way through an interview (as
+testers who opened a link, answered a few questions and walked away) and
+measures Python heap growth with ``tracemalloc`` twice: once holding every
+agent, as ``st.session_state`` did, and once through ``SessionRegistry``
+with a memory ceiling, spilling to a local SQLite file. A simulated clock
+then moves past the idle TTL, and a sample of sessions is checked out again
+to time rehydration and confirm nothing was lost.
+
+Agents stop before the closing question, whose summary would call the model.
+SQLite's own page cache is C memory and not part of the heap figures.
+
+    python -m benchmarks.session_registry
+    python -m benchmarks.session_registry --ceiling-mb 16
+"""
+import argparse
+import copy
+import gc
+import hashlib
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from agents.session_registry import MB, SessionRegistry, agent_bytes
+from benchmarks.fixtures import SAMPLE_SESSION, interview_answers
+from benchmarks.load_test import percentile
+from utils.sqlite_database import SQLiteDatabaseService
+
+# Answers that keep an agent short of the closing question
+MAX_SCRIPTED_TURNS = 5
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def idle_agent(index: int, rng: random.Random):
+    from agents.interview_agent import InterviewAgent
+
+    session_data = copy.deepcopy(SAMPLE_SESSION)
+    session_data["session_id"] = f"bench-link-{index % 50}"
+    agent = InterviewAgent(session_data["session_id"], session_data, probe=False)
+    agent.start_interview()
+    for answer in interview_answers(1)[:rng.randint(0, MAX_SCRIPTED_TURNS)]:
+        agent.get_response(answer)
+    return agent
+
+
+def fingerprint(agent) -> str:
+    # A digest rather than the state itself, which would show up in the heap figures
+    return hashlib.sha256(json.dumps(agent.to_state(), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def heap() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory of idle interview sessions")
+    parser.add_argument("--sessions", type=int, default=10000)
+    parser.add_argument("--ceiling-mb", type=float, default=64.0, help="Registry memory ceiling")
+    parser.add_argument("--idle-ttl", type=float, default=900.0)
+    parser.add_argument("--arrivals-per-second", type=float, default=5.0)
+    parser.add_argument("--rehydrate", type=int, default=200, help="Sessions checked out again after the sweep")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+    os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+    idle_agent(0, random.Random(args.seed))  # imports and config caches stay out of the measurements
+    tracemalloc.start()
+
+    rng = random.Random(args.seed)
+    base = heap()
+    held = [idle_agent(i, rng) for i in range(args.sessions)]
+    unbounded = heap() - base
+    estimated = sum(agent_bytes(agent) for agent in held)
+    del held
+    heap()
+
+    clock = Clock()
+    db = SQLiteDatabaseService(os.path.join(tempfile.mkdtemp(), "registry.db"))
+    registry = SessionRegistry(db, idle_ttl=args.idle_ttl, max_bytes=int(args.ceiling_mb * MB), clock=clock)
+    rng = random.Random(args.seed)
+    sample = set(random.Random(args.seed + 1).sample(range(args.sessions), min(args.rehydrate, args.sessions)))
+    expected = {}
+    base = heap()
+    tracemalloc.reset_peak()
+    most_held = 0
+    start = time.perf_counter()
+    for i in range(args.sessions):
+        agent = idle_agent(i, rng)
+        key = registry.put(agent.session_id, agent)
+        registry.checkin(key)
+        if i in sample:
+            expected[key] = fingerprint(agent)
+        del agent
+        most_held = max(most_held, registry.stats()["bytes"])
+        clock.now += 1 / args.arrivals_per_second
+    build_s = time.perf_counter() - start
+    bounded = heap() - base
+    bounded_peak = tracemalloc.get_traced_memory()[1] - base
+    filled = registry.stats()
+
+    clock.now += args.idle_ttl + 1
+    start = time.perf_counter()
+    swept = registry.evict_idle()
+    sweep_ms = (time.perf_counter() - start) * 1000
+    after_sweep = heap() - base
+
+    waits = []
+    intact = 0
+    for key, state in expected.items():
+        start = time.perf_counter()
+        agent = registry.checkout(key)
+        waits.append(time.perf_counter() - start)
+        intact += agent is not None and fingerprint(agent) == state
+        registry.checkin(key)
+    tracemalloc.stop()
+    stats = registry.stats()
+
+    n = args.sessions
+    print(f"{n} idle sessions, 0-{MAX_SCRIPTED_TURNS} answers each")
+    print(f"  held in session state   heap {unbounded / MB:7.1f} MB  ({unbounded / n / 1024:.1f} KB/session, "
+          f"estimate {estimated / n / 1024:.1f} KB)")
+    print(f"  registry, {args.ceiling_mb:g} MB ceiling  heap {bounded / MB:7.1f} MB  peak {bounded_peak / MB:.1f} MB  "
+          f"tracked max {most_held / MB:.1f} MB  live {filled['live']}")
+    print(f"    spilled at the ceiling {filled['evicted_capacity']}, idle during arrivals {filled['evicted_idle']}, "
+          f"rejected {filled['rejected']}, {build_s / n * 1e6:.0f}us per session incl. building the agent")
+    print(f"  after the idle sweep    heap {after_sweep / MB:7.1f} MB  spilled {swept} in {sweep_ms:.0f}ms, "
+          f"live {filled['live'] - swept}")
+    print(f"  rehydrated {len(waits)}: {intact} identical to before the spill, "
+          f"p50 {percentile(waits, 50) * 1000:.2f}ms p95 {percentile(waits, 95) * 1000:.2f}ms  "
+          f"(hits {stats['hits']}, rehydrated {stats['rehydrated']}, misses {stats['misses']})")
+    print(f"  spill store {os.path.getsize(db.path) / MB:.1f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
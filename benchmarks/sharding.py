@@ -0,0 +1,240 @@
+"""Local multi-process harness for the shard router.
+
+Starts the mock OpenAI server, ``--max-workers`` interview API processes and
+a ``shard_router`` process, all on localhost and sharing one SQLite database
+seeded with ``--links`` session links. Each API worker gets
+``--summary-threads`` threads for summary calls (API and speculation
+threads), the per-node resource that caps its interview capacity.
+
+Scaling curve: for 1..N workers, closed-loop clients (``--clients-per-worker``
+per worker) run complete interviews through the router for ``--duration``
+seconds; completed interviews per minute are compared with N times the
+single-worker rate. CPU used by all processes is printed per step: once it
+reaches the host's core count the curve flattens because the machine, not
+the workers, is saturated.
+
+Rebalance: with load running on two workers a third is added and then the
+first is drained, and every conversation must still complete.
+
+    python -m benchmarks.sharding
+    python -m benchmarks.sharding --max-workers 3 --duration 15
+"""
+import argparse
+import asyncio
+import copy
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.fixtures import SAMPLE_SESSION, interview_answers
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.sharding import HashRing, routing_key
+from utils.sqlite_database import SQLiteDatabaseService
+
+SHARD_TOKEN = "bench-shard-token"
+ADMIN_HEADERS = {"x-shard-token": SHARD_TOKEN}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed_links(path: str, count: int) -> list:
+    db = SQLiteDatabaseService(path)
+    session_ids = []
+    for i in range(count):
+        session = copy.deepcopy(SAMPLE_SESSION)
+        session_id = f"shard-link-{i}"
+        db.save_session({"session_id": session_id, "founder_email": session["founder_email"],
+                         "founder_inputs": json.dumps(session["founder_inputs"]), "created_at": "2024-01-01T00:00:00"})
+        session_ids.append(session_id)
+    return session_ids
+
+
+def serve(module: str, port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-m", "uvicorn", module, "--port", str(port), "--log-level", "warning"],
+                            env=env)
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/healthz", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not start")
+
+
+class Cluster:
+    def __init__(self, args, env: dict):
+        self.args = args
+        self.env = env
+        self.workers = {}
+        self.router = None
+
+    def start_worker(self) -> str:
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        threads = str(self.args.summary_threads)
+        self.workers[url] = serve("api:app", port, dict(self.env, API_WORKER_THREADS=threads, SPECULATION_WORKERS=threads))
+        wait_ready(url)
+        return url
+
+    def start_router(self, workers: list) -> str:
+        port = free_port()
+        self.router_url = f"http://127.0.0.1:{port}"
+        self.router = serve("shard_router:app", port, dict(self.env, SHARD_WORKERS=",".join(workers)))
+        wait_ready(self.router_url)
+        return self.router_url
+
+    def stop(self) -> None:
+        for process in [self.router, *self.workers.values()]:
+            if process is not None:
+                process.terminate()
+                process.wait()
+        self.workers = {}
+        self.router = None
+
+
+async def run_interview(client: httpx.AsyncClient, session_id: str) -> None:
+    response = await client.post(f"/sessions/{session_id}/conversations")
+    response.raise_for_status()
+    status = response.json()
+    for answer in interview_answers(3):
+        response = await client.post(f"/conversations/{status['conversation_id']}/messages", json={"content": answer})
+        response.raise_for_status()
+        status = response.json()
+        if status["complete"]:
+            return
+    raise RuntimeError(f"Conversation {status['conversation_id']} did not complete")
+
+
+async def closed_loop(router_url: str, links: list, clients: int, duration: float, during=None) -> dict:
+    """``clients`` testers running interviews back to back; ``during`` runs alongside them"""
+    done = {"interviews": 0, "errors": 0}
+    deadline = time.monotonic() + duration
+
+    async def tester(index: int):
+        n = index
+        while time.monotonic() < deadline:
+            try:
+                await run_interview(client, links[n % len(links)])
+                # Interviews finishing after the deadline ran with fewer clients and are not counted
+                if time.monotonic() < deadline:
+                    done["interviews"] += 1
+            except Exception as e:
+                done["errors"] += 1
+                print(f"  interview failed: {e}")
+            n += clients
+
+    limits = httpx.Limits(max_connections=clients + 10)
+    async with httpx.AsyncClient(base_url=router_url, timeout=120, limits=limits) as client:
+        start = time.monotonic()
+        tasks = [tester(i) for i in range(clients)]
+        if during is not None:
+            tasks.append(during(client))
+        await asyncio.gather(*tasks)
+        done["elapsed"] = min(time.monotonic() - start, duration)
+    return done
+
+
+def cpu_seconds() -> float:
+    """CPU time of this process (load generator, mock server) and every reaped child"""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def scaling_curve(args, env: dict, links: list) -> None:
+    print(f"scaling: {args.clients_per_worker} clients and {args.summary_threads} summary thread(s) per worker, "
+          f"{args.duration:.0f}s per step, {os.cpu_count()} core(s)")
+    baseline = None
+    for n in range(1, args.max_workers + 1):
+        cluster = Cluster(args, env)
+        try:
+            workers = [cluster.start_worker() for _ in range(n)]
+            router_url = cluster.start_router(workers)
+            cpu_before = cpu_seconds()
+            result = asyncio.run(closed_loop(router_url, links, n * args.clients_per_worker, args.duration))
+        finally:
+            cluster.stop()
+        cores = (cpu_seconds() - cpu_before) / result["elapsed"]
+        per_minute = result["interviews"] / result["elapsed"] * 60
+        if n == 1:
+            baseline = per_minute
+        # No interview finishes in a step shorter than one interview; there is then nothing to scale from
+        linear = f"{per_minute / (baseline * n):5.0%}" if baseline else "  n/a"
+        spread = HashRing(workers).spread(routing_key(link) for link in links)
+        print(f"  {n} worker(s)  {per_minute:6.1f} interviews/min  {linear} of linear  "
+              f"cpu {cores:.2f} cores  errors {result['errors']}  links per worker {sorted(spread.values())}")
+        if n == 1 and not baseline:
+            print("  no interview finished on 1 worker; raise --duration for the scaling figures")
+
+
+def rebalance(args, env: dict, links: list) -> None:
+    cluster = Cluster(args, env)
+    try:
+        first, second = cluster.start_worker(), cluster.start_worker()
+        router_url = cluster.start_router([first, second])
+        third = cluster.start_worker()
+        events = []
+
+        async def membership(client: httpx.AsyncClient):
+            await asyncio.sleep(args.duration / 3)
+            response = await client.post("/admin/workers", json={"url": third}, headers=ADMIN_HEADERS)
+            events.append(("added", third, response.json()["moved"]))
+            await asyncio.sleep(args.duration / 3)
+            response = await client.request("DELETE", "/admin/workers", json={"url": first}, headers=ADMIN_HEADERS)
+            events.append(("drained", first, response.json()["moved"]))
+
+        result = asyncio.run(closed_loop(router_url, links, 2 * args.clients_per_worker, args.duration, membership))
+        health = httpx.get(f"{router_url}/healthz").json()
+    finally:
+        cluster.stop()
+    print("rebalance under load")
+    for action, url, moved in events:
+        print(f"  {action} {url}: {moved} live conversations handed off")
+    print(f"  interviews {result['interviews']}  errors {result['errors']}  "
+          f"failed handoffs {health['handoffs']['failed']}  last rebalance {health['handoffs']['last_seconds'] * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling curve and live rebalancing for sharded interview workers")
+    parser.add_argument("--max-workers", type=int, default=4)
+    parser.add_argument("--links", type=int, default=512, help="Session links spread across workers")
+    parser.add_argument("--clients-per-worker", type=int, default=8)
+    parser.add_argument("--summary-threads", type=int, default=1, help="Summary threads per API worker")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per measurement")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply recorded LLM delays by this factor")
+    parser.add_argument("--skip-rebalance", action="store_true")
+    args = parser.parse_args()
+
+    sqlite_path = os.path.join(tempfile.mkdtemp(), "sharding.db")
+    links = seed_links(sqlite_path, args.links)
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        env = dict(os.environ, STORAGE_BACKEND="sqlite", SQLITE_PATH=sqlite_path, OPENAI_BASE_URL=mock.base_url,
+                   OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "sk-mock"),
+                   OPENAI_PROJECT_ID=os.environ.get("OPENAI_PROJECT_ID", "proj-mock"),
+                   FOUNDER_TOKEN_BUDGET_PER_HOUR="1000000000", SESSION_TOKEN_BUDGET_PER_HOUR="1000000000",
+                   SHARD_INTERNAL_TOKEN=SHARD_TOKEN)
+        scaling_curve(args, env, links)
+        if not args.skip_rebalance:
+            rebalance(args, env, links)
+
+
+if __name__ == "__main__":
+    main()
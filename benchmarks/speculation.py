@@ -0,0 +1,79 @@
+"""Perceived latency of summary turns with and without speculative prefetch.
+
+Simulated testers pause for ``--think-time`` seconds before every answer, as
+if typing. The turn after the intent question waits on the problem summary;
+with speculation on, the summary starts as soon as the question is shown and
+is usually ready by the time the answer arrives. Runs both modes against the
+mock OpenAI server and prints summary-turn percentiles, LLM calls and the
+speculator's counters.
+
+    python -m benchmarks.speculation
+    python -m benchmarks.speculation --testers 20 --think-time 1.0 --latency-scale 0.5
+"""
+import argparse
+import copy
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.interview_agent import InterviewAgent
+from benchmarks.fixtures import SAMPLE_SESSION, interview_answers
+from benchmarks.load_test import percentile
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.admission import AdmissionController, set_admission_controller
+from utils.speculation import Speculator, set_speculator
+
+
+def run_tester(think_time: float) -> list:
+    session = copy.deepcopy(SAMPLE_SESSION)
+    agent = InterviewAgent(session_id=session["session_id"], session_data=session)
+    agent.start_interview()
+    summary_turns = []
+    for answer in interview_answers(len(session["founder_inputs"]["problems"])):
+        time.sleep(think_time)
+        summary_turn = agent.stage == "closing"
+        start = time.perf_counter()
+        agent.get_response(answer)
+        if summary_turn:
+            summary_turns.append(time.perf_counter() - start)
+    return summary_turns
+
+
+def run(args, enabled: bool, mock) -> dict:
+    speculator = Speculator(workers=args.testers, enabled=enabled)
+    set_speculator(speculator)
+    calls_before = len(mock.calls)
+    with ThreadPoolExecutor(max_workers=args.testers) as pool:
+        results = list(pool.map(lambda _: run_tester(args.think_time), range(args.testers)))
+    return {
+        "turns": [t for r in results for t in r],
+        "llm_calls": len(mock.calls) - calls_before,
+        "stats": speculator.stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark speculative summaries against on-demand ones")
+    parser.add_argument("--testers", type=int, default=10)
+    parser.add_argument("--think-time", type=float, default=2.0, help="Seconds a tester takes to answer")
+    parser.add_argument("--latency-scale", type=float, default=0.5, help="Multiply recorded LLM delays by this factor")
+    args = parser.parse_args()
+
+    set_admission_controller(AdmissionController(1e12, 1e12, 1e12, 1e12))
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+        results = {"on-demand": run(args, False, mock), "speculative": run(args, True, mock)}
+
+    for name, result in results.items():
+        turns = result["turns"]
+        print(f"{name:<12} summary turns {len(turns)}  p50 {percentile(turns, 50) * 1000:.1f}ms  "
+              f"p95 {percentile(turns, 95) * 1000:.1f}ms  llm calls {result['llm_calls']}")
+    stats = results["speculative"]["stats"]
+    print(f"speculation  started {stats['started']}  hits {stats['hits']}  discarded {stats['discarded']}  "
+          f"hidden {stats['hidden_seconds']:.1f}s  still waited {stats['waited_seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
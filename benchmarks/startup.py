@@ -0,0 +1,124 @@
+"""Cold-start cost of app.py, measured in fresh interpreters.
+
+Reports:
+
+* ``import app`` wall time (median of ``--runs`` fresh processes), next to
+  ``import streamlit`` alone so the app's own share is visible;
+* the heaviest imports from ``python -X importtime -c "import app"``;
+* first paint of the login page and of a tester link (``?session_id=``),
+  each in a fresh process under ``AppTest`` with local SQLite and the mock
+  OpenAI server.
+
+It exits non-zero if the login page pulls in a module listed in
+``DEFERRED_MODULES`` or, with ``--budget-ms``, if importing app takes longer
+than the budget, so it can run as a regression check.
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 600
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Loaded only by the pages (or tools) that use them
+DEFERRED_MODULES = ("openai", "requests", "supabase", "cryptography", "pyarrow")
+
+FIRST_PAINT = r"""
+import json, os, sys, time
+from streamlit.testing.v1 import AppTest
+from benchmarks.fixtures import SAMPLE_SESSION
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.sqlite_database import SQLiteDatabaseService
+
+db = SQLiteDatabaseService(os.environ["SQLITE_PATH"])
+if not db.get_session(SAMPLE_SESSION["session_id"]):
+    db.save_session({**SAMPLE_SESSION, "founder_inputs": json.dumps(SAMPLE_SESSION["founder_inputs"])})
+
+script = '''
+import streamlit as st
+{query}
+import app
+app.main()
+'''.format(query=sys.argv[1])
+with MockOpenAIServer(latency_scale=0) as mock:
+    os.environ["OPENAI_BASE_URL"] = mock.base_url
+    ready = time.perf_counter()
+    at = AppTest.from_string(script, default_timeout=60).run()
+    painted = time.perf_counter()
+print(json.dumps({
+    "first_paint_ms": (painted - ready) * 1000,
+    "exceptions": [e.value for e in at.exception],
+    "deferred_loaded": [m for m in json.loads(sys.argv[2]) if m in sys.modules]
+}))
+"""
+
+
+def python(code: str, *argv, flags=(), env=None) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code, *argv], capture_output=True, text=True, env=env, check=True)
+
+
+def median_import_ms(module: str, runs: int) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+    return statistics.median(float(python(code).stdout) for _ in range(runs))
+
+
+def heaviest_imports(limit: int) -> list:
+    """Top-level packages by cumulative import time, from -X importtime"""
+    stderr = python("import app", flags=("-X", "importtime")).stderr
+    totals = {}
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match and len(match.group(2)) <= 3:
+            totals[match.group(3)] = int(match.group(1)) / 1000
+    return sorted(totals.items(), key=lambda item: -item[1])[:limit]
+
+
+def first_paint(query: str, env: dict) -> dict:
+    result = python(FIRST_PAINT, query, json.dumps(DEFERRED_MODULES), env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app.py cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per import measurement")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail if importing app takes longer than this")
+    args = parser.parse_args()
+
+    env = dict(os.environ, STORAGE_BACKEND="sqlite", SQLITE_PATH=os.path.join(tempfile.mkdtemp(), "startup.db"),
+               OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "sk-mock"),
+               OPENAI_PROJECT_ID=os.environ.get("OPENAI_PROJECT_ID", "proj-mock"))
+
+    streamlit_ms = median_import_ms("streamlit", args.runs)
+    app_ms = median_import_ms("app", args.runs)
+    print(f"import streamlit     {streamlit_ms:.0f}ms")
+    print(f"import app           {app_ms:.0f}ms ({app_ms - streamlit_ms:.0f}ms on top of streamlit)")
+    print("heaviest imports (-X importtime, cumulative)")
+    for module, ms in heaviest_imports(args.top):
+        print(f"  {module:<28} {ms:.0f}ms")
+
+    login = first_paint("", env)
+    tester = first_paint('st.query_params["session_id"] = "bench-session"', env)
+    print(f"first paint, login   {login['first_paint_ms']:.0f}ms")
+    print(f"first paint, tester  {tester['first_paint_ms']:.0f}ms")
+
+    failures = []
+    for name, result in (("login", login), ("tester link", tester)):
+        if result["exceptions"]:
+            failures.append(f"{name} page raised: {result['exceptions']}")
+    if login["deferred_loaded"]:
+        failures.append(f"login page imported {', '.join(login['deferred_loaded'])}")
+    if args.budget_ms is not None and app_ms > args.budget_ms:
+        failures.append(f"import app took {app_ms:.0f}ms, budget {args.budget_ms:.0f}ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Per-operation latency of the storage backends.
+
+Compares the hot-path calls (``get_session`` on every rerun, ``save_responses``
+and bulk writes) on local SQLite against the Supabase stand-in with a
+simulated network round trip.
+
+    python -m benchmarks.storage --ops 2000 --remote-latency 0.03
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.fixtures import SAMPLE_SESSION
+from benchmarks.local_supabase import LocalSupabaseClient
+from utils.database import DatabaseService
+from utils.sqlite_database import SQLiteDatabaseService
+
+
+def time_ops(fn, count: int) -> dict:
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {"p50_ms": statistics.median(samples) * 1000, "p99_ms": samples[int(len(samples) * 0.99) - 1] * 1000}
+
+
+def bench_backend(db, ops: int) -> dict:
+    for i in range(100):
+        db.save_session({
+            "session_id": f"s{i}",
+            "founder_email": SAMPLE_SESSION["founder_email"],
+            "founder_inputs": json.dumps(SAMPLE_SESSION["founder_inputs"])
+        })
+    responses = [{"type": "problem_resonance", "problem": "p", "resonance_score": 4}] * 20
+    results = {
+        "get_session": time_ops(lambda i: db.get_session(f"s{i % 100}"), ops),
+        "save_responses": time_ops(lambda i: db.save_responses(f"s{i % 100}", responses), ops)
+    }
+    batch = [{"session_id": f"s{i % 100}", "responses": responses} for i in range(1000)]
+    start = time.perf_counter()
+    db.save_responses_batch(batch)
+    results["save_responses_batch_1000"] = {"total_ms": (time.perf_counter() - start) * 1000}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark storage backend latency")
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--remote-latency", type=float, default=0.03, help="Simulated Supabase round trip in seconds")
+    args = parser.parse_args()
+
+    backends = {
+        "sqlite": SQLiteDatabaseService(os.path.join(tempfile.mkdtemp(), "bench.db")),
+        "supabase (simulated)": DatabaseService(client=LocalSupabaseClient(latency=args.remote_latency)),
+    }
+    for name, db in backends.items():
+        ops = args.ops if name == "sqlite" else max(1, min(args.ops, 100))
+        print(f"== {name}")
+        for op, result in bench_backend(db, ops).items():
+            print(f"  {op:<28}" + "  ".join(f"{k} {v:.3f}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
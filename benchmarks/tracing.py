@@ -0,0 +1,106 @@
+"""Overhead of the tracing layer, and a sample breakdown of where turn time goes.
+
+Runs simulated testers (a ``get_session`` per rerun, as Streamlit does, then
+the agent's reply) against SQLite and the mock OpenAI server, once with the
+default no-op tracer and once exporting spans to a file, then prints the
+turn latency of both runs, the per-call overhead of a traced database call
+and ``trace_tool.py``'s breakdown of the recorded turns.
+
+    python -m benchmarks.tracing
+    python -m benchmarks.tracing --testers 8 --exporter sqlite
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fixtures import interview_answers
+from benchmarks.load_test import percentile, seed_session
+from benchmarks.mock_openai import MockOpenAIServer
+from utils.admission import AdmissionController, set_admission_controller
+from utils.sqlite_database import SQLiteDatabaseService
+from utils.tracing import JsonlSpanExporter, SQLiteSpanExporter, Tracer, get_tracer, set_tracer
+
+
+def run_tester(db, session_id: str) -> list:
+    from agents.interview_agent import InterviewAgent
+
+    session_data = db.get_session(session_id)
+    session_data["founder_inputs"] = json.loads(session_data["founder_inputs"])
+    agent = InterviewAgent(session_id=session_id, session_data=session_data)
+    agent.start_interview()
+    turns = []
+    for answer in interview_answers(len(session_data["founder_inputs"]["problems"])):
+        start = time.perf_counter()
+        # Stands in for the Streamlit rerun that wraps each chat message
+        with get_tracer().start_as_current_span("app.rerun", {"session_id": session_id}):
+            db.get_session(session_id)
+            agent.get_response(answer)
+        turns.append(time.perf_counter() - start)
+    return turns
+
+
+def run(db, session_id: str, testers: int) -> list:
+    with ThreadPoolExecutor(max_workers=testers) as pool:
+        return [t for turns in pool.map(lambda _: run_tester(db, session_id), range(testers)) for t in turns]
+
+
+def per_call_us(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tracing overhead and print a turn breakdown")
+    parser.add_argument("--testers", type=int, default=4)
+    parser.add_argument("--latency-scale", type=float, default=0.1, help="Multiply recorded LLM delays by this factor")
+    parser.add_argument("--exporter", choices=["file", "sqlite"], default="file")
+    parser.add_argument("--calls", type=int, default=20000, help="Database calls for the per-call overhead")
+    args = parser.parse_args()
+
+    set_admission_controller(AdmissionController(1e12, 1e12, 1e12, 1e12))
+    directory = tempfile.mkdtemp()
+    db = SQLiteDatabaseService(os.path.join(directory, "tracing.db"))
+    session_id = seed_session(db)
+    extension = ".jsonl" if args.exporter == "file" else ".db"
+    exporter_class = JsonlSpanExporter if args.exporter == "file" else SQLiteSpanExporter
+    trace_path = os.path.join(directory, "traces" + extension)
+    exporter = exporter_class(trace_path)
+
+    set_tracer(Tracer())
+    noop_us = per_call_us(lambda: db.get_session(session_id), args.calls)
+    # Spans from the tight loop go to their own file so they don't drown out the turns
+    set_tracer(Tracer(exporter_class(os.path.join(directory, "calls" + extension))))
+    traced_us = per_call_us(lambda: db.get_session(session_id), args.calls)
+    get_tracer().flush()
+
+    with MockOpenAIServer(latency_scale=args.latency_scale) as mock:
+        os.environ['OPENAI_BASE_URL'] = mock.base_url
+        os.environ.setdefault('OPENAI_API_KEY', 'sk-mock')
+        os.environ.setdefault('OPENAI_PROJECT_ID', 'proj-mock')
+
+        set_tracer(Tracer())
+        untraced = run(db, session_id, args.testers)
+        set_tracer(Tracer(exporter))
+        traced = run(db, session_id, args.testers)
+        get_tracer().flush()
+
+    print(f"get_session        no-op tracer {noop_us:6.1f}us/call   exporting {traced_us:6.1f}us/call")
+    for name, turns in (("untraced", untraced), ("traced", traced)):
+        print(f"turns {name:<12} n={len(turns)}  p50 {percentile(turns, 50) * 1000:7.1f}ms  "
+              f"p95 {percentile(turns, 95) * 1000:7.1f}ms")
+    print()
+    for extra in ([], ["--by-stage"]):
+        root = "interview.turn" if extra else "app.rerun"
+        subprocess.run([sys.executable, "trace_tool.py", trace_path, "--root", root, *extra], check=True)
+        print()
+
+
+if __name__ == "__main__":
+    main()
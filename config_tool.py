@@ -7,6 +7,7 @@ def main():
     parser.add_argument("--env", default="development", help="Environment (development/production)")
     parser.add_argument("--encrypt", action="store_true", help="Encrypt and save configuration")
     parser.add_argument("--decrypt", action="store_true", help="Load and decrypt configuration")
+    parser.add_argument("--upgrade", action="store_true", help="Rewrite config.enc in the current encrypted format")
     args = parser.parse_args()
     
     config = ConfigManager(env=args.env)
@@ -28,13 +29,35 @@ def main():
     
     elif args.decrypt:
         password = getpass.getpass("Enter decryption password: ")
-        config.load_encrypted_config(password)
+        try:
+            config.load_encrypted_config(password, strict=True)
+        except ValueError as e:
+            print(f"{e}")
+            return
         
         if config.validate_config():
             print("Configuration loaded and validated successfully!")
         else:
             print("Configuration validation failed after decryption.")
     
+    elif args.upgrade:
+        password = getpass.getpass("Enter decryption password: ")
+        try:
+            # Every entry must decrypt, or the rewrite would replace the secrets with .env values
+            version = config.load_encrypted_config(password, strict=True)
+        except ValueError as e:
+            print(f"{e}; config.enc left unchanged.")
+            return
+        if version is None:
+            print("No config.enc to upgrade")
+            return
+        if not config.validate_config():
+            print("Configuration validation failed after decryption; config.enc left unchanged.")
+            return
+        config.save_encrypted_config(password, backup=True)
+        print(f"config.enc rewritten from format version {version} to the current format "
+              f"(previous file kept as config.enc.bak)")
+    
     else:
         if config.validate_config():
             print("Current configuration is valid.")
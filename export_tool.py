@@ -0,0 +1,25 @@
+import argparse
+import time
+from utils.exporter import FORMATS, TABLE_SCHEMAS, InterviewExporter
+from utils.storage import get_database_service
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a founder's interview data to Parquet, Arrow or CSV")
+    parser.add_argument("founder_email", help="Founder whose sessions to export")
+    parser.add_argument("--out", default="export", help="Output directory, one file per table")
+    parser.add_argument("--format", choices=FORMATS, default="parquet", help="Output format")
+    parser.add_argument("--tables", nargs="+", choices=list(TABLE_SCHEMAS), help="Only export these tables")
+    parser.add_argument("--page-size", type=int, default=500, help="Sessions read per page")
+    args = parser.parse_args()
+
+    exporter = InterviewExporter(get_database_service(), page_size=args.page_size)
+    start = time.perf_counter()
+    counts = exporter.export(args.founder_email, args.out, fmt=args.format, tables=args.tables)
+    elapsed = time.perf_counter() - start
+
+    for table, rows in counts.items():
+        print(f"{table:<16} {rows} rows")
+    print(f"Exported to {args.out} in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
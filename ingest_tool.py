@@ -0,0 +1,39 @@
+import argparse
+import sys
+import time
+from utils.ingest import IngestPipeline
+from utils.storage import get_database_service
+
+def main():
+    parser = argparse.ArgumentParser(description="Import externally-run interviews from JSONL transcripts")
+    parser.add_argument("path", help="JSONL file, one interview per line, or - for stdin")
+    parser.add_argument("--founder-email", help="Founder for transcripts that do not name one")
+    parser.add_argument("--batch-size", type=int, default=500, help="Interviews saved per database round trip")
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, do not save")
+    args = parser.parse_args()
+
+    pipeline = IngestPipeline(
+        None if args.dry_run else get_database_service(),
+        batch_size=args.batch_size,
+        founder_email=args.founder_email
+    )
+    start = time.perf_counter()
+    if args.path == "-":
+        stats = pipeline.ingest(sys.stdin, dry_run=args.dry_run)
+    else:
+        stats = pipeline.ingest_file(args.path, dry_run=args.dry_run)
+    elapsed = time.perf_counter() - start
+
+    for error in stats["errors"]:
+        print(f"line {error['line']}: {error['error']}")
+    verb = "Validated" if args.dry_run else "Imported"
+    print(f"{verb} {stats['imported']} of {stats['lines']} interviews "
+          f"({stats['rejected']} rejected) in {elapsed:.2f}s")
+    if stats["error"]:
+        print(f"Import stopped, saving to the database failed: {stats['error']}")
+        print("Interviews already imported stay saved; run the same file again to import the rest.")
+    if stats["rejected"] or stats["error"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
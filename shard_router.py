@@ -0,0 +1,261 @@
+"""Consistent-hashing router in front of several interview API workers.
+
+Interview agents live in the memory of the worker that created them, so every
+request for a conversation has to reach that worker. The router places each
+session link on a hash ring of workers (``utils.sharding.HashRing``) and
+forwards requests there; conversation ids carry their session's routing key,
+so no lookup table is needed and any number of routers agree.
+
+    SHARD_WORKERS=http://127.0.0.1:8001,http://127.0.0.1:8002 uvicorn shard_router:app --port 8000
+
+Workers are added or drained at runtime:
+
+    GET    /admin/workers                       current ring
+    POST   /admin/workers   {"url": "..."}      add a worker
+    DELETE /admin/workers   {"url": "..."}      drain and remove a worker
+
+A membership change rebalances live conversations: requests for the session
+links that change owner are held, turns already in flight finish, each moved
+conversation is exported from its old worker and imported on its new one,
+and then the new ring takes effect. A worker that dies without being drained
+loses the conversations it held in memory; removing it skips it and still
+takes it out of the ring.
+
+The admin endpoints, and the workers' ``/internal`` ones the rebalance uses,
+hand out live transcripts, so both refuse every call unless
+``SHARD_INTERNAL_TOKEN`` is set and sent as ``X-Shard-Token``.
+"""
+from typing import Dict, List, Optional
+import asyncio
+import hmac
+import json
+import os
+import re
+import time
+import httpx
+from dotenv import load_dotenv
+from utils.sharding import HashRing, conversation_routing_key, routing_key
+
+load_dotenv()
+
+SHARD_INTERNAL_TOKEN = os.getenv('SHARD_INTERNAL_TOKEN')
+# Connection-level headers are not forwarded
+HOP_BY_HOP_HEADERS = {b"connection", b"keep-alive", b"transfer-encoding", b"upgrade", b"host", b"content-length"}
+
+class ShardRouter:
+    """ASGI application forwarding interview API requests to the worker that owns them"""
+
+    def __init__(self, workers: List[str], vnodes: int = 256, internal_token: Optional[str] = SHARD_INTERNAL_TOKEN,
+                 timeout: float = 120.0):
+        self.ring = HashRing([w.rstrip("/") for w in workers], vnodes)
+        self.internal_token = internal_token
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        # Set while a rebalance is running: the ring it is moving to and an event fired when done
+        self._next_ring: Optional[HashRing] = None
+        self._rebalanced = asyncio.Event()
+        self._membership = asyncio.Lock()
+        self._in_flight: Dict[str, int] = {}
+        self.handoffs = {"rebalances": 0, "moved": 0, "failed": 0, "unreachable": 0, "last_seconds": 0.0}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created inside the event loop that serves requests
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=httpx.Limits(max_connections=1000))
+        return self._client
+
+    def _internal_headers(self) -> Dict[str, str]:
+        return {"x-shard-token": self.internal_token} if self.internal_token else {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        try:
+            if scope["path"] == "/admin/workers":
+                await self._admin(scope, body, send)
+            elif scope["path"] == "/healthz":
+                await self._json(send, 200, {"status": "ok", "workers": self.ring.nodes, "handoffs": self.handoffs})
+            else:
+                await self._forward(scope, body, send)
+        except Exception as e:
+            print(f"Error routing {scope['method']} {scope['path']}: {str(e)}")
+            await self._json(send, 502, {"error": "Bad gateway"})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._client is not None:
+                    await self._client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _json(self, send, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def key_for(path: str) -> Optional[str]:
+        """Routing key of a request path, or None for paths no worker owns"""
+        match = re.match(r"^/sessions/([^/]+)/", path)
+        if match:
+            return routing_key(match.group(1))
+        match = re.match(r"^/conversations/([^/]+)", path)
+        if match:
+            return conversation_routing_key(match.group(1))
+        return None
+
+    async def _owner(self, key: str) -> str:
+        # Keys changing owner wait for the handoff; everything else goes straight through
+        while self._next_ring is not None and self._next_ring.node_for(key) != self.ring.node_for(key):
+            await self._rebalanced.wait()
+        return self.ring.node_for(key)
+
+    async def _forward(self, scope, body: bytes, send) -> None:
+        key = self.key_for(scope["path"])
+        if key is None:
+            await self._json(send, 404, {"error": "Not found"})
+            return
+        worker = await self._owner(key)
+        if worker is None:
+            await self._json(send, 503, {"error": "No workers available"})
+            return
+
+        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        try:
+            headers = [(k, v) for k, v in scope["headers"] if k not in HOP_BY_HOP_HEADERS]
+            url = worker + scope["path"] + (f"?{scope['query_string'].decode()}" if scope.get("query_string") else "")
+            request = self.client.build_request(scope["method"], url, headers=headers, content=body)
+            response = await self.client.send(request, stream=True)
+            try:
+                await send({
+                    "type": "http.response.start",
+                    "status": response.status_code,
+                    "headers": [(k, v) for k, v in response.headers.raw if k.lower() not in HOP_BY_HOP_HEADERS]
+                })
+                # Passed through chunk by chunk so server-sent events reach the client as they are written
+                async for chunk in response.aiter_raw():
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+            finally:
+                await response.aclose()
+        finally:
+            self._in_flight[key] -= 1
+            if not self._in_flight[key]:
+                del self._in_flight[key]
+
+    async def _admin(self, scope, body: bytes, send) -> None:
+        if not self.internal_token:
+            await self._json(send, 403, {"error": "Admin endpoints are disabled until SHARD_INTERNAL_TOKEN is set"})
+            return
+        sent = dict(scope["headers"]).get(b"x-shard-token") or b""
+        if not hmac.compare_digest(sent, self.internal_token.encode("utf-8")):
+            await self._json(send, 403, {"error": "Forbidden"})
+            return
+        if scope["method"] == "GET":
+            await self._json(send, 200, {"workers": self.ring.nodes})
+            return
+        try:
+            url = json.loads(body or b"{}").get("url", "").rstrip("/")
+        except (ValueError, AttributeError):
+            url = ""
+        if not url:
+            await self._json(send, 400, {"error": "url is required"})
+            return
+        if scope["method"] == "POST":
+            moved = await self.add_worker(url)
+        elif scope["method"] == "DELETE":
+            if url not in self.ring.nodes:
+                await self._json(send, 404, {"error": "Unknown worker"})
+                return
+            moved = await self.remove_worker(url)
+        else:
+            await self._json(send, 405, {"error": "Method not allowed"})
+            return
+        await self._json(send, 200, {"workers": self.ring.nodes, "moved": moved})
+
+    async def add_worker(self, url: str) -> int:
+        ring = self.ring.copy()
+        ring.add_node(url)
+        return await self._rebalance(ring)
+
+    async def remove_worker(self, url: str) -> int:
+        ring = self.ring.copy()
+        ring.remove_node(url)
+        return await self._rebalance(ring)
+
+    async def _rebalance(self, ring: HashRing) -> int:
+        """Move every conversation whose owner differs under ``ring``; returns how many moved"""
+        async with self._membership:
+            started = time.perf_counter()
+            old = self.ring
+            self._rebalanced = asyncio.Event()
+            self._next_ring = ring
+            try:
+                # New requests for moving keys are now held; let the ones already sent finish
+                while any(ring.node_for(key) != old.node_for(key) for key in self._in_flight):
+                    await asyncio.sleep(0.005)
+                moves = []
+                unreachable = 0
+                for worker in old.nodes:
+                    try:
+                        response = await self.client.get(f"{worker}/internal/conversations",
+                                                         headers=self._internal_headers())
+                        response.raise_for_status()
+                        conversation_ids = response.json()["conversations"]
+                    except Exception as e:
+                        # Most likely dead: what it held is gone either way, and it must not block the new ring
+                        print(f"Skipping worker {worker} in rebalance, could not list its conversations: {str(e)}")
+                        unreachable += 1
+                        continue
+                    for conversation_id in conversation_ids:
+                        target = ring.node_for(conversation_routing_key(conversation_id))
+                        if target != worker:
+                            moves.append(self._hand_off(conversation_id, worker, target))
+                results = await asyncio.gather(*moves)
+                self.ring = ring
+            finally:
+                self._next_ring = None
+                self._rebalanced.set()
+            moved = sum(results)
+            self.handoffs["rebalances"] += 1
+            self.handoffs["moved"] += moved
+            self.handoffs["failed"] += len(results) - moved
+            self.handoffs["unreachable"] += unreachable
+            self.handoffs["last_seconds"] = time.perf_counter() - started
+            return moved
+
+    async def _hand_off(self, conversation_id: str, source: str, target: str) -> bool:
+        try:
+            response = await self.client.post(f"{source}/internal/conversations/{conversation_id}/export",
+                                              headers=self._internal_headers())
+            if response.status_code == 404:
+                # Finished and cleaned up between listing and export
+                return True
+            response.raise_for_status()
+            response = await self.client.post(f"{target}/internal/conversations", json=response.json(),
+                                              headers=self._internal_headers())
+            response.raise_for_status()
+            return True
+        except Exception as e:
+            print(f"Error handing off conversation {conversation_id} from {source} to {target}: {str(e)}")
+            return False
+
+app = ShardRouter([w for w in os.getenv('SHARD_WORKERS', '').split(',') if w.strip()])
@@ -0,0 +1,49 @@
+-- One row per LLM call, written in batches by utils.llm_usage.UsageMeter
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id BIGSERIAL PRIMARY KEY,
+    site TEXT NOT NULL,
+    model TEXT NOT NULL,
+    session_id TEXT,
+    founder_email TEXT,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd NUMERIC(12, 6) NOT NULL DEFAULT 0,
+    latency_ms INTEGER,
+    ttft_ms INTEGER,
+    estimated BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_usage_session_id ON llm_usage(session_id);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_founder_created ON llm_usage(founder_email, created_at);
+
+-- Rollups used to find hot spots and check budgets
+CREATE OR REPLACE VIEW llm_usage_by_session AS
+SELECT
+    founder_email,
+    session_id,
+    COUNT(*) AS calls,
+    SUM(prompt_tokens) AS prompt_tokens,
+    SUM(completion_tokens) AS completion_tokens,
+    SUM(total_tokens) AS total_tokens,
+    SUM(cost_usd) AS cost_usd,
+    AVG(latency_ms)::INTEGER AS avg_latency_ms,
+    AVG(ttft_ms)::INTEGER AS avg_ttft_ms
+FROM llm_usage
+GROUP BY founder_email, session_id;
+
+CREATE OR REPLACE VIEW llm_usage_by_founder AS
+SELECT
+    founder_email,
+    site,
+    model,
+    COUNT(*) AS calls,
+    SUM(total_tokens) AS total_tokens,
+    SUM(cost_usd) AS cost_usd,
+    AVG(latency_ms)::INTEGER AS avg_latency_ms
+FROM llm_usage
+GROUP BY founder_email, site, model;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,41 @@
+-- Shared token buckets for utils.admission.DatabaseBucketStore
+CREATE TABLE IF NOT EXISTS token_buckets (
+    bucket_key TEXT PRIMARY KEY,
+    tokens DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Atomically refill a bucket and take p_amount tokens from it (negative gives tokens back)
+CREATE OR REPLACE FUNCTION take_tokens(
+    p_key TEXT,
+    p_amount DOUBLE PRECISION,
+    p_capacity DOUBLE PRECISION,
+    p_refill_rate DOUBLE PRECISION
+) RETURNS BOOLEAN AS $$
+DECLARE
+    available DOUBLE PRECISION;
+BEGIN
+    INSERT INTO token_buckets (bucket_key, tokens, updated_at)
+    VALUES (p_key, p_capacity, CURRENT_TIMESTAMP)
+    ON CONFLICT (bucket_key) DO NOTHING;
+
+    SELECT LEAST(p_capacity, tokens + EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - updated_at)) * p_refill_rate)
+    INTO available
+    FROM token_buckets
+    WHERE bucket_key = p_key
+    FOR UPDATE;
+
+    IF available < p_amount THEN
+        UPDATE token_buckets SET tokens = available, updated_at = CURRENT_TIMESTAMP WHERE bucket_key = p_key;
+        RETURN FALSE;
+    END IF;
+
+    UPDATE token_buckets
+    SET tokens = LEAST(p_capacity, available - p_amount), updated_at = CURRENT_TIMESTAMP
+    WHERE bucket_key = p_key;
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
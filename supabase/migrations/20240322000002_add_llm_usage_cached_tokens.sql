@@ -0,0 +1,20 @@
+-- Prompt tokens served from the provider's prefix cache (reported or estimated)
+ALTER TABLE llm_usage ADD COLUMN IF NOT EXISTS cached_tokens INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE VIEW llm_usage_by_session AS
+SELECT
+    founder_email,
+    session_id,
+    COUNT(*) AS calls,
+    SUM(prompt_tokens) AS prompt_tokens,
+    SUM(completion_tokens) AS completion_tokens,
+    SUM(total_tokens) AS total_tokens,
+    SUM(cost_usd) AS cost_usd,
+    AVG(latency_ms)::INTEGER AS avg_latency_ms,
+    AVG(ttft_ms)::INTEGER AS avg_ttft_ms,
+    SUM(cached_tokens) AS cached_tokens
+FROM llm_usage
+GROUP BY founder_email, session_id;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
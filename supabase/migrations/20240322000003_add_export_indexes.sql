@@ -0,0 +1,5 @@
+-- Bulk export pages through a founder's sessions and then loads their rows by session_id
+CREATE INDEX IF NOT EXISTS idx_sessions_founder_email ON sessions(founder_email, id);
+CREATE INDEX IF NOT EXISTS idx_responses_session_id ON responses(session_id);
+CREATE INDEX IF NOT EXISTS idx_testers_session_id ON testers(session_id);
+CREATE INDEX IF NOT EXISTS idx_analyses_session_id ON analyses(session_id);
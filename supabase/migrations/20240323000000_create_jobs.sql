@@ -0,0 +1,84 @@
+-- Durable job queue for long LLM work (analyses, reports), see utils/job_queue.py
+CREATE TABLE IF NOT EXISTS jobs (
+    id BIGSERIAL PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'dead')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by TEXT,
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    progress JSONB,
+    result JSONB,
+    last_error TEXT,
+    founder_email TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Only unfinished jobs are ever scanned by claim_jobs
+CREATE INDEX IF NOT EXISTS idx_jobs_claimable ON jobs(priority DESC, id) WHERE status IN ('queued', 'running');
+
+-- Insert a job, or return the one already queued under the same dedupe key.
+-- A dead job with that key is reset so it runs again.
+CREATE OR REPLACE FUNCTION enqueue_job(
+    p_kind TEXT,
+    p_payload JSONB,
+    p_dedupe_key TEXT,
+    p_priority INTEGER,
+    p_max_attempts INTEGER,
+    p_founder_email TEXT
+) RETURNS SETOF jobs AS $$
+DECLARE
+    job_id BIGINT;
+BEGIN
+    INSERT INTO jobs (kind, payload, dedupe_key, priority, max_attempts, founder_email)
+    VALUES (p_kind, p_payload, p_dedupe_key, p_priority, p_max_attempts, p_founder_email)
+    ON CONFLICT (dedupe_key) DO UPDATE
+        SET status = 'queued', attempts = 0, run_after = CURRENT_TIMESTAMP, last_error = NULL, updated_at = CURRENT_TIMESTAMP
+        WHERE jobs.status = 'dead'
+    RETURNING id INTO job_id;
+
+    IF job_id IS NULL THEN
+        SELECT id INTO job_id FROM jobs WHERE dedupe_key = p_dedupe_key;
+    END IF;
+    RETURN QUERY SELECT * FROM jobs WHERE id = job_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Lease up to p_limit runnable jobs (queued and due, or running with an expired
+-- lease), highest priority first. SKIP LOCKED lets any number of workers claim
+-- concurrently without waiting on, or double-claiming, each other's rows.
+CREATE OR REPLACE FUNCTION claim_jobs(
+    p_worker TEXT,
+    p_kinds TEXT[],
+    p_limit INTEGER,
+    p_lease_seconds DOUBLE PRECISION
+) RETURNS SETOF jobs AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE jobs
+    SET status = 'running',
+        locked_by = p_worker,
+        attempts = jobs.attempts + 1,
+        lease_expires_at = CURRENT_TIMESTAMP + make_interval(secs => p_lease_seconds),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE jobs.id IN (
+        SELECT candidate.id FROM jobs candidate
+        WHERE ((candidate.status = 'queued' AND candidate.run_after <= CURRENT_TIMESTAMP)
+            OR (candidate.status = 'running' AND candidate.lease_expires_at < CURRENT_TIMESTAMP))
+          AND (p_kinds IS NULL OR candidate.kind = ANY(p_kinds))
+        ORDER BY candidate.priority DESC, candidate.id
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING jobs.*;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
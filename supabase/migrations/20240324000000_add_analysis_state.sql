@@ -0,0 +1,10 @@
+-- Incremental analyses: the compact state an analysis was folded from and the
+-- last responses row it covers, so a refresh only reads newer rows
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS state JSONB;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS watermark BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_analyses_watermark ON analyses(session_id, watermark) WHERE watermark IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_responses_session_id_id ON responses(session_id, id);
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,13 @@
+-- Interview agents spilled by idle testers' tabs, see agents/session_registry.py.
+-- Rows are removed when the interview completes; updated_at finds abandoned ones.
+CREATE TABLE IF NOT EXISTS agent_states (
+    key TEXT PRIMARY KEY,
+    session_id TEXT,
+    state JSONB NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_agent_states_updated_at ON agent_states(updated_at);
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,13 @@
+-- Client-generated keys for writes replayed from a process's local outbox
+-- (utils/outbox.py), so a batch retried after a lost response is stored once
+ALTER TABLE responses ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+ALTER TABLE testers ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+-- Plain unique indexes (NULLs stay distinct) so upserts can name the column in on_conflict
+CREATE UNIQUE INDEX IF NOT EXISTS idx_responses_idempotency_key ON responses(idempotency_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_testers_idempotency_key ON testers(idempotency_key);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_analyses_idempotency_key ON analyses(idempotency_key);
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
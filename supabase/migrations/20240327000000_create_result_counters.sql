@@ -0,0 +1,29 @@
+-- Live result counters per founder, session link, problem and day, kept up
+-- to date as interviews happen (utils/result_counters.py) so dashboards read
+-- a few summary rows instead of re-parsing every responses blob.
+-- Interview-level metrics use problem = ''.
+CREATE TABLE IF NOT EXISTS result_counters (
+    founder_email TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    problem TEXT NOT NULL DEFAULT '',
+    day DATE NOT NULL,
+    metric TEXT NOT NULL,
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (founder_email, session_id, problem, day, metric)
+);
+
+CREATE INDEX IF NOT EXISTS idx_result_counters_founder_day ON result_counters(founder_email, day);
+
+-- Atomically add a batch of increments; p_rows holds at most one row per key
+CREATE OR REPLACE FUNCTION increment_result_counters(p_rows JSONB) RETURNS VOID AS $$
+    INSERT INTO result_counters (founder_email, session_id, problem, day, metric, value, updated_at)
+    SELECT r->>'founder_email', r->>'session_id', COALESCE(r->>'problem', ''), (r->>'day')::DATE,
+           r->>'metric', (r->>'value')::BIGINT, CURRENT_TIMESTAMP
+    FROM jsonb_array_elements(p_rows) AS r
+    ON CONFLICT (founder_email, session_id, problem, day, metric)
+    DO UPDATE SET value = result_counters.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+$$ LANGUAGE sql;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,33 @@
+-- Save a batch of imported interviews (utils/ingest.py) in one transaction,
+-- skipping session ids that are already stored so an import can be re-run.
+-- Returns the skipped session ids.
+CREATE OR REPLACE FUNCTION import_interviews(p_sessions JSONB, p_responses JSONB, p_testers JSONB)
+RETURNS TEXT[] AS $$
+DECLARE
+    skipped TEXT[];
+BEGIN
+    SELECT COALESCE(array_agg(session_id), '{}') INTO skipped
+    FROM sessions
+    WHERE session_id IN (SELECT s->>'session_id' FROM jsonb_array_elements(p_sessions) AS s);
+
+    INSERT INTO sessions (session_id, founder_email, founder_inputs, created_at)
+    SELECT r.session_id, r.founder_email, r.founder_inputs, r.created_at
+    FROM jsonb_populate_recordset(NULL::sessions, p_sessions) AS r
+    WHERE r.session_id <> ALL(skipped);
+
+    INSERT INTO responses (session_id, responses, created_at)
+    SELECT r.session_id, r.responses, r.created_at
+    FROM jsonb_populate_recordset(NULL::responses, p_responses) AS r
+    WHERE r.session_id <> ALL(skipped);
+
+    INSERT INTO testers (session_id, email, opt_in, gdpr_consent, created_at)
+    SELECT r.session_id, r.email, r.opt_in, r.gdpr_consent, r.created_at
+    FROM jsonb_populate_recordset(NULL::testers, p_testers) AS r
+    WHERE r.session_id <> ALL(skipped);
+
+    RETURN skipped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,36 @@
+-- Batch keys of applied result counter increments (utils/result_counters.py),
+-- so a batch resent after a lost reply is added once. Keys are only resent by
+-- the process that made them, so a day of them is kept.
+CREATE TABLE IF NOT EXISTS result_counter_batches (
+    batch_key TEXT PRIMARY KEY,
+    applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_result_counter_batches_applied_at ON result_counter_batches(applied_at);
+
+DROP FUNCTION IF EXISTS increment_result_counters(JSONB);
+
+-- Atomically add a batch of increments, unless p_batch_key was applied before;
+-- p_rows holds at most one row per key
+CREATE OR REPLACE FUNCTION increment_result_counters(p_rows JSONB, p_batch_key TEXT DEFAULT NULL)
+RETURNS VOID AS $$
+BEGIN
+    IF p_batch_key IS NOT NULL THEN
+        DELETE FROM result_counter_batches WHERE applied_at < CURRENT_TIMESTAMP - INTERVAL '1 day';
+        INSERT INTO result_counter_batches (batch_key) VALUES (p_batch_key) ON CONFLICT (batch_key) DO NOTHING;
+        IF NOT FOUND THEN
+            RETURN;
+        END IF;
+    END IF;
+
+    INSERT INTO result_counters (founder_email, session_id, problem, day, metric, value, updated_at)
+    SELECT r->>'founder_email', r->>'session_id', COALESCE(r->>'problem', ''), (r->>'day')::DATE,
+           r->>'metric', (r->>'value')::BIGINT, CURRENT_TIMESTAMP
+    FROM jsonb_array_elements(p_rows) AS r
+    ON CONFLICT (founder_email, session_id, problem, day, metric)
+    DO UPDATE SET value = result_counters.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
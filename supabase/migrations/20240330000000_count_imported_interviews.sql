@@ -0,0 +1,47 @@
+-- Imported interviews (utils/ingest.py) also add to the live result counters,
+-- in the same transaction as the rows they are counted from. p_counters holds
+-- the increments of each interview in the batch (interview_counter_rows in
+-- utils/result_counters.py); those of skipped session ids are left out.
+DROP FUNCTION IF EXISTS import_interviews(JSONB, JSONB, JSONB);
+
+CREATE OR REPLACE FUNCTION import_interviews(p_sessions JSONB, p_responses JSONB, p_testers JSONB,
+                                             p_counters JSONB DEFAULT '[]'::JSONB)
+RETURNS TEXT[] AS $$
+DECLARE
+    skipped TEXT[];
+BEGIN
+    SELECT COALESCE(array_agg(session_id), '{}') INTO skipped
+    FROM sessions
+    WHERE session_id IN (SELECT s->>'session_id' FROM jsonb_array_elements(p_sessions) AS s);
+
+    INSERT INTO sessions (session_id, founder_email, founder_inputs, created_at)
+    SELECT r.session_id, r.founder_email, r.founder_inputs, r.created_at
+    FROM jsonb_populate_recordset(NULL::sessions, p_sessions) AS r
+    WHERE r.session_id <> ALL(skipped);
+
+    INSERT INTO responses (session_id, responses, created_at)
+    SELECT r.session_id, r.responses, r.created_at
+    FROM jsonb_populate_recordset(NULL::responses, p_responses) AS r
+    WHERE r.session_id <> ALL(skipped);
+
+    INSERT INTO testers (session_id, email, opt_in, gdpr_consent, created_at)
+    SELECT r.session_id, r.email, r.opt_in, r.gdpr_consent, r.created_at
+    FROM jsonb_populate_recordset(NULL::testers, p_testers) AS r
+    WHERE r.session_id <> ALL(skipped);
+
+    -- Grouped so one insert never touches a counter twice
+    INSERT INTO result_counters (founder_email, session_id, problem, day, metric, value, updated_at)
+    SELECT r->>'founder_email', r->>'session_id', COALESCE(r->>'problem', ''), (r->>'day')::DATE,
+           r->>'metric', SUM((r->>'value')::BIGINT), CURRENT_TIMESTAMP
+    FROM jsonb_array_elements(p_counters) AS r
+    WHERE r->>'session_id' <> ALL(skipped)
+    GROUP BY 1, 2, 3, 4, 5
+    ON CONFLICT (founder_email, session_id, problem, day, metric)
+    DO UPDATE SET value = result_counters.value + EXCLUDED.value, updated_at = CURRENT_TIMESTAMP;
+
+    RETURN skipped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh schema cache
+NOTIFY pgrst, 'reload schema';
@@ -0,0 +1,138 @@
+"""Flame-style breakdowns of recorded traces.
+
+Reads spans written with TRACING_EXPORTER=file (JSON lines) or sqlite:
+
+    python trace_tool.py data/traces.jsonl                      latency of each kind of root span
+    python trace_tool.py data/traces.jsonl --root interview.turn  where turn time goes, summed over all turns
+    python trace_tool.py data/traces.db --root app.rerun --slowest 3
+    python trace_tool.py data/traces.jsonl --root interview.turn --by-stage
+    python trace_tool.py data/traces.jsonl --root app.rerun --folded > reruns.folded   # for flamegraph.pl or speedscope
+
+``--root`` can name any span, not only trace roots: every span with that name
+is treated as the top of its own tree. Spans that ran concurrently, such as a
+speculative prefetch beside the wait for it, overlap their siblings, so the
+self-time shares of a tree can add up to more than 100%.
+"""
+import argparse
+import statistics
+from collections import defaultdict
+from utils.tracing import load_spans
+
+BAR_WIDTH = 30
+
+def duration_ms(span) -> float:
+    return (span["end_ns"] - span["start_ns"]) / 1e6
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def self_ms(span, children) -> float:
+    """Time in a span not covered by its children, which are clipped to the span"""
+    covered = sum(max(0, min(child["end_ns"], span["end_ns"]) - max(child["start_ns"], span["start_ns"]))
+                  for child in children.get(span["span_id"], ()))
+    return max(0.0, (span["end_ns"] - span["start_ns"] - covered) / 1e6)
+
+def walk(span, children, path=()):
+    """Yield ``(path, span)`` for a span and everything under it, children in start order"""
+    path = path + (span["name"],)
+    yield path, span
+    for child in sorted(children.get(span["span_id"], ()), key=lambda s: s["start_ns"]):
+        yield from walk(child, children, path)
+
+def bar(share: float) -> str:
+    return "█" * max(1, round(share * BAR_WIDTH)) if share > 0 else ""
+
+def summarize(roots) -> None:
+    by_name = defaultdict(list)
+    for span in roots:
+        by_name[span["name"]].append(duration_ms(span))
+    print(f"{'span':<36} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for name, durations in sorted(by_name.items(), key=lambda item: -sum(item[1])):
+        print(f"{name:<36} {len(durations):>6} {statistics.median(durations):>9.1f} "
+              f"{percentile(durations, 95):>9.1f} {max(durations):>9.1f}")
+
+def breakdown(tops, children) -> None:
+    """Total and self time per call path, summed over every tree"""
+    totals, selfs, counts = defaultdict(float), defaultdict(float), defaultdict(int)
+    for top in tops:
+        for path, span in walk(top, children):
+            totals[path] += duration_ms(span)
+            selfs[path] += self_ms(span, children)
+            counts[path] += 1
+    grand_total = sum(duration_ms(top) for top in tops)
+    print(f"{len(tops)} x {tops[0]['name']}, {grand_total / len(tops):.1f}ms on average\n")
+    print(f"{'path':<48} {'calls':>6} {'total ms':>10} {'self ms':>9} {'share':>6}")
+
+    # Depth-first, siblings by total time
+    def emit(prefix):
+        for path in sorted((p for p in totals if p[:-1] == prefix), key=lambda p: -totals[p]):
+            share = selfs[path] / grand_total if grand_total else 0.0
+            label = "  " * (len(path) - 1) + path[-1]
+            print(f"{label:<48} {counts[path]:>6} {totals[path]:>10.1f} {selfs[path]:>9.1f} {share:>6.1%} {bar(share)}")
+            emit(path)
+    emit(())
+
+def show_tree(top, children) -> None:
+    total = duration_ms(top) or 1e-9
+    print(f"\ntrace {top['trace_id'][:16]}  {top['name']}  {duration_ms(top):.1f}ms  {top.get('attributes') or ''}")
+    for path, span in walk(top, children):
+        offset = (span["start_ns"] - top["start_ns"]) / 1e6
+        label = "  " * (len(path) - 1) + span["name"]
+        lead = " " * round(max(0.0, offset) / total * BAR_WIDTH)
+        status = "  !" if span.get("status") == "error" else ""
+        print(f"{label:<48} +{offset:>8.1f} {duration_ms(span):>9.1f}ms {lead}{bar(duration_ms(span) / total)}{status}")
+
+def folded(tops, children) -> None:
+    stacks = defaultdict(float)
+    for top in tops:
+        for path, span in walk(top, children):
+            stacks[";".join(path)] += self_ms(span, children)
+    for stack, ms in sorted(stacks.items()):
+        print(f"{stack} {round(ms * 1000)}")
+
+def by_stage(tops) -> None:
+    stages = defaultdict(list)
+    for top in tops:
+        stages[top.get("attributes", {}).get("interview.stage", "unknown")].append(duration_ms(top))
+    print(f"{'stage':<24} {'turns':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for stage, durations in sorted(stages.items(), key=lambda item: -statistics.median(item[1])):
+        print(f"{stage:<24} {len(durations):>6} {statistics.median(durations):>9.1f} "
+              f"{percentile(durations, 95):>9.1f} {max(durations):>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Print flame-style latency breakdowns of recorded traces")
+    parser.add_argument("path", help="Span file (.jsonl) or SQLite database (.db)")
+    parser.add_argument("--root", help="Span name to break down, e.g. interview.turn or app.rerun")
+    parser.add_argument("--slowest", type=int, default=0, help="Also print the N slowest trees span by span")
+    parser.add_argument("--by-stage", action="store_true", help="Latency per interview stage (with --root interview.turn)")
+    parser.add_argument("--folded", action="store_true", help="Print folded stacks (self time in microseconds)")
+    args = parser.parse_args()
+
+    spans = [span for span in load_spans(args.path) if span.get("end_ns")]
+    children = defaultdict(list)
+    for span in spans:
+        if span.get("parent_id"):
+            children[span["parent_id"]].append(span)
+
+    if not args.root:
+        known = {span["span_id"] for span in spans}
+        summarize([span for span in spans if not span.get("parent_id") or span["parent_id"] not in known])
+        return
+
+    tops = [span for span in spans if span["name"] == args.root]
+    if not tops:
+        print(f"No spans named {args.root}")
+        return
+    if args.folded:
+        folded(tops, children)
+        return
+    if args.by_stage:
+        by_stage(tops)
+        return
+    breakdown(tops, children)
+    for top in sorted(tops, key=duration_ms, reverse=True)[:args.slowest]:
+        show_tree(top, children)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+from typing import Dict, List, Optional, Tuple
+import os
+import threading
+import time
+
+# What to do with a call when its budget is exhausted
+ALLOW = "allow"
+DEGRADE = "degrade"
+SKIP = "skip"
+QUEUE = "queue"
+
+# Per call site action when over budget; DEGRADE routes to the router's fallback tier
+SITE_POLICIES = {
+    "interview.chat": DEGRADE,
+    "interview.summary": SKIP,
+    "analysis.analyze": QUEUE,
+    "analysis.update": QUEUE,
+    "analysis.report": QUEUE,
+}
+
+class AdmissionDeferred(Exception):
+    """Raised when a call is over budget and should be retried later"""
+
+    def __init__(self, site: str, retry_after: float, estimated_tokens: int = 0):
+        super().__init__(f"{site} is over its token budget, retry in {retry_after:.0f}s")
+        self.site = site
+        self.retry_after = retry_after
+        self.estimated_tokens = estimated_tokens
+
+class TokenBucket:
+    """Classic token bucket: ``capacity`` tokens, refilled at ``refill_rate`` per second"""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def try_take(self, amount: float) -> bool:
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available"""
+        self._refill()
+        if self.tokens >= amount:
+            return 0.0
+        if not self.refill_rate:
+            return float('inf')
+        return (amount - self.tokens) / self.refill_rate
+
+class InMemoryBucketStore:
+    """Token buckets held in this process; fine for a single replica"""
+
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: str, capacity: float, refill_rate: float) -> TokenBucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(capacity, refill_rate)
+        return bucket
+
+    def take(self, key: str, amount: float, capacity: float, refill_rate: float) -> bool:
+        with self._lock:
+            return self._bucket(key, capacity, refill_rate).try_take(amount)
+
+    def give_back(self, key: str, amount: float, capacity: float, refill_rate: float) -> None:
+        with self._lock:
+            self._bucket(key, capacity, refill_rate).give_back(amount)
+
+    def wait_time(self, key: str, amount: float, capacity: float, refill_rate: float) -> float:
+        with self._lock:
+            return self._bucket(key, capacity, refill_rate).wait_time(amount)
+
+class DatabaseBucketStore:
+    """Token buckets shared by every replica through the ``take_tokens`` database function.
+
+    A call the store cannot answer is let through: budgets cap spend, they
+    should not take interviews down with the database.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def take(self, key: str, amount: float, capacity: float, refill_rate: float) -> bool:
+        try:
+            return self.db.take_tokens(key, amount, capacity, refill_rate)
+        except Exception as e:
+            print(f"Error taking tokens from {key}: {str(e)}")
+            return True
+
+    def give_back(self, key: str, amount: float, capacity: float, refill_rate: float) -> None:
+        try:
+            self.db.take_tokens(key, -amount, capacity, refill_rate)
+        except Exception as e:
+            print(f"Error giving tokens back to {key}: {str(e)}")
+
+    def wait_time(self, key: str, amount: float, capacity: float, refill_rate: float) -> float:
+        # Bucket levels are not exposed, so assume the bucket was just emptied
+        if not refill_rate:
+            return float('inf')
+        return min(amount, capacity) / refill_rate
+
+class AdmissionController:
+    """Per-founder and per-session token budgets for LLM calls.
+
+    Each call must fit in both its session bucket and its founder bucket. When
+    it does not, the call site's policy decides how to degrade: fall back to a
+    cheaper model, skip the call, or queue it for later.
+    """
+
+    def __init__(self, founder_capacity: float, founder_refill: float,
+                 session_capacity: float, session_refill: float, store=None):
+        self.founder_limits = (founder_capacity, founder_refill)
+        self.session_limits = (session_capacity, session_refill)
+        self.store = store or InMemoryBucketStore()
+        self.stats: Dict[str, int] = {ALLOW: 0, DEGRADE: 0, SKIP: 0, QUEUE: 0}
+        self._lock = threading.Lock()
+
+    def _keys(self, founder_email: Optional[str], session_id: Optional[str]) -> List[Tuple[str, Tuple[float, float]]]:
+        keys = []
+        if session_id:
+            keys.append((f"session:{session_id}", self.session_limits))
+        if founder_email:
+            keys.append((f"founder:{founder_email}", self.founder_limits))
+        return keys
+
+    def admit(self, site: str, estimated_tokens: int, founder_email: Optional[str] = None,
+              session_id: Optional[str] = None) -> str:
+        """Reserve tokens for a call; returns ALLOW or the site's over-budget action"""
+        taken = []
+        for key, (capacity, refill) in self._keys(founder_email, session_id):
+            if not self.store.take(key, estimated_tokens, capacity, refill):
+                # Undo partial reservations so one bucket does not drain the other
+                for taken_key, (c, r) in taken:
+                    self.store.give_back(taken_key, estimated_tokens, c, r)
+                decision = SITE_POLICIES.get(site, DEGRADE)
+                break
+            taken.append((key, (capacity, refill)))
+        else:
+            decision = ALLOW
+        with self._lock:
+            self.stats[decision] += 1
+        return decision
+
+    def retry_after(self, estimated_tokens: int, founder_email: Optional[str] = None,
+                    session_id: Optional[str] = None) -> float:
+        """Seconds until a call of this size would fit every bucket"""
+        return max([self.store.wait_time(key, estimated_tokens, c, r)
+                    for key, (c, r) in self._keys(founder_email, session_id)] or [0.0])
+
+def _budget_from_env(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+def _bucket_store():
+    """Buckets named by ``ADMISSION_STORE``: ``memory`` (default) or ``database``.
+
+    In-memory buckets are per process, so every app replica, API shard and job
+    worker would grant a founder the full budget again; deployments running
+    more than one of them set ``database`` to share one set of buckets.
+    """
+    store = os.getenv('ADMISSION_STORE', 'memory').lower()
+    if store == 'memory':
+        return InMemoryBucketStore()
+    if store == 'database':
+        from utils.storage import get_database_service
+        return DatabaseBucketStore(get_database_service())
+    raise ValueError(f"Unknown ADMISSION_STORE '{store}', expected 'memory' or 'database'")
+
+# Process-wide controller, built on first use so importing opens no database;
+# budgets are tokens per hour and refill continuously
+admission_controller: Optional[AdmissionController] = None
+_controller_lock = threading.Lock()
+
+def get_admission_controller() -> AdmissionController:
+    global admission_controller
+    with _controller_lock:
+        if admission_controller is None:
+            founder_budget = _budget_from_env('FOUNDER_TOKEN_BUDGET_PER_HOUR', 200000)
+            session_budget = _budget_from_env('SESSION_TOKEN_BUDGET_PER_HOUR', 40000)
+            admission_controller = AdmissionController(
+                founder_capacity=founder_budget,
+                founder_refill=founder_budget / 3600,
+                session_capacity=session_budget,
+                session_refill=session_budget / 3600,
+                store=_bucket_store()
+            )
+        return admission_controller
+
+def set_admission_controller(controller: AdmissionController) -> None:
+    """Swap the process-wide controller, e.g. for benchmarks with their own budgets"""
+    global admission_controller
+    admission_controller = controller
@@ -0,0 +1,269 @@
+"""Local normalization of short interview answers to the values they stand for.
+
+Three kinds of answer have a fixed set of meanings:
+
+    resonance   "4", "4/5", "four", "definitely a 5", "8 out of 10", "somewhat"   -> 1..5
+    likelihood  "very likely" ... "very unlikely", "probably not", "maybe"        -> 1..5
+    opt_in      "yes, that's fine", "sure", "rather not"                          -> True/False
+
+Rules handle the common phrasings; when they find nothing, an optional tiny
+naive Bayes model trained on ``TRAINING_EXAMPLES`` gets a say, and its guess
+is kept only when it is confident and shares words with what it was trained
+on. ``None`` means neither could tell, and the interview asks again.
+Everything runs in-process in microseconds, so answers are normalized as they
+arrive and stored next to the raw text.
+"""
+from typing import Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+import math
+import os
+import re
+import threading
+
+RESONANCE = "resonance"
+LIKELIHOOD = "likelihood"
+OPT_IN = "opt_in"
+
+SCALE_MIN, SCALE_MAX = 1, 5
+
+LIKELIHOOD_LABELS = {5: "very likely", 4: "somewhat likely", 3: "unsure", 2: "unlikely", 1: "very unlikely"}
+
+_NUMBER_WORDS = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+                 "nine": 9, "ten": 10}
+_NUMBER_WORD_RE = re.compile(r"\b(" + "|".join(_NUMBER_WORDS) + r")\b")
+
+_FRACTION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:/|out of|of)\s*(\d+)")
+_RANGE_RE = re.compile(r"\b(\d)\s*(?:-|–|to|or)\s*(\d)\b")
+_NUMBER_RE = re.compile(r"(?<![\d.])(\d+(?:\.\d+)?)(?![\d.]|\s*%)")
+
+# Checked in order; the first pattern that matches gives the value
+_RESONANCE_PHRASES = [
+    (1, r"\bnot at all\b|\bnot in the slightest\b|\bdoesn'?t\b|\bdoes not\b|\bnever\b|\bnope\b|^no\b|\bzero\b"
+        r"|\bnothing like\b|\bnot me\b|\bcan'?t relate\b"),
+    (2, r"\bnot really\b|\bnot much\b|\bnot very\b|\ba (?:little|bit)\b|\bslightly\b|\bbarely\b|\brarely\b|\bhardly\b"),
+    (3, r"\bsomewhat\b|\bmoderately\b|\bsort of\b|\bkind of\b|\bkinda\b|\bpartly\b|\bpartially\b|\bsometimes\b"
+        r"|\bneutral\b|\bmedium\b|\bin the middle\b|\b50/50\b|\bso-so\b|\bmeh\b"),
+    (5, r"\bcompletely\b|\btotally\b|\bexactly\b|\babsolutely\b|\b100%|\bspot on\b|\bso much\b|\bvery much\b"
+        r"|\bthat'?s me\b|\bhits home\b|\bdefinitely\b|\bextremely\b|\b(?:this|that) is (?:me|my life)\b|\bbig time\b"),
+    (4, r"\ba lot\b|\bmostly\b|\bquite\b|\bpretty much\b|\breally\b|\bstrongly\b|\bvery\b|\bfairly\b|\byes\b|\bresonates\b"),
+]
+
+_LIKELIHOOD_PHRASES = [
+    (1, r"\bvery unlikely\b|\bhighly unlikely\b|\bextremely unlikely\b|\bdefinitely not\b|\bno way\b|\bnever\b"
+        r"|\bnot at all\b|\bnot a chance\b|\bzero chance\b|\bnot interested\b|^no\b|\bnope\b"),
+    (2, r"\bunlikely\b|\bnot (?:very |that |so )?likely\b|\bprobably not\b|\bi doubt\b|\bdoubtful\b|\bnot really\b"
+        r"|\bi would not\b|\bi'?d not\b|\bwouldn'?t\b|\bnot for me\b|\bpass\b|\bnot convinced\b|\bskeptical\b"),
+    (5, r"\b(?:very|extremely|highly|super) likely\b|\bdefinitely\b|\babsolutely\b|\bcertainly\b|\bfor sure\b|\b100%"
+        r"|\bin a heartbeat\b|\bsign me up\b|\bwithout (?:a )?doubt\b|\bwould love\b|\btake my money\b"),
+    (3, r"\bunsure\b|\bnot sure\b|\bmaybe\b|\bdon'?t know\b|\bdunno\b|\bdepends\b|\bpossibly\b|\bmight\b|\bneutral\b"
+        r"|\b50/50\b|\bperhaps\b|\bhard to say\b|\bno idea\b|\bon the fence\b"),
+    (4, r"\blikely\b|\bprobably\b|\bi think so\b|\bwould consider\b|\bi'?d consider\b|\bi would\b|\bi'?d try\b"
+        r"|\byes\b|\byeah\b|\bsure\b|\binterested\b"),
+]
+
+_OPT_IN_PHRASES = [
+    (True, r"\bwhy not\b|\bno problem\b|\bnot a problem\b|\bdon'?t mind\b|\bdo not mind\b|\bnot at all\b"
+           r"|\bgo ahead\b|\bno worries\b|\bof course\b"),
+    (False, r"\bno\b|\bnope\b|\bnah\b|\bnot\b|\bdon'?t\b|\brather not\b|\bprefer not\b|\bpass\b|\bskip\b"
+            r"|\banonymous\b|\bprivate\b"),
+    (True, r"\byes\b|\byeah\b|\byep\b|\bsure\b|\bok(?:ay)?\b|\babsolutely\b|\bdefinitely\b|\b(?:yes )?please do\b"
+           r"|\bfine\b|\bhappy to\b|\bhappily\b|\bcount me in\b|\bsounds good\b|\bgreat\b"),
+]
+
+def _compile(phrases):
+    return [(value, re.compile(pattern)) for value, pattern in phrases]
+
+_RESONANCE_RULES = _compile(_RESONANCE_PHRASES)
+_LIKELIHOOD_RULES = _compile(_LIKELIHOOD_PHRASES)
+_OPT_IN_RULES = _compile(_OPT_IN_PHRASES)
+
+def _clean(text: str) -> str:
+    text = (text or "").lower().replace("’", "'").strip()
+    return _NUMBER_WORD_RE.sub(lambda m: str(_NUMBER_WORDS[m.group(1)]), text)
+
+def _half_up(value: float) -> int:
+    return int(math.floor(value + 0.5))
+
+def _first_phrase(rules, text: str):
+    for value, pattern in rules:
+        if pattern.search(text):
+            return value
+    return None
+
+def parse_scale(text: str) -> Optional[int]:
+    """A 1-5 score from a number in the answer, or None.
+
+    "4/5" and "4 out of 5" are read on their own scale ("8/10" is a 4), a
+    range ("3-4", "3 or 4") rounds its middle up, and a lone in-range number
+    anywhere in the answer ("definitely a 5") is taken as the score.
+    """
+    text = _clean(text)
+    fraction = _FRACTION_RE.search(text)
+    if fraction:
+        value, scale = float(fraction.group(1)), float(fraction.group(2))
+        if scale > 0 and 0 <= value <= scale:
+            return min(SCALE_MAX, max(SCALE_MIN, _half_up(value / scale * SCALE_MAX)))
+    span = _RANGE_RE.search(text)
+    if span:
+        low, high = int(span.group(1)), int(span.group(2))
+        if SCALE_MIN <= low <= SCALE_MAX and SCALE_MIN <= high <= SCALE_MAX:
+            return _half_up((low + high) / 2)
+    numbers = {float(n) for n in _NUMBER_RE.findall(text)}
+    in_range = {n for n in numbers if SCALE_MIN <= n <= SCALE_MAX and n == int(n)}
+    # "I have 2 kids, so 4" is ambiguous; only a single score is trusted
+    if len(in_range) == 1 and len(numbers) == 1:
+        return int(in_range.pop())
+    return None
+
+def parse_resonance(text: str) -> Optional[int]:
+    """How much a problem resonates, 1-5, from a number or a phrase"""
+    score = parse_scale(text)
+    if score is not None:
+        return score
+    return _first_phrase(_RESONANCE_RULES, _clean(text))
+
+def parse_likelihood(text: str) -> Optional[int]:
+    """Answer to "how likely would you be to ...", 5 (very likely) to 1 (very unlikely)"""
+    score = parse_scale(text)
+    if score is not None:
+        return score
+    return _first_phrase(_LIKELIHOOD_RULES, _clean(text))
+
+def parse_opt_in(text: str) -> Optional[bool]:
+    """Yes or no to sharing the tester's email with the founder"""
+    return _first_phrase(_OPT_IN_RULES, _clean(text))
+
+_RULES = {RESONANCE: parse_resonance, LIKELIHOOD: parse_likelihood, OPT_IN: parse_opt_in}
+
+# Seed examples for the tiny model: phrasings the rules deliberately leave alone
+TRAINING_EXAMPLES = {
+    RESONANCE: [
+        ("that is my everyday struggle", 5), ("this is literally my life", 5), ("couldn't agree more", 5),
+        ("nailed it", 5), ("painfully accurate", 5), ("ugh yes all the time", 5),
+        ("happens to me fairly often", 4), ("i can relate to that", 4), ("pretty relatable", 4),
+        ("close to my experience", 4), ("i see this a lot at work", 4),
+        ("it happens now and then", 3), ("occasionally", 3), ("it's an issue but not a big one", 3),
+        ("half the time", 3), ("some of it rings true", 3),
+        ("only once or twice", 2), ("not a big deal for me", 2), ("it's minor", 2), ("seldom an issue", 2),
+        ("i've heard of it but it's not my problem", 2),
+        ("doesn't apply to me", 1), ("not relevant to me", 1), ("not my problem at all", 1),
+        ("i've never experienced this", 1), ("can't say it has ever happened", 1),
+    ],
+    LIKELIHOOD: [
+        ("i'd jump on it", 5), ("where do i sign", 5), ("i need this yesterday", 5), ("shut up and take it", 5),
+        ("very keen", 5), ("i'd be first in line", 5),
+        ("good chance", 4), ("i'd give it a go", 4), ("i would try it out", 4), ("quite keen", 4),
+        ("sounds useful i'd probably try", 4),
+        ("i'd want a demo first", 3), ("i'd need to see it first", 3), ("depends on the price", 3), ("could go either way", 3),
+        ("would have to think about it", 3),
+        ("not my priority", 2), ("i'd lean no", 2), ("i'm skeptical", 2), ("doubt it", 2),
+        ("not keen", 2),
+        ("i'd never use that", 1), ("not for me at all", 1), ("zero interest", 1), ("wouldn't touch it", 1),
+        ("hard pass", 1),
+    ],
+    OPT_IN: [
+        ("go for it", True), ("i'm in", True), ("that works", True), ("feel free", True), ("sounds fine to me", True),
+        ("you can share it", True), ("alright", True), ("cool with me", True),
+        ("i'd rather keep it private", False), ("please keep me anonymous", False), ("keep my email to yourself", False),
+        ("i'll pass on that", False), ("leave me out", False), ("not comfortable with that", False),
+    ],
+}
+
+_TOKEN_RE = re.compile(r"[a-z']+|\d+")
+
+def _features(text: str) -> List[str]:
+    tokens = _TOKEN_RE.findall(_clean(text))
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+class TinyAnswerModel:
+    """Multinomial naive Bayes over words and word pairs, one per answer kind.
+
+    Small enough to train at startup from a few dozen examples; ``predict``
+    returns ``(value, probability, known_features)`` so callers can refuse
+    guesses about answers that share nothing with the training data.
+    """
+
+    def __init__(self, examples: Dict[str, List[Tuple[str, object]]] = None, alpha: float = 0.5):
+        self.alpha = alpha
+        self.models = {}
+        for kind, labelled in (examples or TRAINING_EXAMPLES).items():
+            counts = defaultdict(Counter)
+            priors = Counter()
+            for text, value in labelled:
+                counts[value].update(_features(text))
+                priors[value] += 1
+            vocabulary = set().union(*counts.values())
+            self.models[kind] = {
+                "priors": {value: math.log(n / len(labelled)) for value, n in priors.items()},
+                "likelihoods": {value: {feature: math.log((n + alpha) / (sum(c.values()) + alpha * len(vocabulary)))
+                                        for feature, n in c.items()} for value, c in counts.items()},
+                "unseen": {value: math.log(alpha / (sum(c.values()) + alpha * len(vocabulary)))
+                           for value, c in counts.items()},
+                "vocabulary": vocabulary,
+            }
+
+    def predict(self, kind: str, text: str) -> Tuple[object, float, int]:
+        model = self.models[kind]
+        features = _features(text)
+        known = sum(1 for feature in features if feature in model["vocabulary"])
+        scores = {value: prior + sum(model["likelihoods"][value].get(f, model["unseen"][value])
+                                     for f in features if f in model["vocabulary"])
+                  for value, prior in model["priors"].items()}
+        best = max(scores, key=scores.get)
+        top = max(scores.values())
+        total = sum(math.exp(score - top) for score in scores.values())
+        return best, 1.0 / total, known
+
+class AnswerNormalizer:
+    """Rules first, then the optional model when it is sure enough.
+
+    Counts how each answer was resolved (``rules``, ``model`` or
+    ``unresolved``) per kind, for the benchmark and for tuning.
+    """
+
+    def __init__(self, model: Optional[TinyAnswerModel] = None, min_confidence: float = 0.75,
+                 min_known_features: int = 2):
+        self.model = model
+        self.min_confidence = min_confidence
+        self.min_known_features = min_known_features
+        self.stats = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def normalize(self, kind: str, text: str):
+        value = _RULES[kind](text)
+        source = "rules"
+        # A question back ("what would they use it for?") needs an answer, not a guess
+        if value is None and self.model is not None and not (text or "").strip().endswith("?"):
+            guess, confidence, known = self.model.predict(kind, text)
+            if confidence >= self.min_confidence and known >= self.min_known_features:
+                value, source = guess, "model"
+        with self._lock:
+            self.stats[kind][source if value is not None else "unresolved"] += 1
+        return value
+
+    def resonance(self, text: str) -> Optional[int]:
+        return self.normalize(RESONANCE, text)
+
+    def likelihood(self, text: str) -> Optional[int]:
+        return self.normalize(LIKELIHOOD, text)
+
+    def opt_in(self, text: str) -> Optional[bool]:
+        return self.normalize(OPT_IN, text)
+
+def _normalizer_from_env() -> AnswerNormalizer:
+    model = os.getenv('ANSWER_MODEL', 'naive_bayes').lower()
+    return AnswerNormalizer(TinyAnswerModel() if model == 'naive_bayes' else None)
+
+# Process-wide normalizer, built on first use (after entry points load .env)
+answer_normalizer = None
+
+def get_answer_normalizer() -> AnswerNormalizer:
+    global answer_normalizer
+    if answer_normalizer is None:
+        answer_normalizer = _normalizer_from_env()
+    return answer_normalizer
+
+def set_answer_normalizer(normalizer: AnswerNormalizer) -> None:
+    """Swap the process-wide normalizer, e.g. to compare rules alone in a benchmark"""
+    global answer_normalizer
+    answer_normalizer = normalizer
@@ -0,0 +1,156 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import Counter
+import os
+import threading
+import time
+
+# Longest a turn's LLM work may run before its token cancels it
+TURN_TIMEOUT_SECONDS = float(os.getenv('TURN_TIMEOUT_SECONDS', '90'))
+
+class CancellationToken:
+    """Cooperative cancellation for one turn's LLM calls.
+
+    ``cancel`` may be called from any thread (a rerun, a disconnected client,
+    a discarded speculation). It runs the callbacks the work registered with
+    ``on_cancel``, which close the open HTTP stream so a thread blocked on
+    the next chunk wakes at once, and marks the token so loops reading
+    ``cancelled`` stop between chunks.
+
+    ``timeout`` and the ``checks`` (``(predicate, reason)`` pairs such as
+    "is the tab still connected") are evaluated when ``cancelled`` is read,
+    the checks at most every ``poll_interval`` seconds.
+    """
+
+    def __init__(self, timeout: Optional[float] = None, checks: Optional[List[Tuple[Callable[[], bool], str]]] = None,
+                 poll_interval: float = 0.2):
+        self.reason: Optional[str] = None
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.checks = list(checks or [])
+        self.poll_interval = poll_interval
+        self._last_poll = 0.0
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._callbacks: List[Callable] = []
+        self._lock = threading.Lock()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the work; False if it was already cancelled or finished"""
+        with self._lock:
+            if self._cancelled.is_set() or self._finished.is_set():
+                return False
+            self.reason = reason
+            self._cancelled.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error cancelling LLM call: {str(e)}")
+        return True
+
+    @property
+    def cancelled(self) -> bool:
+        if self._cancelled.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return self.cancel("timeout") or self._cancelled.is_set()
+        now = time.monotonic()
+        if self.checks and now - self._last_poll >= self.poll_interval:
+            self._last_poll = now
+            for check, reason in self.checks:
+                try:
+                    triggered = check()
+                except Exception:
+                    triggered = False
+                if triggered:
+                    return self.cancel(reason) or self._cancelled.is_set()
+        return False
+
+    def on_cancel(self, callback: Callable) -> Callable:
+        """Run ``callback`` on cancellation (at once if already cancelled); returns a function that unregisters it"""
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback: Callable) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def finish(self) -> None:
+        """Mark the work done; later ``cancel`` calls are no-ops"""
+        with self._lock:
+            self._finished.set()
+            self._callbacks = []
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the work has finished, e.g. after cancelling it; False on timeout"""
+        return self._finished.wait(timeout)
+
+    def inherit(self, reasons: Tuple[str, ...], timeout: Optional[float] = None) -> 'CancellationToken':
+        """A new token for work outliving this one, keeping only the checks for ``reasons``"""
+        return CancellationToken(timeout=timeout, checks=[c for c in self.checks if c[1] in reasons],
+                                 poll_interval=self.poll_interval)
+
+class CancellationMeter:
+    """Counts LLM streams stopped early and estimates what stopping saved.
+
+    What a cancelled stream would have produced is unknown, so it is taken
+    from the streams on the same call site that ran to completion: their
+    mean completion tokens and duration, less what the cancelled stream had
+    already used. Cancellations on a site with no completed stream yet are
+    counted as unmeasured.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # site -> [completed streams, completion tokens, seconds]
+        self._completed: Dict[str, List[float]] = {}
+        self._reasons: Counter = Counter()
+        self._counters = {"completed": 0, "cancelled": 0, "unmeasured": 0, "tokens_received": 0,
+                          "tokens_saved": 0.0, "seconds_saved": 0.0}
+
+    def observe(self, site: str, completion_tokens: int, seconds: float) -> None:
+        """Record a stream that ran to the end"""
+        with self._lock:
+            totals = self._completed.setdefault(site, [0, 0, 0.0])
+            totals[0] += 1
+            totals[1] += completion_tokens
+            totals[2] += seconds
+            self._counters["completed"] += 1
+
+    def record_cancel(self, site: str, reason: str, completion_tokens: int, seconds: float) -> None:
+        """Record a stream closed early after ``completion_tokens`` and ``seconds``"""
+        with self._lock:
+            self._reasons[reason] += 1
+            self._counters["cancelled"] += 1
+            self._counters["tokens_received"] += completion_tokens
+            totals = self._completed.get(site)
+            if not totals:
+                self._counters["unmeasured"] += 1
+                return
+            count, tokens, elapsed = totals
+            self._counters["tokens_saved"] += max(0.0, tokens / count - completion_tokens)
+            self._counters["seconds_saved"] += max(0.0, elapsed / count - seconds)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["reasons"] = dict(self._reasons)
+        counters["tokens_saved"] = round(counters["tokens_saved"])
+        counters["seconds_saved"] = round(counters["seconds_saved"], 3)
+        return counters
+
+# Process-wide meter shared by all agents
+cancellation_meter = CancellationMeter()
+
+def get_cancellation_meter() -> CancellationMeter:
+    return cancellation_meter
+
+def set_cancellation_meter(meter: CancellationMeter) -> None:
+    """Swap the process-wide meter, e.g. to measure one benchmark run"""
+    global cancellation_meter
+    cancellation_meter = meter
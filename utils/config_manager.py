@@ -1,10 +1,52 @@
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
+from functools import lru_cache
 from dotenv import load_dotenv
 import base64
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import shutil
+import tempfile
+
+# config.enc format written by save_encrypted_config. Version 1 files have no
+# header and one PBKDF2 salt per value; version 2 files derive one key per file
+# and use it to wrap a random data key that encrypts every value:
+#
+#   @version=2
+#   @kdf=pbkdf2-sha256
+#   @iterations=100000
+#   @salt=<base64 salt>
+#   @data_key=<data key, Fernet-encrypted with the derived key>
+#   openai_api_key=<value, Fernet-encrypted with the data key>
+ENCRYPTED_CONFIG_VERSION = 2
+KDF_ITERATIONS = 100000
+
+@lru_cache(maxsize=64)
+def _derive_key(password: str, salt: bytes, iterations: int = KDF_ITERATIONS) -> bytes:
+    # PBKDF2 is deliberately slow (~50ms), so each password and salt is derived once per process
+    # cryptography is only needed by config_tool, not by the app's config reads
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+
+def _read_encrypted_config(input_file: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Split a config.enc file into its ``@`` header fields and its entries"""
+    header, entries = {}, {}
+    with open(input_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            key, value = line.split("=", 1)
+            if key.startswith("@"):
+                header[key[1:]] = value
+            else:
+                entries[key] = value
+    return header, entries
 
 class ConfigManager:
     def __init__(self, env: str = "development"):
@@ -38,20 +80,15 @@ class ConfigManager:
         self.config[key] = value
     
     @staticmethod
-    def generate_key(password: str, salt: bytes) -> bytes:
+    def generate_key(password: str, salt: bytes, iterations: int = KDF_ITERATIONS) -> bytes:
         """Generate an encryption key from a password"""
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        return base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        return _derive_key(password, salt, iterations)
     
     def encrypt_value(self, value: str, password: str) -> str:
         """Encrypt a configuration value"""
         salt = os.urandom(16)
         key = self.generate_key(password, salt)
+        from cryptography.fernet import Fernet
         f = Fernet(key)
         encrypted = f.encrypt(value.encode())
         return base64.urlsafe_b64encode(salt + encrypted).decode()
@@ -63,37 +100,90 @@ class ConfigManager:
             salt = data[:16]
             encrypted = data[16:]
             key = self.generate_key(password, salt)
+            from cryptography.fernet import Fernet
             f = Fernet(key)
             return f.decrypt(encrypted).decode()
         except Exception as e:
             raise ValueError(f"Failed to decrypt value: {str(e)}")
     
-    def save_encrypted_config(self, password: str, output_file: str = "config.enc"):
-        """Save encrypted configuration to a file"""
-        encrypted_config = {}
-        for key, value in self.config.items():
-            if value:
-                encrypted_config[key] = self.encrypt_value(value, password)
-        
-        with open(output_file, "w") as f:
-            for key, value in encrypted_config.items():
-                f.write(f"{key}={value}\n")
+    def save_encrypted_config(self, password: str, output_file: str = "config.enc", backup: bool = False):
+        """Save encrypted configuration to a file (always in the current format).
+
+        The file is written next to ``output_file`` and moved over it, so an
+        interrupted save leaves the old file whole; with ``backup`` the old
+        file is also copied to ``<output_file>.bak`` first.
+        """
+        from cryptography.fernet import Fernet
+        salt = os.urandom(16)
+        data_key = Fernet.generate_key()
+        wrapped_key = Fernet(self.generate_key(password, salt)).encrypt(data_key).decode()
+        cipher = Fernet(data_key)
+
+        if backup and os.path.exists(output_file):
+            shutil.copy2(output_file, output_file + ".bak")
+        fd, temp_path = tempfile.mkstemp(prefix=".config-", dir=os.path.dirname(os.path.abspath(output_file)))
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(f"@version={ENCRYPTED_CONFIG_VERSION}\n")
+                f.write("@kdf=pbkdf2-sha256\n")
+                f.write(f"@iterations={KDF_ITERATIONS}\n")
+                f.write(f"@salt={base64.urlsafe_b64encode(salt).decode()}\n")
+                f.write(f"@data_key={wrapped_key}\n")
+                for key, value in self.config.items():
+                    if value:
+                        f.write(f"{key}={cipher.encrypt(value.encode()).decode()}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, output_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
     
-    def load_encrypted_config(self, password: str, input_file: str = "config.enc"):
-        """Load encrypted configuration from a file"""
+    def load_encrypted_config(self, password: str, input_file: str = "config.enc",
+                              strict: bool = False) -> Optional[int]:
+        """Load encrypted configuration from a file; returns the file's format version.
+
+        Entries that do not decrypt (a wrong password fails them all) are
+        skipped with a warning, or with ``strict`` raise ValueError before any
+        value is loaded.
+        """
         if not os.path.exists(input_file):
-            return
+            return None
         
-        with open(input_file, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
+        header, entries = _read_encrypted_config(input_file)
+        version = int(header.get("version", 1))
+        loaded, failed = {}, []
+        if version == 1:
+            # One key derivation per value; re-save the file to upgrade it
+            for key, value in entries.items():
+                try:
+                    loaded[key] = self.decrypt_value(value, password)
+                except ValueError as e:
+                    failed.append(f"{key}: {str(e)}")
+        else:
+            if version != ENCRYPTED_CONFIG_VERSION or header.get("kdf") != "pbkdf2-sha256":
+                raise ValueError(f"Unsupported encrypted config format: version {version}, kdf {header.get('kdf')}")
+
+            from cryptography.fernet import Fernet, InvalidToken
+            try:
+                salt = base64.urlsafe_b64decode(header["salt"].encode())
+                kek = self.generate_key(password, salt, int(header["iterations"]))
+                cipher = Fernet(Fernet(kek).decrypt(header["data_key"].encode()))
+            except (KeyError, ValueError, InvalidToken) as e:
+                cipher = None
+                failed.append(f"{input_file}: wrong password or corrupted header ({type(e).__name__})")
+            if cipher is not None:
+                for key, value in entries.items():
                     try:
-                        decrypted_value = self.decrypt_value(value, password)
-                        self.config[key] = decrypted_value
-                    except ValueError as e:
-                        print(f"Warning: Could not decrypt {key}: {str(e)}")
+                        loaded[key] = cipher.decrypt(value.encode()).decode()
+                    except InvalidToken:
+                        failed.append(f"{key}: invalid token")
+        if failed and strict:
+            raise ValueError(f"Could not decrypt {input_file}: {'; '.join(failed)}")
+        for failure in failed:
+            print(f"Warning: Could not decrypt {failure}")
+        self.config.update(loaded)
+        return version
     
     def validate_config(self) -> bool:
         """Validate that all required configuration values are present"""
@@ -3,10 +3,23 @@ from supabase import create_client, Client
 from dotenv import load_dotenv
 import os
 import json
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from utils.result_counters import interview_counter_rows
+from utils.tracing import trace_methods
+from utils.storage import (
+    StorageBackend, SESSION_TABLES, JOB_QUEUED, JOB_RUNNING, OUTBOX_METHODS, validate_founder_inputs, founder_inputs_row
+)
 
-class DatabaseService:
-    def __init__(self):
+@trace_methods("db")
+class DatabaseService(StorageBackend):
+    """Supabase storage backend"""
+    
+    def __init__(self, client: Optional[Client] = None):
+        """Connect to Supabase, or use ``client`` (e.g. a local stand-in) when given"""
+        if client is not None:
+            self.supabase = client
+            return
+        
         load_dotenv()
         url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
         key = os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
@@ -58,6 +71,51 @@ class DatabaseService:
             'created_at': datetime.now().isoformat()
         }).execute()
     
+    def save_responses_batch(self, batch: list) -> None:
+        """Save many sessions' responses in a single insert"""
+        if not batch:
+            return
+        created_at = datetime.now().isoformat()
+        self.supabase.table('responses').insert([{
+            'session_id': record['session_id'],
+            'responses': json.dumps(record['responses']),
+            'created_at': record.get('created_at', created_at)
+        } for record in batch]).execute()
+    
+    def save_interviews_batch(self, batch: list) -> list:
+        """Save many imported interviews in one transaction, skipping session ids already stored"""
+        if not batch:
+            return []
+        created_at = datetime.now().isoformat()
+        sessions, responses, testers, counters = [], [], [], []
+        for record in batch:
+            session = dict(record['session'])
+            session.setdefault('created_at', created_at)
+            sessions.append(session)
+            counters.extend(interview_counter_rows({**record, 'session': session}))
+            responses.append({
+                'session_id': session['session_id'],
+                'responses': json.dumps(record['responses']),
+                'created_at': session['created_at']
+            })
+            tester = record.get('tester')
+            if tester:
+                testers.append({
+                    'session_id': session['session_id'],
+                    'email': tester.get('email'),
+                    'opt_in': tester.get('opt_in', False),
+                    'gdpr_consent': tester.get('gdpr_consent', False),
+                    'created_at': session['created_at']
+                })
+        # One function call is one transaction, so no interview is left half written
+        response = self.supabase.rpc('import_interviews', {
+            'p_sessions': sessions,
+            'p_responses': responses,
+            'p_testers': testers,
+            'p_counters': counters
+        }).execute()
+        return response.data or []
+    
     def get_responses(self, session_id: str) -> list:
         """Get interview responses from database"""
         response = self.supabase.table('responses').select('*').eq('session_id', session_id).execute()
@@ -65,6 +123,15 @@ class DatabaseService:
             return json.loads(response.data[0]['responses'])
         return []
     
+    def get_response_rows(self, session_id: str, after_id: int = 0, limit: Optional[int] = None) -> list:
+        """Get each interview's responses saved after row ``after_id``"""
+        query = self.supabase.table('responses').select('id, responses, created_at').eq('session_id', session_id).gt('id', after_id).order('id')
+        if limit is not None:
+            query = query.limit(limit)
+        response = query.execute()
+        return [{'id': row['id'], 'responses': json.loads(row['responses']), 'created_at': row.get('created_at')}
+                for row in response.data or []]
+    
     def save_tester_info(self, session_id: str, email: str, opt_in: bool, gdpr_consent: bool) -> None:
         """Save tester information and preferences"""
         self.supabase.table('testers').insert({
@@ -89,53 +156,99 @@ class DatabaseService:
         }).execute()
     
     def get_analysis(self, session_id: str) -> dict:
-        """Get analysis results from database"""
-        response = self.supabase.table('analyses').select('*').eq('session_id', session_id).execute()
+        """Get the most recent analysis results from database"""
+        response = self.supabase.table('analyses').select('*').eq('session_id', session_id).order('id', desc=True).limit(1).execute()
         if response.data:
             return json.loads(response.data[0]['analysis'])
         return None
     
+    def save_analysis_state(self, session_id: str, analysis: dict, state: dict, watermark: int) -> None:
+        """Save an incremental analysis and the state it was folded from"""
+        self.supabase.table('analyses').insert({
+            'session_id': session_id,
+            'analysis': json.dumps(analysis),
+            'state': state,
+            'watermark': watermark,
+            'created_at': datetime.now().isoformat()
+        }).execute()
+    
+    def get_analysis_state(self, session_id: str) -> Optional[Dict]:
+        """Get the incremental analysis that covers the most responses"""
+        response = self.supabase.table('analyses').select('analysis, state, watermark').eq('session_id', session_id).gt('watermark', 0).order('watermark', desc=True).limit(1).execute()
+        if not response.data:
+            return None
+        row = response.data[0]
+        return {'analysis': json.loads(row['analysis']), 'state': row['state'], 'watermark': row['watermark']}
+    
+    def save_agent_states(self, states: Dict[str, dict]) -> None:
+        """Insert or replace spilled agent states in a single upsert"""
+        if states:
+            updated_at = datetime.now().isoformat()
+            self.supabase.table('agent_states').upsert([
+                {'key': key, 'session_id': state.get('session_id'), 'state': state, 'updated_at': updated_at}
+                for key, state in states.items()
+            ], on_conflict='key').execute()
+    
+    def get_agent_state(self, key: str) -> Optional[Dict]:
+        """Get a spilled agent state"""
+        response = self.supabase.table('agent_states').select('state').eq('key', key).limit(1).execute()
+        return response.data[0]['state'] if response.data else None
+    
+    def delete_agent_states(self, keys: List[str]) -> None:
+        """Delete spilled agent states"""
+        if keys:
+            self.supabase.table('agent_states').delete().in_('key', list(keys)).execute()
+    
+    def save_llm_usage(self, records: list) -> None:
+        """Save a batch of LLM usage records in a single insert"""
+        if records:
+            self.supabase.table('llm_usage').insert(records).execute()
+    
+    def get_llm_usage(self, founder_email: str) -> list:
+        """Get per-session LLM usage rollups for a founder"""
+        response = self.supabase.table('llm_usage_by_session').select('*').eq('founder_email', founder_email).execute()
+        return response.data or []
+    
+    def take_tokens(self, bucket_key: str, amount: float, capacity: float, refill_rate: float) -> bool:
+        """Atomically take tokens from a shared budget bucket"""
+        response = self.supabase.rpc('take_tokens', {
+            'p_key': bucket_key,
+            'p_amount': amount,
+            'p_capacity': capacity,
+            'p_refill_rate': refill_rate
+        }).execute()
+        return bool(response.data)
+    
+    def list_sessions(self, founder_email: str, offset: int = 0, limit: int = 500) -> list:
+        """Page through a founder's sessions, oldest first"""
+        response = self.supabase.table('sessions').select('*').eq('founder_email', founder_email).order('id').range(offset, offset + limit - 1).execute()
+        return response.data or []
+    
+    def get_session_rows(self, table: str, session_ids: list) -> list:
+        """Get every responses/testers/analyses row for a set of sessions"""
+        if table not in SESSION_TABLES:
+            raise ValueError(f"Unknown session table: {table}")
+        rows = []
+        # Keep the in.(...) filter well under URL length limits and page past
+        # PostgREST's default row cap
+        for start in range(0, len(session_ids), 100):
+            chunk = session_ids[start:start + 100]
+            offset = 0
+            while True:
+                response = self.supabase.table(table).select('*').in_('session_id', chunk).order('id').range(offset, offset + 999).execute()
+                rows.extend(response.data or [])
+                if len(response.data or []) < 1000:
+                    break
+                offset += 1000
+        return rows
+    
     def save_founder_inputs(self, founder_email: str, inputs: dict) -> dict:
         """Save founder inputs to the database"""
         try:
-            # Validate required fields
-            required_fields = ['problem_domain', 'problems', 'value_prop', 'target_action']
-            for field in required_fields:
-                if field not in inputs:
-                    raise ValueError(f"Missing required field: {field}")
-            
-            # Validate field types
-            if not isinstance(inputs['problems'], list):
-                raise ValueError("Problems must be a list")
-            
-            # Validate problems list is not empty
-            if not inputs['problems']:
-                raise ValueError("Problems list cannot be empty")
-            
-            # Validate pricing information if it's a paid service
-            if inputs.get('is_paid_service', False):
-                if not inputs.get('pricing_model'):
-                    raise ValueError("Pricing model is required for paid services")
-                if not inputs.get('price_points'):
-                    raise ValueError("At least one price point is required for paid services")
-                if not isinstance(inputs['price_points'], list):
-                    raise ValueError("Price points must be a list")
-                if not all(isinstance(price, (int, float)) for price in inputs['price_points']):
-                    raise ValueError("Price points must be numbers")
+            validate_founder_inputs(inputs)
             
             # Prepare data for insertion
-            data = {
-                'founder_email': founder_email,
-                'problem_domain': inputs['problem_domain'],
-                'problems': inputs['problems'],
-                'value_prop': inputs['value_prop'],
-                'target_action': inputs['target_action'],
-                'follow_up_action': inputs.get('follow_up_action', ''),
-                'is_paid_service': inputs.get('is_paid_service', False),
-                'pricing_model': inputs.get('pricing_model', ''),
-                'price_points': inputs.get('price_points', []),
-                'pricing_questions': inputs.get('pricing_questions', [])
-            }
+            data = founder_inputs_row(founder_email, inputs)
             
             # Insert or update founder inputs
             response = self.supabase.table('founder_inputs').upsert(
@@ -161,4 +274,120 @@ class DatabaseService:
         if not result.data:
             return None
             
-        return result.data[0]["inputs"] 
\ No newline at end of file
+        return result.data[0]["inputs"]
+    
+    def increment_result_counters(self, rows: List[Dict], batch_key: Optional[str] = None) -> None:
+        """Add to live result counters in one call, once per batch key"""
+        if rows:
+            self.supabase.rpc('increment_result_counters', {'p_rows': rows, 'p_batch_key': batch_key}).execute()
+    
+    def get_result_counters(self, founder_email: str, since: Optional[str] = None) -> list:
+        """Get a founder's live result counters"""
+        query = self.supabase.table('result_counters').select('session_id, problem, day, metric, value').eq('founder_email', founder_email)
+        if since:
+            query = query.gte('day', since)
+        response = query.execute()
+        return response.data or []
+    
+    def apply_outbox_batch(self, records: List[Dict]) -> None:
+        """Apply queued writes with one upsert per table, ignoring rows already stored"""
+        by_method = {method: [] for method in OUTBOX_METHODS}
+        for record in records:
+            by_method[record['method']].append(record)
+        if by_method['save_founder_inputs']:
+            # Later inputs for the same founder replace earlier ones; one upsert may not touch a row twice
+            latest = {r['payload']['founder_email']: r['payload'] for r in by_method['save_founder_inputs']}
+            self.supabase.table('founder_inputs').upsert(
+                [founder_inputs_row(email, payload['inputs']) for email, payload in latest.items()],
+                on_conflict='founder_email'
+            ).execute()
+        if by_method['save_session']:
+            self.supabase.table('sessions').upsert(
+                [r['payload']['session_data'] for r in by_method['save_session']],
+                on_conflict='session_id', ignore_duplicates=True
+            ).execute()
+        rows = {
+            'responses': [{
+                'session_id': r['payload']['session_id'],
+                'responses': json.dumps(r['payload']['responses']),
+                'created_at': r['payload']['created_at'],
+                'idempotency_key': r['key']
+            } for r in by_method['save_responses']],
+            'testers': [{
+                'session_id': r['payload']['session_id'],
+                'email': r['payload']['email'],
+                'opt_in': r['payload']['opt_in'],
+                'gdpr_consent': r['payload']['gdpr_consent'],
+                'created_at': r['payload']['created_at'],
+                'idempotency_key': r['key']
+            } for r in by_method['save_tester_info']],
+            'analyses': [{
+                'session_id': r['payload']['session_id'],
+                'analysis': json.dumps(r['payload']['analysis']),
+                'created_at': r['payload']['created_at'],
+                'idempotency_key': r['key']
+            } for r in by_method['save_analysis']]
+        }
+        for table, table_rows in rows.items():
+            if table_rows:
+                self.supabase.table(table).upsert(table_rows, on_conflict='idempotency_key', ignore_duplicates=True).execute()
+    
+    def enqueue_job(self, kind: str, payload: dict, dedupe_key: Optional[str] = None, priority: int = 0,
+                    max_attempts: int = 5, founder_email: Optional[str] = None) -> Dict:
+        """Queue a job, or return the existing one with the same dedupe key (a dead one is requeued)"""
+        response = self.supabase.rpc('enqueue_job', {
+            'p_kind': kind,
+            'p_payload': payload,
+            'p_dedupe_key': dedupe_key,
+            'p_priority': priority,
+            'p_max_attempts': max_attempts,
+            'p_founder_email': founder_email
+        }).execute()
+        return response.data[0]
+    
+    def claim_jobs(self, worker_id: str, kinds: Optional[List[str]] = None, limit: int = 1,
+                   lease_seconds: float = 120.0) -> list:
+        """Lease runnable jobs with FOR UPDATE SKIP LOCKED, highest priority first"""
+        response = self.supabase.rpc('claim_jobs', {
+            'p_worker': worker_id,
+            'p_kinds': kinds,
+            'p_limit': limit,
+            'p_lease_seconds': lease_seconds
+        }).execute()
+        return sorted(response.data or [], key=lambda job: (-job['priority'], job['id']))
+    
+    def heartbeat_job(self, job_id: int, worker_id: str, lease_seconds: float, progress: Optional[dict] = None) -> bool:
+        """Extend a job's lease and optionally store progress"""
+        now = datetime.now(timezone.utc)
+        update = {'lease_expires_at': (now + timedelta(seconds=lease_seconds)).isoformat(), 'updated_at': now.isoformat()}
+        if progress is not None:
+            update['progress'] = progress
+        response = self.supabase.table('jobs').update(update).eq('id', job_id).eq('locked_by', worker_id).eq('status', JOB_RUNNING).execute()
+        return bool(response.data)
+    
+    def finish_job(self, job_id: int, worker_id: str, status: str, result: Optional[dict] = None,
+                   error: Optional[str] = None, retry_in: Optional[float] = None, refund_attempt: bool = False) -> bool:
+        """Mark a leased job succeeded, dead, or queued again in ``retry_in`` seconds"""
+        now = datetime.now(timezone.utc)
+        if refund_attempt:
+            # PostgREST updates cannot reference the current value; the lease makes this row ours
+            attempts = self.get_job(job_id=job_id)['attempts'] - 1
+        response = self.supabase.table('jobs').update({
+            **({'attempts': attempts} if refund_attempt else {}),
+            'status': status,
+            'result': result,
+            'last_error': error,
+            'run_after': (now + timedelta(seconds=retry_in or 0)).isoformat(),
+            'locked_by': None,
+            'lease_expires_at': None,
+            'updated_at': now.isoformat(),
+            'finished_at': None if status == JOB_QUEUED else now.isoformat()
+        }).eq('id', job_id).eq('locked_by', worker_id).eq('status', JOB_RUNNING).execute()
+        return bool(response.data)
+    
+    def get_job(self, job_id: Optional[int] = None, dedupe_key: Optional[str] = None) -> Optional[Dict]:
+        """Get a job by id or by deduplication key"""
+        query = self.supabase.table('jobs').select('*')
+        query = query.eq('id', job_id) if job_id is not None else query.eq('dedupe_key', dedupe_key)
+        response = query.execute()
+        return response.data[0] if response.data else None
@@ -0,0 +1,264 @@
+"""Bulk export of a founder's interview corpus to Parquet, Arrow or CSV.
+
+Sessions are read a page at a time and each page is written as one columnar
+batch per table, so memory stays bounded by ``page_size`` regardless of how
+many interviews a founder has. The output is one file per table:
+
+    sessions.parquet         one row per session
+    response_events.parquet  one row per recorded interview event, in the current response schema
+    testers.parquet          tester contact and consent rows
+    analyses.parquet         stored analyses as JSON text
+
+and can be queried directly, e.g. ``pandas.read_parquet`` or
+``duckdb.sql("select type, count(*) from 'export/response_events.parquet' group by 1")``.
+"""
+from typing import Dict, List, Optional
+import csv
+import json
+import os
+from utils.responses import upgrade_responses
+from utils.storage import StorageBackend
+
+FORMATS = ("parquet", "arrow", "csv")
+
+# Column name -> pyarrow type alias, in output order
+TABLE_SCHEMAS = {
+    "sessions": {
+        "session_id": "string",
+        "founder_email": "string",
+        "created_at": "string",
+        "founder_inputs": "string",
+    },
+    "response_events": {
+        "session_id": "string",
+        "response_id": "int64",
+        "event_index": "int32",
+        "type": "string",
+        "problem": "string",
+        "resonance_score": "int32",
+        "likelihood": "int32",
+        "opt_in": "bool",
+        "text": "string",
+        "response": "string",
+        "value_prop": "string",
+        "action": "string",
+        "summary": "string",
+        "skipped": "bool",
+        "timestamp": "string",
+        "schema_version": "int32",
+    },
+    "testers": {
+        "session_id": "string",
+        "email": "string",
+        "opt_in": "bool",
+        "gdpr_consent": "bool",
+        "created_at": "string",
+    },
+    "analyses": {
+        "session_id": "string",
+        "analysis": "string",
+        "created_at": "string",
+    },
+}
+
+def _load_json(value):
+    """JSON columns come back as text from SQLite and as decoded values from Supabase"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+def _dump_json(value) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+def _text_column(values: list) -> list:
+    """Strings pass through untouched; anything else is stringified"""
+    if set(map(type, values)) <= {str, type(None)}:
+        return values
+    return [value if value is None or isinstance(value, str) else str(value) for value in values]
+
+def _bool(value) -> Optional[bool]:
+    return None if value is None else bool(value)
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class CSVTableWriter:
+    """Appends column batches to a CSV file with a header row"""
+
+    def __init__(self, path: str, columns: Dict[str, str]):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, batch: Dict[str, list]) -> None:
+        self.writer.writerows(zip(*batch.values()))
+
+    def close(self) -> None:
+        self.file.close()
+
+class ArrowTableWriter:
+    """Appends column batches to a Parquet file or an Arrow IPC file.
+
+    Parquet batches are buffered up to ``row_group_size`` rows so each page of
+    sessions does not become its own small row group.
+    """
+
+    def __init__(self, path: str, columns: Dict[str, str], fmt: str, row_group_size: int = 65536):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet and Arrow export need pyarrow: pip install pyarrow") from e
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in columns.items()])
+        self.row_group_size = row_group_size if fmt == "parquet" else 0
+        self.pending = []
+        self.pending_rows = 0
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write(self, batch: Dict[str, list]) -> None:
+        self.pending.append(self.pa.RecordBatch.from_pydict(batch, schema=self.schema))
+        self.pending_rows += self.pending[-1].num_rows
+        if self.pending_rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.pending:
+            self.writer.write_table(self.pa.Table.from_batches(self.pending, schema=self.schema))
+            self.pending = []
+            self.pending_rows = 0
+
+    def close(self) -> None:
+        try:
+            self._flush()
+        finally:
+            self.writer.close()
+
+class InterviewExporter:
+    """Streams a founder's sessions, response events, testers and analyses to files"""
+
+    def __init__(self, db: StorageBackend, page_size: int = 500):
+        self.db = db
+        self.page_size = page_size
+
+    def export(self, founder_email: str, out_dir: str, fmt: str = "parquet",
+               tables: Optional[List[str]] = None) -> Dict[str, int]:
+        """Write one file per table into ``out_dir``; returns rows written per table"""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}', expected one of {', '.join(FORMATS)}")
+        tables = tables or list(TABLE_SCHEMAS)
+        unknown = set(tables) - set(TABLE_SCHEMAS)
+        if unknown:
+            raise ValueError(f"Unknown export tables: {', '.join(sorted(unknown))}")
+
+        os.makedirs(out_dir, exist_ok=True)
+        writers = {}
+        counts = {table: 0 for table in tables}
+        try:
+            for table in tables:
+                path = os.path.join(out_dir, f"{table}.{fmt}")
+                if fmt == "csv":
+                    writers[table] = CSVTableWriter(path, TABLE_SCHEMAS[table])
+                else:
+                    writers[table] = ArrowTableWriter(path, TABLE_SCHEMAS[table], fmt)
+
+            for page in self.iter_pages(founder_email, tables):
+                for table, batch in page.items():
+                    rows = len(batch["session_id"])
+                    if rows:
+                        writers[table].write(batch)
+                        counts[table] += rows
+        finally:
+            for writer in writers.values():
+                writer.close()
+        return counts
+
+    def iter_pages(self, founder_email: str, tables: Optional[List[str]] = None):
+        """Yield ``{table: {column: [values]}}`` for each page of sessions"""
+        tables = tables or list(TABLE_SCHEMAS)
+        offset = 0
+        while True:
+            sessions = self.db.list_sessions(founder_email, offset=offset, limit=self.page_size)
+            if not sessions:
+                return
+            session_ids = [s["session_id"] for s in sessions]
+            page = {}
+            if "sessions" in tables:
+                page["sessions"] = self._session_columns(sessions)
+            if "response_events" in tables:
+                page["response_events"] = self._event_columns(self.db.get_session_rows("responses", session_ids))
+            if "testers" in tables:
+                page["testers"] = self._tester_columns(self.db.get_session_rows("testers", session_ids))
+            if "analyses" in tables:
+                page["analyses"] = self._analysis_columns(self.db.get_session_rows("analyses", session_ids))
+            yield page
+            if len(sessions) < self.page_size:
+                return
+            offset += self.page_size
+
+    @staticmethod
+    def _empty(table: str) -> Dict[str, list]:
+        return {column: [] for column in TABLE_SCHEMAS[table]}
+
+    def _session_columns(self, sessions: List[Dict]) -> Dict[str, list]:
+        columns = self._empty("sessions")
+        for session in sessions:
+            columns["session_id"].append(session["session_id"])
+            columns["founder_email"].append(session.get("founder_email"))
+            columns["created_at"].append(session.get("created_at"))
+            columns["founder_inputs"].append(_dump_json(session.get("founder_inputs")))
+        return columns
+
+    def _event_columns(self, rows: List[Dict]) -> Dict[str, list]:
+        # Flatten first, then build each column with one comprehension; this is
+        # the hot loop of a large export and per-cell appends are several times slower
+        events, session_ids, response_ids, indexes = [], [], [], []
+        for row in rows:
+            decoded = _load_json(row.get("responses"))
+            if not isinstance(decoded, list):
+                continue
+            # Events saved before response schema 2 are exported with their current meanings
+            decoded = upgrade_responses([event for event in decoded if isinstance(event, dict)])
+            events.extend(decoded)
+            session_ids.extend([row["session_id"]] * len(decoded))
+            response_ids.extend([_int(row.get("id"))] * len(decoded))
+            indexes.extend(range(len(decoded)))
+
+        columns = {"session_id": session_ids, "response_id": response_ids, "event_index": indexes}
+        for field in ("type", "problem", "text", "response", "value_prop", "action", "summary", "timestamp"):
+            columns[field] = _text_column([event.get(field) for event in events])
+        columns["resonance_score"] = [_int(event.get("resonance_score")) for event in events]
+        columns["likelihood"] = [_int(event.get("likelihood")) for event in events]
+        columns["opt_in"] = [_bool(event.get("opt_in")) for event in events]
+        columns["skipped"] = [_bool(event.get("skipped")) for event in events]
+        columns["schema_version"] = [_int(event.get("schema_version")) for event in events]
+        return {column: columns[column] for column in TABLE_SCHEMAS["response_events"]}
+
+    def _tester_columns(self, rows: List[Dict]) -> Dict[str, list]:
+        columns = self._empty("testers")
+        for row in rows:
+            columns["session_id"].append(row["session_id"])
+            columns["email"].append(row.get("email"))
+            columns["opt_in"].append(_bool(row.get("opt_in")))
+            columns["gdpr_consent"].append(_bool(row.get("gdpr_consent")))
+            columns["created_at"].append(row.get("created_at"))
+        return columns
+
+    def _analysis_columns(self, rows: List[Dict]) -> Dict[str, list]:
+        columns = self._empty("analyses")
+        for row in rows:
+            columns["session_id"].append(row["session_id"])
+            columns["analysis"].append(_dump_json(row.get("analysis")))
+            columns["created_at"].append(row.get("created_at"))
+        return columns
@@ -0,0 +1,240 @@
+"""Bulk import of interviews run outside the app (phone calls, transcribed notes).
+
+Input is JSONL, one interview per line:
+
+    {"session_id": "call-0001", "founder_email": "founder@example.com",
+     "created_at": "2024-03-01T10:00:00", "founder_inputs": {...},
+     "tester": {"email": "t@example.com", "opt_in": true, "gdpr_consent": true},
+     "responses": [{"type": "problem_resonance", "problem": "...", "resonance_score": 4}, ...]}
+
+Only ``session_id`` and ``responses`` are required. Every response must be one
+of the events ``InterviewAgent`` records, with that event's fields; pitch and
+opt-in answers without normalized values get them from their text, as the
+interview would have stored them. Events are read as the current response
+schema unless they say ``"schema_version": 1`` (exports of interviews recorded
+before it), which are upgraded as ``utils.responses`` describes. Valid lines
+are handed to a writer thread through a bounded queue, so a slow database
+pauses parsing instead of buffering the whole file, and are saved
+``batch_size`` interviews per round trip.
+
+Imports can be re-run: a ``session_id`` that is already stored, or that came
+earlier in the same file, is rejected with its line instead of saved twice.
+Each batch is saved all or nothing, so a failed write leaves no interview
+half stored.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+import json
+import queue
+import threading
+from utils.responses import RESPONSE_SCHEMA_VERSION, upgrade_responses
+from utils.storage import StorageBackend
+
+# Fields of each event recorded by InterviewAgent.record_response: (required, optional)
+RESPONSE_EVENT_FIELDS = {
+    "problem_resonance": ({"problem", "resonance_score"}, {"response"}),
+    "problem_explanation": ({"text"}, set()),
+    "problem_action": ({"text"}, set()),
+    "value_prop_interest": ({"response"}, {"value_prop", "action", "likelihood", "likelihood_label"}),
+    "price_sensitivity": ({"response"}, set()),
+    "opt_in_intent": ({"response"}, {"opt_in"}),
+    "interview_summary": ({"summary"}, {"skipped"}),
+}
+
+# Values derived from an answer's text; validated by type instead of as strings
+NORMALIZED_FIELDS = {"likelihood", "likelihood_label", "opt_in"}
+
+def validate_response_event(event: Dict) -> Dict:
+    """Return a clean copy of a response event or raise ValueError"""
+    if not isinstance(event, dict):
+        raise ValueError("Response events must be objects")
+    event_type = event.get("type")
+    if event_type not in RESPONSE_EVENT_FIELDS:
+        raise ValueError(f"Unknown response type: {event_type}")
+    required, optional = RESPONSE_EVENT_FIELDS[event_type]
+    missing = required - event.keys()
+    if missing:
+        raise ValueError(f"{event_type} is missing {', '.join(sorted(missing))}")
+    unknown = event.keys() - required - optional - {"type", "timestamp", "schema_version"}
+    if unknown:
+        raise ValueError(f"{event_type} has unknown fields {', '.join(sorted(unknown))}")
+
+    if event_type == "problem_resonance":
+        score = event["resonance_score"]
+        if isinstance(score, bool) or not isinstance(score, int) or not 1 <= score <= 5:
+            raise ValueError("resonance_score must be an integer from 1 to 5")
+    for field in (required | optional) - NORMALIZED_FIELDS - {"resonance_score", "skipped"}:
+        if field in event and not isinstance(event[field], str):
+            raise ValueError(f"{event_type}.{field} must be a string")
+
+    clean = dict(event)
+    clean.setdefault("timestamp", None)
+    version = clean.setdefault("schema_version", RESPONSE_SCHEMA_VERSION)
+    if isinstance(version, bool) or version not in (1, RESPONSE_SCHEMA_VERSION):
+        raise ValueError(f"Unsupported schema_version: {version}")
+    if version == RESPONSE_SCHEMA_VERSION:
+        # Version 1 answers sit under other types; upgrade_responses normalizes them once moved
+        _normalize_event(clean)
+    return clean
+
+def _normalize_event(event: Dict) -> None:
+    """Check normalized values a transcript brings, and fill in the ones it lacks from the raw text"""
+    from utils.answers import LIKELIHOOD_LABELS, get_answer_normalizer
+
+    if event["type"] == "value_prop_interest":
+        likelihood = event.get("likelihood")
+        if likelihood is None:
+            likelihood = get_answer_normalizer().likelihood(event["response"])
+        elif isinstance(likelihood, bool) or not isinstance(likelihood, int) or not 1 <= likelihood <= 5:
+            raise ValueError("likelihood must be an integer from 1 to 5")
+        event["likelihood"] = likelihood
+        event["likelihood_label"] = LIKELIHOOD_LABELS.get(likelihood)
+    elif event["type"] == "opt_in_intent":
+        opt_in = event.get("opt_in")
+        if opt_in is None:
+            opt_in = get_answer_normalizer().opt_in(event["response"])
+        elif not isinstance(opt_in, bool):
+            raise ValueError("opt_in must be true or false")
+        event["opt_in"] = opt_in
+
+def validate_transcript(record: Dict, founder_email: Optional[str] = None) -> Dict:
+    """Turn one transcript into a ``save_interviews_batch`` record or raise ValueError"""
+    if not isinstance(record, dict):
+        raise ValueError("Each line must be a JSON object")
+    session_id = record.get("session_id")
+    if not isinstance(session_id, str) or not session_id:
+        raise ValueError("session_id is required")
+    responses = record.get("responses")
+    if not isinstance(responses, list) or not responses:
+        raise ValueError("responses must be a non-empty list")
+
+    created_at = record.get("created_at") or datetime.now().isoformat()
+    events = upgrade_responses([validate_response_event(event) for event in responses])
+    for event in events:
+        if event["timestamp"] is None:
+            event["timestamp"] = created_at
+
+    tester = record.get("tester")
+    if tester is not None:
+        if not isinstance(tester, dict) or not tester.get("email"):
+            raise ValueError("tester must be an object with an email")
+        tester = {
+            "email": tester["email"],
+            "opt_in": bool(tester.get("opt_in", False)),
+            "gdpr_consent": bool(tester.get("gdpr_consent", False))
+        }
+
+    return {
+        "session": {
+            "session_id": session_id,
+            "founder_email": record.get("founder_email") or founder_email,
+            "founder_inputs": json.dumps(record.get("founder_inputs") or {}),
+            "created_at": created_at
+        },
+        "responses": events,
+        "tester": tester
+    }
+
+class IngestPipeline:
+    """Validates JSONL transcripts and saves them in batches on a writer thread"""
+
+    def __init__(self, db: StorageBackend, batch_size: int = 500, max_pending_batches: int = 4,
+                 founder_email: Optional[str] = None, max_errors: int = 100):
+        self.db = db
+        self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
+        self.founder_email = founder_email
+        self.max_errors = max_errors
+
+    def ingest_file(self, path: str, dry_run: bool = False,
+                    progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        with open(path, encoding="utf-8") as f:
+            return self.ingest(f, dry_run=dry_run, progress=progress)
+
+    def ingest(self, lines: Iterable[str], dry_run: bool = False,
+               progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Import JSONL lines and return counts plus the first ``max_errors`` line errors.
+
+        With ``dry_run`` lines are only validated. ``progress`` is called with
+        the running totals after every saved batch. If the database fails the
+        import stops there: batches already saved stay saved and ``error``
+        says what went wrong.
+        """
+        stats = {"lines": 0, "imported": 0, "rejected": 0, "batches": 0, "errors": [], "error": None}
+        batches: queue.Queue = queue.Queue(maxsize=self.max_pending_batches)
+        failure: List[BaseException] = []
+        seen = set()
+        lock = threading.Lock()
+
+        def reject(line_number: int, error: str) -> None:
+            with lock:
+                stats["rejected"] += 1
+                if len(stats["errors"]) < self.max_errors:
+                    stats["errors"].append({"line": line_number, "error": error})
+
+        def writer():
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if failure:
+                    continue
+                try:
+                    skipped = set(self.db.save_interviews_batch([record for _, record in batch]))
+                except BaseException as e:
+                    failure.append(e)
+                    continue
+                for line_number, record in batch:
+                    if record["session"]["session_id"] in skipped:
+                        reject(line_number, f"session_id {record['session']['session_id']} is already stored")
+                with lock:
+                    stats["imported"] += len(batch) - len(skipped)
+                    stats["batches"] += 1
+                if progress:
+                    progress(stats)
+
+        thread = None if dry_run else threading.Thread(target=writer, name="ingest-writer", daemon=True)
+        if thread:
+            thread.start()
+
+        batch: List[Tuple[int, Dict]] = []
+        try:
+            for line_number, line in enumerate(lines, start=1):
+                if failure:
+                    break
+                if not line.strip():
+                    continue
+                stats["lines"] += 1
+                try:
+                    record = validate_transcript(json.loads(line), self.founder_email)
+                except ValueError as e:
+                    reject(line_number, str(e))
+                    continue
+                session_id = record["session"]["session_id"]
+                if session_id in seen:
+                    reject(line_number, f"session_id {session_id} appears earlier in the file")
+                    continue
+                seen.add(session_id)
+                batch.append((line_number, record))
+                if len(batch) >= self.batch_size:
+                    if dry_run:
+                        stats["imported"] += len(batch)
+                    else:
+                        # Blocks while the writer is max_pending_batches behind
+                        batches.put(batch)
+                    batch = []
+            if batch:
+                if dry_run:
+                    stats["imported"] += len(batch)
+                else:
+                    batches.put(batch)
+        finally:
+            if thread:
+                batches.put(None)
+                thread.join()
+
+        # Already-stored rejections come back from the writer after later lines were parsed
+        stats["errors"].sort(key=lambda error: error["line"])
+        if failure:
+            stats["error"] = str(failure[0])
+        return stats
@@ -0,0 +1,213 @@
+"""Durable, database-backed queue for long LLM jobs.
+
+Pages enqueue a job and poll it; separate worker processes (``worker.py``)
+lease jobs with ``claim_jobs`` (``FOR UPDATE SKIP LOCKED`` on Postgres, a
+write-locked transaction on SQLite), run them and store the result, so a job
+survives the founder navigating away and page latency no longer depends on
+LLM latency.
+
+* Deduplication: jobs are keyed by a hash of their kind and payload, so
+  enqueueing the same work twice returns the job already queued or done.
+* Priorities: higher ``priority`` jobs are claimed first.
+* Leases: a worker holds a job for ``lease_seconds`` and extends the lease
+  while it runs; a job whose worker died is claimed again once it expires.
+* Retries: failures are retried with exponential backoff and jitter until
+  ``max_attempts``, then the job is marked dead. A handler raising
+  ``RetryLater`` (e.g. over its token budget) is retried after the given delay
+  without using up attempts.
+* Lost leases: when a lease cannot be renewed the job's ``CancellationToken``
+  (``progress.token``) is cancelled and the next ``progress`` call raises
+  ``LeaseLost``, so the handler stops spending tokens on a run another
+  worker now owns.
+"""
+from typing import Callable, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from utils.cancellation import CancellationToken
+from utils.storage import StorageBackend, JOB_QUEUED, JOB_SUCCEEDED, JOB_DEAD
+from utils.tracing import get_tracer
+
+# Progress is written at most this often; each write is a database round trip
+PROGRESS_INTERVAL = 1.0
+
+def content_hash(kind: str, payload: Dict) -> str:
+    """Deduplication key: identical work hashes to the same job"""
+    return hashlib.sha256(json.dumps([kind, payload], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class RetryLater(Exception):
+    """Raised by a handler to run the job again after ``delay`` seconds without using an attempt"""
+
+    def __init__(self, delay: float, message: str = ""):
+        super().__init__(message or f"Retry in {delay:.0f}s")
+        self.delay = delay
+
+class LeaseLost(Exception):
+    """Raised by ``progress`` once the worker no longer holds the job's lease"""
+
+class JobQueue:
+    """Enqueue and look up jobs; the page-side half of the queue"""
+
+    def __init__(self, db: StorageBackend, base_backoff: float = 5.0, max_backoff: float = 600.0):
+        self.db = db
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+    def enqueue(self, kind: str, payload: Dict, priority: int = 0, max_attempts: int = 5,
+                founder_email: Optional[str] = None, dedupe: bool = True) -> Dict:
+        """Queue ``kind`` with ``payload``; with ``dedupe`` an identical job is returned instead"""
+        return self.db.enqueue_job(kind, payload, content_hash(kind, payload) if dedupe else None,
+                                   priority, max_attempts, founder_email)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        return self.db.get_job(job_id=job_id)
+
+    def find(self, kind: str, payload: Dict) -> Optional[Dict]:
+        """The job already queued or done for this exact work, if any"""
+        return self.db.get_job(dedupe_key=content_hash(kind, payload))
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds before retry number ``attempts``: exponential with full jitter"""
+        return random.uniform(0.5, 1.0) * min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+
+class JobWorker:
+    """Claims jobs and runs them on a thread pool until stopped.
+
+    ``handlers`` maps a job kind to ``handler(payload, progress) -> result``;
+    ``progress(dict)`` stores partial output the page can show while the job
+    runs, and ``progress.token`` is cancelled if the lease is lost. One loop
+    thread claims jobs for free slots and renews the leases of running ones.
+    """
+
+    def __init__(self, queue: JobQueue, handlers: Dict[str, Callable], worker_id: Optional[str] = None,
+                 concurrency: int = 2, lease_seconds: float = 120.0, poll_interval: float = 1.0):
+        self.queue = queue
+        self.db = queue.db
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="job")
+        self._running: Dict[int, float] = {}
+        self._tokens: Dict[int, CancellationToken] = {}
+        self._lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.counters = {"claimed": 0, "succeeded": 0, "retried": 0, "dead": 0, "lost_leases": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def run_once(self) -> int:
+        """Claim jobs for free slots and renew due leases; returns how many were claimed"""
+        self._renew_leases()
+        with self._lock:
+            free = self.concurrency - len(self._running)
+        if free <= 0 or self.stopping.is_set():
+            return 0
+        jobs = self.db.claim_jobs(self.worker_id, list(self.handlers), free, self.lease_seconds)
+        for job in jobs:
+            with self._lock:
+                self._running[job["id"]] = time.monotonic()
+                self._tokens[job["id"]] = CancellationToken()
+                self.counters["claimed"] += 1
+            self._executor.submit(self._execute, job)
+        return len(jobs)
+
+    def run(self) -> None:
+        """Work until ``stopping`` is set, then let running jobs finish"""
+        while not self.stopping.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                print(f"Error claiming jobs: {str(e)}")
+                claimed = 0
+            if not claimed:
+                self.stopping.wait(self.poll_interval)
+        while self._running:
+            self._renew_leases()
+            time.sleep(min(self.poll_interval, 0.1))
+        self._executor.shutdown(wait=True)
+
+    def _renew_leases(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            due = [job_id for job_id, renewed in self._running.items() if now - renewed >= self.lease_seconds / 3]
+        for job_id in due:
+            if not self.db.heartbeat_job(job_id, self.worker_id, self.lease_seconds):
+                self._lose_lease(job_id)
+            with self._lock:
+                if job_id in self._running:
+                    self._running[job_id] = now
+
+    def _lose_lease(self, job_id: int) -> None:
+        with self._lock:
+            token = self._tokens.get(job_id)
+        # Another worker may already be running the job; stop this run's LLM calls
+        if token is not None and token.cancel("lease_lost"):
+            self._count("lost_leases")
+
+    def _execute(self, job: Dict) -> None:
+        last_progress = 0.0
+        with self._lock:
+            token = self._tokens[job["id"]]
+
+        def progress(update: Dict) -> None:
+            nonlocal last_progress
+            if token.cancelled:
+                raise LeaseLost(f"Lease on job {job['id']} lost")
+            now = time.monotonic()
+            if now - last_progress >= PROGRESS_INTERVAL:
+                last_progress = now
+                if not self.db.heartbeat_job(job["id"], self.worker_id, self.lease_seconds, progress=update):
+                    self._lose_lease(job["id"])
+                    raise LeaseLost(f"Lease on job {job['id']} lost")
+                with self._lock:
+                    self._running[job["id"]] = now
+        progress.token = token
+
+        try:
+            if job["attempts"] > job["max_attempts"]:
+                # Its workers kept dying mid-run; stop handing it out
+                self._finish(job, JOB_DEAD, error="Lease expired after the last attempt")
+                return
+            with get_tracer().start_as_current_span(f"job.{job['kind']}", {"job.id": job["id"], "job.attempt": job["attempts"]}):
+                result = self.handlers[job["kind"]](job["payload"], progress)
+            self._finish(job, JOB_SUCCEEDED, result=result)
+        except RetryLater as e:
+            self._finish(job, JOB_QUEUED, error=str(e), retry_in=e.delay, refund_attempt=True)
+        except Exception as e:
+            if token.cancelled:
+                # Stopped after losing the lease; the job is no longer ours to finish
+                print(f"Stopped {job['kind']} job {job['id']}: lease lost")
+                return
+            print(f"Error running {job['kind']} job {job['id']}: {str(e)}")
+            if job["attempts"] >= job["max_attempts"]:
+                self._finish(job, JOB_DEAD, error=str(e))
+            else:
+                self._finish(job, JOB_QUEUED, error=str(e), retry_in=self.queue.backoff(job["attempts"]))
+        finally:
+            token.finish()
+            with self._lock:
+                self._running.pop(job["id"], None)
+                self._tokens.pop(job["id"], None)
+
+    def _finish(self, job: Dict, status: str, result: Optional[Dict] = None, error: Optional[str] = None,
+                retry_in: Optional[float] = None, refund_attempt: bool = False) -> None:
+        if not self.db.finish_job(job["id"], self.worker_id, status, result=result, error=error,
+                                  retry_in=retry_in, refund_attempt=refund_attempt):
+            # Another worker took the job over after our lease ran out; its run wins
+            self._count("lost_leases")
+            return
+        self._count({JOB_SUCCEEDED: "succeeded", JOB_QUEUED: "retried", JOB_DEAD: "dead"}[status])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.counters, "running": len(self._running), "worker_id": self.worker_id}
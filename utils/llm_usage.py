@@ -0,0 +1,230 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from collections import deque
+from datetime import datetime
+import atexit
+import threading
+import time
+
+# USD per 1K tokens as (prompt, completion)
+MODEL_PRICES = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo-preview": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+}
+
+# Share of the prompt price charged for tokens served from the provider's prompt cache
+CACHED_PROMPT_DISCOUNT = 0.5
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for calls without a usage block"""
+    return max(1, len(text) // 4) if text else 0
+
+def estimate_message_tokens(messages: List[Dict]) -> int:
+    """Estimate prompt tokens for a chat message list, including per-message overhead"""
+    return sum(estimate_tokens(str(m.get("content", ""))) + 4 for m in messages)
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """Estimate the USD cost of a call, 0.0 for unknown models"""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    prompt_cost = (prompt_tokens - cached_tokens) * prompt_price + cached_tokens * prompt_price * CACHED_PROMPT_DISCOUNT
+    return (prompt_cost + completion_tokens * completion_price) / 1000
+
+def provider_cached_tokens(usage) -> Optional[int]:
+    """Cached prompt tokens reported in a usage block, if the provider sent them"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is None and getattr(usage, "model_extra", None):
+        details = usage.model_extra.get("prompt_tokens_details")
+    if isinstance(details, dict):
+        return details.get("cached_tokens")
+    return getattr(details, "cached_tokens", None)
+
+class UsageMeter:
+    """Records token usage and latency for every LLM call.
+
+    Records go into a fixed-size ring buffer (for in-process rollups) and a
+    pending batch. A background thread hands the batch to ``sink`` every
+    ``flush_interval`` seconds, or sooner once it reaches ``flush_size`` rows,
+    and once more at interpreter exit, so the hot path never waits on the
+    database.
+
+    A batch the sink failed is kept aside and resent, before anything newer,
+    on the next flush. Past ``capacity`` pending records (a database down for
+    long) new records are dropped from the batch and counted in ``stats``.
+    """
+
+    def __init__(self, capacity: int = 2048, flush_size: int = 50, flush_interval: float = 30.0,
+                 sink: Optional[Callable[[List[Dict]], None]] = None):
+        self.recent = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.pending = deque()
+        # A batch the sink failed, resent as it was
+        self._in_flight: Optional[List[Dict]] = None
+        self._counters = {"recorded": 0, "flushes": 0, "flushed_rows": 0, "flush_errors": 0, "dropped": 0}
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.sink = None
+        self._lock = threading.Lock()
+        # One flush at a time, from the background thread, exit or a caller
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.set_sink(sink)
+
+    def set_sink(self, sink: Optional[Callable[[List[Dict]], None]]) -> None:
+        """Set where flushed batches go, e.g. ``DatabaseService.save_llm_usage``, and start flushing"""
+        self.sink = sink
+        with self._lock:
+            if sink is None or self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="llm-usage", daemon=True)
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def record(self, site: str, model: str, prompt_tokens: int, completion_tokens: int,
+               latency: float, ttft: Optional[float] = None, session_id: Optional[str] = None,
+               founder_email: Optional[str] = None, estimated: bool = False,
+               cached_tokens: int = 0) -> Dict:
+        """Record a single LLM call"""
+        entry = {
+            "site": site,
+            "model": model,
+            "session_id": session_id,
+            "founder_email": founder_email,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cached_tokens": cached_tokens,
+            "cost_usd": estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens),
+            "latency_ms": int(latency * 1000),
+            "ttft_ms": int(ttft * 1000) if ttft is not None else None,
+            "estimated": estimated,
+            "created_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self.recent.append(entry)
+            self._counters["recorded"] += 1
+            if len(self.pending) >= self.capacity:
+                self._counters["dropped"] += 1
+            else:
+                self.pending.append(entry)
+            due = len(self.pending) >= self.flush_size
+        if due:
+            self._wake.set()
+        return entry
+
+    def record_completion(self, response, site: str, model: str, started_at: float,
+                          session_id: Optional[str] = None, founder_email: Optional[str] = None,
+                          cached_tokens: int = 0) -> Dict:
+        """Record a non-streaming completion from its ``usage`` block.
+
+        ``cached_tokens`` is the caller's estimate, used only when the provider
+        does not report cached prompt tokens itself.
+        """
+        latency = time.perf_counter() - started_at
+        usage = getattr(response, "usage", None)
+        reported = provider_cached_tokens(usage)
+        return self.record(
+            site, model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            latency=latency, ttft=latency,
+            session_id=session_id, founder_email=founder_email,
+            cached_tokens=reported if reported is not None else cached_tokens
+        )
+
+    def track_stream(self, deltas: Iterable[str], site: str, model: str, messages: List[Dict],
+                     started_at: float, session_id: Optional[str] = None,
+                     founder_email: Optional[str] = None, cached_tokens: int = 0) -> Iterator[str]:
+        """Pass streamed text through while measuring time-to-first-token.
+
+        Streams carry no usage block, so prompt tokens are estimated and each
+        content delta counts as one completion token. The call is recorded even
+        if the consumer stops early.
+        """
+        ttft = None
+        completion_tokens = 0
+        try:
+            for delta in deltas:
+                if ttft is None:
+                    ttft = time.perf_counter() - started_at
+                completion_tokens += 1
+                yield delta
+        finally:
+            self.record(
+                site, model,
+                prompt_tokens=estimate_message_tokens(messages),
+                completion_tokens=completion_tokens,
+                latency=time.perf_counter() - started_at, ttft=ttft,
+                session_id=session_id, founder_email=founder_email, estimated=True,
+                cached_tokens=cached_tokens
+            )
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Hand pending records to the sink, after any batch that failed before; returns the number flushed"""
+        with self._flush_lock:
+            flushed = 0
+            if self._in_flight is not None:
+                if not self._send(self._in_flight):
+                    return 0
+                flushed += len(self._in_flight)
+                self._in_flight = None
+            with self._lock:
+                if not self.pending or self.sink is None:
+                    return flushed
+                batch = list(self.pending)
+                self.pending.clear()
+            if not self._send(batch):
+                self._in_flight = batch
+                return flushed
+            return flushed + len(batch)
+
+    def _send(self, batch: List[Dict]) -> bool:
+        try:
+            self.sink(batch)
+        except Exception as e:
+            print(f"Error flushing LLM usage: {str(e)}")
+            with self._lock:
+                self._counters["flush_errors"] += 1
+            return False
+        with self._lock:
+            self._counters["flushes"] += 1
+            self._counters["flushed_rows"] += len(batch)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = len(self._in_flight) if self._in_flight is not None else 0
+            return {**self._counters, "pending": len(self.pending) + in_flight}
+
+    def rollup(self, key: str = "session_id") -> Dict[str, Dict]:
+        """Aggregate recent calls by ``session_id``, ``founder_email``, ``site`` or ``model``"""
+        totals: Dict[str, Dict] = {}
+        with self._lock:
+            entries = list(self.recent)
+        for entry in entries:
+            bucket = totals.setdefault(entry.get(key) or "unknown", {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+                "total_tokens": 0, "cost_usd": 0.0, "latency_ms": 0
+            })
+            bucket["calls"] += 1
+            bucket["prompt_tokens"] += entry["prompt_tokens"]
+            bucket["completion_tokens"] += entry["completion_tokens"]
+            bucket["cached_tokens"] += entry["cached_tokens"]
+            bucket["total_tokens"] += entry["total_tokens"]
+            bucket["cost_usd"] += entry["cost_usd"]
+            bucket["latency_ms"] += entry["latency_ms"]
+        return totals
+
+# Process-wide meter shared by all agents
+usage_meter = UsageMeter()
+
+def get_usage_meter() -> UsageMeter:
+    return usage_meter
@@ -0,0 +1,64 @@
+from typing import Dict, Optional
+import json
+import os
+
+CHATGPT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'chatgpt_config.json')
+
+# Used for call sites missing from the config
+DEFAULT_SITE = {"tier": "large", "max_tokens": 500, "temperature": 0.7}
+DEFAULT_TIMEOUT = 60
+
+class ModelRouter:
+    """Maps each LLM call site to a model tier, token limit and timeout.
+
+    ``model_tiers`` name the models (``small``, ``large``, ...), ``call_sites``
+    pick a tier per site such as ``interview.summary``, and ``fallback_tier`` is
+    used when a call is degraded by admission control.
+    """
+
+    def __init__(self, config: Dict):
+        self.tiers: Dict[str, Dict] = config.get("model_tiers", {})
+        self.sites: Dict[str, Dict] = config.get("call_sites", {})
+        self.fallback_tier: Optional[str] = config.get("fallback_tier")
+        if not self.tiers:
+            raise ValueError("Model routing config must define at least one model tier")
+        for site, settings in self.sites.items():
+            if settings.get("tier") not in self.tiers:
+                raise ValueError(f"Call site '{site}' uses unknown model tier '{settings.get('tier')}'")
+        if self.fallback_tier and self.fallback_tier not in self.tiers:
+            raise ValueError(f"Unknown fallback tier '{self.fallback_tier}'")
+
+    @classmethod
+    def from_file(cls, path: str = CHATGPT_CONFIG_PATH) -> 'ModelRouter':
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def route(self, site: str, degraded: bool = False) -> Dict:
+        """Resolve a call site to ``model``, ``max_tokens``, ``timeout`` and ``temperature``"""
+        settings = self.sites.get(site, DEFAULT_SITE)
+        tier_name = settings.get("tier", DEFAULT_SITE["tier"])
+        if degraded and self.fallback_tier:
+            tier_name = self.fallback_tier
+        tier = self.tiers.get(tier_name) or next(iter(self.tiers.values()))
+        return {
+            "site": site,
+            "tier": tier_name,
+            "model": tier["model"],
+            "max_tokens": settings.get("max_tokens", DEFAULT_SITE["max_tokens"]),
+            "timeout": settings.get("timeout", tier.get("timeout", DEFAULT_TIMEOUT)),
+            "temperature": settings.get("temperature", DEFAULT_SITE["temperature"])
+        }
+
+_router: Optional[ModelRouter] = None
+
+def get_model_router() -> ModelRouter:
+    """Process-wide router loaded once from ``config/chatgpt_config.json``"""
+    global _router
+    if _router is None:
+        _router = ModelRouter.from_file()
+    return _router
+
+def set_model_router(router: Optional[ModelRouter]) -> None:
+    """Swap the process-wide router, e.g. to compare routing policies"""
+    global _router
+    _router = router
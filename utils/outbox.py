@@ -0,0 +1,408 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from utils.storage import OUTBOX_METHODS, validate_founder_inputs, founder_inputs_row
+from utils.tracing import trace_methods
+
+# Entry lifecycle: pending -> sent, or dead once out of attempts
+OUTBOX_PENDING = 'pending'
+OUTBOX_SENT = 'sent'
+OUTBOX_DEAD = 'dead'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    method TEXT NOT NULL,
+    lookup TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    retry_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, id);
+CREATE INDEX IF NOT EXISTS idx_outbox_lookup ON outbox(method, lookup, status);
+CREATE INDEX IF NOT EXISTS idx_outbox_lookup_order ON outbox(lookup, status, id);
+"""
+
+class Outbox:
+    """Durable local log of storage writes, replayed to the remote store in the background.
+
+    ``append`` commits a write to a local SQLite file (WAL, synced on every
+    commit) and returns, so the caller never waits on the network. A relay
+    thread sends pending entries to the store in the order they were written,
+    up to ``batch_size`` per ``apply_outbox_batch`` call, each with its
+    idempotency key: a batch resent after a lost reply, or by another process
+    sharing the file, is stored once.
+
+    When a batch fails the relay reads from the store. If that fails too the
+    store is taken to be down: the relay backs off exponentially up to
+    ``max_backoff`` and the entries are not charged an attempt. Otherwise the
+    batch is resent in halves, down to the entries the store rejects; each of
+    those backs off on its own and is parked as dead after ``max_attempts``,
+    staying in the file for ``requeue``.
+
+    Writes sharing a ``lookup`` (a session, a founder) reach the store in the
+    order they were made: while an entry backs off, later entries with its
+    lookup wait until it is sent or dead, so an older ``save_founder_inputs``
+    can never replace newer inputs.
+    Sent entries are deleted ``retention`` seconds later.
+    """
+
+    def __init__(self, path: str = "data/outbox.db", batch_size: int = 200, max_attempts: int = 10,
+                 base_backoff: float = 1.0, max_backoff: float = 300.0, poll_interval: float = 1.0,
+                 linger: float = 0.05, retention: float = 86400.0, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.linger = linger
+        self.retention = retention
+        self.clock = clock
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # An acknowledged write must survive a power cut, not just a crash
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # One replay at a time, whether from the relay thread or ``flush``
+        self._replay_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.remote = None
+        self._failures = 0
+        self._retry_at = 0.0
+        self._last_compact = clock()
+        self._counters = {"appended": 0, "sent": 0, "batches": 0, "failed_batches": 0, "dead": 0}
+
+    def append(self, method: str, payload: dict, lookup: Optional[str] = None) -> str:
+        """Durably record a write and return its idempotency key; ``lookup`` finds it again with ``find``"""
+        if method not in OUTBOX_METHODS:
+            raise ValueError(f"Unknown outbox method: {method}")
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO outbox (idempotency_key, method, lookup, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, method, lookup, json.dumps(payload), self.clock())
+            )
+            self._counters["appended"] += 1
+        self._wake.set()
+        return key
+
+    def find(self, method: str, lookup: str) -> Optional[Dict]:
+        """Payload of the latest ``method`` write for ``lookup`` that has not reached the store"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM outbox WHERE method = ? AND lookup = ? AND status != ? ORDER BY id DESC LIMIT 1",
+                (method, lookup, OUTBOX_SENT)
+            ).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    def pending(self, limit: Optional[int] = None) -> List[Dict]:
+        """Entries due for replay, oldest first, skipping any queued behind an earlier one still backing off"""
+        now = self.clock()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, idempotency_key, method, lookup, payload, attempts FROM outbox AS o "
+                "WHERE status = ? AND retry_at <= ? AND (lookup IS NULL OR NOT EXISTS ("
+                "  SELECT 1 FROM outbox AS e WHERE e.lookup = o.lookup AND e.status = ? AND e.id < o.id"
+                "  AND e.retry_at > ?)) "
+                "ORDER BY id LIMIT ?",
+                (OUTBOX_PENDING, now, OUTBOX_PENDING, now, limit or self.batch_size)
+            ).fetchall()
+        return [{"id": row["id"], "key": row["idempotency_key"], "method": row["method"], "lookup": row["lookup"],
+                 "payload": json.loads(row["payload"]), "attempts": row["attempts"]} for row in rows]
+
+    def start(self, remote) -> None:
+        """Start replaying to ``remote`` on a background thread; later calls keep the first remote"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.remote = remote
+            self._thread = threading.Thread(target=self._run, name="outbox-relay", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            backoff = self._retry_at - self.clock()
+            if backoff > 0:
+                # The store is down; new writes wait with the rest
+                self._stop.wait(backoff)
+            else:
+                self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            if self.linger:
+                # Lets writes arriving together go out in one batch
+                time.sleep(self.linger)
+            try:
+                self.drain()
+                self._compact_if_due()
+            except Exception as e:
+                print(f"Error replaying outbox: {str(e)}")
+
+    def drain(self) -> int:
+        """Replay due entries until none are left or the store fails; returns how many were sent"""
+        sent = 0
+        with self._replay_lock:
+            while self.clock() >= self._retry_at:
+                batch = self.pending()
+                if not batch:
+                    break
+                sent += self.replay(batch)
+                if len(batch) < self.batch_size:
+                    break
+        return sent
+
+    def replay(self, batch: List[Dict]) -> int:
+        """Send one batch to the store; returns how many entries it accepted"""
+        try:
+            self.remote.apply_outbox_batch(batch)
+        except Exception as e:
+            with self._lock:
+                self._counters["failed_batches"] += 1
+            return self._replay_failed_batch(batch, str(e))
+        self._mark_sent(batch)
+        return len(batch)
+
+    def _replay_failed_batch(self, batch: List[Dict], error: str) -> int:
+        """Back off if the store is down; otherwise resend in halves to find the entries it rejects"""
+        if not self._store_reachable():
+            print(f"Error replaying outbox, store unavailable: {error}")
+            self._mark_failed([(record, error) for record in batch], charge=False)
+            self._failures += 1
+            self._retry_at = self.clock() + self._backoff(self._failures)
+            return 0
+        # A reply lost on the way back costs two calls; one bad entry about 2 * log2(batch_size)
+        sent, failed, held = [], [], []
+        self._bisect(batch, sent, failed, held)
+        if sent:
+            self._mark_sent(sent)
+        self._mark_failed(failed, charge=True)
+        # Not tried: they wait, uncharged, until the entry ahead of them is sent or dead
+        self._mark_failed(held, charge=False)
+        return len(sent)
+
+    def _bisect(self, batch: List[Dict], sent: List[Dict], failed: List[Tuple[Dict, str]],
+                held: List[Tuple[Dict, str]]) -> None:
+        middle = len(batch) // 2
+        # Earlier entries first, so a session is stored before the rows that refer to it
+        for half in (batch[:middle], batch[middle:]):
+            blocked = {record["lookup"] for record, _ in failed + held if record["lookup"] is not None}
+            held.extend((record, f"Waiting for an earlier write to {record['lookup']}")
+                        for record in half if record["lookup"] in blocked)
+            half = [record for record in half if record["lookup"] not in blocked]
+            if not half:
+                continue
+            try:
+                self.remote.apply_outbox_batch(half)
+                sent.extend(half)
+            except Exception as e:
+                if len(half) == 1:
+                    failed.append((half[0], str(e)))
+                else:
+                    self._bisect(half, sent, failed, held)
+
+    def _store_reachable(self) -> bool:
+        try:
+            # Any cheap read will do
+            self.remote.get_session("outbox-probe")
+            return True
+        except Exception:
+            return False
+
+    def _backoff(self, failures: int) -> float:
+        return min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+
+    def _mark_sent(self, records: List[Dict]) -> None:
+        now = self.clock()
+        self._failures = 0
+        self._retry_at = 0.0
+        with self._lock:
+            self._update_many("UPDATE outbox SET status = ?, sent_at = ?, last_error = NULL WHERE id = ?",
+                              [(OUTBOX_SENT, now, record["id"]) for record in records])
+            self._counters["sent"] += len(records)
+            self._counters["batches"] += 1
+
+    def _mark_failed(self, failed: List[Tuple[Dict, str]], charge: bool) -> None:
+        """Record errors; entries ``charge``d an attempt back off on their own, or die out of attempts"""
+        now = self.clock()
+        updates = []
+        for record, error in failed:
+            attempts = record["attempts"] + 1 if charge else record["attempts"]
+            if charge and attempts >= self.max_attempts:
+                print(f"Error replaying outbox entry {record['key']} ({record['method']}), parked as dead: {error}")
+                updates.append((OUTBOX_DEAD, attempts, 0.0, error, record["id"]))
+            else:
+                retry_at = now + self._backoff(attempts) if charge else 0.0
+                updates.append((OUTBOX_PENDING, attempts, retry_at, error, record["id"]))
+        if not updates:
+            return
+        with self._lock:
+            self._update_many("UPDATE outbox SET status = ?, attempts = ?, retry_at = ?, last_error = ? WHERE id = ?",
+                              updates)
+            self._counters["dead"] += sum(1 for update in updates if update[0] == OUTBOX_DEAD)
+
+    def _update_many(self, sql: str, rows: List[tuple]) -> None:
+        # Callers hold self._lock
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(sql, rows)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def requeue(self) -> int:
+        """Give dead entries a fresh set of attempts, e.g. after fixing what the store rejected"""
+        with self._lock:
+            cursor = self._conn.execute("UPDATE outbox SET status = ?, attempts = 0, retry_at = 0 WHERE status = ?",
+                                        (OUTBOX_PENDING, OUTBOX_DEAD))
+        self._wake.set()
+        return cursor.rowcount
+
+    def _compact_if_due(self) -> None:
+        now = self.clock()
+        if now - self._last_compact < min(self.retention, 600.0):
+            return
+        self._last_compact = now
+        with self._lock:
+            self._conn.execute("DELETE FROM outbox WHERE status = ? AND sent_at < ?", (OUTBOX_SENT, now - self.retention))
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Replay until nothing is pending; False if entries remain after ``timeout`` seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.remote is not None:
+                self.drain()
+            if not self.stats()[OUTBOX_PENDING]:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(min(0.1, max(0.0, deadline - time.monotonic())))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Try to replay what is pending, then stop the relay; anything left is replayed on the next start"""
+        if self.remote is not None and not self.flush(timeout):
+            print(f"Outbox closed with {self.stats()[OUTBOX_PENDING]} writes still pending in {self.path}")
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {row["status"]: row["n"] for row in
+                      self._conn.execute("SELECT status, COUNT(*) AS n FROM outbox GROUP BY status")}
+            oldest = self._conn.execute("SELECT MIN(created_at) AS t FROM outbox WHERE status = ?",
+                                        (OUTBOX_PENDING,)).fetchone()["t"]
+            counters = dict(self._counters)
+        now = self.clock()
+        return {
+            **counters,
+            OUTBOX_PENDING: counts.get(OUTBOX_PENDING, 0),
+            OUTBOX_DEAD: counts.get(OUTBOX_DEAD, 0),
+            "oldest_pending_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "backoff_seconds": round(max(0.0, self._retry_at - now), 3)
+        }
+
+@trace_methods("outbox")
+class OutboxStorage:
+    """A storage backend whose interview writes go through an ``Outbox``.
+
+    The queued ``save_*`` methods validate their input, append it to the
+    outbox and return at once; every other call goes to the wrapped backend.
+    Reads of a session, its tester, its latest analysis or a founder's inputs
+    check the outbox first, so a link created during an outage still opens
+    in this process before the write has reached the store.
+    """
+
+    def __init__(self, backend, outbox: Outbox):
+        self.backend = backend
+        self.outbox = outbox
+        outbox.start(backend)
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def save_session(self, session_data: dict) -> str:
+        session_data = dict(session_data)
+        session_data.setdefault('created_at', datetime.now().isoformat())
+        self.outbox.append('save_session', {'session_data': session_data}, lookup=session_data['session_id'])
+        return session_data['session_id']
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        pending = self.outbox.find('save_session', session_id)
+        return pending['session_data'] if pending else self.backend.get_session(session_id)
+
+    def save_responses(self, session_id: str, responses: list) -> None:
+        self.outbox.append('save_responses', {
+            'session_id': session_id, 'responses': responses, 'created_at': datetime.now().isoformat()
+        }, lookup=session_id)
+
+    def save_tester_info(self, session_id: str, email: str, opt_in: bool, gdpr_consent: bool) -> None:
+        self.outbox.append('save_tester_info', {
+            'session_id': session_id, 'email': email, 'opt_in': opt_in, 'gdpr_consent': gdpr_consent,
+            'created_at': datetime.now().isoformat()
+        }, lookup=session_id)
+
+    def get_tester_info(self, session_id: str) -> Optional[Dict]:
+        return self.outbox.find('save_tester_info', session_id) or self.backend.get_tester_info(session_id)
+
+    def save_analysis(self, session_id: str, analysis: dict) -> None:
+        self.outbox.append('save_analysis', {
+            'session_id': session_id, 'analysis': analysis, 'created_at': datetime.now().isoformat()
+        }, lookup=session_id)
+
+    def get_analysis(self, session_id: str) -> Optional[Dict]:
+        pending = self.outbox.find('save_analysis', session_id)
+        return pending['analysis'] if pending else self.backend.get_analysis(session_id)
+
+    def save_founder_inputs(self, founder_email: str, inputs: dict) -> Optional[Dict]:
+        # Rejected inputs are reported now, not when the entry is replayed
+        validate_founder_inputs(inputs)
+        self.outbox.append('save_founder_inputs', {'founder_email': founder_email, 'inputs': inputs},
+                           lookup=founder_email)
+        return founder_inputs_row(founder_email, inputs)
+
+    def get_founder_inputs(self, founder_email: str) -> Optional[Dict]:
+        pending = self.outbox.find('save_founder_inputs', founder_email)
+        if pending is None:
+            return self.backend.get_founder_inputs(founder_email)
+        return {field: value for field, value in founder_inputs_row(founder_email, pending['inputs']).items()
+                if field != 'founder_email'}
+
+# Process-wide outbox, opened on first use so importing the module creates no file
+outbox: Optional[Outbox] = None
+_outbox_lock = threading.Lock()
+
+def get_outbox() -> Outbox:
+    global outbox
+    with _outbox_lock:
+        if outbox is None:
+            outbox = Outbox(os.getenv('OUTBOX_PATH', 'data/outbox.db'),
+                            max_attempts=int(os.getenv('OUTBOX_MAX_ATTEMPTS', '10')))
+            atexit.register(outbox.close)
+        return outbox
+
+def set_outbox(box: Outbox) -> None:
+    """Replace the process-wide outbox, e.g. with a temporary file in benchmarks"""
+    global outbox
+    outbox = box
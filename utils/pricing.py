@@ -0,0 +1,328 @@
+"""Deterministic reading of ``price_sensitivity`` answers.
+
+The interview asks "what would you expect to pay? What would feel fair? What
+would feel expensive?", so one answer often carries several prices, each with
+its own anchor:
+
+    "$5-10 per month would feel fair"            fair 5-10 / month
+    "10 bucks is fair, 30 a month is too much"   fair 10, too expensive 30
+    "anything under $3 feels sketchy"            too cheap 3
+
+``extract_prices`` parses a whole corpus at once (each pattern runs once over
+the joined text or as one pandas string operation, never per answer in
+Python) into one row per answer: currencies, ranges, number words, periods
+and anchors, converted to the founder's billing period. ``price_curves`` turns
+those rows into Van Westendorp-style curves evaluated at the founder's
+``price_points``, plus the usual crossing points. No model calls; a
+founder's whole corpus takes milliseconds.
+"""
+from typing import Dict, Iterable, List, Optional
+import json
+import re
+import numpy as np
+import pandas as pd
+from utils.responses import upgrade_responses
+from utils.storage import StorageBackend
+
+ANCHORS = ("too_cheap", "cheap", "fair", "expensive", "too_expensive")
+
+# Days per period, for converting between billing periods
+PERIOD_DAYS = {"day": 1.0, "week": 7.0, "month": 365.0 / 12, "year": 365.0}
+
+# Founder pricing model -> period its price points are quoted in
+PRICING_MODEL_PERIODS = {"Subscription": "month", "Freemium": "month", "One-time": "one_time"}
+
+CURRENCIES = {
+    "$": "USD", "usd": "USD", "dollar": "USD", "dollars": "USD", "buck": "USD", "bucks": "USD",
+    "€": "EUR", "eur": "EUR", "euro": "EUR", "euros": "EUR",
+    "£": "GBP", "gbp": "GBP", "pound": "GBP", "pounds": "GBP", "quid": "GBP",
+}
+
+_UNITS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+    "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+_TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90}
+# "one" alone is too often not a number ("one more app"); it is only read before a currency
+_NUMBER_WORDS = {**{k: v for k, v in _UNITS.items() if k != "one"}, **_TENS,
+                 "a hundred": 100, "one hundred": 100, "hundred": 100, "zero": 0}
+
+# "between 5 and 10" and "5 to 10" become "5-10" before clauses are split on "and"
+_BETWEEN_RE = r"\bbetween\s+([$€£]?\s*\d+(?:\.\d+)?k?)\s+and\s+([$€£]?\s*\d+(?:\.\d+)?k?)"
+_TO_RE = r"([$€£]?\d+(?:\.\d+)?k?)\s*(?:to|–|—|-)\s*([$€£]?\s*\d+(?:\.\d+)?k?)\b"
+
+# Clause boundaries; a period followed by a digit is a decimal point
+_CLAUSE_RE = r"[;!?\n]|\.(?!\d)|,|\bbut\b|\band\b|\bwhile\b|\bwhereas\b|\bthough\b"
+
+_PRICE_RE = (
+    r"(?P<symbol>[$€£])?\s*(?P<low>\d+(?:\.\d+)?)(?P<low_k>k)?"
+    r"(?:-[$€£]?\s*(?P<high>\d+(?:\.\d+)?)(?P<high_k>k)?)?"
+    # Counts of other things ("5 users", "3 times a week", "10%") are not prices
+    r"(?!\d|\s*(?:%|percent|people|persons|users|seats|employees|times|x\b|hours?|hrs?\b|minutes?|mins?\b"
+    r"|kids|children|stars?|out of|/10|/5|years? old|months? (?:free|trial)|days? (?:free|trial)))"
+    r"\s*(?P<word>dollars?|bucks?|usd|euros?|eur|pounds?|gbp|quid)?"
+)
+
+# The first period named in a clause; the group name before "_" is the period
+_PERIOD_RE = re.compile(
+    r"(?:/|\b(?:per|an?|each|every)\s)\s*(?:(?P<month_per>month|mo|mth)|(?P<year_per>year|yr|annum)"
+    r"|(?P<week_per>week|wk)|(?P<day_per>day))\b"
+    r"|\b(?:(?P<month_ly>monthly|p/m)|(?P<year_ly>yearly|annually|annual)|(?P<week_ly>weekly)|(?P<day_ly>daily)"
+    r"|(?P<onetime_ly>onetime|oneoff|once|lifetime|up[- ]?front|outright))\b"
+)
+_PERIOD_NAMES = {"month": "month", "year": "year", "week": "week", "day": "day", "onetime": "one_time"}
+
+# Checked in order; the first that matches a clause is its anchor
+_ANCHOR_PATTERNS = [
+    ("fair", r"\bnot (?:too |that |very |so )?(?:expensive|pricey|much|steep|bad)\b"),
+    ("too_expensive", r"\btoo (?:expensive|much|pricey|steep|high|rich)\b|\b(?:would|wo|could|ca|do)n'?t pay\b"
+                      r"|\bnot pay\b|\bno way\b|\brip[- ]?off\b|\boutrageous\b|\bdeal[- ]?breaker\b|\bwalk away\b"
+                      r"|\bridiculous\b|\bcrazy\b|\bnever\b"),
+    ("too_cheap", r"\btoo (?:cheap|low)\b|\bsuspicious\b|\bsketchy\b|\b(?:would|do)n'?t trust\b|\bdoubt the quality\b"
+                  r"|\bmust be (?:bad|junk|a scam)\b|\bscam\b"),
+    ("expensive", r"\bexpensive\b|\bpricey\b|\bsteep\b|\ba stretch\b|\bpushing it\b|\bhesitat\w*|\bthink twice\b"
+                  r"|\bmax(?:imum)?\b|\bat most\b|\bup to\b|\bupper limit\b|\bmost i'?d\b|\bceiling\b|\bpainful\b"),
+    ("cheap", r"\bcheap\b|\bbargain\b|\bsteal\b|\b(?:great|good) (?:deal|value)\b|\bno[- ]?brainer\b|\binstant(?:ly)? buy\b"),
+    ("fair", r"\bfair\b|\breasonable\b|\bok(?:ay)?\b|\bfine\b|\bworth\b|\bwould pay\b|\b'd pay\b|\bhappy to pay\b"
+             r"|\bexpect\b|\babout right\b|\bsounds right\b|\bcomfortable\b"),
+]
+_ANCHOR_RE = re.compile("|".join(f"(?P<anchor{i}>{pattern})" for i, (_, pattern) in enumerate(_ANCHOR_PATTERNS)))
+
+_WORD_NUMBER_RE = re.compile(
+    r"\bone[- ]?(?P<one_time>time|off)\b"
+    r"|\b(?:one|a)\s+(?P<one>dollar|buck|euro|pound|quid)\b"
+    r"|\b(?P<tens>" + "|".join(_TENS) + r")[ -](?P<unit>" + "|".join(k for k, v in _UNITS.items() if v < 10) + r")\b"
+    r"|\b(?P<word>" + "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True)) + r")\b"
+    # "if it's free" is a price of zero; "free trial" and "feel free" are not
+    r"|(?<!feel )\b(?P<free>free)\b(?!\s+(?:trial|time|tier|version|plan|months?|weeks?|days?))"
+)
+
+def _word_number(match: re.Match) -> str:
+    if match.group("one_time"):
+        return "one" + match.group("one_time")
+    if match.group("one"):
+        return "1 " + match.group("one")
+    if match.group("tens"):
+        return str(_TENS[match.group("tens")] + _UNITS[match.group("unit")])
+    if match.group("word"):
+        return str(_NUMBER_WORDS[match.group("word")])
+    return "0"
+
+def _normalize(answers: pd.Series) -> pd.Series:
+    # One pass of each substitution over the whole corpus rather than one per answer;
+    # NUL never occurs in answers and is neither a word nor a space character
+    text = "\0".join(answers).lower().replace("’", "'")
+    text = re.sub(r"(\d),(\d{3})\b", r"\1\2", text)
+    text = _WORD_NUMBER_RE.sub(_word_number, text)
+    text = re.sub(_BETWEEN_RE, r"\1-\2", text)
+    text = re.sub(_TO_RE, r"\1-\2", text)
+    return pd.Series(text.split("\0"), index=answers.index)
+
+def _scan(clauses: pd.Series, pattern) -> List[tuple]:
+    """``(clause position, group name)`` of every match of ``pattern``, in order.
+
+    The clauses are scanned as one string and matches mapped back through
+    their offsets, instead of running the pattern once per clause.
+    """
+    if clauses.empty:
+        return []
+    lengths = clauses.str.len().to_numpy() + 1
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    matches = list(re.finditer(pattern, "\0".join(clauses)))
+    positions = np.searchsorted(starts, [m.start() for m in matches], side="right") - 1
+    return [(int(position), m.lastgroup) for position, m in zip(positions, matches)]
+
+def _amount(value: pd.Series, thousands: pd.Series) -> pd.Series:
+    return value.astype(float) * np.where(thousands.notna(), 1000.0, 1.0)
+
+def _period_factor(period: pd.Series, target: str) -> np.ndarray:
+    """Multiplier from each clause's period to ``target``; one-time prices are never converted"""
+    if target not in PERIOD_DAYS:
+        return np.ones(len(period))
+    days = period.map(PERIOD_DAYS).astype(float).to_numpy()
+    return np.where(np.isnan(days), 1.0, PERIOD_DAYS[target] / np.where(np.isnan(days), 1.0, days))
+
+def extract_prices(texts: Iterable[str], period: str = "month", currency: str = "USD") -> pd.DataFrame:
+    """One row per answer: ``currency``, ``period``, ``priced`` and a price per anchor.
+
+    Prices are converted to ``period`` (``month``, ``year``, ``week``, ``day``
+    or ``one_time``); answers that give no period are taken to be quoted in
+    it already, and those that give no currency in ``currency``. ``fair_low``
+    and ``fair_high`` hold a fair range ("$5-10"); every other anchor holds a
+    single threshold, the low end of a range. A priced clause with no anchor
+    word is a fair price, since that is what the question asks for.
+    """
+    answers = pd.Series(list(texts), dtype=object).fillna("").astype(str)
+    columns = ["text", "currency", "period", "priced", "too_cheap", "cheap", "fair_low", "fair_high",
+               "expensive", "too_expensive"]
+    if answers.empty:
+        return pd.DataFrame(columns=columns)
+    normalized = _normalize(answers)
+
+    clauses = normalized.str.split(_CLAUSE_RE, regex=True).explode().fillna("")
+    mentions = clauses.str.extract(_PRICE_RE)
+    clause_periods = np.full(len(clauses), None, dtype=object)
+    for position, group in reversed(_scan(clauses, _PERIOD_RE)):
+        clause_periods[position] = _PERIOD_NAMES[group.split("_")[0]]
+    mentions["period"] = clause_periods
+
+    # Anchors only matter for clauses with a price; the earliest pattern in the list that matches wins
+    has_price = np.flatnonzero(mentions["low"].notna().to_numpy())
+    rank = np.full(len(has_price), len(_ANCHOR_PATTERNS))
+    for position, group in _scan(clauses.iloc[has_price], _ANCHOR_RE):
+        rank[position] = min(rank[position], int(group[len("anchor"):]))
+    mentions["anchor"] = "fair"
+    mentions.iloc[has_price, mentions.columns.get_loc("anchor")] = np.array(
+        [anchor for anchor, _ in _ANCHOR_PATTERNS] + ["fair"], dtype=object)[rank]
+    mentions["currency"] = mentions["symbol"].combine_first(mentions["word"]).map(CURRENCIES)
+
+    # A period or currency named once covers every price in the answer
+    for column in ("period", "currency"):
+        mentions[column] = mentions[column].fillna(mentions.groupby(level=0)[column].transform("first"))
+    mentions["period"] = mentions["period"].fillna(period)
+    mentions["currency"] = mentions["currency"].fillna(currency)
+
+    factor = _period_factor(mentions["period"], period)
+    mentions["low"] = _amount(mentions["low"], mentions["low_k"]) * factor
+    mentions["high"] = (_amount(mentions["high"], mentions["high_k"]) * factor).fillna(mentions["low"])
+    priced = mentions[mentions["low"].notna()]
+
+    # First price per (answer, anchor)
+    first = priced.groupby([priced.index, "anchor"])[["low", "high"]].first()
+    lows = first["low"].unstack()
+    highs = first["high"].unstack()
+    result = pd.DataFrame(index=answers.index)
+    result["text"] = answers
+    result["currency"] = priced.groupby(level=0)["currency"].first()
+    result["period"] = priced.groupby(level=0)["period"].first()
+    result["priced"] = result.index.isin(priced.index)
+    for anchor in ("too_cheap", "cheap", "expensive", "too_expensive"):
+        result[anchor] = lows[anchor] if anchor in lows else np.nan
+    result["fair_low"] = lows["fair"] if "fair" in lows else np.nan
+    result["fair_high"] = highs["fair"] if "fair" in highs else np.nan
+    return result[columns]
+
+def _share_at_or_above(values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    values = np.sort(values[~np.isnan(values)])
+    if not len(values):
+        return np.full(len(grid), np.nan)
+    return 1 - np.searchsorted(values, grid, side="left") / len(values)
+
+def _share_at_or_below(values: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    values = np.sort(values[~np.isnan(values)])
+    if not len(values):
+        return np.full(len(grid), np.nan)
+    return np.searchsorted(values, grid, side="right") / len(values)
+
+def _crossing(grid: np.ndarray, a: np.ndarray, b: np.ndarray) -> Optional[float]:
+    """First price where curve ``a`` meets curve ``b``, linearly interpolated.
+
+    Step curves from few answers often touch over a whole stretch of prices;
+    the middle of that stretch is taken.
+    """
+    diff = a - b
+    if np.isnan(diff).all():
+        return None
+    for i in range(len(grid) - 1):
+        if diff[i] == 0:
+            end = i
+            while end + 1 < len(grid) and diff[end + 1] == 0:
+                end += 1
+            return float((grid[i] + grid[end]) / 2)
+        if diff[i] * diff[i + 1] < 0:
+            return float(grid[i] + (grid[i + 1] - grid[i]) * diff[i] / (diff[i] - diff[i + 1]))
+    return None
+
+def _curves(prices: pd.DataFrame, grid: np.ndarray) -> Dict[str, np.ndarray]:
+    """Van Westendorp curves, each over the answers that gave that anchor.
+
+    "Cheap" (good value) uses the fair price where no bargain price was given,
+    since the interview asks what would feel fair. ``would_pay`` is the share
+    of priced answers whose ceiling (fair, bargain or getting-expensive price,
+    else just under the too-expensive one) is at or above each price.
+    """
+    value = prices["cheap"].fillna(prices["fair_high"]).to_numpy(float)
+    too_expensive = prices["too_expensive"].to_numpy(float)
+    ceiling = prices["fair_high"].fillna(prices["cheap"]).fillna(prices["expensive"]).to_numpy(float)
+    ceiling = np.where(np.isnan(ceiling), np.nextafter(too_expensive, -np.inf), ceiling)
+    return {
+        "too_cheap": _share_at_or_above(prices["too_cheap"].to_numpy(float), grid),
+        "cheap": _share_at_or_above(value, grid),
+        "expensive": _share_at_or_below(prices["expensive"].to_numpy(float), grid),
+        "too_expensive": _share_at_or_below(too_expensive, grid),
+        "would_pay": _share_at_or_above(ceiling, grid),
+    }
+
+def _round(value, digits: int):
+    return None if value is None or np.isnan(value) else round(float(value), digits)
+
+def price_curves(prices: pd.DataFrame, price_points: List[float], currency: str = "USD",
+                 grid_size: int = 200) -> Dict:
+    """Van Westendorp-style summary of ``extract_prices`` rows at ``price_points``.
+
+    Answers quoted in another currency are counted but left out of the curves.
+    Crossings are found on a grid spanning every observed price and price
+    point: optimal price (too cheap meets too expensive), indifference price
+    (cheap meets expensive) and the acceptable range between "too cheap" meeting
+    "not cheap" and "too expensive" meeting "not expensive". Any of them is
+    None when the answers don't contain the anchors it needs.
+    """
+    priced = prices[prices["priced"].astype(bool)]
+    usable = priced[priced["currency"] == currency]
+    value_columns = ["too_cheap", "cheap", "fair_low", "fair_high", "expensive", "too_expensive"]
+    observed = usable[value_columns].to_numpy(float).ravel()
+    observed = observed[~np.isnan(observed)]
+    points = np.array(sorted(price_points), dtype=float)
+    top = max(observed.max() if len(observed) else 0.0, points.max() if len(points) else 0.0)
+    grid = np.unique(np.concatenate([np.linspace(0.0, top * 1.05 or 1.0, grid_size), observed, points]))
+    curves = _curves(usable, grid)
+    at_points = _curves(usable, points) if len(points) else {}
+
+    lower = _crossing(grid, curves["too_cheap"], 1 - curves["cheap"])
+    upper = _crossing(grid, curves["too_expensive"], 1 - curves["expensive"])
+    fair = usable["fair_high"].fillna(usable["fair_low"]).dropna()
+    return {
+        "answers": int(len(prices)),
+        "priced": int(len(priced)),
+        "other_currency": int(len(priced) - len(usable)),
+        "anchors": {anchor: int(usable[column].notna().sum())
+                    for anchor, column in (("too_cheap", "too_cheap"), ("cheap", "cheap"), ("fair", "fair_high"),
+                                           ("expensive", "expensive"), ("too_expensive", "too_expensive"))},
+        "median_fair": _round(fair.median(), 2) if len(fair) else None,
+        "price_points": [
+            {"price": float(price), **{name: _round(curve[i], 3) for name, curve in at_points.items()}}
+            for i, price in enumerate(points)
+        ],
+        "optimal_price": _round(_crossing(grid, curves["too_cheap"], curves["too_expensive"]), 2),
+        "indifference_price": _round(_crossing(grid, curves["cheap"], curves["expensive"]), 2),
+        "acceptable_range": [_round(lower, 2), _round(upper, 2)],
+        "curves": {"price": [round(float(p), 2) for p in grid],
+                   **{name: [_round(v, 3) for v in curve] for name, curve in curves.items()}},
+    }
+
+def founder_period(founder_inputs: Dict) -> str:
+    """Billing period the founder's price points are quoted in"""
+    return PRICING_MODEL_PERIODS.get(founder_inputs.get("pricing_model") or "", "month")
+
+def price_answers(interviews: Iterable[List[Dict]]) -> List[str]:
+    """The ``price_sensitivity`` answer texts from interviews (one response list each)"""
+    # Interviews saved before response schema 2 recorded the pitch answer under this type too
+    return [response.get("response") or "" for responses in interviews for response in upgrade_responses(responses)
+            if response.get("type") == "price_sensitivity"]
+
+def founder_price_answers(db: StorageBackend, founder_email: str, page_size: int = 500) -> List[str]:
+    """Every ``price_sensitivity`` answer across a founder's sessions, read a page of sessions at a time"""
+    answers = []
+    offset = 0
+    while True:
+        sessions = db.list_sessions(founder_email, offset=offset, limit=page_size)
+        if not sessions:
+            return answers
+        rows = db.get_session_rows("responses", [s["session_id"] for s in sessions])
+        # JSON columns come back as text from SQLite and as decoded values from Supabase
+        answers.extend(price_answers(json.loads(row["responses"]) if isinstance(row["responses"], str)
+                                     else row["responses"] or [] for row in rows))
+        if len(sessions) < page_size:
+            return answers
+        offset += page_size
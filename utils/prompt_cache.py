@@ -0,0 +1,83 @@
+from typing import Dict, List
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import time
+
+from utils.llm_usage import estimate_message_tokens
+
+# Providers keep cached prefixes for a few minutes and only cache long prompts
+PROVIDER_CACHE_TTL = 300
+MIN_CACHEABLE_TOKENS = 1024
+
+class PrefixCacheTracker:
+    """Tracks which message prefixes repeat across LLM calls.
+
+    Provider-side prompt caching only helps when calls share an identical
+    leading run of messages. For every call we hash each message-boundary
+    prefix; the longest one seen within the provider TTL is what the provider
+    could serve from cache. That gives an estimate of cached tokens per call
+    when the response itself does not report them (e.g. streams).
+    """
+
+    def __init__(self, ttl: float = PROVIDER_CACHE_TTL, min_tokens: int = MIN_CACHEABLE_TOKENS,
+                 max_prefixes: int = 10000):
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self.max_prefixes = max_prefixes
+        self.prefixes: "OrderedDict[str, Dict]" = OrderedDict()
+        self.sites: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, messages: List[Dict], site: str = "unknown") -> int:
+        """Register a call's messages; returns the tokens a provider cache could reuse"""
+        now = time.monotonic()
+        digest = hashlib.sha256()
+        tokens = 0
+        cached_tokens = 0
+        with self._lock:
+            for i, message in enumerate(messages):
+                digest.update(json.dumps(message, sort_keys=True).encode())
+                tokens += estimate_message_tokens([message])
+                key = digest.hexdigest()[:16]
+                entry = self.prefixes.get(key)
+                if entry is not None and now - entry["last_seen"] < self.ttl and tokens >= self.min_tokens:
+                    cached_tokens = tokens
+                    entry["hits"] += 1
+                if entry is None:
+                    entry = self.prefixes[key] = {"prefix_id": key, "messages": i + 1, "tokens": tokens,
+                                                  "calls": 0, "hits": 0, "site": site}
+                entry["calls"] += 1
+                entry["last_seen"] = now
+                self.prefixes.move_to_end(key)
+            while len(self.prefixes) > self.max_prefixes:
+                self.prefixes.popitem(last=False)
+
+            totals = self.sites.setdefault(site, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+            totals["calls"] += 1
+            totals["prompt_tokens"] += tokens
+            totals["cached_tokens"] += cached_tokens
+        return cached_tokens
+
+    def prefix_stats(self, limit: int = 20) -> List[Dict]:
+        """Most reused prefixes, with their size and hit counts"""
+        with self._lock:
+            entries = [dict(e) for e in self.prefixes.values() if e["hits"]]
+        for entry in entries:
+            entry.pop("last_seen", None)
+        return sorted(entries, key=lambda e: e["hits"] * e["tokens"], reverse=True)[:limit]
+
+    def site_stats(self) -> Dict[str, Dict]:
+        """Per call site share of prompt tokens that sit in a reusable prefix"""
+        with self._lock:
+            stats = {site: dict(totals) for site, totals in self.sites.items()}
+        for totals in stats.values():
+            totals["cached_ratio"] = totals["cached_tokens"] / totals["prompt_tokens"] if totals["prompt_tokens"] else 0.0
+        return stats
+
+# Process-wide tracker shared by all agents
+prefix_tracker = PrefixCacheTracker()
+
+def get_prefix_tracker() -> PrefixCacheTracker:
+    return prefix_tracker
@@ -0,0 +1,66 @@
+"""Versions of the response events ``InterviewAgent`` records, and reading old ones.
+
+Since version 2 every event carries ``schema_version`` and each answer is
+recorded under the question it answers: ``problem_action`` for the action
+question, ``value_prop_interest`` for the pitch (with its normalized
+likelihood), ``price_sensitivity`` for the price question and
+``opt_in_intent`` for the opt-in question. Events saved before have no
+``schema_version`` and were recorded one question late:
+
+    value_prop_interest  the action answer, or the explanation again after a low resonance score
+    price_sensitivity    for "buy" targets the pitch answer, then each price answer
+    opt_in_intent        for other targets the pitch answer; the opt-in answer itself was never recorded
+
+Readers call ``upgrade_responses`` on each interview's events and only ever
+handle the current meanings.
+"""
+from typing import Dict, List
+from utils.answers import LIKELIHOOD_LABELS, get_answer_normalizer
+
+RESPONSE_SCHEMA_VERSION = 2
+
+def response_schema_version(response: Dict) -> int:
+    return response.get("schema_version", 1)
+
+def upgrade_responses(responses: List[Dict]) -> List[Dict]:
+    """One interview's events with the ones saved before ``RESPONSE_SCHEMA_VERSION`` mapped to current meanings"""
+    if all(response_schema_version(response) >= RESPONSE_SCHEMA_VERSION for response in responses):
+        return responses
+
+    upgraded = []
+    explanation = None
+    # The legacy value_prop_interest row of the current problem, until the pitch answer after it is seen
+    pitched = None
+    for response in responses:
+        if response_schema_version(response) >= RESPONSE_SCHEMA_VERSION:
+            upgraded.append(response)
+            continue
+        kind = response.get("type")
+        stamp = {"timestamp": response.get("timestamp"), "schema_version": RESPONSE_SCHEMA_VERSION}
+        if kind == "value_prop_interest":
+            pitched = response
+            text = response.get("response") or ""
+            if text != explanation:
+                upgraded.append({"type": "problem_action", "text": text, **stamp})
+        elif kind in ("price_sensitivity", "opt_in_intent") and pitched is not None:
+            likelihood = get_answer_normalizer().likelihood(response.get("response") or "")
+            upgraded.append({
+                "type": "value_prop_interest",
+                "value_prop": pitched.get("value_prop", ""),
+                "action": pitched.get("action", ""),
+                "response": response.get("response") or "",
+                "likelihood": likelihood,
+                "likelihood_label": LIKELIHOOD_LABELS.get(likelihood),
+                **stamp
+            })
+            pitched = None
+        elif kind == "price_sensitivity":
+            upgraded.append({"type": "price_sensitivity", "response": response.get("response") or "", **stamp})
+        elif kind == "opt_in_intent":
+            # Only ever the pitch answer, already taken above; no opt-in was recorded
+            continue
+        else:
+            if kind == "problem_explanation":
+                explanation = response.get("text")
+            upgraded.append({**response, **stamp})
+    return upgraded
@@ -0,0 +1,197 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from datetime import date
+import atexit
+import os
+import threading
+import uuid
+
+# Counted per founder, session link and day; the resonance ones also per
+# problem, the others under problem ""
+INTERVIEWS_STARTED = "interviews_started"
+INTERVIEWS_COMPLETED = "interviews_completed"
+RESONANCE_COUNT = "resonance_count"
+RESONANCE_SUM = "resonance_sum"
+TESTERS = "testers"
+OPT_INS = "opt_ins"
+SESSION_METRICS = (INTERVIEWS_STARTED, INTERVIEWS_COMPLETED, TESTERS, OPT_INS)
+
+class ResultCounters:
+    """Founder dashboard counters, kept up to date as interview events happen.
+
+    Agents and the tester form call ``record_*`` as they go. Increments are
+    summed in memory per (founder, session link, problem, day, metric), and a
+    background thread hands them to ``sink`` (``increment_result_counters``)
+    every ``flush_interval`` seconds, or sooner once ``flush_size`` keys are
+    pending: one atomic add per key, never a read of the ``responses`` blobs.
+    What is pending is flushed once more at exit.
+
+    Each batch carries a ``batch_key`` the store records with the increments.
+    A failed batch is resent as it was, under the same key, before anything
+    newer, so a batch whose reply was lost after the store applied it is
+    skipped rather than counted twice. Past ``capacity`` pending keys (a
+    store down for long) new keys are dropped and counted in ``stats``.
+    """
+
+    def __init__(self, flush_size: int = 200, flush_interval: float = 5.0, capacity: int = 50000,
+                 sink: Optional[Callable[[List[Dict], Optional[str]], None]] = None):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.sink = None
+        self._pending: Dict[Tuple[str, str, str, str, str], int] = {}
+        # The batch key and rows of a flush that failed, resent as they were
+        self._in_flight: Optional[Tuple[str, List[Dict]]] = None
+        self._lock = threading.Lock()
+        # One flush at a time, from the background thread or a caller wanting fresh rows
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._counters = {"events": 0, "flushes": 0, "flushed_rows": 0, "flush_errors": 0, "dropped": 0}
+        self.set_sink(sink)
+
+    def set_sink(self, sink: Optional[Callable[[List[Dict], Optional[str]], None]]) -> None:
+        """Set where increments go, e.g. ``DatabaseService.increment_result_counters``, and start flushing"""
+        self.sink = sink
+        with self._lock:
+            if sink is None or self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="result-counters", daemon=True)
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def add(self, founder_email: Optional[str], session_id: str, metric: str, value: int = 1, problem: str = "") -> None:
+        key = (founder_email or "", session_id, problem or "", date.today().isoformat(), metric)
+        with self._lock:
+            if key not in self._pending and len(self._pending) >= self.capacity:
+                self._counters["dropped"] += 1
+                return
+            self._pending[key] = self._pending.get(key, 0) + value
+            self._counters["events"] += 1
+            due = len(self._pending) >= self.flush_size
+        if due:
+            self._wake.set()
+
+    def record_started(self, session_id: str, founder_email: Optional[str]) -> None:
+        self.add(founder_email, session_id, INTERVIEWS_STARTED)
+
+    def record_completed(self, session_id: str, founder_email: Optional[str]) -> None:
+        self.add(founder_email, session_id, INTERVIEWS_COMPLETED)
+
+    def record_response(self, session_id: str, founder_email: Optional[str], response: Dict) -> None:
+        """Count an interview response as it is recorded; only resonance scores are counted"""
+        score = response.get("resonance_score")
+        if response.get("type") != "problem_resonance" or not isinstance(score, int):
+            return
+        problem = response.get("problem") or ""
+        self.add(founder_email, session_id, RESONANCE_COUNT, problem=problem)
+        self.add(founder_email, session_id, RESONANCE_SUM, score, problem=problem)
+
+    def record_tester(self, session_id: str, founder_email: Optional[str], opt_in: bool) -> None:
+        self.add(founder_email, session_id, TESTERS)
+        if opt_in:
+            self.add(founder_email, session_id, OPT_INS)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Hand pending increments to the sink, after any batch that failed before; returns the number of rows"""
+        with self._flush_lock:
+            flushed = 0
+            if self._in_flight is not None:
+                if not self._send(*self._in_flight):
+                    return 0
+                flushed += len(self._in_flight[1])
+                self._in_flight = None
+            with self._lock:
+                if not self._pending or self.sink is None:
+                    return flushed
+                pending, self._pending = self._pending, {}
+            rows = [{"founder_email": founder_email, "session_id": session_id, "problem": problem,
+                     "day": day, "metric": metric, "value": value}
+                    for (founder_email, session_id, problem, day, metric), value in pending.items()]
+            batch = (uuid.uuid4().hex, rows)
+            if not self._send(*batch):
+                self._in_flight = batch
+                return flushed
+            return flushed + len(rows)
+
+    def _send(self, batch_key: str, rows: List[Dict]) -> bool:
+        try:
+            self.sink(rows, batch_key)
+        except Exception as e:
+            print(f"Error flushing result counters: {str(e)}")
+            with self._lock:
+                self._counters["flush_errors"] += 1
+            return False
+        with self._lock:
+            self._counters["flushes"] += 1
+            self._counters["flushed_rows"] += len(rows)
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = len(self._in_flight[1]) if self._in_flight is not None else 0
+            return {**self._counters, "pending": len(self._pending) + in_flight}
+
+def interview_counter_rows(record: Dict) -> List[Dict]:
+    """Counter increments for one whole interview saved at once (a ``save_interviews_batch`` record).
+
+    The same metrics an interview run in the app records as it goes, dated
+    the day the interview was held.
+    """
+    session = record["session"]
+    founder_email = session.get("founder_email") or ""
+    day = str(session.get("created_at") or date.today().isoformat())[:10]
+    counts: Dict[Tuple[str, str], int] = {("", INTERVIEWS_STARTED): 1, ("", INTERVIEWS_COMPLETED): 1}
+    for response in record["responses"]:
+        score = response.get("resonance_score")
+        if response.get("type") == "problem_resonance" and isinstance(score, int):
+            problem = response.get("problem") or ""
+            counts[(problem, RESONANCE_COUNT)] = counts.get((problem, RESONANCE_COUNT), 0) + 1
+            counts[(problem, RESONANCE_SUM)] = counts.get((problem, RESONANCE_SUM), 0) + score
+    tester = record.get("tester")
+    if tester:
+        counts[("", TESTERS)] = 1
+        if tester.get("opt_in"):
+            counts[("", OPT_INS)] = 1
+    return [{"founder_email": founder_email, "session_id": session["session_id"], "problem": problem,
+             "day": day, "metric": metric, "value": value}
+            for (problem, metric), value in counts.items()]
+
+def summarize_counters(rows: Iterable[Dict]) -> Dict:
+    """Totals, per session link, per problem and per day from ``get_result_counters`` rows"""
+    totals = {metric: 0 for metric in SESSION_METRICS}
+    sessions: Dict[str, Dict] = {}
+    problems: Dict[str, Dict] = {}
+    days: Dict[str, Dict] = {}
+    for row in rows:
+        metric, value = row["metric"], row["value"]
+        day = str(row["day"])
+        if metric in SESSION_METRICS:
+            totals[metric] += value
+            session = sessions.setdefault(row["session_id"], {m: 0 for m in SESSION_METRICS})
+            session[metric] += value
+            daily = days.setdefault(day, {INTERVIEWS_STARTED: 0, INTERVIEWS_COMPLETED: 0})
+            if metric in daily:
+                daily[metric] += value
+        elif metric in (RESONANCE_COUNT, RESONANCE_SUM):
+            problem = problems.setdefault(row["problem"], {"ratings": 0, "score_total": 0})
+            problem["ratings" if metric == RESONANCE_COUNT else "score_total"] += value
+    for problem in problems.values():
+        problem["mean_resonance"] = round(problem["score_total"] / problem["ratings"], 2) if problem["ratings"] else None
+    return {"totals": totals, "sessions": sessions, "problems": problems, "days": dict(sorted(days.items()))}
+
+# Process-wide counters shared by all agents; flushing starts once a sink is set
+result_counters = ResultCounters(flush_interval=float(os.getenv('RESULT_COUNTERS_FLUSH_SECONDS', '5')))
+
+def get_result_counters() -> ResultCounters:
+    return result_counters
+
+def set_result_counters(counters: ResultCounters) -> None:
+    """Swap the process-wide counters, e.g. to measure one benchmark run"""
+    global result_counters
+    result_counters = counters
@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, List, Optional
+import bisect
+import hashlib
+
+# Conversation ids start with their session's routing key, so any router can place
+# a conversation without a lookup table
+ROUTING_KEY_LENGTH = 16
+
+def routing_key(session_id: str) -> str:
+    """Fixed-length routing key for a session link"""
+    return hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:ROUTING_KEY_LENGTH]
+
+def conversation_routing_key(conversation_id: str) -> str:
+    return conversation_id[:ROUTING_KEY_LENGTH]
+
+def _position(value: str) -> int:
+    return int(hashlib.md5(value.encode("utf-8")).hexdigest()[:16], 16)
+
+class HashRing:
+    """Consistent-hashing ring of worker nodes.
+
+    Each node is placed at ``vnodes`` points on the ring and a key belongs to
+    the first node clockwise from the key's position. Adding or removing a
+    node only moves the keys in the arcs that node gains or loses, about
+    ``1/n`` of them, so a membership change hands off a fraction of live
+    conversations instead of reshuffling all of them.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 256):
+        self.vnodes = vnodes
+        self.nodes: List[str] = []
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        self._rebuild()
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.nodes:
+            raise KeyError(f"Unknown node: {node}")
+        self.nodes.remove(node)
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        ring = sorted((_position(f"{node}#{i}"), node) for node in self.nodes for i in range(self.vnodes))
+        self._points = [point for point, _ in ring]
+        self._owners = [node for _, node in ring]
+
+    def node_for(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _position(key)) % len(self._points)
+        return self._owners[index]
+
+    def copy(self) -> 'HashRing':
+        return HashRing(self.nodes, self.vnodes)
+
+    def spread(self, keys: Iterable[str]) -> Dict[str, int]:
+        """How many of ``keys`` each node owns"""
+        counts = {node: 0 for node in self.nodes}
+        for key in keys:
+            counts[self.node_for(key)] += 1
+        return counts
@@ -0,0 +1,105 @@
+from typing import Callable, Dict, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+import hashlib
+import json
+import os
+import threading
+import time
+from utils.tracing import get_tracer, run_in_context
+
+def fingerprint(*parts) -> str:
+    """Stable digest of the inputs a speculative result was computed from"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class Speculation:
+    """A background computation, the fingerprint of the inputs it assumed and its cancellation token"""
+
+    def __init__(self, key: str, future: Future, token=None):
+        self.key = key
+        self.future = future
+        self.token = token
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future: Future) -> None:
+        self.finished_at = time.monotonic()
+
+class Speculator:
+    """Runs LLM work the next turn will probably need while the tester is still typing.
+
+    ``start`` launches ``fn`` on a background thread and remembers the
+    fingerprint of the inputs it was given. When the turn arrives, ``resolve``
+    compares that fingerprint with the real inputs: on a match the result is
+    used (waiting for it if it is still running), on a mismatch it is
+    discarded and the caller computes the result itself.
+    """
+
+    def __init__(self, workers: int = 8, enabled: bool = True):
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="speculation")
+        self._lock = threading.Lock()
+        self._counters = {"started": 0, "hits": 0, "discarded": 0, "failed": 0,
+                          "hidden_seconds": 0.0, "waited_seconds": 0.0}
+
+    def start(self, key: str, fn: Callable, *args, token=None) -> Optional[Speculation]:
+        """Run ``fn(*args)`` in the background; ``token`` is cancelled if the result is discarded"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._counters["started"] += 1
+        # Spans opened by the speculative call join the trace of the turn that started it
+        return Speculation(key, self._executor.submit(run_in_context(fn, *args)), token)
+
+    def resolve(self, speculation: Optional[Speculation], key: str) -> Tuple[bool, object]:
+        """``(True, result)`` if the speculation matches ``key``, otherwise ``(False, None)``"""
+        if speculation is None:
+            return False, None
+        if speculation.key != key:
+            self.discard(speculation)
+            return False, None
+        waited_from = time.monotonic()
+        with get_tracer().start_as_current_span("speculation.wait", {"speculation.ready": speculation.future.done()}):
+            try:
+                result = speculation.future.result()
+            except Exception as e:
+                print(f"Error in speculative call: {str(e)}")
+                with self._lock:
+                    self._counters["failed"] += 1
+                return False, None
+        with self._lock:
+            self._counters["hits"] += 1
+            # Work that overlapped the tester's typing vs. the part they still waited for
+            self._counters["hidden_seconds"] += min(waited_from, speculation.finished_at or waited_from) - speculation.started_at
+            self._counters["waited_seconds"] += time.monotonic() - waited_from
+        return True, result
+
+    def discard(self, speculation: Optional[Speculation]) -> None:
+        """Drop a speculation whose assumptions no longer hold; a queued one never runs, a running one is cancelled"""
+        if speculation is None:
+            return
+        if not speculation.future.cancel() and speculation.token is not None:
+            speculation.token.cancel("discarded")
+        with self._lock:
+            self._counters["discarded"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        resolved = counters["hits"] + counters["discarded"]
+        counters["hit_rate"] = counters["hits"] / resolved if resolved else 0.0
+        return counters
+
+# Process-wide speculator shared by all agents
+speculator = Speculator(
+    workers=int(os.getenv('SPECULATION_WORKERS', '8')),
+    enabled=os.getenv('SPECULATIVE_PREFETCH', 'true').lower() not in ('0', 'false', 'no')
+)
+
+def get_speculator() -> Speculator:
+    return speculator
+
+def set_speculator(instance: Speculator) -> None:
+    """Swap the process-wide speculator, e.g. to compare with speculation disabled"""
+    global speculator
+    speculator = instance
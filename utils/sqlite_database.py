@@ -0,0 +1,639 @@
+from typing import Dict, List, Optional
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import json
+import os
+import sqlite3
+import threading
+import time
+from utils.result_counters import interview_counter_rows
+from utils.tracing import trace_methods
+from utils.storage import (
+    StorageBackend, SESSION_TABLES, JOB_QUEUED, JOB_RUNNING, JOB_DEAD, OUTBOX_METHODS, validate_founder_inputs,
+    founder_inputs_row
+)
+
+# Same tables as the Supabase migrations, with JSON and arrays stored as TEXT
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS founders (
+    id INTEGER PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS founder_inputs (
+    id INTEGER PRIMARY KEY,
+    founder_email TEXT NOT NULL UNIQUE,
+    problem_domain TEXT NOT NULL,
+    problems TEXT NOT NULL,
+    value_prop TEXT NOT NULL,
+    target_action TEXT NOT NULL,
+    follow_up_action TEXT,
+    is_paid_service INTEGER DEFAULT 0,
+    pricing_model TEXT,
+    price_points TEXT,
+    pricing_questions TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL UNIQUE,
+    founder_email TEXT,
+    founder_inputs TEXT,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    responses TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    idempotency_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_founder_email ON sessions(founder_email, id);
+CREATE INDEX IF NOT EXISTS idx_responses_session_id ON responses(session_id);
+CREATE TABLE IF NOT EXISTS testers (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    email TEXT,
+    opt_in INTEGER,
+    gdpr_consent INTEGER,
+    created_at TEXT,
+    idempotency_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_testers_session_id ON testers(session_id);
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    analysis TEXT NOT NULL,
+    state TEXT,
+    watermark INTEGER,
+    created_at TEXT,
+    idempotency_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_session_id ON analyses(session_id);
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    model TEXT NOT NULL,
+    session_id TEXT,
+    founder_email TEXT,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    completion_tokens INTEGER NOT NULL DEFAULT 0,
+    total_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    latency_ms INTEGER,
+    ttft_ms INTEGER,
+    estimated INTEGER DEFAULT 0,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_llm_usage_founder ON llm_usage(founder_email, session_id);
+CREATE TABLE IF NOT EXISTS token_buckets (
+    bucket_key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after REAL NOT NULL,
+    locked_by TEXT,
+    lease_expires_at REAL,
+    progress TEXT,
+    result TEXT,
+    last_error TEXT,
+    founder_email TEXT,
+    created_at TEXT,
+    updated_at REAL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claimable ON jobs(status, priority DESC, id);
+CREATE TABLE IF NOT EXISTS agent_states (
+    key TEXT PRIMARY KEY,
+    session_id TEXT,
+    state TEXT NOT NULL,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_agent_states_updated_at ON agent_states(updated_at);
+CREATE TABLE IF NOT EXISTS result_counters (
+    founder_email TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    problem TEXT NOT NULL DEFAULT '',
+    day TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    PRIMARY KEY (founder_email, session_id, problem, day, metric)
+);
+CREATE TABLE IF NOT EXISTS result_counter_batches (
+    batch_key TEXT PRIMARY KEY,
+    applied_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_result_counter_batches_applied_at ON result_counter_batches(applied_at);
+"""
+
+JOB_JSON_FIELDS = ("payload", "progress", "result")
+
+# How long an applied result counter batch key is remembered
+RESULT_COUNTER_BATCH_TTL = timedelta(days=1)
+
+# Columns added after a table was first created, with their types
+ADDED_COLUMNS = {
+    "analyses": {"state": "TEXT", "watermark": "INTEGER", "idempotency_key": "TEXT"},
+    "responses": {"idempotency_key": "TEXT"},
+    "testers": {"idempotency_key": "TEXT"},
+}
+
+# Tables written by replayed outbox entries, which carry an idempotency key
+IDEMPOTENT_TABLES = ("responses", "testers", "analyses")
+
+LLM_USAGE_COLUMNS = (
+    "site", "model", "session_id", "founder_email", "prompt_tokens", "completion_tokens",
+    "total_tokens", "cached_tokens", "cost_usd", "latency_ms", "ttft_ms", "estimated", "created_at"
+)
+
+@trace_methods("db")
+class SQLiteDatabaseService(StorageBackend):
+    """Local SQLite storage backend.
+
+    Uses WAL mode so readers never block the writer, one connection per thread,
+    parameterised statements (compiled once and reused by sqlite3's statement
+    cache) and ``executemany`` for bulk writes.
+    """
+
+    def __init__(self, path: str = "data/mombot.db"):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        # A private in-memory database only exists on the connection that created it
+        self._shared = self._connect() if path == ":memory:" else None
+        self._write_lock = threading.Lock()
+        self.conn.executescript(SCHEMA)
+        self._upgrade_schema()
+
+    def _upgrade_schema(self) -> None:
+        """Bring database files created by older versions up to SCHEMA"""
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {row["name"] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns.items():
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_watermark ON analyses(session_id, watermark)")
+        for table in IDEMPOTENT_TABLES:
+            self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_idempotency_key ON {table}(idempotency_key)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Serialise writers within the process and wrap them in a transaction"""
+        with self._write_lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _one(self, sql: str, params: tuple = ()) -> Optional[Dict]:
+        row = self.conn.execute(sql, params).fetchone()
+        return dict(row) if row else None
+
+    def create_founder(self, email: str, password_hash: bytes) -> None:
+        """Create a new founder account"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO founders (email, password_hash, created_at) VALUES (?, ?, ?)",
+                (email, password_hash.hex(), datetime.now().isoformat())
+            )
+
+    def get_founder(self, email: str) -> Optional[Dict]:
+        """Get founder by email"""
+        founder = self._one("SELECT * FROM founders WHERE email = ?", (email,))
+        if founder:
+            founder['password_hash'] = bytes.fromhex(founder['password_hash'])
+        return founder
+
+    def save_session(self, session_data: dict) -> str:
+        """Save session data to database"""
+        founder_inputs = session_data.get('founder_inputs')
+        if not isinstance(founder_inputs, str):
+            founder_inputs = json.dumps(founder_inputs)
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO sessions (session_id, founder_email, founder_inputs, created_at) VALUES (?, ?, ?, ?)",
+                (session_data['session_id'], session_data.get('founder_email'), founder_inputs,
+                 session_data.get('created_at', datetime.now().isoformat()))
+            )
+        return session_data['session_id']
+
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Get session data from database"""
+        return self._one("SELECT * FROM sessions WHERE session_id = ?", (session_id,))
+
+    def save_responses(self, session_id: str, responses: list) -> None:
+        """Save interview responses to database"""
+        self.save_responses_batch([{'session_id': session_id, 'responses': responses}])
+
+    def save_responses_batch(self, batch: List[Dict]) -> None:
+        """Save many sessions' responses in one transaction"""
+        if not batch:
+            return
+        created_at = datetime.now().isoformat()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO responses (session_id, responses, created_at) VALUES (?, ?, ?)",
+                [(r['session_id'], json.dumps(r['responses']), r.get('created_at', created_at)) for r in batch]
+            )
+
+    def save_interviews_batch(self, batch: List[Dict]) -> List[str]:
+        """Save many imported interviews in one transaction, skipping session ids already stored"""
+        if not batch:
+            return []
+        created_at = datetime.now().isoformat()
+        with self._transaction() as conn:
+            session_ids = [record['session']['session_id'] for record in batch]
+            skipped = set()
+            for start in range(0, len(session_ids), 500):
+                chunk = session_ids[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT session_id FROM sessions WHERE session_id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                skipped.update(row['session_id'] for row in rows)
+            sessions, responses, testers, counters = [], [], [], []
+            for record in batch:
+                session = record['session']
+                if session['session_id'] in skipped:
+                    continue
+                counters.extend(interview_counter_rows(record))
+                founder_inputs = session.get('founder_inputs')
+                if not isinstance(founder_inputs, str):
+                    founder_inputs = json.dumps(founder_inputs)
+                session_created_at = session.get('created_at', created_at)
+                sessions.append((session['session_id'], session.get('founder_email'), founder_inputs, session_created_at))
+                responses.append((session['session_id'], json.dumps(record['responses']), session_created_at))
+                tester = record.get('tester')
+                if tester:
+                    testers.append((session['session_id'], tester.get('email'), tester.get('opt_in', False),
+                                    tester.get('gdpr_consent', False), session_created_at))
+            conn.executemany(
+                "INSERT INTO sessions (session_id, founder_email, founder_inputs, created_at) VALUES (?, ?, ?, ?)",
+                sessions
+            )
+            conn.executemany("INSERT INTO responses (session_id, responses, created_at) VALUES (?, ?, ?)", responses)
+            conn.executemany(
+                "INSERT INTO testers (session_id, email, opt_in, gdpr_consent, created_at) VALUES (?, ?, ?, ?, ?)",
+                testers
+            )
+            # Imported interviews count on the live results panel like ones run in the app
+            self._increment_result_counters(conn, counters, created_at)
+        return [session_id for session_id in session_ids if session_id in skipped]
+
+    def get_responses(self, session_id: str) -> list:
+        """Get interview responses from database"""
+        row = self._one("SELECT responses FROM responses WHERE session_id = ? ORDER BY id LIMIT 1", (session_id,))
+        return json.loads(row['responses']) if row else []
+
+    def get_response_rows(self, session_id: str, after_id: int = 0, limit: Optional[int] = None) -> list:
+        """Get each interview's responses saved after row ``after_id``"""
+        rows = self.conn.execute(
+            "SELECT id, responses, created_at FROM responses WHERE session_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (session_id, after_id, -1 if limit is None else limit)
+        ).fetchall()
+        return [{"id": row["id"], "responses": json.loads(row["responses"]), "created_at": row["created_at"]} for row in rows]
+
+    def save_tester_info(self, session_id: str, email: str, opt_in: bool, gdpr_consent: bool) -> None:
+        """Save tester information and preferences"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO testers (session_id, email, opt_in, gdpr_consent, created_at) VALUES (?, ?, ?, ?, ?)",
+                (session_id, email, opt_in, gdpr_consent, datetime.now().isoformat())
+            )
+
+    def get_tester_info(self, session_id: str) -> Optional[Dict]:
+        """Get tester information"""
+        tester = self._one("SELECT * FROM testers WHERE session_id = ? ORDER BY id LIMIT 1", (session_id,))
+        if tester:
+            tester['opt_in'] = bool(tester['opt_in'])
+            tester['gdpr_consent'] = bool(tester['gdpr_consent'])
+        return tester
+
+    def save_analysis(self, session_id: str, analysis: dict) -> None:
+        """Save analysis results to database"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO analyses (session_id, analysis, created_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(analysis), datetime.now().isoformat())
+            )
+
+    def get_analysis(self, session_id: str) -> Optional[Dict]:
+        """Get the most recent analysis results from database"""
+        row = self._one("SELECT analysis FROM analyses WHERE session_id = ? ORDER BY id DESC LIMIT 1", (session_id,))
+        return json.loads(row['analysis']) if row else None
+
+    def save_analysis_state(self, session_id: str, analysis: dict, state: dict, watermark: int) -> None:
+        """Save an incremental analysis and the state it was folded from"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO analyses (session_id, analysis, state, watermark, created_at) VALUES (?, ?, ?, ?, ?)",
+                (session_id, json.dumps(analysis), json.dumps(state), watermark, datetime.now().isoformat())
+            )
+
+    def get_analysis_state(self, session_id: str) -> Optional[Dict]:
+        """Get the incremental analysis that covers the most responses"""
+        row = self._one(
+            "SELECT analysis, state, watermark FROM analyses WHERE session_id = ? AND watermark IS NOT NULL "
+            "ORDER BY watermark DESC, id DESC LIMIT 1",
+            (session_id,)
+        )
+        if not row:
+            return None
+        return {"analysis": json.loads(row['analysis']), "state": json.loads(row['state']), "watermark": row['watermark']}
+
+    def save_agent_states(self, states: Dict[str, dict]) -> None:
+        """Insert or replace spilled agent states in one transaction"""
+        if not states:
+            return
+        updated_at = datetime.now().isoformat()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO agent_states (key, session_id, state, updated_at) VALUES (?, ?, ?, ?)",
+                [(key, state.get('session_id'), json.dumps(state), updated_at) for key, state in states.items()]
+            )
+
+    def get_agent_state(self, key: str) -> Optional[Dict]:
+        """Get a spilled agent state"""
+        row = self._one("SELECT state FROM agent_states WHERE key = ?", (key,))
+        return json.loads(row['state']) if row else None
+
+    def delete_agent_states(self, keys: List[str]) -> None:
+        """Delete spilled agent states"""
+        if not keys:
+            return
+        with self._transaction() as conn:
+            conn.executemany("DELETE FROM agent_states WHERE key = ?", [(key,) for key in keys])
+
+    def save_llm_usage(self, records: list) -> None:
+        """Save a batch of LLM usage records in one transaction"""
+        if not records:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
+                f"INSERT INTO llm_usage ({', '.join(LLM_USAGE_COLUMNS)}) VALUES ({', '.join('?' * len(LLM_USAGE_COLUMNS))})",
+                [tuple(r.get(c) for c in LLM_USAGE_COLUMNS) for r in records]
+            )
+
+    def get_llm_usage(self, founder_email: str) -> list:
+        """Get per-session LLM usage rollups for a founder"""
+        rows = self.conn.execute("""
+            SELECT founder_email, session_id, COUNT(*) AS calls,
+                   SUM(prompt_tokens) AS prompt_tokens, SUM(completion_tokens) AS completion_tokens,
+                   SUM(total_tokens) AS total_tokens, SUM(cost_usd) AS cost_usd,
+                   CAST(AVG(latency_ms) AS INTEGER) AS avg_latency_ms, CAST(AVG(ttft_ms) AS INTEGER) AS avg_ttft_ms,
+                   SUM(cached_tokens) AS cached_tokens
+            FROM llm_usage WHERE founder_email = ? GROUP BY founder_email, session_id
+        """, (founder_email,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def take_tokens(self, bucket_key: str, amount: float, capacity: float, refill_rate: float) -> bool:
+        """Atomically refill a budget bucket and take tokens from it"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT tokens, updated_at FROM token_buckets WHERE bucket_key = ?", (bucket_key,)).fetchone()
+            available = capacity if row is None else min(capacity, row['tokens'] + (now - row['updated_at']) * refill_rate)
+            allowed = available >= amount
+            remaining = min(capacity, available - amount) if allowed else available
+            conn.execute(
+                "INSERT INTO token_buckets (bucket_key, tokens, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(bucket_key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                (bucket_key, remaining, now)
+            )
+        return allowed
+
+    def list_sessions(self, founder_email: str, offset: int = 0, limit: int = 500) -> list:
+        """Page through a founder's sessions, oldest first"""
+        rows = self.conn.execute(
+            "SELECT * FROM sessions WHERE founder_email = ? ORDER BY id LIMIT ? OFFSET ?",
+            (founder_email, limit, offset)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_session_rows(self, table: str, session_ids: List[str]) -> list:
+        """Get every responses/testers/analyses row for a set of sessions"""
+        if table not in SESSION_TABLES:
+            raise ValueError(f"Unknown session table: {table}")
+        if not session_ids:
+            return []
+        rows = self.conn.execute(
+            f"SELECT * FROM {table} WHERE session_id IN ({', '.join('?' * len(session_ids))}) ORDER BY id",
+            tuple(session_ids)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_founder_inputs(self, founder_email: str, inputs: dict) -> Optional[Dict]:
+        """Save founder inputs to the database"""
+        validate_founder_inputs(inputs)
+        with self._transaction() as conn:
+            self._upsert_founder_inputs(conn, founder_email, inputs)
+        return self._founder_inputs_record(founder_email)
+
+    def _upsert_founder_inputs(self, conn: sqlite3.Connection, founder_email: str, inputs: dict) -> None:
+        data = founder_inputs_row(founder_email, inputs)
+        for field in ('problems', 'price_points', 'pricing_questions'):
+            data[field] = json.dumps(data[field])
+        columns = list(data)
+        conn.execute(
+            f"INSERT INTO founder_inputs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(founder_email) DO UPDATE SET "
+            f"{', '.join(f'{c} = excluded.{c}' for c in columns if c != 'founder_email')}, updated_at = CURRENT_TIMESTAMP",
+            tuple(data.values())
+        )
+
+    def _founder_inputs_record(self, founder_email: str) -> Optional[Dict]:
+        row = self._one("SELECT * FROM founder_inputs WHERE founder_email = ?", (founder_email,))
+        if row:
+            for field in ('problems', 'price_points', 'pricing_questions'):
+                row[field] = json.loads(row[field]) if row[field] else []
+            row['is_paid_service'] = bool(row['is_paid_service'])
+        return row
+
+    def get_founder_inputs(self, founder_email: str) -> Optional[Dict]:
+        """Get the most recent founder inputs for a given email."""
+        row = self._founder_inputs_record(founder_email)
+        if not row:
+            return None
+        return {field: row[field] for field in founder_inputs_row(founder_email, row) if field != 'founder_email'}
+
+    def increment_result_counters(self, rows: List[Dict], batch_key: Optional[str] = None) -> None:
+        """Add to live result counters in one transaction, once per batch key"""
+        if not rows:
+            return
+        now = datetime.now()
+        updated_at = now.isoformat()
+        with self._transaction() as conn:
+            if batch_key is not None:
+                # Keys are only resent by the process that made them, so a day of them is plenty
+                conn.execute("DELETE FROM result_counter_batches WHERE applied_at < ?",
+                             ((now - RESULT_COUNTER_BATCH_TTL).isoformat(),))
+                applied = conn.execute("INSERT OR IGNORE INTO result_counter_batches (batch_key, applied_at) VALUES (?, ?)",
+                                       (batch_key, updated_at))
+                if not applied.rowcount:
+                    return
+            self._increment_result_counters(conn, rows, updated_at)
+
+    def _increment_result_counters(self, conn: sqlite3.Connection, rows: List[Dict], updated_at: str) -> None:
+        conn.executemany(
+            "INSERT INTO result_counters (founder_email, session_id, problem, day, metric, value, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(founder_email, session_id, problem, day, metric) "
+            "DO UPDATE SET value = value + excluded.value, updated_at = excluded.updated_at",
+            [(r['founder_email'], r['session_id'], r.get('problem', ''), r['day'], r['metric'], r['value'], updated_at)
+             for r in rows]
+        )
+
+    def get_result_counters(self, founder_email: str, since: Optional[str] = None) -> list:
+        """Get a founder's live result counters"""
+        rows = self.conn.execute(
+            "SELECT session_id, problem, day, metric, value FROM result_counters WHERE founder_email = ? AND day >= ?",
+            (founder_email, since or "")
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def apply_outbox_batch(self, records: List[Dict]) -> None:
+        """Apply queued writes in one transaction, skipping rows already stored"""
+        by_method = {method: [] for method in OUTBOX_METHODS}
+        for record in records:
+            by_method[record['method']].append(record)
+        sessions = []
+        for record in by_method['save_session']:
+            session = record['payload']['session_data']
+            founder_inputs = session.get('founder_inputs')
+            if not isinstance(founder_inputs, str):
+                founder_inputs = json.dumps(founder_inputs)
+            sessions.append((session['session_id'], session.get('founder_email'), founder_inputs, session.get('created_at')))
+        with self._transaction() as conn:
+            for record in by_method['save_founder_inputs']:
+                self._upsert_founder_inputs(conn, record['payload']['founder_email'], record['payload']['inputs'])
+            conn.executemany(
+                "INSERT INTO sessions (session_id, founder_email, founder_inputs, created_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO NOTHING",
+                sessions
+            )
+            conn.executemany(
+                "INSERT INTO responses (session_id, responses, created_at, idempotency_key) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(idempotency_key) DO NOTHING",
+                [(r['payload']['session_id'], json.dumps(r['payload']['responses']), r['payload']['created_at'], r['key'])
+                 for r in by_method['save_responses']]
+            )
+            conn.executemany(
+                "INSERT INTO testers (session_id, email, opt_in, gdpr_consent, created_at, idempotency_key) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(idempotency_key) DO NOTHING",
+                [(r['payload']['session_id'], r['payload']['email'], r['payload']['opt_in'], r['payload']['gdpr_consent'],
+                  r['payload']['created_at'], r['key']) for r in by_method['save_tester_info']]
+            )
+            conn.executemany(
+                "INSERT INTO analyses (session_id, analysis, created_at, idempotency_key) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(idempotency_key) DO NOTHING",
+                [(r['payload']['session_id'], json.dumps(r['payload']['analysis']), r['payload']['created_at'], r['key'])
+                 for r in by_method['save_analysis']]
+            )
+
+    def _job(self, row) -> Dict:
+        job = dict(row)
+        for field in JOB_JSON_FIELDS:
+            job[field] = json.loads(job[field]) if job[field] is not None else None
+        return job
+
+    def enqueue_job(self, kind: str, payload: dict, dedupe_key: Optional[str] = None, priority: int = 0,
+                    max_attempts: int = 5, founder_email: Optional[str] = None) -> Dict:
+        """Queue a job, or return the existing one with the same dedupe key (a dead one is requeued)"""
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "INSERT INTO jobs (kind, payload, dedupe_key, priority, max_attempts, founder_email, run_after, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(dedupe_key) DO UPDATE SET status = ?, attempts = 0, run_after = excluded.run_after, "
+                "last_error = NULL, updated_at = excluded.updated_at WHERE jobs.status = ? RETURNING *",
+                (kind, json.dumps(payload), dedupe_key, priority, max_attempts, founder_email, now,
+                 datetime.now().isoformat(), now, JOB_QUEUED, JOB_DEAD)
+            ).fetchone()
+            if row is None:
+                row = conn.execute("SELECT * FROM jobs WHERE dedupe_key = ?", (dedupe_key,)).fetchone()
+        return self._job(row)
+
+    def claim_jobs(self, worker_id: str, kinds: Optional[List[str]] = None, limit: int = 1,
+                   lease_seconds: float = 120.0) -> list:
+        """Lease runnable jobs, highest priority first.
+
+        BEGIN IMMEDIATE takes SQLite's write lock, so concurrent claimers (threads
+        or processes) run one at a time and never lease the same job; this is the
+        local stand-in for Postgres' FOR UPDATE SKIP LOCKED.
+        """
+        now = time.time()
+        kind_filter = f"AND kind IN ({', '.join('?' * len(kinds))})" if kinds else ""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"UPDATE jobs SET status = ?, locked_by = ?, attempts = attempts + 1, lease_expires_at = ?, updated_at = ? "
+                f"WHERE id IN (SELECT id FROM jobs WHERE ((status = ? AND run_after <= ?) OR (status = ? AND lease_expires_at < ?)) "
+                f"{kind_filter} ORDER BY priority DESC, id LIMIT ?) RETURNING *",
+                (JOB_RUNNING, worker_id, now + lease_seconds, now, JOB_QUEUED, now, JOB_RUNNING, now, *(kinds or ()), limit)
+            ).fetchall()
+        return sorted((self._job(row) for row in rows), key=lambda job: (-job["priority"], job["id"]))
+
+    def heartbeat_job(self, job_id: int, worker_id: str, lease_seconds: float, progress: Optional[dict] = None) -> bool:
+        """Extend a job's lease and optionally store progress"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ?, progress = COALESCE(?, progress) "
+                "WHERE id = ? AND locked_by = ? AND status = ?",
+                (now + lease_seconds, now, json.dumps(progress) if progress is not None else None, job_id, worker_id, JOB_RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def finish_job(self, job_id: int, worker_id: str, status: str, result: Optional[dict] = None,
+                   error: Optional[str] = None, retry_in: Optional[float] = None, refund_attempt: bool = False) -> bool:
+        """Mark a leased job succeeded, dead, or queued again in ``retry_in`` seconds"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, last_error = ?, run_after = ?, attempts = attempts - ?, "
+                "locked_by = NULL, lease_expires_at = NULL, updated_at = ?, finished_at = ? "
+                "WHERE id = ? AND locked_by = ? AND status = ?",
+                (status, json.dumps(result) if result is not None else None, error, now + (retry_in or 0),
+                 1 if refund_attempt else 0, now, None if status == JOB_QUEUED else datetime.now().isoformat(),
+                 job_id, worker_id, JOB_RUNNING)
+            )
+        return cursor.rowcount == 1
+
+    def get_job(self, job_id: Optional[int] = None, dedupe_key: Optional[str] = None) -> Optional[Dict]:
+        """Get a job by id or by deduplication key"""
+        if job_id is not None:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        else:
+            row = self.conn.execute("SELECT * FROM jobs WHERE dedupe_key = ?", (dedupe_key,)).fetchone()
+        return self._job(row) if row else None
@@ -0,0 +1,231 @@
+from typing import Dict, List, Optional
+from abc import ABC, abstractmethod
+import os
+
+# Per-session tables that can be read in bulk with get_session_rows
+SESSION_TABLES = ('responses', 'testers', 'analyses')
+
+# Job lifecycle: queued -> running -> succeeded, or back to queued for a retry,
+# or dead once out of attempts
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_SUCCEEDED = 'succeeded'
+JOB_DEAD = 'dead'
+
+# Writes the local outbox can queue, in the order a replayed batch applies
+# them: founder inputs and sessions before the rows that refer to them
+OUTBOX_METHODS = ('save_founder_inputs', 'save_session', 'save_responses', 'save_tester_info', 'save_analysis')
+
+class StorageBackend(ABC):
+    """Everything the app and agents need from a database.
+
+    ``DatabaseService`` implements this on top of Supabase; ``SQLiteDatabaseService``
+    talks to a local SQLite file for single-node deployments, tests and benchmarks.
+    """
+
+    @abstractmethod
+    def create_founder(self, email: str, password_hash: bytes) -> None:
+        """Create a new founder account"""
+
+    @abstractmethod
+    def get_founder(self, email: str) -> Optional[Dict]:
+        """Get founder by email, with ``password_hash`` as bytes"""
+
+    @abstractmethod
+    def save_session(self, session_data: dict) -> str:
+        """Save session data and return its session_id"""
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict]:
+        """Get session data"""
+
+    @abstractmethod
+    def save_responses(self, session_id: str, responses: list) -> None:
+        """Save interview responses"""
+
+    @abstractmethod
+    def save_responses_batch(self, batch: List[Dict]) -> None:
+        """Save many ``{"session_id", "responses"}`` records in one round trip"""
+
+    @abstractmethod
+    def save_interviews_batch(self, batch: List[Dict]) -> List[str]:
+        """Save many complete ``{"session", "responses", "tester"}`` interviews at once, all or nothing.
+
+        Interviews whose ``session_id`` is already stored are skipped; returns their session ids.
+        """
+
+    @abstractmethod
+    def get_responses(self, session_id: str) -> list:
+        """Get interview responses"""
+
+    @abstractmethod
+    def get_response_rows(self, session_id: str, after_id: int = 0, limit: Optional[int] = None) -> list:
+        """Get ``{"id", "responses", "created_at"}`` for each interview saved after row ``after_id``, oldest first"""
+
+    @abstractmethod
+    def save_tester_info(self, session_id: str, email: str, opt_in: bool, gdpr_consent: bool) -> None:
+        """Save tester information and preferences"""
+
+    @abstractmethod
+    def get_tester_info(self, session_id: str) -> Optional[Dict]:
+        """Get tester information"""
+
+    @abstractmethod
+    def save_analysis(self, session_id: str, analysis: dict) -> None:
+        """Save analysis results"""
+
+    @abstractmethod
+    def get_analysis(self, session_id: str) -> Optional[Dict]:
+        """Get the most recent analysis results"""
+
+    @abstractmethod
+    def save_analysis_state(self, session_id: str, analysis: dict, state: dict, watermark: int) -> None:
+        """Save an incremental analysis with its compact state, covering responses rows up to ``watermark``"""
+
+    @abstractmethod
+    def get_analysis_state(self, session_id: str) -> Optional[Dict]:
+        """Get ``{"analysis", "state", "watermark"}`` of the furthest incremental analysis, if any"""
+
+    @abstractmethod
+    def save_agent_states(self, states: Dict[str, dict]) -> None:
+        """Insert or replace the spilled state of idle interview agents, keyed by their registry key"""
+
+    @abstractmethod
+    def get_agent_state(self, key: str) -> Optional[Dict]:
+        """Get a spilled interview agent's state, if any"""
+
+    @abstractmethod
+    def delete_agent_states(self, keys: List[str]) -> None:
+        """Forget spilled agent states, e.g. once their interviews are complete"""
+
+    @abstractmethod
+    def save_llm_usage(self, records: list) -> None:
+        """Save a batch of LLM usage records"""
+
+    @abstractmethod
+    def get_llm_usage(self, founder_email: str) -> list:
+        """Get per-session LLM usage rollups for a founder"""
+
+    @abstractmethod
+    def take_tokens(self, bucket_key: str, amount: float, capacity: float, refill_rate: float) -> bool:
+        """Atomically take tokens from a shared budget bucket"""
+
+    @abstractmethod
+    def list_sessions(self, founder_email: str, offset: int = 0, limit: int = 500) -> list:
+        """Page through a founder's sessions, oldest first"""
+
+    @abstractmethod
+    def get_session_rows(self, table: str, session_ids: List[str]) -> list:
+        """Get every ``responses``, ``testers`` or ``analyses`` row for a set of sessions"""
+
+    @abstractmethod
+    def save_founder_inputs(self, founder_email: str, inputs: dict) -> Optional[Dict]:
+        """Insert or update a founder's inputs"""
+
+    @abstractmethod
+    def get_founder_inputs(self, founder_email: str) -> Optional[Dict]:
+        """Get the most recent founder inputs for a given email"""
+
+    @abstractmethod
+    def enqueue_job(self, kind: str, payload: dict, dedupe_key: Optional[str] = None, priority: int = 0,
+                    max_attempts: int = 5, founder_email: Optional[str] = None) -> Dict:
+        """Queue a job, or return the existing one with the same ``dedupe_key`` (a dead one is requeued)"""
+
+    @abstractmethod
+    def claim_jobs(self, worker_id: str, kinds: Optional[List[str]] = None, limit: int = 1,
+                   lease_seconds: float = 120.0) -> list:
+        """Lease up to ``limit`` runnable jobs, highest priority first, skipping ones other workers hold"""
+
+    @abstractmethod
+    def heartbeat_job(self, job_id: int, worker_id: str, lease_seconds: float, progress: Optional[dict] = None) -> bool:
+        """Extend a job's lease (and store progress); False if the worker no longer holds it"""
+
+    @abstractmethod
+    def finish_job(self, job_id: int, worker_id: str, status: str, result: Optional[dict] = None,
+                   error: Optional[str] = None, retry_in: Optional[float] = None, refund_attempt: bool = False) -> bool:
+        """Mark a leased job succeeded, dead, or queued again in ``retry_in`` seconds.
+
+        ``refund_attempt`` gives back the attempt the claim used, for retries
+        that were not failures (e.g. waiting for a token budget).
+        """
+
+    @abstractmethod
+    def increment_result_counters(self, rows: List[Dict], batch_key: Optional[str] = None) -> None:
+        """Atomically add each row's ``value`` to its ``(founder_email, session_id, problem, day, metric)`` counter.
+
+        A ``batch_key`` already applied (a retry after a lost reply) adds nothing.
+        """
+
+    @abstractmethod
+    def get_result_counters(self, founder_email: str, since: Optional[str] = None) -> list:
+        """Get a founder's counter rows, for days from ``since`` (``YYYY-MM-DD``) on if given"""
+
+    @abstractmethod
+    def apply_outbox_batch(self, records: List[Dict]) -> None:
+        """Apply queued ``{"key", "method", "payload"}`` writes, skipping any whose idempotency key is already stored"""
+
+    @abstractmethod
+    def get_job(self, job_id: Optional[int] = None, dedupe_key: Optional[str] = None) -> Optional[Dict]:
+        """Get a job by id or by deduplication key"""
+
+def validate_founder_inputs(inputs: dict) -> None:
+    """Raise ValueError if founder inputs are incomplete or malformed"""
+    # Validate required fields
+    required_fields = ['problem_domain', 'problems', 'value_prop', 'target_action']
+    for field in required_fields:
+        if field not in inputs:
+            raise ValueError(f"Missing required field: {field}")
+
+    # Validate field types
+    if not isinstance(inputs['problems'], list):
+        raise ValueError("Problems must be a list")
+
+    # Validate problems list is not empty
+    if not inputs['problems']:
+        raise ValueError("Problems list cannot be empty")
+
+    # Validate pricing information if it's a paid service
+    if inputs.get('is_paid_service', False):
+        if not inputs.get('pricing_model'):
+            raise ValueError("Pricing model is required for paid services")
+        if not inputs.get('price_points'):
+            raise ValueError("At least one price point is required for paid services")
+        if not isinstance(inputs['price_points'], list):
+            raise ValueError("Price points must be a list")
+        if not all(isinstance(price, (int, float)) for price in inputs['price_points']):
+            raise ValueError("Price points must be numbers")
+
+def founder_inputs_row(founder_email: str, inputs: dict) -> dict:
+    """Column values stored for a founder's inputs"""
+    return {
+        'founder_email': founder_email,
+        'problem_domain': inputs['problem_domain'],
+        'problems': inputs['problems'],
+        'value_prop': inputs['value_prop'],
+        'target_action': inputs['target_action'],
+        'follow_up_action': inputs.get('follow_up_action', ''),
+        'is_paid_service': inputs.get('is_paid_service', False),
+        'pricing_model': inputs.get('pricing_model', ''),
+        'price_points': inputs.get('price_points', []),
+        'pricing_questions': inputs.get('pricing_questions', [])
+    }
+
+def get_database_service() -> StorageBackend:
+    """Create the storage backend selected by ``STORAGE_BACKEND`` (``supabase`` or ``sqlite``)"""
+    backend = os.getenv('STORAGE_BACKEND', 'supabase').lower()
+    if backend == 'supabase':
+        from utils.database import DatabaseService
+        return with_outbox(DatabaseService(), default='true')
+    if backend == 'sqlite':
+        from utils.sqlite_database import SQLiteDatabaseService
+        # Already a local file, so the outbox is off unless asked for
+        return with_outbox(SQLiteDatabaseService(os.getenv('SQLITE_PATH', 'data/mombot.db')), default='false')
+    raise ValueError(f"Unknown STORAGE_BACKEND '{backend}', expected 'supabase' or 'sqlite'")
+
+
+def with_outbox(db: StorageBackend, default: str = 'true') -> StorageBackend:
+    """Route ``db``'s interview writes through the local outbox unless ``STORAGE_OUTBOX`` is off"""
+    if os.getenv('STORAGE_OUTBOX', default).lower() in ('0', 'false', 'no'):
+        return db
+    from utils.outbox import OutboxStorage, get_outbox
+    return OutboxStorage(db, get_outbox())
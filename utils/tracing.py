@@ -0,0 +1,319 @@
+"""Lightweight tracing for turns, database calls and LLM calls.
+
+Spans follow OpenTelemetry's API (``start_as_current_span``, ``start_span``,
+``set_attribute``, ``add_event``, ``record_exception``, ``end``), so the
+OpenTelemetry SDK can take over with ``TRACING_EXPORTER=otel``. Tracing is off
+by default: every span is then one shared no-op object and a traced call costs
+a context manager and nothing else.
+
+``TRACING_EXPORTER=file`` appends finished spans as JSON lines and
+``TRACING_EXPORTER=sqlite`` writes them to a SQLite file (``TRACING_PATH``);
+``trace_tool.py`` prints flame-style breakdowns of either.
+"""
+from typing import Callable, Dict, List, Optional
+from contextlib import contextmanager
+import contextvars
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+def _attributes(attributes: Optional[Dict]) -> Dict:
+    # OpenTelemetry only accepts primitive attribute values and no None
+    return {k: v if isinstance(v, (str, bool, int, float)) else str(v)
+            for k, v in (attributes or {}).items() if v is not None}
+
+class Span:
+    """One timed operation; ``end`` hands it to the tracer's exporter"""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "attributes", "events",
+                 "status", "start_ns", "end_ns")
+
+    def __init__(self, tracer: 'Tracer', name: str, parent: Optional['Span'], attributes: Optional[Dict]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = _attributes(attributes)
+        self.events: List[Dict] = []
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def is_recording(self) -> bool:
+        return self.end_ns is None
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes.update(_attributes({key: value}))
+
+    def set_attributes(self, attributes: Dict) -> None:
+        self.attributes.update(_attributes(attributes))
+
+    def add_event(self, name: str, attributes: Optional[Dict] = None) -> None:
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": _attributes(attributes)})
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.status = "error"
+        self.add_event("exception", {"type": type(exception).__name__, "message": str(exception)})
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.tracer._finished(self)
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": self.status
+        }
+
+class _NoopSpan:
+    """Stands in for every span while tracing is off"""
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict] = None) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+class JsonlSpanExporter:
+    """Appends spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Dict]) -> None:
+        lines = "".join(json.dumps(span) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+
+class SQLiteSpanExporter:
+    """Writes spans to a ``spans`` table in a SQLite file"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS spans (
+        span_id TEXT PRIMARY KEY,
+        trace_id TEXT NOT NULL,
+        parent_id TEXT,
+        name TEXT NOT NULL,
+        start_ns INTEGER NOT NULL,
+        end_ns INTEGER NOT NULL,
+        attributes TEXT,
+        events TEXT,
+        status TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_spans_trace_id ON spans(trace_id);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def export(self, spans: List[Dict]) -> None:
+        rows = [(s["span_id"], s["trace_id"], s["parent_id"], s["name"], s["start_ns"], s["end_ns"],
+                 json.dumps(s["attributes"]), json.dumps(s["events"]), s["status"]) for s in spans]
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            finally:
+                conn.close()
+
+def load_spans(path: str) -> List[Dict]:
+    """Read spans written by either local exporter"""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute("SELECT * FROM spans ORDER BY start_ns").fetchall()
+        finally:
+            conn.close()
+        return [{**dict(row), "attributes": json.loads(row["attributes"] or "{}"),
+                 "events": json.loads(row["events"] or "[]")} for row in rows]
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class Tracer:
+    """Creates spans and hands finished ones to ``exporter`` in batches.
+
+    Without an exporter the tracer is disabled and hands out ``NOOP_SPAN``.
+    Batches are written once ``flush_size`` spans are pending, after
+    ``flush_interval`` seconds, or when a root span (a whole request or rerun)
+    ends.
+    """
+
+    def __init__(self, exporter=None, flush_size: int = 200, flush_interval: float = 2.0):
+        self.exporter = exporter
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.pending: List[Dict] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def current_span(self):
+        return _current_span.get() or NOOP_SPAN
+
+    def start_span(self, name: str, attributes: Optional[Dict] = None):
+        """A child of the current span that is not made current; call ``end`` when done.
+
+        Used for work that outlives the caller's frame, such as a streamed
+        completion consumed by a generator.
+        """
+        if self.exporter is None:
+            return NOOP_SPAN
+        return Span(self, name, _current_span.get(), attributes)
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[Dict] = None):
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+        span = Span(self, name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except Exception as e:
+            # Control flow such as Streamlit's rerun (a BaseException) is not an error
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def _finished(self, span: Span) -> None:
+        with self._lock:
+            self.pending.append(span.to_dict())
+            due = (span.parent_id is None or len(self.pending) >= self.flush_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Export pending spans in one batch; returns the number exported"""
+        with self._lock:
+            batch, self.pending = self.pending, []
+            self._last_flush = time.monotonic()
+        if not batch or self.exporter is None:
+            return 0
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            print(f"Error exporting spans: {str(e)}")
+            return 0
+        return len(batch)
+
+class OpenTelemetryTracer:
+    """Same interface, backed by the OpenTelemetry SDK configured by the host process"""
+
+    enabled = True
+
+    def __init__(self, name: str = "mombot"):
+        from opentelemetry import trace
+        self._trace = trace
+        self._tracer = trace.get_tracer(name)
+
+    def current_span(self):
+        return self._trace.get_current_span()
+
+    def start_span(self, name: str, attributes: Optional[Dict] = None):
+        return self._tracer.start_span(name, attributes=_attributes(attributes))
+
+    def start_as_current_span(self, name: str, attributes: Optional[Dict] = None):
+        return self._tracer.start_as_current_span(name, attributes=_attributes(attributes))
+
+    def flush(self) -> int:
+        return 0
+
+def traced(name: str):
+    """Decorator running each call of a function inside a span called ``name``"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with tracer.start_as_current_span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def trace_methods(prefix: str):
+    """Class decorator tracing every public method the class defines, as ``prefix.method``"""
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_") and callable(value) and not isinstance(value, (staticmethod, classmethod, type)):
+                setattr(cls, attr, traced(f"{prefix}.{attr}")(value))
+        return cls
+    return decorator
+
+def run_in_context(fn: Callable, *args) -> Callable:
+    """Bind ``fn`` to the caller's context so spans it opens on another thread join the caller's trace"""
+    return functools.partial(contextvars.copy_context().run, fn, *args)
+
+def _tracer_from_env():
+    exporter = os.getenv('TRACING_EXPORTER', 'none').lower()
+    if exporter == 'file':
+        return Tracer(JsonlSpanExporter(os.getenv('TRACING_PATH', 'data/traces.jsonl')))
+    if exporter == 'sqlite':
+        return Tracer(SQLiteSpanExporter(os.getenv('TRACING_PATH', 'data/traces.db')))
+    if exporter == 'otel':
+        return OpenTelemetryTracer()
+    return Tracer()
+
+# Process-wide tracer; disabled unless TRACING_EXPORTER is set. Built on first
+# use so entry points can load .env after importing the modules that trace
+tracer = None
+
+def get_tracer():
+    global tracer
+    if tracer is None:
+        tracer = _tracer_from_env()
+    return tracer
+
+def set_tracer(instance) -> None:
+    """Swap the process-wide tracer, e.g. to record spans in a benchmark"""
+    global tracer
+    tracer = instance
@@ -0,0 +1,62 @@
+"""Background worker for queued analyses and reports.
+
+Run one or more next to the app; they share the database queue:
+
+    python worker.py
+    python worker.py --concurrency 4 --kinds analysis.report
+
+SIGTERM or Ctrl-C stops claiming new jobs and lets running ones finish.
+"""
+import argparse
+import os
+import signal
+from dotenv import load_dotenv
+from agents.jobs import job_handlers
+from utils.job_queue import JobQueue, JobWorker
+from utils.llm_usage import get_usage_meter
+from utils.storage import get_database_service
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run queued analysis and report jobs")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv('JOB_WORKER_CONCURRENCY', '2')),
+                        help="Jobs run at once by this worker")
+    parser.add_argument("--kinds", help="Comma-separated job kinds to run (default: all)")
+    parser.add_argument("--lease", type=float, default=float(os.getenv('JOB_LEASE_SECONDS', '120')),
+                        help="Seconds a job is held before another worker may take it over")
+    parser.add_argument("--poll", type=float, default=1.0, help="Seconds between claims when the queue is empty")
+    parser.add_argument("--once", action="store_true", help="Claim one batch, finish it and exit")
+    args = parser.parse_args()
+
+    db = get_database_service()
+    get_usage_meter().set_sink(db.save_llm_usage)
+    handlers = job_handlers(db)
+    if args.kinds:
+        kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in handlers]
+        if unknown:
+            parser.error(f"Unknown job kinds: {', '.join(unknown)}")
+        handlers = {kind: handlers[kind] for kind in kinds}
+
+    worker = JobWorker(JobQueue(db), handlers, concurrency=args.concurrency,
+                       lease_seconds=args.lease, poll_interval=args.poll)
+    if args.once:
+        claimed = worker.run_once()
+        # Stopped before the first claim, so run() only waits for this batch
+        worker.stopping.set()
+        worker.run()
+        print(f"Ran {claimed} job(s): {worker.stats()}")
+        return
+
+    def stop(signum, frame):
+        print("Stopping: finishing running jobs")
+        worker.stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Worker {worker.worker_id} running {', '.join(handlers)} with concurrency {args.concurrency}")
+    worker.run()
+    print(f"Worker stopped: {worker.stats()}")
+
+if __name__ == "__main__":
+    main()